@@ -8,6 +8,7 @@ from __future__ import print_function
 # Imports
 import unittest
 import logging
+import threading
 from functools import wraps
 
 #
@@ -32,13 +33,63 @@ class Parallel(object):
             + type: list
         - tile: Whether to enable the tile mode or not (default False)
             + type: bool
+        - coarsen: Maximum cost (number of calls) of the statements of the same iteration fused into a single task.
+         Disabled when None (default None)
+            + type: int
+        - chunk: Number of consecutive iterations of the parallel loops grouped into a single task when the tile mode
+         is disabled. Disabled when None (default None)
+            + type: int
+        - optimize: Whether to optimize the generated code that spawns the tasks (dead CLooG stores, loop-invariant
+         bounds, common subexpressions and integer divisions) or not (default False)
+            + type: bool
+        - constraints: Map containing original callee names and the constraints (e.g. {"potrf": {"ComputingUnits":
+         "4"}}) of the generated tasks calling them. Extends the @constraint decorators of the callees (default None)
+            + type: dict<str, dict<str, Object>>
+        - task_options: Map containing original callee names and the @task options (e.g. {"gemm": {"priority": True}})
+         of the generated tasks calling them (default None)
+            + type: dict<str, dict<str, Object>>
+        - priority: Whether to mark the tasks on the critical path (e.g. the panel factorizations) as high-priority
+         tasks or not. When set to "level", the priority level of each critical task is also written (default False)
+            + type: bool or str
+        - views: Whether to pass basic-slice views of ndarray-backed arrays to the loop tasks instead of building
+         collections element by element. The array type is checked at runtime and the written views are copied back
+         to the arrays when the host code synchronizes them (default False)
+            + type: bool
+        - inplace: Whether the statements assigning the result of a callee to one of its arguments (e.g. c = gemm(a, b,
+         c)) update the argument in place (INOUT parameter) instead of returning a new object. When True, only the
+         callees of the module that update the argument through subscript assignments or out= keywords are converted
+         (pure callees and scalar updates keep returning a new object). Can be a list of callee names to convert them
+         without checks (default False)
+            + type: bool or List<str>
+        - vectorize: Whether to emit the body of the element-wise loop tasks as a single NumPy expression over the
+         whole chunk or not. Implies views (default False)
+            + type: bool
+        - cost_model: Map containing the expected parameter values ("params"), the estimated duration of an
+         iteration of the innermost loop ("iteration_cost"), the target task duration ("task_duration") and the
+         expected number of workers ("workers") used to choose the depth of the taskified loops when the tile mode is
+         enabled (e.g. {"params": {"m_size": 1024}, "workers": 48}). Disabled when None (default None)
+            + type: dict<str, Object>
+        - taskify_depth: Depth (starting at 1 for the main loop) of the taskified loops when the tile mode is enabled.
+         Overrides the cost model. Disabled when None (default None)
+            + type: int
+        - nested: Whether to wrap the iterations of the outermost parallel loops into parent tasks that spawn the inner
+         tasks from the workers (nested tasks) instead of spawning all the tasks from the master or not (default False)
+            + type: bool
         - force_autogen: When enabled, force the generation of the code. When disabled, reuse the autogenerated
          version if possible (default True)
             + type: bool
         - generate_only: When enabled, only generate the parallel code (default False)
             + type: bool
+
+    The rest of kwargs are attribute overrides: when the decorated function is called with arguments, the attributes
+    of its first argument (the object of a decorated method) with these names take the given values during the call
     """
 
+    # Static attribute Names of the decorator options (the rest of kwargs are attribute overrides)
+    _options = ["pluto_extra_flags", "tile", "coarsen", "chunk", "optimize", "constraints", "task_options", "priority",
+                "views", "inplace", "vectorize", "cost_model", "taskify_depth", "nested", "force_autogen",
+                "generate_only"]
+
     def __init__(self, *args, **kwargs):
         logger.debug("Init @parallel decorator...")
 
@@ -60,6 +111,54 @@ class Parallel(object):
             elif "--tile" not in self.pluto_extra_flags:
                 self.pluto_extra_flags.append("--tile")
 
+        self.coarsen = None
+        if "coarsen" in self.kwargs.keys():
+            self.coarsen = self.kwargs["coarsen"]
+
+        self.chunk = None
+        if "chunk" in self.kwargs.keys():
+            self.chunk = self.kwargs["chunk"]
+
+        self.optimize = False
+        if "optimize" in self.kwargs.keys():
+            self.optimize = self.kwargs["optimize"]
+
+        self.constraints = None
+        if "constraints" in self.kwargs.keys():
+            self.constraints = self.kwargs["constraints"]
+
+        self.task_options = None
+        if "task_options" in self.kwargs.keys():
+            self.task_options = self.kwargs["task_options"]
+
+        self.priority = False
+        if "priority" in self.kwargs.keys():
+            self.priority = self.kwargs["priority"]
+
+        self.views = False
+        if "views" in self.kwargs.keys():
+            self.views = self.kwargs["views"]
+
+        self.inplace = False
+        if "inplace" in self.kwargs.keys():
+            self.inplace = self.kwargs["inplace"]
+
+        self.vectorize = False
+        if "vectorize" in self.kwargs.keys():
+            self.vectorize = self.kwargs["vectorize"]
+
+        self.cost_model = None
+        if "cost_model" in self.kwargs.keys():
+            self.cost_model = self.kwargs["cost_model"]
+
+        self.taskify_depth = None
+        if "taskify_depth" in self.kwargs.keys():
+            self.taskify_depth = self.kwargs["taskify_depth"]
+
+        self.nested = False
+        if "nested" in self.kwargs.keys():
+            self.nested = self.kwargs["nested"]
+
         self.force_autogen = True
         if "force_autogen" in self.kwargs.keys():
             self.force_autogen = self.kwargs["force_autogen"]
@@ -68,13 +167,24 @@ class Parallel(object):
         if "generate_only" in self.kwargs.keys():
             self.generate_only = self.kwargs["generate_only"]
 
+        # Attributes set on the object of the decorated methods during the calls
+        self.attribute_overrides = dict((k, v) for k, v in self.kwargs.items() if k not in Parallel._options)
+        # Map containing the ids of the objects with overridden attributes and their number of running calls, saved
+        # attributes and object (protected by the overrides lock)
+        self._overridden_objects = {}
+        self._overrides_lock = threading.Lock()
+
         # Add a place to store internal translator structures
         self.translator_py2scop = None
         self.code_replacer = None
+        self.code_reuser = None
+        self.new_func = None
 
     def __call__(self, func):
         """
-        Parallelizes the annotated function and returns a wrapper to it
+        Parallelizes the annotated function and returns a wrapper to it. All the functions annotated in the same
+        module are translated together when the last one is annotated, so that the module is rewritten and loaded
+        only once and the generated task names do not collide
 
         Arguments:
                 - func : Python Function Object to parallelize
@@ -90,72 +200,123 @@ class Parallel(object):
         if __debug__:
             logger.debug("[decorator] Start decorator for function: " + str(func))
 
-        # Try to reuse a generated version or translate it
-        from pycompss.util.translators.code_reuser.code_reuser import CodeReuser
-        self.code_reuser = CodeReuser(func, self.force_autogen)
-        if self.code_reuser.can_reuse():
-            # We are not forced to autogenerate files and an existing autogen file exists, reuse generated code
-            new_func = self.code_reuser.reuse()
-        else:
-            # Parallelize given function
-            new_func = self._translate(func, keep_generated_files=__debug__)
+        # Register the function in its module batch and process the batch when all its functions are registered
+        batch = _ModuleBatch.register(self, func)
+        if batch.is_complete():
+            processed_decorators = batch.process()
+            # Stop execution if generate_only flag is enabled
+            if any(decorator.generate_only for decorator in processed_decorators):
+                logger.warn("WARN: Stop execution because generate_only flag is enabled")
+                raise Exception("WARN: Stop execution because generate_only flag is enabled")
+
+        # Add decorator wrapper (the user code is restored once the generated code is loaded, so each call is a
+        # direct call to the new function)
+        @wraps(func)
+        def parallel_f(*args, **kwargs):
+            # The function is called before the rest of functions of its module are annotated, process it now (only
+            # the first caller translates it, the concurrent callers wait for the translation)
+            if self.new_func is None:
+                batch.process()
+            if len(self.attribute_overrides) > 0 and len(args) > 0:
+                return self._call_with_overrides(args, kwargs)
+            return self.new_func(*args, **kwargs)
+
+        def task_graph(*args, **kwargs):
+            # Expands the generated code for the given arguments into a task graph, without running the tasks
+            if self.new_func is None:
+                batch.process()
+            return self._get_task_graph(func, args, kwargs)
+
+        def submit(*args, **kwargs):
+            # Calls the function on a background thread and returns a handle to its result (awaitable in asyncio)
+            _check_async_runtime(func.__name__)
+            if self.new_func is None:
+                batch.process()
+            return ParallelHandle(parallel_f, args, kwargs)
 
-        # Stop execution if generate_only flag is enabled
-        if self.generate_only:
-            logger.warn("WARN: Stop execution because generate_only flag is enabled")
-            raise Exception("WARN: Stop execution because generate_only flag is enabled")
+        # Return the wrapper of the parallelized function
+        parallel_f.__doc__ = func.__doc__
+        parallel_f.task_graph = task_graph
+        parallel_f.submit = submit
+        return parallel_f
 
-        # Add decorator wrapper
-        @wraps(new_func)
-        def parallel_f(*args, **kwargs):
-            # This is executed only when called.
-            if __debug__:
-                logger.debug("[parallel_f] Executing parallel_f wrapper")
+    def _call_with_overrides(self, args, kwargs):
+        """
+        Calls the new function setting the attribute overrides on its first argument (the 'self' of a method) and
+        restores the original attributes afterwards. The concurrent (or recursive) calls on the same object share the
+        overrides, which are restored when the last call finishes
 
-            # Save things
-            if __debug__:
-                logger.debug("[parallel_f] Saving method data")
-            slf = None
-            saved = {}
-            if len(args) > 0:
-                # The 'self' for a method function is passed as args[0]
-                slf = args[0]
-                # Replace and store the attributes
-                for k, v in self.kwargs.items():
+        Arguments:
+                - args : Positional arguments of the function
+                - kwargs : Keyword arguments of the function
+        Return:
+                - ret : Value returned by the new function
+        """
+
+        if __debug__:
+            logger.debug("[parallel_f] Overriding method attributes: " + str(list(self.attribute_overrides.keys())))
+
+        slf = args[0]
+        with self._overrides_lock:
+            entry = self._overridden_objects.get(id(slf))
+            if entry is None:
+                saved = {}
+                for k, v in self.attribute_overrides.items():
                     if hasattr(slf, k):
                         saved[k] = getattr(slf, k)
                         setattr(slf, k, v)
+                # Keep a reference to the object so that its id is not reused
+                entry = [0, saved, slf]
+                self._overridden_objects[id(slf)] = entry
+            entry[0] += 1
+        try:
+            return self.new_func(*args, **kwargs)
+        finally:
+            with self._overrides_lock:
+                entry[0] -= 1
+                if entry[0] == 0:
+                    del self._overridden_objects[id(slf)]
+                    for k, v in entry[1].items():
+                        setattr(slf, k, v)
 
-            # Call the method
-            if __debug__:
-                logger.debug("[parallel_f] Calling user method")
+    def _restore_user_code(self):
+        """
+        Restores the user file once the generated code is loaded (according to code_replacer or code_reuser)
+        """
 
-            try:
-                ret = new_func(*args, **kwargs)
-            except Exception:
-                raise
-            finally:
-                # Put things back
-                if __debug__:
-                    logger.debug("[parallel_f] Restoring method data")
-                if len(args) > 0:
-                    for k, v in saved.items():
-                        setattr(slf, k, v)
+        if __debug__:
+            logger.debug("[decorator] Restoring user code")
+        if self.code_replacer is not None:
+            self.code_replacer.restore()
+        elif self.code_reuser is not None:
+            self.code_reuser.restore()
 
-                # Restore user code (according to code_replacer or code_reuser)
-                if __debug__:
-                    logger.debug("[parallel_f] Restoring user code")
-                if self.code_replacer is not None:
-                    self.code_replacer.restore()
-                elif self.code_reuser is not None:
-                    self.code_reuser.restore()
+    def _get_task_graph(self, func, args, kwargs):
+        """
+        Records the task graph spawned by the generated code of the given function for the given arguments. The
+        generated module is loaded on the local runtime and the tasks are not executed
 
-            # Return method value
-            return ret
+        Arguments:
+                - func : Python original function
+                - args : Positional arguments of the function
+                - kwargs : Keyword arguments of the function
+        Return:
+                - graph : TaskGraph (exportable as DOT or JSON)
+        Raise:
+                - TaskGraphException
+        """
 
-        # Return the wrapper of the parallelized function
-        parallel_f.__doc__ = new_func.__doc__
-        return parallel_f
+        if __debug__:
+            logger.debug("[decorator] Recording task graph of function: " + str(func))
+
+        # The generated module is stored in the autogen file
+        if self.code_replacer is not None:
+            generated_file = self.code_replacer.new_file
+        else:
+            generated_file = self.code_reuser.autogen_file
+
+        from pycompss.util.local_runtime.task_graph import build_task_graph
+        return build_task_graph(generated_file, func.__name__, args, kwargs)
 
     def _translate(self, func=None, keep_generated_files=False):
         """
@@ -173,62 +334,72 @@ class Parallel(object):
                 - CodeReplacerException
         """
 
+        return Parallel._translate_all([(self, func)], keep_generated_files)[0]
+
+    @staticmethod
+    def _translate_all(decorators2funcs, keep_generated_files=False):
+        """
+        Parallelizes the given functions of the same module and returns pointers to the new parallel functions. The
+        generated task names are unique within the module and the module is rewritten and loaded only once
+
+        Arguments:
+                - decorators2funcs : List of tuples containing the decorator and the Python Function Object to
+                        parallelize
+                - keep_generated_files : Keep auto-generated intermediate files (default False)
+        Return:
+                - new_funcs : List of Python Function Objects to the parallel functions
+        Raise:
+                - Py2ScopException
+                - Scop2PScop2PyException
+                - Py2PyCOMPSsException
+                - CodeReplacerException
+        """
+
         if __debug__:
-            logger.debug("[decorator] Translating function: " + str(func))
+            logger.debug("[decorator] Translating functions: " + str([func for _, func in decorators2funcs]))
 
-        scop_files = None
-        py_files = None
-        pycompss_file = None
+        files_to_clean = []
+        funcs2pycompss_files = []
         try:
-            # Process python code to scop
-            base_scop_file = ".tmp_gen_scop.scop"
-            scop_files = self._py2scop(func, base_scop_file)
-            if __debug__:
-                logger.debug("[decorator] Generated OpenScop content")
-                # for scop_file in scop_files:
-                #       with open(scop_file, 'r') as f:
-                #               logger.debug(f.read())
-
-            # Parallelize each OpenScop code and process it back to python
-            base_py_file = ".tmp_gen_parallel.py"
-            py_files = self._scop2pscop2py(scop_files, base_py_file)
-            if __debug__:
-                logger.debug("[decorator] Generated Parallel Python content")
-                # for py_file in py_files:
-                #       with open(py_file, 'r') as f:
-                #               logger.debug(f.read())
-
-            # Merges and adds PyCOMPSs annotations
-            pycompss_file = ".tmp_gen_pycompss.py"
-            self._py2pycompss(func, py_files, pycompss_file)
-            if __debug__:
-                logger.debug("[decorator] Generated PyCOMPSs content")
-                # with open(pycompss_file, 'r') as f:
-                #        logger.debug(f.read())
+            task_counter_id = 0
+            for decorator, func in decorators2funcs:
+                # Process python code to scop
+                base_scop_file = ".tmp_gen_scop_" + func.__name__ + ".scop"
+                scop_files = decorator._py2scop(func, base_scop_file)
+                files_to_clean.extend(scop_files)
+                if __debug__:
+                    logger.debug("[decorator] Generated OpenScop content")
+
+                # Parallelize each OpenScop code and process it back to python
+                base_py_file = ".tmp_gen_parallel_" + func.__name__ + ".py"
+                py_files = decorator._scop2pscop2py(scop_files, base_py_file)
+                files_to_clean.extend(py_files)
+                if __debug__:
+                    logger.debug("[decorator] Generated Parallel Python content")
+
+                # Merges and adds PyCOMPSs annotations (task names continue from the previous functions)
+                pycompss_file = ".tmp_gen_pycompss_" + func.__name__ + ".py"
+                files_to_clean.append(pycompss_file)
+                task_counter_id = decorator._py2pycompss(func, py_files, pycompss_file, task_counter_id)
+                funcs2pycompss_files.append((func, pycompss_file))
+                if __debug__:
+                    logger.debug("[decorator] Generated PyCOMPSs content")
 
             # Embed code into user file
-            new_func = self._load_generated_code(func, pycompss_file, keep_generated_files)
+            new_funcs = Parallel._load_generated_code(decorators2funcs, funcs2pycompss_files, keep_generated_files)
         except Exception as e:
             logger.error(e)
             raise
         finally:
             if not keep_generated_files:
                 # Clean
-                files_to_clean = []
-                if scop_files is not None:
-                    for f in scop_files:
-                        files_to_clean.append(f)
-                if py_files is not None:
-                    for f in py_files:
-                        files_to_clean.append(f)
-                if pycompss_file is not None:
-                    files_to_clean.append(pycompss_file)
                 Parallel._clean(files_to_clean)
 
         # Return parallelized code
         if __debug__:
-            logger.debug("[decorator] Replaced " + str(func) + " by " + str(new_func))
-        return new_func
+            for (_, func), new_func in zip(decorators2funcs, new_funcs):
+                logger.debug("[decorator] Replaced " + str(func) + " by " + str(new_func))
+        return new_funcs
 
     def _py2scop(self, func, base_output):
         """
@@ -295,7 +466,7 @@ class Parallel(object):
 
         return output_files
 
-    def _py2pycompss(self, func, par_py_files, output):
+    def _py2pycompss(self, func, par_py_files, output, task_counter_id=0):
         """
         Substitutes the given parallel python files into the original
         function code and adds the required PyCOMPSs annotations. The
@@ -306,7 +477,9 @@ class Parallel(object):
                 - par_py_files : List of files containing the Python parallelization
                         of each for block in the func_source
                 - output : PyCOMPSs file path
+                - task_counter_id : Number of tasks already generated in the module (default 0)
         Return:
+                - task_counter_id : Number of tasks generated in the module after translating func
         Raise:
                 - Py2PyCOMPSsException
         """
@@ -315,36 +488,50 @@ class Parallel(object):
             logger.debug("[decorator] Start py2pycompss")
 
         from pycompss.util.translators.py2pycompss.translator_py2pycompss import Py2PyCOMPSs
-        Py2PyCOMPSs.translate(func, par_py_files, output, tile=self.tile)
+        task_counter_id = Py2PyCOMPSs.translate(func, par_py_files, output, tile=self.tile, coarsen=self.coarsen,
+                                                chunk=self.chunk, optimize=self.optimize,
+                                                constraints=self.constraints, task_options=self.task_options,
+                                                priority=self.priority, views=self.views, inplace=self.inplace,
+                                                vectorize=self.vectorize, cost_model=self.cost_model,
+                                                taskify_depth=self.taskify_depth, nested=self.nested,
+                                                task_counter_id=task_counter_id)
 
         # Finish
         if __debug__:
             logger.debug("[decorator] Finished py2pycompss")
 
-    def _load_generated_code(self, func, new_code, keep_generated_files):
+        return task_counter_id
+
+    @staticmethod
+    def _load_generated_code(decorators2funcs, funcs2new_codes, keep_generated_files):
         """
-        Replaces the func code by the content of new_code
+        Replaces the code of the given functions by the content of their new code files. All the functions belong to
+        the same module, which is rewritten and loaded only once
 
         Arguments:
-                - func : function to be replaced
-                - new_code : File path containing the new code
+                - decorators2funcs : List of tuples containing the decorator and the function to be replaced
+                - funcs2new_codes : List of tuples containing the function to be replaced and the file path
+                        containing its new code
+                - keep_generated_files : Keep auto-generated intermediate files
         Return:
-                - new_func : pointer to the new function
+                - new_funcs : List of pointers to the new functions
         Raise:
-                - LoadGeneratedCodeException
+                - CodeReplacerException
         """
 
         if __debug__:
             logger.debug("[decorator] Start load_generated_code")
 
         from pycompss.util.translators.code_replacer.code_replacer import CodeReplacer
-        self.code_replacer = CodeReplacer(func)
-        new_func = self.code_replacer.replace(new_code, keep_generated_files)
+        code_replacer = CodeReplacer(funcs2new_codes[0][0])
+        for decorator, _ in decorators2funcs:
+            decorator.code_replacer = code_replacer
+        new_funcs = code_replacer.replace_all(funcs2new_codes, keep_generated_files)
 
         # Finish
         if __debug__:
             logger.debug("[decorator] Finished load_generated_code")
-        return new_func
+        return new_funcs
 
     @staticmethod
     def _clean(list_of_files):
@@ -374,6 +561,383 @@ class Parallel(object):
 parallel = Parallel
 
 
+#
+# Module batch
+#
+
+class _ModuleBatch(object):
+    """
+    Groups the @parallel functions of the same user module so that they are translated together. The module is
+    rewritten and loaded only once and the generated task names are unique within the module
+
+    Attributes:
+            - original_file : File containing the user module
+            - parallel_names : Names of the top-level functions annotated with @parallel in the module source
+            - registered_names : Names of the functions registered so far
+            - pending : List of tuples containing the registered decorators and functions not processed yet
+    """
+
+    # Map containing the user module files and their batch of functions being registered
+    file2batch = {}
+
+    # Static attribute Lock protecting the batches and the translations (re-entrant, so that the code loaded by a
+    # translation can use the decorator)
+    _lock = threading.RLock()
+
+    def __init__(self, original_file=None, parallel_names=None):
+        """
+        Creates an empty batch for the given module file
+
+        :param original_file: File containing the user module
+            + type: str
+        :param parallel_names: Names of the functions of the batch. Parsed from the module file when None
+            + type: List<str>
+        """
+
+        self.original_file = original_file
+        if parallel_names is None:
+            parallel_names = _ModuleBatch.get_parallel_names(original_file)
+        self.parallel_names = parallel_names
+        self.registered_names = []
+        self.pending = []
+
+    @staticmethod
+    def register(decorator, func):
+        """
+        Registers the given function in the batch of its module. Functions that are not annotated at the top level
+        of their module source (e.g. methods or nested functions) get a batch of their own
+
+        :param decorator: Decorator of the function
+            + type: Parallel
+        :param func: Python function to parallelize
+            + type: func
+        :return batch: Batch of the function
+            + type: _ModuleBatch
+        """
+
+        import inspect
+        import os
+        try:
+            original_file = os.path.abspath(inspect.getfile(func))
+        except Exception:
+            original_file = None
+
+        with _ModuleBatch._lock:
+            batch = _ModuleBatch.file2batch.get(original_file)
+            if batch is None and original_file is not None:
+                batch = _ModuleBatch(original_file)
+                _ModuleBatch.file2batch[original_file] = batch
+            if batch is None or func.__name__ not in batch.parallel_names or func.__name__ in batch.registered_names:
+                batch = _ModuleBatch(original_file, [func.__name__])
+
+            batch.registered_names.append(func.__name__)
+            batch.pending.append((decorator, func))
+        return batch
+
+    @staticmethod
+    def get_parallel_names(original_file):
+        """
+        Returns the names of the top-level functions annotated with @parallel in the given module file
+
+        :param original_file: File containing the user module
+            + type: str
+        :return parallel_names: List of function names (empty if the file cannot be parsed)
+            + type: List<str>
+        """
+
+        import ast
+        try:
+            with open(original_file, 'r') as f:
+                module_ast = ast.parse(f.read())
+        except Exception as e:
+            if __debug__:
+                logger.debug("[decorator] Cannot parse module file " + str(original_file) + ": " + str(e))
+            return []
+
+        parallel_names = []
+        for node in module_ast.body:
+            if isinstance(node, ast.FunctionDef):
+                for decorator in node.decorator_list:
+                    decorator_func = decorator.func if isinstance(decorator, ast.Call) else decorator
+                    if isinstance(decorator_func, ast.Name):
+                        decorator_name = decorator_func.id
+                    elif isinstance(decorator_func, ast.Attribute):
+                        decorator_name = decorator_func.attr
+                    else:
+                        decorator_name = None
+                    if decorator_name in ("parallel", "Parallel"):
+                        parallel_names.append(node.name)
+        return parallel_names
+
+    def is_complete(self):
+        """
+        Returns whether all the annotated functions of the module have been registered or not
+
+        :return: True if all the annotated functions have been registered, False otherwise
+            + type: bool
+        """
+
+        return all(name in self.registered_names for name in self.parallel_names)
+
+    def process(self):
+        """
+        Translates (or reuses the previously generated code of) the pending functions at once and stores the new
+        functions in their decorators. The translation runs once: the concurrent callers wait for it and find no
+        pending functions. When it fails, the functions stay pending so that the next call retries it
+
+        :return decorators: List of the processed decorators
+            + type: List<Parallel>
+        :raise Py2ScopException:
+        :raise Scop2PScop2PyException:
+        :raise Py2PyCOMPSsException:
+        :raise CodeReplacerException:
+        :raise CodeReuserException:
+        """
+
+        with _ModuleBatch._lock:
+            decorators2funcs = self.pending
+            self.pending = []
+            if self.is_complete() and _ModuleBatch.file2batch.get(self.original_file) is self:
+                del _ModuleBatch.file2batch[self.original_file]
+            if len(decorators2funcs) == 0:
+                return []
+
+            try:
+                return _ModuleBatch._process(decorators2funcs)
+            except Exception:
+                self.pending = decorators2funcs + self.pending
+                raise
+
+    @staticmethod
+    def _process(decorators2funcs):
+        """
+        Translates (or reuses the previously generated code of) the given functions at once and stores the new
+        functions in their decorators. Must be called with the lock held
+
+        :param decorators2funcs: List of tuples containing the decorator and the function to process
+            + type: List<Tuple(Parallel, func)>
+        :return decorators: List of the processed decorators
+            + type: List<Parallel>
+        :raise Py2ScopException:
+        :raise Scop2PScop2PyException:
+        :raise Py2PyCOMPSsException:
+        :raise CodeReplacerException:
+        :raise CodeReuserException:
+        """
+
+        decorators = [decorator for decorator, _ in decorators2funcs]
+        funcs = [func for _, func in decorators2funcs]
+        if __debug__:
+            logger.debug("[decorator] Processing module batch: " + str(funcs))
+
+        # Try to reuse a generated version or translate it
+        from pycompss.util.translators.code_reuser.code_reuser import CodeReuser
+        force_autogen = any(decorator.force_autogen for decorator in decorators)
+        code_reuser = CodeReuser(funcs[0], force_autogen)
+        for decorator in decorators:
+            decorator.code_reuser = code_reuser
+        if code_reuser.can_reuse():
+            # We are not forced to autogenerate files and an existing autogen file exists, reuse generated code
+            new_funcs = code_reuser.reuse_all(funcs)
+        else:
+            # Parallelize given functions
+            new_funcs = Parallel._translate_all(decorators2funcs, keep_generated_files=__debug__)
+
+        for decorator, new_func in zip(decorators, new_funcs):
+            decorator.new_func = new_func
+
+        # The new module is loaded, so the user file can be restored now instead of after each call
+        decorators[0]._restore_user_code()
+        return decorators
+
+
+#
+# Parallel Handle class
+#
+
+def _check_async_runtime(func_name):
+    """
+    Checks that the asynchronous calls can be run. The COMPSs binding does not accept tasks from several master
+    threads, so only the local runtime supports them
+
+    :param func_name: Name of the called function
+        + type: str
+    :raise ParallelHandleException: When the local runtime is not installed
+    """
+
+    from pycompss.util.local_runtime.runtime import is_installed
+    if not is_installed():
+        raise ParallelHandleException("[ERROR] The asynchronous call to " + str(func_name) + " requires the local "
+                                      "runtime, the COMPSs binding does not accept tasks from several threads")
+
+
+class ParallelHandle(object):
+    """
+    Handle of an asynchronous call to a parallel function (parallel_f.submit). The function runs on a background
+    thread, so the caller can spawn the tasks of several independent calls before waiting for any of them. The handle
+    can be waited with result() or awaited from an asyncio coroutine.
+
+    The synchronizations of the generated code keep their runtime semantics: the final compss_barrier of a call waits
+    for the tasks of every call in flight, not only for its own tasks, so waiting on one handle may wait for the
+    others. Only the local runtime accepts tasks from several threads, so parallel_f.submit raises a
+    ParallelHandleException when the local runtime is not installed.
+
+    Attributes:
+        - name: Name of the called function
+            + type: str
+    """
+
+    def __init__(self, func, args, kwargs):
+        """
+        Starts the call of the given function on a background thread
+
+        :param func: Function to call
+            + type: func
+        :param args: Positional arguments of the function
+            + type: Tuple<Object>
+        :param kwargs: Keyword arguments of the function
+            + type: dict<str, Object>
+        """
+
+        self.name = getattr(func, "__name__", "parallel")
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(func, args, kwargs), name="ParallelCall-" + self.name)
+        self._thread.start()
+
+    def done(self):
+        """
+        Returns whether the call has finished or not
+
+        :return: True if the call has finished, False otherwise
+            + type: bool
+        """
+
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """
+        Waits for the call and returns the value returned by the function (or raises its exception)
+
+        :param timeout: Maximum number of seconds to wait (default None, no limit)
+            + type: float
+        :return: Value returned by the function
+            + type: Object
+        :raise ParallelHandleException: When the call does not finish before the timeout
+        """
+
+        exception = self.exception(timeout)
+        if exception is not None:
+            raise exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Waits for the call and returns the exception raised by the function, if any
+
+        :param timeout: Maximum number of seconds to wait (default None, no limit)
+            + type: float
+        :return: Exception raised by the function or None
+            + type: Exception
+        :raise ParallelHandleException: When the call does not finish before the timeout
+        """
+
+        if not self._done.wait(timeout):
+            raise ParallelHandleException("[ERROR] The call to " + self.name + " has not finished after " +
+                                          str(timeout) + " seconds")
+        return self._exception
+
+    def add_done_callback(self, callback):
+        """
+        Registers a function called with the handle when the call finishes (immediately if it has finished)
+
+        :param callback: Function receiving the handle
+            + type: func
+        """
+
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def __await__(self):
+        """
+        Waits for the call from an asyncio coroutine (result = await handle)
+
+        :return: Iterator of the asyncio future of the call
+            + type: Iterator
+        """
+
+        import asyncio
+        loop = asyncio.get_running_loop() if hasattr(asyncio, "get_running_loop") else asyncio.get_event_loop()
+        future = loop.create_future()
+        self.add_done_callback(lambda handle: loop.call_soon_threadsafe(handle._set_async_result, future))
+        return future.__await__()
+
+    def _set_async_result(self, future):
+        """
+        Transfers the result of the call to the given asyncio future
+
+        :param future: Asyncio future
+            + type: asyncio.Future
+        """
+
+        if future.cancelled():
+            return
+        if self._exception is not None:
+            future.set_exception(self._exception)
+        else:
+            future.set_result(self._result)
+
+    def _run(self, func, args, kwargs):
+        """
+        Calls the function and runs the callbacks (on the background thread)
+
+        :param func: Function to call
+            + type: func
+        :param args: Positional arguments of the function
+            + type: Tuple<Object>
+        :param kwargs: Keyword arguments of the function
+            + type: dict<str, Object>
+        """
+
+        try:
+            self._result = func(*args, **kwargs)
+        except Exception as e:
+            logger.error("[ERROR] Asynchronous call to " + self.name + " failed: " + str(e))
+            self._exception = e
+        finally:
+            with self._lock:
+                self._done.set()
+                callbacks = self._callbacks
+                self._callbacks = []
+            for callback in callbacks:
+                callback(self)
+
+
+#
+# Exception Class
+#
+
+class ParallelHandleException(Exception):
+
+    def __init__(self, msg=None, nested_exception=None):
+        self.msg = msg
+        self.nested_exception = nested_exception
+
+    def __str__(self):
+        s = "Exception on ParallelHandle class.\n"
+        if self.msg is not None:
+            s = s + "Message: " + str(self.msg) + "\n"
+        if self.nested_exception is not None:
+            s = s + "Nested Exception: " + str(self.nested_exception) + "\n"
+        return s
+
+
 #
 # UNIT TEST CASES
 #
@@ -424,6 +988,186 @@ class TestParallelDecorator(unittest.TestCase):
             # Erase PYC file because we are overriding it and python does not know
             os.remove(tests_path + "/test1_matmul.pyc")
 
+    def test_module_batch(self):
+        # Create a module file with two annotated functions, a nested one and a method
+        import os
+        import tempfile
+        code = "@parallel()\n" \
+               "def f1(a):\n" \
+               "    @parallel()\n" \
+               "    def nested(b):\n" \
+               "        return b\n" \
+               "    return nested\n" \
+               "\n" \
+               "class C(object):\n" \
+               "    @parallel()\n" \
+               "    def method(self):\n" \
+               "        return self\n" \
+               "\n" \
+               "@parallel(tile=True)\n" \
+               "def f2(a):\n" \
+               "    return a\n"
+        fd, module_file = tempfile.mkstemp(suffix=".py")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(code)
+            self.assertEqual(_ModuleBatch.get_parallel_names(module_file), ["f1", "f2"])
+
+            # Load the functions without translating them
+            module_globals = {"parallel": lambda *args, **kwargs: (lambda func: func)}
+            exec(compile(code, module_file, "exec"), module_globals)
+
+            # The functions of the module share a batch that is complete when the last one is registered
+            batch1 = _ModuleBatch.register(parallel(), module_globals["f1"])
+            self.assertFalse(batch1.is_complete())
+            batch_method = _ModuleBatch.register(parallel(), module_globals["C"].method)
+            self.assertNotEqual(batch_method, batch1)
+            self.assertTrue(batch_method.is_complete())
+            batch2 = _ModuleBatch.register(parallel(), module_globals["f2"])
+            self.assertEqual(batch2, batch1)
+            self.assertTrue(batch2.is_complete())
+            self.assertEqual([func.__name__ for _, func in batch2.pending], ["f1", "f2"])
+        finally:
+            _ModuleBatch.file2batch.pop(os.path.abspath(module_file), None)
+            os.remove(module_file)
+
+    def test_attribute_overrides(self):
+        class Solver(object):
+            def __init__(self):
+                self.tile = "solver tile"
+                self.tolerance = 1
+
+        # Only the kwargs that are not decorator options are set on the object during the call
+        p = parallel(tile=True, tolerance=5)
+        self.assertEqual(p.attribute_overrides, {"tolerance": 5})
+        p.new_func = lambda slf: (slf.tile, slf.tolerance)
+        solver = Solver()
+        self.assertEqual(p._call_with_overrides([solver], {}), ("solver tile", 5))
+        self.assertEqual(solver.tolerance, 1)
+
+        # The attributes are restored when the function fails
+        def fail(slf):
+            raise ValueError(str(slf.tolerance))
+        p.new_func = fail
+        self.assertRaises(ValueError, p._call_with_overrides, [solver], {})
+        self.assertEqual(solver.tolerance, 1)
+
+    def test_concurrent_calls(self):
+        class Solver(object):
+            def __init__(self):
+                self.tolerance = 1
+
+        # The concurrent calls on the same object see the overrides until the last one finishes
+        barrier = threading.Barrier(4) if hasattr(threading, "Barrier") else None
+        if barrier is None:
+            self.skipTest("threading.Barrier is not available")
+        p = parallel(tolerance=5)
+
+        def new_func(slf):
+            barrier.wait(timeout=10)
+            return slf.tolerance
+        p.new_func = new_func
+        solvers = [Solver(), Solver()]
+        results = []
+        threads = [threading.Thread(target=lambda slf=slf: results.append(p._call_with_overrides([slf], {})))
+                   for slf in solvers + solvers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [5, 5, 5, 5])
+        self.assertEqual([solver.tolerance for solver in solvers], [1, 1])
+        self.assertEqual(p._overridden_objects, {})
+
+    def test_handle(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def kernel(value):
+            started.set()
+            release.wait(10)
+            if value < 0:
+                raise ValueError("negative value")
+            return value * 2
+
+        # The call runs on a background thread
+        handle = ParallelHandle(kernel, (3,), {})
+        self.assertTrue(started.wait(10))
+        self.assertFalse(handle.done())
+        self.assertRaises(ParallelHandleException, handle.result, 0.01)
+        callbacks = []
+        handle.add_done_callback(lambda h: callbacks.append(h.name))
+        release.set()
+        self.assertEqual(handle.result(10), 6)
+        self.assertTrue(handle.done())
+        self.assertIsNone(handle.exception())
+        handle.add_done_callback(lambda h: callbacks.append(h.name))
+        self.assertEqual(callbacks, ["kernel", "kernel"])
+
+        failed_handle = ParallelHandle(kernel, (-1,), {})
+        self.assertTrue(isinstance(failed_handle.exception(10), ValueError))
+        self.assertRaises(ValueError, failed_handle.result)
+
+        # Asyncio form
+        import sys
+        if sys.version_info >= (3, 7):
+            import asyncio
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                handles = [ParallelHandle(kernel, (value,), {}) for value in range(3)]
+                self.assertEqual(loop.run_until_complete(asyncio.wait_for(asyncio.gather(*handles), 10)), [0, 2, 4])
+                self.assertRaises(ValueError, loop.run_until_complete, asyncio.wait_for(failed_handle, 10))
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+
+    def test_handle_requires_local_runtime(self):
+        from pycompss.util.local_runtime.runtime import install, uninstall
+
+        # The asynchronous calls are rejected on the COMPSs binding
+        self.assertRaises(ParallelHandleException, _check_async_runtime, "kernel")
+        install()
+        try:
+            _check_async_runtime("kernel")
+        finally:
+            uninstall()
+        self.assertRaises(ParallelHandleException, _check_async_runtime, "kernel")
+
+    def test_handle_local_runtime(self):
+        from pycompss.util.local_runtime.runtime import start, stop
+        from pycompss.util.local_runtime.api import compss_barrier, compss_wait_on
+        from pycompss.util.local_runtime.task import task
+        from pycompss.util.local_runtime.parameter import INOUT
+
+        @task(block=INOUT)
+        def scale(block, factor):
+            block[0] *= factor
+
+        def kernel(blocks, factor):
+            for block in blocks:
+                scale(block, factor)
+            compss_barrier()
+            return [compss_wait_on(block)[0] for block in blocks]
+
+        # Independent calls submit their tasks concurrently to the runtime
+        start(num_workers=2)
+        try:
+            handles = [ParallelHandle(kernel, ([[float(i)] for i in range(4)], factor), {}) for factor in [2, 3]]
+            self.assertEqual([handle.result(30) for handle in handles], [[0.0, 2.0, 4.0, 6.0], [0.0, 3.0, 6.0, 9.0]])
+        finally:
+            stop()
+
+    def test_failed_translation(self):
+        # The functions stay pending when the translation fails (the builtin has no source file)
+        p = parallel()
+        batch = _ModuleBatch.register(p, len)
+        self.assertTrue(batch.is_complete())
+        from pycompss.util.translators.code_reuser.code_reuser import CodeReuserException
+        self.assertRaises(CodeReuserException, batch.process)
+        self.assertEqual(batch.pending, [(p, len)])
+        self.assertIsNone(p.new_func)
+
 
 #
 # MAIN FOR UNIT TEST
@@ -0,0 +1,2 @@
+# For * imports
+__all__ = ['apps_benchmark', 'translation_benchmark']
@@ -0,0 +1,157 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import logging
+
+
+#
+# Command line interface
+#
+
+def _parse_grid(params):
+    """
+    Parses the parameter grid given as a list of NAME=VALUE1,VALUE2,... strings
+
+    :param params: List of parameter strings
+        + type: List<str>
+    :return grid: Map containing the parameter names and their list of values
+        + type: dict<str, List<str>>
+    """
+
+    grid = {}
+    for param in params:
+        name, values = param.split("=", 1)
+        grid[name] = values.split(",")
+    return grid
+
+
+def _run_apps(args):
+    """
+    Runs the applications benchmark
+
+    :param args: Parsed command line arguments
+        + type: argparse.Namespace
+    """
+
+    from pycompss.util.benchmarks.apps_benchmark import AppsBenchmark
+    benchmark = AppsBenchmark(args.examples_dir,
+                              executor=args.executor,
+                              warmups=args.warmups,
+                              repetitions=args.repetitions,
+                              cores=args.cores,
+                              baselines=args.baselines.split(","),
+                              python_bin=args.python,
+                              runcompss_flags=args.runcompss_flags.split())
+    report = benchmark.run(grid=_parse_grid(args.param),
+                           app_names=args.apps.split(",") if args.apps else None,
+                           version_names=args.versions.split(",") if args.versions else None)
+    AppsBenchmark.write_report(report, args.output)
+    print("Benchmark report written to " + args.output)
+
+
+def _run_translation(args):
+    """
+    Runs the translation benchmark and compares it with the baseline report, if any
+
+    :param args: Parsed command line arguments
+        + type: argparse.Namespace
+    :return: Exit value (1 if there are regressions, 0 otherwise)
+        + type: int
+    """
+
+    from pycompss.util.benchmarks.translation_benchmark import TranslationBenchmark
+    from pycompss.util.benchmarks.apps_benchmark import AppsBenchmark
+    benchmark = TranslationBenchmark(warmups=args.warmups,
+                                     repetitions=args.repetitions,
+                                     measure_memory=not args.no_memory)
+    sweep = None
+    if len(args.sweep) > 0:
+        sweep = dict((name, [int(value) for value in values]) for name, values in _parse_grid(args.sweep).items())
+    report = benchmark.run(examples_dir=None if args.no_kernels else args.examples_dir,
+                           app_names=args.apps.split(",") if args.apps else None,
+                           synthetic_sweep={} if args.no_synthetic else sweep)
+    AppsBenchmark.write_report(report, args.output)
+    print("Benchmark report written to " + args.output)
+
+    if args.baseline is None:
+        return 0
+    import json
+    with open(args.baseline, 'r') as f:
+        baseline_report = json.load(f)
+    regressions = TranslationBenchmark.compare_reports(baseline_report, report, threshold=args.threshold)
+    for regression in regressions:
+        print("REGRESSION " + regression["case"] + " " + regression["stage"] + " " + regression["metric"] + ": " +
+              str(regression["baseline"]) + " -> " + str(regression["current"]) +
+              " (x" + "%.2f" % regression["ratio"] + ")")
+    print("Found " + str(len(regressions)) + " regressions against commit " + str(baseline_report.get("commit")))
+    return 1 if len(regressions) > 0 else 0
+
+
+def main(argv=None):
+    """
+    Entry point of the benchmarks command line interface
+
+    :param argv: Command line arguments (default sys.argv)
+        + type: List<str>
+    """
+
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m pycompss.util.benchmarks",
+                                     description="PyCOMPSs AutoParallel benchmarks")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    subparsers = parser.add_subparsers(dest="benchmark")
+
+    apps_parser = subparsers.add_parser("apps", help="Run the example applications")
+    apps_parser.add_argument("--examples-dir", default="examples", help="Path to the examples folder")
+    apps_parser.add_argument("--apps", default=None, help="Comma-separated application names (default all)")
+    apps_parser.add_argument("--versions", default=None, help="Comma-separated version names (default all)")
+    apps_parser.add_argument("--param", action="append", default=[],
+                             help="Parameter values as NAME=VALUE1,VALUE2 (can be repeated)")
+    apps_parser.add_argument("--executor", choices=["local", "threads", "processes", "compss"], default="local",
+                             help="Run with the Python interpreter (local), with the Python interpreter on the local "
+                                  "runtime (threads or processes) or with runcompss (compss)")
+    apps_parser.add_argument("--warmups", type=int, default=1, help="Discarded executions")
+    apps_parser.add_argument("--repetitions", type=int, default=3, help="Measured executions")
+    apps_parser.add_argument("--cores", type=int, default=1, help="Cores used by each execution")
+    apps_parser.add_argument("--baselines", default="sequential,userparallel",
+                             help="Comma-separated reference versions for the speedup")
+    apps_parser.add_argument("--python", default=None, help="Python interpreter of the local runtime executors")
+    apps_parser.add_argument("--runcompss-flags", default="", help="Extra flags for runcompss")
+    apps_parser.add_argument("--output", default="apps_benchmark.json", help="JSON report file")
+    apps_parser.set_defaults(func=_run_apps)
+
+    translation_parser = subparsers.add_parser("translation", help="Measure the translation stages")
+    translation_parser.add_argument("--examples-dir", default="examples", help="Path to the examples folder")
+    translation_parser.add_argument("--apps", default=None, help="Comma-separated application names (default all)")
+    translation_parser.add_argument("--no-kernels", action="store_true", help="Skip the example kernels")
+    translation_parser.add_argument("--no-synthetic", action="store_true", help="Skip the synthetic loop nests")
+    translation_parser.add_argument("--sweep", action="append", default=[],
+                                    help="Synthetic dimension values as NAME=VALUE1,VALUE2 where NAME is statements, "
+                                         "depth, params or dims (can be repeated, default all)")
+    translation_parser.add_argument("--warmups", type=int, default=1, help="Discarded executions")
+    translation_parser.add_argument("--repetitions", type=int, default=3, help="Measured executions")
+    translation_parser.add_argument("--no-memory", action="store_true", help="Do not measure the peak memory")
+    translation_parser.add_argument("--baseline", default=None, help="JSON report of a previous commit to compare")
+    translation_parser.add_argument("--threshold", type=float, default=0.2,
+                                    help="Relative increase reported as a regression")
+    translation_parser.add_argument("--output", default="translation_benchmark.json", help="JSON report file")
+    translation_parser.set_defaults(func=_run_translation)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO,
+                        format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    return args.func(args)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
@@ -0,0 +1,634 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import os
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Applications Benchmark class
+#
+
+class AppsBenchmark(object):
+    """
+    Runs the versions (sequential, userparallel, autoparallel, ...) of the example applications over a grid of
+    parameter values and gathers the times printed on their RESULTS blocks.
+
+    The applications are discovered from the examples folder: each folder is an application and each sub-folder
+    containing a run.sh script is a version. The Python script of each version, its arguments and their default
+    values are extracted from its run.sh script (e.g. jacobi-2d.py $NSIZE $TSIZE with NSIZE=8 and TSIZE=2).
+
+    Attributes:
+        - examples_dir: Path to the examples folder
+            + type: str
+        - executor: Execution mode ("local" runs the scripts with the Python interpreter, "threads" and "processes"
+         with the Python interpreter on the threads or processes backend of the local runtime of
+         pycompss.util.local_runtime and "compss" with runcompss)
+            + type: str
+        - warmups: Number of executions discarded before measuring
+            + type: int
+        - repetitions: Number of measured executions
+            + type: int
+        - cores: Number of cores used by each execution (to compute the parallel efficiency and as number of workers
+         of the threads and processes executors)
+            + type: int
+        - baselines: Names of the versions used as reference to compute the speedup (the first one available)
+            + type: List<str>
+        - python_bin: Python interpreter used by the local, threads and processes executors
+            + type: str
+        - runcompss_flags: Extra flags for the runcompss command
+            + type: List<str>
+    """
+
+    # Static attribute Names of the time entries of the RESULTS blocks that are not kernel times
+    _non_kernel_times = ["TOTAL_TIME", "INIT_TIME"]
+
+    def __init__(self, examples_dir, executor="local", warmups=1, repetitions=3, cores=1, baselines=None,
+                 python_bin=None, runcompss_flags=None):
+        """
+        Initializes the AppsBenchmark internal structures
+
+        :param examples_dir: Path to the examples folder
+            + type: str
+        :param executor: Execution mode: "local", "threads", "processes" or "compss" (default "local")
+            + type: str
+        :param warmups: Number of executions discarded before measuring (default 1)
+            + type: int
+        :param repetitions: Number of measured executions (default 3)
+            + type: int
+        :param cores: Number of cores used by each execution (default 1)
+            + type: int
+        :param baselines: Names of the reference versions for the speedup (default sequential, userparallel)
+            + type: List<str>
+        :param python_bin: Python interpreter used by the local, threads and processes executors (default the
+         current one)
+            + type: str
+        :param runcompss_flags: Extra flags for the runcompss command (default None)
+            + type: List<str>
+        """
+
+        if executor not in ["local", "threads", "processes", "compss"]:
+            raise AppsBenchmarkException("[ERROR] Unknown executor " + str(executor))
+
+        import sys
+        self.examples_dir = examples_dir
+        self.executor = executor
+        self.warmups = warmups
+        self.repetitions = repetitions
+        self.cores = cores
+        self.baselines = baselines if baselines is not None else ["sequential", "userparallel"]
+        self.python_bin = python_bin if python_bin is not None else sys.executable
+        self.runcompss_flags = runcompss_flags if runcompss_flags is not None else []
+
+    @staticmethod
+    def discover_applications(examples_dir, app_names=None, version_names=None):
+        """
+        Returns the versions of the example applications
+
+        :param examples_dir: Path to the examples folder
+            + type: str
+        :param app_names: Names of the applications to consider (default all)
+            + type: List<str>
+        :param version_names: Names of the versions to consider (default all)
+            + type: List<str>
+        :return app_versions: List of application versions sorted by application and version name
+            + type: List<AppVersion>
+        """
+
+        app_versions = []
+        for app_name in sorted(os.listdir(examples_dir)):
+            app_dir = os.path.join(examples_dir, app_name)
+            if not os.path.isdir(app_dir) or (app_names is not None and app_name not in app_names):
+                continue
+            for version_name in sorted(os.listdir(app_dir)):
+                version_dir = os.path.join(app_dir, version_name)
+                run_script = os.path.join(version_dir, "run.sh")
+                if version_name == "results" or not os.path.isfile(run_script):
+                    continue
+                if version_names is not None and version_name not in version_names:
+                    continue
+                app_version = AppVersion.from_run_script(app_name, version_name, run_script)
+                if app_version is not None:
+                    app_versions.append(app_version)
+        return app_versions
+
+    def run(self, grid=None, app_names=None, version_names=None):
+        """
+        Runs the selected application versions for each combination of the given parameter values
+
+        :param grid: Map containing the parameter names and their list of values. Applications not using a parameter
+        ignore it and the parameters not present in the grid take the default values of the run.sh scripts
+        (default None)
+            + type: dict<str, List<str>>
+        :param app_names: Names of the applications to run (default all)
+            + type: List<str>
+        :param version_names: Names of the versions to run (default all)
+            + type: List<str>
+        :return report: Benchmark report (JSON serializable)
+            + type: dict
+        """
+
+        grid = grid if grid is not None else {}
+        entries = []
+        for app_version in AppsBenchmark.discover_applications(self.examples_dir, app_names, version_names):
+            for params in AppsBenchmark._expand_grid(app_version, grid):
+                if __debug__:
+                    logger.debug("[AppsBenchmark] Running " + app_version.app_name + " - " +
+                                 app_version.version_name + " with " + str(params))
+                entries.append(self.run_version(app_version, params))
+        AppsBenchmark.compute_speedups(entries, self.baselines, self.cores)
+
+        import platform
+        import time
+        return {"executor": self.executor,
+                "warmups": self.warmups,
+                "repetitions": self.repetitions,
+                "cores": self.cores,
+                "host": platform.node(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": entries}
+
+    def run_version(self, app_version, params):
+        """
+        Runs an application version with the given parameters (warmups plus repetitions) and summarizes its times
+
+        :param app_version: Application version
+            + type: AppVersion
+        :param params: Map containing the values of the application arguments
+            + type: dict<str, str>
+        :return entry: Report entry of the application version
+            + type: dict
+        """
+
+        cmd = self._get_command(app_version, params)
+        env = self._get_environment()
+        runs = []
+        failed_runs = 0
+        for execution in range(self.warmups + self.repetitions):
+            exit_value, output = AppsBenchmark._execute(cmd, app_version.version_dir, env)
+            results = AppsBenchmark.parse_results(output)
+            if exit_value != 0 or results is None:
+                logger.error("[ERROR] Execution of " + " ".join(cmd) + " failed with exit value " + str(exit_value))
+                failed_runs += 1
+            elif execution >= self.warmups:
+                runs.append(results)
+
+        entry = {"application": app_version.app_name,
+                 "version": app_version.version_name,
+                 "parameters": params,
+                 "runs": runs,
+                 "failed_runs": failed_runs}
+        for time_name in ["TOTAL_TIME", "INIT_TIME", "KERNEL_TIME"]:
+            entry[time_name.lower()] = AppsBenchmark._summarize([run[time_name] for run in runs if time_name in run])
+        return entry
+
+    @staticmethod
+    def parse_results(output):
+        """
+        Parses the RESULTS block printed by the example applications. The kernel time (e.g. JACOBI_TIME) is also
+        stored as KERNEL_TIME
+
+        :param output: Standard output of the application
+            + type: str
+        :return results: Map containing the entries of the RESULTS block or None if there is no RESULTS block
+            + type: dict<str, object>
+        """
+
+        results = None
+        for line in output.splitlines():
+            line = line.strip()
+            if line.startswith("RESULTS --"):
+                results = {}
+            elif results is not None:
+                if line.startswith("--"):
+                    break
+                fields = line.split(None, 1)
+                if len(fields) == 2:
+                    results[fields[0]] = AppsBenchmark._parse_value(fields[1])
+
+        if results is not None:
+            kernel_times = [key for key in sorted(results.keys())
+                            if key.endswith("_TIME") and key not in AppsBenchmark._non_kernel_times]
+            if len(kernel_times) > 0:
+                results["KERNEL_TIME"] = results[kernel_times[0]]
+        return results
+
+    @staticmethod
+    def compute_speedups(entries, baselines, cores):
+        """
+        Adds the speedup and the parallel efficiency of the mean total time of each entry with respect to the first
+        available baseline version of the same application and parameters
+
+        :param entries: List of report entries
+            + type: List<dict>
+        :param baselines: Names of the reference versions
+            + type: List<str>
+        :param cores: Number of cores used by each execution
+            + type: int
+        """
+
+        for entry in entries:
+            entry["baseline"] = None
+            entry["speedup"] = None
+            entry["efficiency"] = None
+            for baseline in baselines:
+                reference = [e for e in entries
+                             if e["application"] == entry["application"] and e["version"] == baseline and
+                             e["parameters"] == entry["parameters"] and e["total_time"] is not None]
+                if len(reference) > 0:
+                    if entry["total_time"] is not None and entry["total_time"]["mean"] > 0:
+                        entry["baseline"] = baseline
+                        entry["speedup"] = reference[0]["total_time"]["mean"] / entry["total_time"]["mean"]
+                        entry["efficiency"] = entry["speedup"] / cores
+                    break
+
+    @staticmethod
+    def write_report(report, output_file):
+        """
+        Writes the given report as JSON
+
+        :param report: Benchmark report
+            + type: dict
+        :param output_file: Path to the JSON file
+            + type: str
+        """
+
+        import json
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    def _get_command(self, app_version, params):
+        """
+        Returns the command running the given application version
+
+        :param app_version: Application version
+            + type: AppVersion
+        :param params: Map containing the values of the application arguments
+            + type: dict<str, str>
+        :return cmd: Command
+            + type: List<str>
+        """
+
+        args = [str(params[arg_name]) for arg_name in app_version.arg_names]
+        if self.executor == "compss":
+            return ["runcompss", "--lang=python", "--project=../../xml/project.xml",
+                    "--resources=../../xml/resources.xml"] + self.runcompss_flags + [app_version.script] + args
+        if self.executor in ["threads", "processes"]:
+            return [self.python_bin, "-m", "pycompss.util.local_runtime", "--workers", str(self.cores),
+                    "--backend", self.executor, app_version.script] + args
+        return [self.python_bin, app_version.script] + args
+
+    def _get_environment(self):
+        """
+        Returns the environment of the executions. The threads and processes executors add this repository to the
+        PYTHONPATH so that the local runtime can be imported
+
+        :return: Environment variables or None to inherit the current environment
+            + type: dict<str, str>
+        """
+
+        if self.executor not in ["threads", "processes"]:
+            return None
+        repository_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join([repository_dir] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else []))
+        return env
+
+    @staticmethod
+    def _execute(cmd, cwd, env=None):
+        """
+        Executes the given command
+
+        :param cmd: Command
+            + type: List<str>
+        :param cwd: Working directory
+            + type: str
+        :param env: Environment variables (default the current environment)
+            + type: dict<str, str>
+        :return exit_value: Exit value of the command
+            + type: int
+        :return output: Standard output of the command
+            + type: str
+        """
+
+        from subprocess import Popen, PIPE, STDOUT
+        try:
+            process = Popen(cmd, cwd=cwd, env=env, stdin=None, stdout=PIPE, stderr=STDOUT, shell=False)
+            stdout, _ = process.communicate()
+        except OSError as e:
+            logger.error("[ERROR] Cannot execute " + " ".join(cmd) + ": " + str(e))
+            return -1, ""
+        if not isinstance(stdout, str):
+            stdout = stdout.decode("utf-8", "replace")
+        return process.returncode, stdout
+
+    @staticmethod
+    def _expand_grid(app_version, grid):
+        """
+        Returns all the combinations of parameter values of the given application version
+
+        :param app_version: Application version
+            + type: AppVersion
+        :param grid: Map containing the parameter names and their list of values
+            + type: dict<str, List<str>>
+        :return combinations: List of maps containing the values of the application arguments
+            + type: List<dict<str, str>>
+        """
+
+        import itertools
+        values = [grid.get(arg_name, [app_version.default_args.get(arg_name)]) for arg_name in app_version.arg_names]
+        return [dict(zip(app_version.arg_names, combination)) for combination in itertools.product(*values)]
+
+    @staticmethod
+    def _summarize(values):
+        """
+        Returns the mean, minimum, maximum and standard deviation of the given values
+
+        :param values: List of values
+            + type: List<float>
+        :return: Map containing the statistics or None if there are no values
+            + type: dict<str, float>
+        """
+
+        values = [float(value) for value in values]
+        if len(values) == 0:
+            return None
+        mean = sum(values) / len(values)
+        stdev = (sum((value - mean) ** 2 for value in values) / len(values)) ** 0.5
+        return {"mean": mean, "min": min(values), "max": max(values), "stdev": stdev}
+
+    @staticmethod
+    def _parse_value(str_value):
+        """
+        Converts the given string into an integer, a float or a boolean when possible
+
+        :param str_value: String value
+            + type: str
+        :return: Converted value
+            + type: object
+        """
+
+        for cast in (int, float):
+            try:
+                return cast(str_value)
+            except ValueError:
+                pass
+        if str_value in ["True", "False"]:
+            return str_value == "True"
+        return str_value
+
+
+#
+# Application Version class
+#
+
+class AppVersion(object):
+    """
+    Represents a version of an example application
+
+    Attributes:
+        - app_name: Application name
+            + type: str
+        - version_name: Version name
+            + type: str
+        - version_dir: Path to the version folder
+            + type: str
+        - script: Name of the Python script of the version
+            + type: str
+        - arg_names: Names of the script arguments
+            + type: List<str>
+        - default_args: Map containing the argument names and their default values
+            + type: dict<str, str>
+    """
+
+    def __init__(self, app_name, version_name, version_dir, script, arg_names, default_args):
+        """
+        Initializes the AppVersion internal structures
+
+        :param app_name: Application name
+            + type: str
+        :param version_name: Version name
+            + type: str
+        :param version_dir: Path to the version folder
+            + type: str
+        :param script: Name of the Python script of the version
+            + type: str
+        :param arg_names: Names of the script arguments
+            + type: List<str>
+        :param default_args: Map containing the argument names and their default values
+            + type: dict<str, str>
+        """
+
+        self.app_name = app_name
+        self.version_name = version_name
+        self.version_dir = version_dir
+        self.script = script
+        self.arg_names = arg_names
+        self.default_args = default_args
+
+    @staticmethod
+    def from_run_script(app_name, version_name, run_script):
+        """
+        Builds the application version launched by the given run.sh script
+
+        :param app_name: Application name
+            + type: str
+        :param version_name: Version name
+            + type: str
+        :param run_script: Path to the run.sh script
+            + type: str
+        :return: Application version or None if the script does not launch a Python application
+            + type: AppVersion
+        """
+
+        import re
+        with open(run_script, 'r') as f:
+            content = f.read()
+
+        launch = re.search(r'(\S+\.py)((?:[ \t]+\$\{?\w+\}?)*)', content)
+        if launch is None:
+            return None
+        script = launch.group(1)
+        arg_names = re.findall(r'\$\{?(\w+)\}?', launch.group(2))
+        default_args = {}
+        for arg_name in arg_names:
+            assign = re.search(r'^\s*' + arg_name + r'=(\S+)\s*$', content, re.MULTILINE)
+            if assign is not None:
+                default_args[arg_name] = assign.group(1)
+        return AppVersion(app_name, version_name, os.path.dirname(run_script), script, arg_names, default_args)
+
+
+#
+# Exception Class
+#
+
+class AppsBenchmarkException(Exception):
+
+    def __init__(self, msg=None, nested_exception=None):
+        self.msg = msg
+        self.nested_exception = nested_exception
+
+    def __str__(self):
+        s = "Exception on AppsBenchmark class.\n"
+        if self.msg is not None:
+            s = s + "Message: " + str(self.msg) + "\n"
+        if self.nested_exception is not None:
+            s = s + "Nested Exception: " + str(self.nested_exception) + "\n"
+        return s
+
+
+#
+# UNIT TESTS
+#
+
+class TestAppsBenchmark(unittest.TestCase):
+    _app_code = "from __future__ import print_function\n" \
+                "import sys\n" \
+                "size = int(sys.argv[1])\n" \
+                "print(\"RESULTS -----------------\")\n" \
+                "print(\"VERSION \" + sys.argv[0])\n" \
+                "print(\"NSIZE \" + str(size))\n" \
+                "print(\"TOTAL_TIME \" + str(size * VERSION_COST))\n" \
+                "print(\"INIT_TIME 0.5\")\n" \
+                "print(\"DUMMY_TIME \" + str(size * VERSION_COST - 0.5))\n" \
+                "print(\"-------------------------\")\n"
+
+    _run_script = "#!/bin/bash -e\n" \
+                  "  NSIZE=4\n" \
+                  "  TSIZE=2\n" \
+                  "  runcompss \\\n" \
+                  "          --lang=python \\\n" \
+                  "          dummy.py $NSIZE\n"
+
+    _task_app_code = "from __future__ import print_function\n" \
+                     "import sys\n" \
+                     "from pycompss.api.task import task\n" \
+                     "from pycompss.api.api import compss_wait_on\n" \
+                     "\n" \
+                     "\n" \
+                     "@task(returns=1)\n" \
+                     "def square(value):\n" \
+                     "    return value * value\n" \
+                     "\n" \
+                     "\n" \
+                     "size = int(sys.argv[1])\n" \
+                     "total = sum(compss_wait_on([square(value) for value in range(size)]))\n" \
+                     "print(\"RESULTS -----------------\")\n" \
+                     "print(\"TOTAL_TIME \" + str(total))\n" \
+                     "print(\"-------------------------\")\n"
+
+    def _create_examples(self, examples_dir):
+        for version_name, version_cost in [("sequential", 4), ("autoparallel", 1)]:
+            version_dir = os.path.join(examples_dir, "dummy", version_name)
+            os.makedirs(version_dir)
+            with open(os.path.join(version_dir, "run.sh"), 'w') as f:
+                f.write(TestAppsBenchmark._run_script)
+            with open(os.path.join(version_dir, "dummy.py"), 'w') as f:
+                f.write(TestAppsBenchmark._app_code.replace("VERSION_COST", str(version_cost)))
+        os.makedirs(os.path.join(examples_dir, "dummy", "results"))
+
+    def test_parse_results(self):
+        output = "Running application\n" \
+                 "RESULTS -----------------\n" \
+                 "VERSION AUTOPARALLEL\n" \
+                 "NSIZE 8\n" \
+                 "DEBUG False\n" \
+                 "TOTAL_TIME 1.5\n" \
+                 "INIT_TIME 0.5\n" \
+                 "JACOBI_TIME 0.75\n" \
+                 "-------------------------\n" \
+                 "Post-process\n"
+        results = AppsBenchmark.parse_results(output)
+        self.assertEqual(results, {"VERSION": "AUTOPARALLEL", "NSIZE": 8, "DEBUG": False, "TOTAL_TIME": 1.5,
+                                   "INIT_TIME": 0.5, "JACOBI_TIME": 0.75, "KERNEL_TIME": 0.75})
+        self.assertIsNone(AppsBenchmark.parse_results("No results\n"))
+
+    def test_discover(self):
+        import shutil
+        import tempfile
+        examples_dir = tempfile.mkdtemp()
+        try:
+            self._create_examples(examples_dir)
+            app_versions = AppsBenchmark.discover_applications(examples_dir)
+            self.assertEqual([(v.app_name, v.version_name) for v in app_versions],
+                             [("dummy", "autoparallel"), ("dummy", "sequential")])
+            self.assertEqual(app_versions[0].script, "dummy.py")
+            self.assertEqual(app_versions[0].arg_names, ["NSIZE"])
+            self.assertEqual(app_versions[0].default_args, {"NSIZE": "4"})
+            self.assertEqual(AppsBenchmark.discover_applications(examples_dir, version_names=["sequential"])[0]
+                             .version_name, "sequential")
+        finally:
+            shutil.rmtree(examples_dir)
+
+    def test_run_local(self):
+        import shutil
+        import tempfile
+        examples_dir = tempfile.mkdtemp()
+        try:
+            self._create_examples(examples_dir)
+            benchmark = AppsBenchmark(examples_dir, warmups=1, repetitions=2, cores=2)
+            report = benchmark.run(grid={"NSIZE": ["2", "4"]})
+
+            self.assertEqual(len(report["results"]), 4)
+            entry = [e for e in report["results"]
+                     if e["version"] == "autoparallel" and e["parameters"] == {"NSIZE": "4"}][0]
+            self.assertEqual(len(entry["runs"]), 2)
+            self.assertEqual(entry["failed_runs"], 0)
+            self.assertEqual(entry["total_time"]["mean"], 4.0)
+            self.assertEqual(entry["kernel_time"]["mean"], 3.5)
+            self.assertEqual(entry["baseline"], "sequential")
+            self.assertEqual(entry["speedup"], 4.0)
+            self.assertEqual(entry["efficiency"], 2.0)
+
+            import json
+            report_file = os.path.join(examples_dir, "report.json")
+            AppsBenchmark.write_report(report, report_file)
+            with open(report_file, 'r') as f:
+                self.assertEqual(len(json.load(f)["results"]), 4)
+        finally:
+            shutil.rmtree(examples_dir)
+
+    def test_run_threads(self):
+        import shutil
+        import sys
+        import tempfile
+        examples_dir = tempfile.mkdtemp()
+        try:
+            version_dir = os.path.join(examples_dir, "dummy", "autoparallel")
+            os.makedirs(version_dir)
+            with open(os.path.join(version_dir, "run.sh"), 'w') as f:
+                f.write(TestAppsBenchmark._run_script)
+            with open(os.path.join(version_dir, "dummy.py"), 'w') as f:
+                f.write(TestAppsBenchmark._task_app_code)
+
+            # The application imports the PyCOMPSs API from the local runtime. The processes backend requires the
+            # shared memory of Python 3.8 or higher
+            executors = ["threads", "processes"] if sys.version_info >= (3, 8) else ["threads"]
+            for executor in executors:
+                benchmark = AppsBenchmark(examples_dir, executor=executor, warmups=0, repetitions=1, cores=2)
+                report = benchmark.run()
+                self.assertEqual(report["results"][0]["failed_runs"], 0)
+                self.assertEqual(report["results"][0]["total_time"]["mean"], 14.0)
+        finally:
+            shutil.rmtree(examples_dir)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
@@ -0,0 +1,869 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import os
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Translation Benchmark class
+#
+
+class TranslationBenchmark(object):
+    """
+    Measures the time and the peak memory of each stage of the AutoParallel translation (Py2Scop, OpenScop I/O,
+    PLUTO, Py2PyCOMPSs and Calculator) on the kernels of the example applications and on synthetic loop nests that
+    sweep the number of statements, the nest depth, the number of parameters and the array dimensionality.
+
+    Each case is translated warmups + repetitions times and the times of the measured executions are summarized. The
+    peak memory is measured on an extra execution traced with tracemalloc (not available on Python 2) so that the
+    tracing overhead does not affect the times. The reports store the commit of the translator so that they can be
+    compared across commits to detect performance regressions.
+
+    Attributes:
+        - warmups: Number of executions discarded before measuring
+            + type: int
+        - repetitions: Number of measured executions
+            + type: int
+        - measure_memory: Whether to measure the peak memory of each stage or not
+            + type: bool
+    """
+
+    # Static attribute Names of the translation stages
+    stages = ["py2scop", "openscop_io", "pluto", "py2pycompss", "calculator"]
+
+    # Static attribute Default values of the synthetic loop nest dimensions
+    default_synthetic_base = {"statements": 1, "depth": 2, "params": 1, "dims": 2}
+
+    # Static attribute Default values swept for each synthetic loop nest dimension
+    default_synthetic_sweep = {"statements": [1, 2, 4, 8],
+                               "depth": [1, 2, 3, 4],
+                               "params": [1, 2, 3, 4],
+                               "dims": [1, 2, 3, 4]}
+
+    def __init__(self, warmups=1, repetitions=3, measure_memory=True):
+        """
+        Initializes the TranslationBenchmark internal structures
+
+        :param warmups: Number of executions discarded before measuring (default 1)
+            + type: int
+        :param repetitions: Number of measured executions (default 3)
+            + type: int
+        :param measure_memory: Whether to measure the peak memory of each stage or not. Ignored when tracemalloc is
+         not available (default True)
+            + type: bool
+        """
+
+        if repetitions < 1:
+            raise TranslationBenchmarkException("[ERROR] At least one measured execution is required")
+
+        self.warmups = warmups
+        self.repetitions = repetitions
+        self.measure_memory = measure_memory and TranslationBenchmark._get_tracemalloc() is not None
+
+    def run(self, examples_dir=None, app_names=None, synthetic_base=None, synthetic_sweep=None):
+        """
+        Runs the benchmark on the kernels of the example applications and on the synthetic loop nests
+
+        :param examples_dir: Path to the examples folder. The kernels are not measured when None (default None)
+            + type: str
+        :param app_names: Names of the applications to consider (default all)
+            + type: List<str>
+        :param synthetic_base: Values of the synthetic loop nest dimensions that are not swept (default
+         default_synthetic_base)
+            + type: dict<str, int>
+        :param synthetic_sweep: Map containing the swept synthetic loop nest dimensions and their values. The
+         synthetic loop nests are not measured when empty (default default_synthetic_sweep)
+            + type: dict<str, List<int>>
+        :return report: Benchmark report (JSON serializable)
+            + type: dict
+        """
+
+        import shutil
+        import tempfile
+        work_dir = tempfile.mkdtemp(prefix="translation_benchmark_")
+        try:
+            cases = []
+            if examples_dir is not None:
+                cases.extend(TranslationBenchmark.load_kernels(examples_dir, work_dir, app_names))
+            cases.extend(TranslationBenchmark.generate_synthetic_sweep(work_dir, synthetic_base, synthetic_sweep))
+
+            entries = []
+            for case in cases:
+                if __debug__:
+                    logger.debug("[TranslationBenchmark] Measuring " + case.name)
+                entries.append(self.run_case(case, work_dir))
+        finally:
+            shutil.rmtree(work_dir)
+
+        import platform
+        import time
+        return {"commit": TranslationBenchmark._get_commit(),
+                "python": platform.python_version(),
+                "host": platform.node(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "warmups": self.warmups,
+                "repetitions": self.repetitions,
+                "pluto": TranslationBenchmark._get_pluto_binary() is not None,
+                "results": entries}
+
+    def run_case(self, case, work_dir):
+        """
+        Translates the given case warmups + repetitions times (plus a traced execution when measuring the memory) and
+        summarizes the measures of each stage
+
+        :param case: Translation case
+            + type: TranslationCase
+        :param work_dir: Folder for the intermediate files
+            + type: str
+        :return entry: Report entry of the case
+            + type: dict
+        """
+
+        from pycompss.util.benchmarks.apps_benchmark import AppsBenchmark
+
+        stage2times = dict((stage, []) for stage in TranslationBenchmark.stages)
+        stage2peak = {}
+        stage2status = {}
+        num_executions = self.warmups + self.repetitions + (1 if self.measure_memory else 0)
+        for execution in range(num_executions):
+            trace = self.measure_memory and execution == num_executions - 1
+            measures = TranslationBenchmark._run_pipeline(case, work_dir, trace)
+            for stage, measure in measures.items():
+                if measure["status"] != "ok" or stage not in stage2status:
+                    stage2status[stage] = measure
+                if measure["status"] != "ok":
+                    continue
+                if trace:
+                    stage2peak[stage] = measure["peak_memory"]
+                elif execution >= self.warmups:
+                    stage2times[stage].append(measure["time"])
+
+        stages = {}
+        for stage in TranslationBenchmark.stages:
+            status = stage2status[stage]
+            stages[stage] = {"status": status["status"],
+                             "message": status.get("message"),
+                             "time": AppsBenchmark._summarize(stage2times[stage]),
+                             "peak_memory": stage2peak.get(stage)}
+        return {"case": case.name,
+                "kind": case.kind,
+                "parameters": case.parameters,
+                "stages": stages}
+
+    @staticmethod
+    def _run_pipeline(case, work_dir, trace):
+        """
+        Translates the given case once measuring each stage. The stages depending on a failed or skipped stage are
+        skipped
+
+        :param case: Translation case
+            + type: TranslationCase
+        :param work_dir: Folder for the intermediate files
+            + type: str
+        :param trace: Whether to measure the peak memory (True) or the time (False)
+            + type: bool
+        :return measures: Map containing the stage names and their measures
+            + type: dict<str, dict>
+        """
+
+        from pycompss.api.parallel import Parallel
+        from pycompss.util.translators.py2pycompss.components.calculator import Calculator
+
+        decorator = Parallel(**case.options)
+        base_name = os.path.join(work_dir, case.name.replace(":", "_").replace("/", "_"))
+        measures = {}
+
+        scops = TranslationBenchmark._measure(measures, "py2scop", trace, TranslationBenchmark._py2scop, case.func)
+
+        scop_files = None
+        if scops is not None:
+            scop_files = TranslationBenchmark._measure(measures, "openscop_io", trace,
+                                                       TranslationBenchmark._openscop_io, scops, base_name + ".scop")
+        else:
+            TranslationBenchmark._skip(measures, "openscop_io", "Py2Scop failed")
+
+        py_files = None
+        pluto_binary = TranslationBenchmark._get_pluto_binary()
+        if pluto_binary is None:
+            TranslationBenchmark._skip(measures, "pluto", "PLUTO binary not found")
+        elif scop_files is None:
+            TranslationBenchmark._skip(measures, "pluto", "OpenScop I/O failed")
+        else:
+            py_files = TranslationBenchmark._measure(measures, "pluto", trace, decorator._scop2pscop2py, scop_files,
+                                                     base_name + ".par.py")
+
+        if py_files is not None:
+            Calculator.clear_cache()
+            TranslationBenchmark._measure(measures, "py2pycompss", trace, decorator._py2pycompss, case.func, py_files,
+                                          base_name + ".pycompss.py")
+        else:
+            TranslationBenchmark._skip(measures, "py2pycompss", "PLUTO " + measures["pluto"]["status"])
+
+        import copy
+        problems = copy.deepcopy(case.calculator_problems)
+        Calculator.clear_cache()
+        TranslationBenchmark._measure(measures, "calculator", trace, TranslationBenchmark._calculator, problems)
+
+        return measures
+
+    @staticmethod
+    def _measure(measures, stage, trace, func, *args):
+        """
+        Calls the given function and stores its time or its peak memory on the given measures
+
+        :param measures: Map containing the stage names and their measures
+            + type: dict<str, dict>
+        :param stage: Stage name
+            + type: str
+        :param trace: Whether to measure the peak memory (True) or the time (False)
+            + type: bool
+        :param func: Function performing the stage
+            + type: func
+        :param args: Function arguments
+            + type: List<Object>
+        :return result: Result of the function or None if it raises an exception
+            + type: Object
+        """
+
+        tracemalloc = TranslationBenchmark._get_tracemalloc() if trace else None
+        timer = TranslationBenchmark._get_timer()
+        if tracemalloc is not None:
+            tracemalloc.start()
+        start_time = timer()
+        try:
+            result = func(*args)
+        except Exception as e:
+            logger.error("[ERROR] Stage " + stage + " failed: " + str(e))
+            measures[stage] = {"status": "error", "message": str(e)}
+            return None
+        finally:
+            end_time = timer()
+            peak_memory = None
+            if tracemalloc is not None:
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+        measures[stage] = {"status": "ok", "time": end_time - start_time, "peak_memory": peak_memory}
+        return result
+
+    @staticmethod
+    def _skip(measures, stage, message):
+        """
+        Marks the given stage as skipped
+
+        :param measures: Map containing the stage names and their measures
+            + type: dict<str, dict>
+        :param stage: Stage name
+            + type: str
+        :param message: Reason
+            + type: str
+        """
+
+        measures[stage] = {"status": "skipped", "message": message}
+
+    @staticmethod
+    def _py2scop(func):
+        """
+        Builds the SCOP of each loop block of the given function (without writing them)
+
+        :param func: Python function
+            + type: func
+        :return scops: List of SCOP objects
+            + type: List<Scop>
+        """
+
+        from pycompss.util.translators.py2scop.translator_py2scop import Py2Scop
+        translator = Py2Scop(func)
+        for_blocks = Py2Scop._ast_extract_for_blocks(translator.func_ast)
+        return [Py2Scop._ast2scop(for_block, block_index) for block_index, for_block in enumerate(for_blocks)]
+
+    @staticmethod
+    def _openscop_io(scops, base_file_name):
+        """
+        Writes the given SCOPs into OpenScop files and reads them back
+
+        :param scops: List of SCOP objects
+            + type: List<Scop>
+        :param base_file_name: OpenScop base name for the output file paths
+            + type: str
+        :return scop_files: List of written OpenScop files
+            + type: List<str>
+        """
+
+        from pycompss.util.translators.py2scop.translator_py2scop import Py2Scop
+        from pycompss.util.translators.scop_types.scop_class import Scop
+        scop_files = []
+        for scop_index, scop in enumerate(scops):
+            scop_file = base_file_name + str(scop_index)
+            Py2Scop.write_os(scop, scop_file)
+            Scop.read_os(scop_file)
+            scop_files.append(scop_file)
+        return scop_files
+
+    @staticmethod
+    def _calculator(problems):
+        """
+        Computes the lex bounds of the given problems
+
+        :param problems: List of loops information and subscript accesses information
+            + type: List<Tuple(dict, dict)>
+        """
+
+        from pycompss.util.translators.py2pycompss.components.calculator import Calculator
+        for loops_info, subscript_accesses_info in problems:
+            Calculator.compute_lex_bounds(loops_info, subscript_accesses_info)
+
+    @staticmethod
+    def load_kernels(examples_dir, work_dir, app_names=None):
+        """
+        Returns the functions annotated with @parallel in the autoparallel versions of the example applications. The
+        functions are loaded without their decorators and without importing the application modules, so the
+        PyCOMPSs runtime is not required
+
+        :param examples_dir: Path to the examples folder
+            + type: str
+        :param work_dir: Folder where the kernel modules are written
+            + type: str
+        :param app_names: Names of the applications to consider (default all)
+            + type: List<str>
+        :return cases: List of translation cases
+            + type: List<TranslationCase>
+        """
+
+        import ast
+        import astor
+
+        cases = []
+        for app_name in sorted(os.listdir(examples_dir)):
+            version_dir = os.path.join(examples_dir, app_name, "autoparallel")
+            if not os.path.isdir(version_dir) or (app_names is not None and app_name not in app_names):
+                continue
+            for file_name in sorted(os.listdir(version_dir)):
+                if not file_name.endswith(".py") or file_name.endswith("_autogen.py"):
+                    continue
+                with open(os.path.join(version_dir, file_name), 'r') as f:
+                    module_ast = ast.parse(f.read())
+                for node in module_ast.body:
+                    options = TranslationBenchmark._get_parallel_options(node)
+                    if options is None:
+                        continue
+                    node.decorator_list = []
+                    case_name = "kernel:" + app_name + "/" + node.name
+                    module_name = "kernel_" + app_name.replace("-", "_") + "_" + node.name
+                    func = TranslationBenchmark._load_function(astor.to_source(node), node.name, work_dir, module_name)
+                    cases.append(TranslationCase(case_name, "kernel", func, options, {"application": app_name}))
+        return cases
+
+    @staticmethod
+    def _get_parallel_options(node):
+        """
+        Returns the options of the @parallel decorator of the given node
+
+        :param node: AST node
+            + type: AST.Node
+        :return options: Map containing the decorator options or None if the node is not a function annotated with
+         @parallel
+            + type: dict<str, Object>
+        """
+
+        import ast
+        if not isinstance(node, ast.FunctionDef):
+            return None
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Name) and decorator.id == "parallel":
+                return {}
+            if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name) and \
+                    decorator.func.id == "parallel":
+                return dict((keyword.arg, ast.literal_eval(keyword.value)) for keyword in decorator.keywords)
+        return None
+
+    @staticmethod
+    def generate_synthetic(work_dir, statements, depth, params, dims):
+        """
+        Returns a synthetic loop nest. The loop nest has the given depth and its innermost loop contains the given
+        number of statements. Each statement updates an array with the values of the next array (each array has the
+        given number of dimensions) and the bounds of the loops are the sum of the given number of parameters
+
+        :param work_dir: Folder where the synthetic module is written
+            + type: str
+        :param statements: Number of statements
+            + type: int
+        :param depth: Nest depth
+            + type: int
+        :param params: Number of parameters
+            + type: int
+        :param dims: Number of dimensions of each array
+            + type: int
+        :return case: Translation case
+            + type: TranslationCase
+        """
+
+        if min(statements, depth, params, dims) < 1:
+            raise TranslationBenchmarkException("[ERROR] Synthetic loop nest dimensions must be positive")
+
+        func_name = "synthetic_s" + str(statements) + "_d" + str(depth) + "_p" + str(params) + "_a" + str(dims)
+        arrays = ["a" + str(array_index) for array_index in range(statements + 1)]
+        param_names = ["n" + str(param_index) for param_index in range(params)]
+        indexes = ["i" + str(loop_index) for loop_index in range(depth)]
+
+        lines = ["def " + func_name + "(" + ", ".join(arrays + param_names) + "):"]
+        for loop_index, index in enumerate(indexes):
+            if loop_index < params:
+                bound = " + ".join(param_names[loop_index::depth])
+            else:
+                bound = param_names[loop_index % params]
+            lines.append("    " * (loop_index + 1) + "for " + index + " in range(" + bound + "):")
+        for statement_index in range(statements):
+            write_access = arrays[statement_index] + \
+                "".join("[" + indexes[(statement_index + dim) % depth] + "]" for dim in range(dims))
+            read_access = arrays[statement_index + 1] + \
+                "".join("[" + indexes[(statement_index + dim + 1) % depth] + "]" for dim in range(dims))
+            lines.append("    " * (depth + 1) + write_access + " = compute(" + write_access + ", " + read_access + ")")
+        source = "\n".join(lines) + "\n"
+
+        func = TranslationBenchmark._load_function(source, func_name, work_dir, func_name)
+        return TranslationCase("synthetic:" + func_name, "synthetic", func, {},
+                               {"statements": statements, "depth": depth, "params": params, "dims": dims})
+
+    @staticmethod
+    def generate_synthetic_sweep(work_dir, base=None, sweep=None):
+        """
+        Returns the synthetic loop nests obtained by sweeping each dimension over its values while the rest of
+        dimensions keep their base values. Repeated loop nests are only returned once
+
+        :param work_dir: Folder where the synthetic modules are written
+            + type: str
+        :param base: Values of the dimensions that are not swept (default default_synthetic_base)
+            + type: dict<str, int>
+        :param sweep: Map containing the swept dimensions and their values (default default_synthetic_sweep)
+            + type: dict<str, List<int>>
+        :return cases: List of translation cases
+            + type: List<TranslationCase>
+        """
+
+        base_values = dict(TranslationBenchmark.default_synthetic_base)
+        if base is not None:
+            base_values.update(base)
+        sweep = sweep if sweep is not None else TranslationBenchmark.default_synthetic_sweep
+
+        cases = []
+        generated = set()
+        for dimension in ["statements", "depth", "params", "dims"]:
+            for value in sweep.get(dimension, []):
+                values = dict(base_values)
+                values[dimension] = value
+                key = (values["statements"], values["depth"], values["params"], values["dims"])
+                if key not in generated:
+                    generated.add(key)
+                    cases.append(TranslationBenchmark.generate_synthetic(work_dir, *key))
+        return cases
+
+    @staticmethod
+    def _load_function(source, func_name, work_dir, module_name):
+        """
+        Writes the given source into a module file and loads the given function from it. The file is kept so that
+        the source of the function can be retrieved
+
+        :param source: Python source code
+            + type: str
+        :param func_name: Name of the function to load
+            + type: str
+        :param work_dir: Folder where the module is written
+            + type: str
+        :param module_name: Module name
+            + type: str
+        :return func: Python function
+            + type: func
+        """
+
+        module_file = os.path.join(work_dir, module_name + ".py")
+        with open(module_file, 'w') as f:
+            f.write(source)
+        namespace = {"__name__": module_name}
+        exec(compile(source, module_file, "exec"), namespace)
+        return namespace[func_name]
+
+    @staticmethod
+    def get_calculator_problems(func_source):
+        """
+        Extracts the loops information and the subscript accesses information of each innermost loop of the given
+        function, in the format used by the Calculator
+
+        :param func_source: Python source code of the function
+            + type: str
+        :return problems: List of loops information and subscript accesses information
+            + type: List<Tuple(dict, dict)>
+        """
+
+        import ast
+        import textwrap
+        func_ast = ast.parse(textwrap.dedent(func_source)).body[0]
+        problems = []
+        for statement in func_ast.body:
+            if isinstance(statement, ast.For):
+                TranslationBenchmark._add_calculator_problems(statement, [], problems)
+        return problems
+
+    @staticmethod
+    def _add_calculator_problems(loop, outer_loops, problems):
+        """
+        Adds the problems of the innermost loops of the given loop
+
+        :param loop: Loop
+            + type: AST.For
+        :param outer_loops: List of enclosing loops
+            + type: List<AST.For>
+        :param problems: List of loops information and subscript accesses information
+            + type: List<Tuple(dict, dict)>
+        """
+
+        import ast
+        if not isinstance(loop.target, ast.Name) or not isinstance(loop.iter, ast.Call) or \
+                not isinstance(loop.iter.func, ast.Name) or loop.iter.func.id != "range" or \
+                len(loop.iter.args) not in [1, 2, 3]:
+            return
+        loops = outer_loops + [loop]
+        inner_loops = [statement for statement in loop.body if isinstance(statement, ast.For)]
+        for inner_loop in inner_loops:
+            TranslationBenchmark._add_calculator_problems(inner_loop, loops, problems)
+        if len(inner_loops) > 0:
+            return
+
+        loops_info = {}
+        for outer_loop in loops:
+            bounds = outer_loop.iter.args[:2]
+            if len(bounds) == 1:
+                bounds = [ast.Num(n=0)] + bounds
+            loops_info[ast.Name(id=outer_loop.target.id)] = ast.Call(func=ast.Name(id="range"), args=bounds,
+                                                                     keywords=[], starargs=None, kwargs=None)
+        subscript_accesses_info = {}
+        for statement in loop.body:
+            TranslationBenchmark._add_accesses(statement, subscript_accesses_info)
+        if len(subscript_accesses_info) > 0:
+            problems.append((loops_info, subscript_accesses_info))
+
+    @staticmethod
+    def _add_accesses(node, subscript_accesses_info):
+        """
+        Adds the accesses of the given node to the subscript accesses information
+
+        :param node: AST node
+            + type: AST.Node
+        :param subscript_accesses_info: Map between subscript names and all its access expressions
+            + type: dict<str, List<List<AST>>>
+        """
+
+        import ast
+        if isinstance(node, ast.Subscript):
+            dims = []
+            value = node
+            while isinstance(value, ast.Subscript):
+                index = value.slice.value if isinstance(value.slice, ast.Index) else value.slice
+                dims.insert(0, index)
+                value = value.value
+            if isinstance(value, ast.Name):
+                accesses = subscript_accesses_info.setdefault(value.id, [])
+                if len(accesses) == 0 or len(accesses[0]) == len(dims):
+                    accesses.append(dims)
+            return
+        for child in ast.iter_child_nodes(node):
+            TranslationBenchmark._add_accesses(child, subscript_accesses_info)
+
+    @staticmethod
+    def compare_reports(baseline_report, report, threshold=0.2):
+        """
+        Compares the minimum time and the peak memory of each stage of each case of the given reports
+
+        :param baseline_report: Reference report (e.g. from a previous commit)
+            + type: dict
+        :param report: New report
+            + type: dict
+        :param threshold: Maximum relative increase considered as noise (default 0.2)
+            + type: float
+        :return regressions: List of stages whose time or memory increased more than the threshold
+            + type: List<dict>
+        """
+
+        case2baseline = dict((entry["case"], entry) for entry in baseline_report["results"])
+        regressions = []
+        for entry in report["results"]:
+            baseline_entry = case2baseline.get(entry["case"])
+            if baseline_entry is None:
+                continue
+            for stage, measure in entry["stages"].items():
+                baseline_measure = baseline_entry["stages"].get(stage)
+                if baseline_measure is None:
+                    continue
+                metrics = [("time", TranslationBenchmark._get_metric(baseline_measure["time"]),
+                            TranslationBenchmark._get_metric(measure["time"])),
+                           ("peak_memory", baseline_measure["peak_memory"], measure["peak_memory"])]
+                for metric, baseline_value, value in metrics:
+                    if baseline_value is None or value is None or baseline_value <= 0:
+                        continue
+                    ratio = float(value) / baseline_value
+                    if ratio > 1 + threshold:
+                        regressions.append({"case": entry["case"], "stage": stage, "metric": metric,
+                                            "baseline": baseline_value, "current": value, "ratio": ratio})
+        return regressions
+
+    @staticmethod
+    def _get_metric(time_summary):
+        """
+        Returns the value of the given time summary used to compare reports (the minimum is the least noisy)
+
+        :param time_summary: Time summary
+            + type: dict<str, float>
+        :return: Minimum time or None
+            + type: float
+        """
+
+        return time_summary["min"] if time_summary is not None else None
+
+    @staticmethod
+    def _get_pluto_binary():
+        """
+        Returns the path to the PLUTO binary used by the Scop2PScop2Py translator
+
+        :return: Path to the PLUTO binary or None if it does not exist
+            + type: str
+        """
+
+        pluto_binary = os.getenv("PLUTO_HOME", "/opt/COMPSs/Dependencies/pluto") + "/bin/polycc"
+        return pluto_binary if os.path.isfile(pluto_binary) else None
+
+    @staticmethod
+    def _get_commit():
+        """
+        Returns the git commit of the translator sources
+
+        :return: Commit hash or None if it cannot be retrieved
+            + type: str
+        """
+
+        from subprocess import Popen, PIPE
+        try:
+            process = Popen(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.realpath(__file__)),
+                            stdout=PIPE, stderr=PIPE, shell=False)
+            stdout, _ = process.communicate()
+        except OSError:
+            return None
+        if process.returncode != 0:
+            return None
+        return stdout.decode("utf-8").strip()
+
+    @staticmethod
+    def _get_tracemalloc():
+        """
+        Returns the tracemalloc module
+
+        :return: The tracemalloc module or None if it is not available (Python 2)
+            + type: module
+        """
+
+        try:
+            import tracemalloc
+            return tracemalloc
+        except ImportError:
+            return None
+
+    @staticmethod
+    def _get_timer():
+        """
+        Returns the most precise timer available
+
+        :return: Timer function
+            + type: func
+        """
+
+        import time
+        return getattr(time, "perf_counter", time.time)
+
+
+#
+# Translation Case class
+#
+
+class TranslationCase(object):
+    """
+    Represents a function measured by the translation benchmark
+
+    Attributes:
+        - name: Case name
+            + type: str
+        - kind: Case kind ("kernel" or "synthetic")
+            + type: str
+        - func: Python function to translate
+            + type: func
+        - options: Options of the @parallel decorator
+            + type: dict<str, Object>
+        - parameters: Map describing the case (application name or synthetic loop nest dimensions)
+            + type: dict
+        - calculator_problems: List of loops information and subscript accesses information of the innermost loops
+            + type: List<Tuple(dict, dict)>
+    """
+
+    def __init__(self, name, kind, func, options, parameters):
+        """
+        Initializes the TranslationCase internal structures
+
+        :param name: Case name
+            + type: str
+        :param kind: Case kind ("kernel" or "synthetic")
+            + type: str
+        :param func: Python function to translate
+            + type: func
+        :param options: Options of the @parallel decorator
+            + type: dict<str, Object>
+        :param parameters: Map describing the case
+            + type: dict
+        """
+
+        import inspect
+        self.name = name
+        self.kind = kind
+        self.func = func
+        self.options = options
+        self.parameters = parameters
+        self.calculator_problems = TranslationBenchmark.get_calculator_problems(inspect.getsource(func))
+
+
+#
+# Exception Class
+#
+
+class TranslationBenchmarkException(Exception):
+
+    def __init__(self, msg=None, nested_exception=None):
+        self.msg = msg
+        self.nested_exception = nested_exception
+
+    def __str__(self):
+        s = "Exception on TranslationBenchmark class.\n"
+        if self.msg is not None:
+            s = s + "Message: " + str(self.msg) + "\n"
+        if self.nested_exception is not None:
+            s = s + "Nested Exception: " + str(self.nested_exception) + "\n"
+        return s
+
+
+#
+# UNIT TESTS
+#
+
+class TestTranslationBenchmark(unittest.TestCase):
+
+    def test_generate_synthetic(self):
+        import inspect
+        import shutil
+        import tempfile
+        work_dir = tempfile.mkdtemp()
+        try:
+            case = TranslationBenchmark.generate_synthetic(work_dir, 2, 3, 4, 2)
+            self.assertEqual(case.name, "synthetic:synthetic_s2_d3_p4_a2")
+            self.assertEqual(inspect.getsource(case.func),
+                             "def synthetic_s2_d3_p4_a2(a0, a1, a2, n0, n1, n2, n3):\n"
+                             "    for i0 in range(n0 + n3):\n"
+                             "        for i1 in range(n1):\n"
+                             "            for i2 in range(n2):\n"
+                             "                a0[i0][i1] = compute(a0[i0][i1], a1[i1][i2])\n"
+                             "                a1[i1][i2] = compute(a1[i1][i2], a2[i2][i0])\n")
+
+            # One problem with the three loops and the accesses to the three arrays
+            self.assertEqual(len(case.calculator_problems), 1)
+            loops_info, subscript_accesses_info = case.calculator_problems[0]
+            self.assertEqual(sorted(loop_ind.id for loop_ind in loops_info.keys()), ["i0", "i1", "i2"])
+            self.assertEqual(sorted(subscript_accesses_info.keys()), ["a0", "a1", "a2"])
+            self.assertEqual(len(subscript_accesses_info["a1"]), 3)
+
+            # The sweep does not repeat the base loop nest
+            cases = TranslationBenchmark.generate_synthetic_sweep(work_dir, sweep={"statements": [1, 2],
+                                                                                   "depth": [2, 3]})
+            self.assertEqual([c.name for c in cases], ["synthetic:synthetic_s1_d2_p1_a2",
+                                                       "synthetic:synthetic_s2_d2_p1_a2",
+                                                       "synthetic:synthetic_s1_d3_p1_a2"])
+        finally:
+            shutil.rmtree(work_dir)
+
+    def test_load_kernels(self):
+        kernel_code = "from pycompss.api.parallel import parallel\n" \
+                      "from pycompss.api.task import task\n" \
+                      "\n" \
+                      "\n" \
+                      "@parallel(tile=True, pluto_extra_flags=[\"--rar\"])\n" \
+                      "def kernel(a, n):\n" \
+                      "    for i in range(1, n):\n" \
+                      "        a[i] = compute(a[i], a[i - 1])\n" \
+                      "\n" \
+                      "\n" \
+                      "@task(returns=1)\n" \
+                      "def compute(x, y):\n" \
+                      "    return x + y\n"
+        import shutil
+        import tempfile
+        examples_dir = tempfile.mkdtemp()
+        try:
+            version_dir = os.path.join(examples_dir, "dummy", "autoparallel")
+            os.makedirs(version_dir)
+            with open(os.path.join(version_dir, "dummy.py"), 'w') as f:
+                f.write(kernel_code)
+            with open(os.path.join(version_dir, "dummy_autogen.py"), 'w') as f:
+                f.write(kernel_code)
+
+            cases = TranslationBenchmark.load_kernels(examples_dir, examples_dir)
+            self.assertEqual(len(cases), 1)
+            self.assertEqual(cases[0].name, "kernel:dummy/kernel")
+            self.assertEqual(cases[0].options, {"tile": True, "pluto_extra_flags": ["--rar"]})
+            self.assertEqual(cases[0].func.__name__, "kernel")
+        finally:
+            shutil.rmtree(examples_dir)
+
+    def test_run(self):
+        benchmark = TranslationBenchmark(warmups=0, repetitions=2)
+        report = benchmark.run(synthetic_sweep={"depth": [1, 2]})
+
+        self.assertEqual([entry["case"] for entry in report["results"]],
+                         ["synthetic:synthetic_s1_d1_p1_a2", "synthetic:synthetic_s1_d2_p1_a2"])
+        for entry in report["results"]:
+            self.assertEqual(sorted(entry["stages"].keys()), sorted(TranslationBenchmark.stages))
+            self.assertEqual(entry["stages"]["calculator"]["status"], "ok")
+            self.assertEqual(entry["stages"]["calculator"]["time"]["min"] >= 0, True)
+            if benchmark.measure_memory:
+                self.assertEqual(entry["stages"]["calculator"]["peak_memory"] > 0, True)
+            if entry["stages"]["py2scop"]["status"] == "ok":
+                self.assertEqual(entry["stages"]["openscop_io"]["status"], "ok")
+            else:
+                self.assertEqual(entry["stages"]["openscop_io"]["status"], "skipped")
+            if not report["pluto"]:
+                self.assertEqual(entry["stages"]["pluto"]["status"], "skipped")
+                self.assertEqual(entry["stages"]["py2pycompss"]["status"], "skipped")
+
+        # A report does not regress against itself but does against a faster one
+        self.assertEqual(TranslationBenchmark.compare_reports(report, report), [])
+        import copy
+        faster_report = copy.deepcopy(report)
+        faster_report["results"][0]["stages"]["calculator"]["time"]["min"] /= 10.0
+        regressions = TranslationBenchmark.compare_reports(faster_report, report)
+        self.assertEqual([(r["case"], r["stage"], r["metric"]) for r in regressions],
+                         [("synthetic:synthetic_s1_d1_p1_a2", "calculator", "time")])
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
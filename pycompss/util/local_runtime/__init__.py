@@ -0,0 +1,2 @@
+# For * imports
+__all__ = ['api', 'constraint', 'parameter', 'process_runtime', 'runtime', 'task', 'task_graph']
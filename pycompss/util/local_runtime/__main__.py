@@ -0,0 +1,88 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import logging
+
+
+#
+# Command line interface
+#
+
+def main(argv=None):
+    """
+    Runs a PyCOMPSs application on the local runtime
+
+    :param argv: Command line arguments (default sys.argv)
+        + type: List<str>
+    """
+
+    import argparse
+    import runpy
+    import sys
+    parser = argparse.ArgumentParser(prog="python -m pycompss.util.local_runtime",
+                                     description="Runs a PyCOMPSs application on a local pool of workers")
+    parser.add_argument("--workers", type=int, default=None, help="Number of workers (default CPUs)")
+    parser.add_argument("--backend", choices=["threads", "processes"], default="threads",
+                        help="Run the tasks on threads or on processes sharing the NumPy blocks")
+    parser.add_argument("--task-graph", default=None, metavar="FILE",
+                        help="Do not run the tasks: write the task graph to FILE (.dot or .json)")
+    parser.add_argument("--function", default=None,
+                        help="With --task-graph, call this function of the script with the application arguments "
+                             "(evaluated as Python literals) instead of running the script")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    parser.add_argument("script", help="Python script of the application")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Application arguments")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO,
+                        format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+
+    if args.task_graph is not None:
+        from pycompss.util.local_runtime.task_graph import build_task_graph
+        script_args = args.args if args.function is None else [_parse_literal(arg) for arg in args.args]
+        graph = build_task_graph(args.script, args.function, script_args)
+        graph.write(args.task_graph)
+        summary = graph.get_summary()
+        print("Task graph written to " + args.task_graph + ": " + str(summary["tasks"]) + " tasks, " +
+              str(summary["dependences"]) + " dependences, " + str(summary["synchronizations"]) +
+              " synchronizations, critical path " + str(summary["critical_path"]) + ", max width " +
+              str(summary["max_width"]) + ", parallelism " + str(summary["parallelism"]))
+        return
+
+    from pycompss.util.local_runtime.runtime import install, uninstall
+    install(num_workers=args.workers, backend=args.backend)
+    sys.argv = [args.script] + args.args
+    try:
+        runpy.run_path(args.script, run_name="__main__")
+    finally:
+        # Waits for the tasks that have not been synchronized
+        uninstall()
+
+
+def _parse_literal(value):
+    """
+    Returns the Python literal of the given command line argument or the argument itself if it is not a literal
+
+    :param value: Command line argument
+        + type: str
+    :return: Value
+        + type: Object
+    """
+
+    import ast
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+
+#
+# API functions (same signatures than pycompss.api.api)
+#
+
+def compss_barrier(no_more_tasks=False):
+    """
+    Waits for all the submitted tasks (inside a task, only for its nested tasks)
+
+    :param no_more_tasks: Ignored by the local runtime (default False)
+        + type: bool
+    """
+
+    from pycompss.util.local_runtime.runtime import get_runtime
+    get_runtime().barrier()
+
+
+def compss_wait_on(*args):
+    """
+    Waits for the tasks accessing the given objects and returns their last versions
+
+    :param args: Objects, futures or lists
+        + type: List<Object>
+    :return: Last version of the object or list of last versions when several objects are given
+        + type: Object
+    """
+
+    from pycompss.util.local_runtime.runtime import get_runtime
+    runtime = get_runtime()
+    values = [runtime.wait_on(obj) for obj in args]
+    return values[0] if len(values) == 1 else values
+
+
+def compss_open(file_name, mode='r'):
+    """
+    Waits for the tasks accessing the given file and opens it
+
+    :param file_name: File path
+        + type: str
+    :param mode: Open mode (default 'r')
+        + type: str
+    :return: File object
+        + type: file
+    """
+
+    from pycompss.util.local_runtime.runtime import get_runtime
+    return get_runtime().open(file_name, mode)
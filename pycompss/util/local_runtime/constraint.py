@@ -0,0 +1,68 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+
+
+#
+# Constraint decorator definition
+#
+
+class Constraint(object):
+    """
+    Activates with the @constraint decorator of the local runtime. The local runtime runs every task on a single
+    worker thread, so the constraints are accepted and ignored
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Stores the decorator arguments
+
+        :param args: Decorator arguments
+        :param kwargs: Decorator keyword arguments (e.g. ComputingUnits="4")
+        """
+
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, func):
+        """
+        Returns the given function
+
+        :param func: Function
+            + type: func
+        :return: The same function
+            + type: func
+        """
+
+        return func
+
+
+# Same name than the PyCOMPSs decorator
+constraint = Constraint
+
+
+#
+# UNIT TESTS
+#
+
+class TestConstraint(unittest.TestCase):
+
+    def test_constraint(self):
+        def func():
+            return 1
+
+        self.assertEqual(constraint(ComputingUnits="${ComputingUnits}")(func), func)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+
+# For * imports (the generated code imports all the parameter definitions)
+__all__ = ['IN', 'OUT', 'INOUT', 'CONCURRENT', 'COMMUTATIVE', 'COLLECTION_IN', 'COLLECTION_OUT', 'COLLECTION_INOUT',
+           'FILE_IN', 'FILE_OUT', 'FILE_INOUT', 'Type', 'Depth']
+
+
+#
+# Direction class
+#
+
+class Direction(object):
+    """
+    Represents the direction of a task parameter
+
+    Attributes:
+        - name: Direction name
+            + type: str
+        - is_read: Whether the task reads the parameter or not
+            + type: bool
+        - is_write: Whether the task writes the parameter or not
+            + type: bool
+        - is_concurrent: Whether the writes of several tasks can run at the same time or not
+            + type: bool
+        - is_collection: Whether the parameter is a collection whose elements are tracked separately or not
+            + type: bool
+        - is_file: Whether the parameter is a file path or not
+            + type: bool
+    """
+
+    def __init__(self, name, is_read, is_write, is_concurrent=False, is_collection=False, is_file=False):
+        """
+        Initializes the Direction internal structures
+
+        :param name: Direction name
+            + type: str
+        :param is_read: Whether the task reads the parameter or not
+            + type: bool
+        :param is_write: Whether the task writes the parameter or not
+            + type: bool
+        :param is_concurrent: Whether the writes of several tasks can run at the same time or not (default False)
+            + type: bool
+        :param is_collection: Whether the parameter is a collection or not (default False)
+            + type: bool
+        :param is_file: Whether the parameter is a file path or not (default False)
+            + type: bool
+        """
+
+        self.name = name
+        self.is_read = is_read
+        self.is_write = is_write
+        self.is_concurrent = is_concurrent
+        self.is_collection = is_collection
+        self.is_file = is_file
+
+    def __repr__(self):
+        return self.name
+
+
+#
+# Parameter definitions (same names than pycompss.api.parameter)
+#
+
+IN = Direction("IN", True, False)
+OUT = Direction("OUT", False, True)
+INOUT = Direction("INOUT", True, True)
+CONCURRENT = Direction("CONCURRENT", True, True, is_concurrent=True)
+# The local runtime serializes the commutative tasks in submission order
+COMMUTATIVE = Direction("COMMUTATIVE", True, True)
+
+COLLECTION_IN = Direction("COLLECTION_IN", True, False, is_collection=True)
+COLLECTION_OUT = Direction("COLLECTION_OUT", False, True, is_collection=True)
+COLLECTION_INOUT = Direction("COLLECTION_INOUT", True, True, is_collection=True)
+
+FILE_IN = Direction("FILE_IN", True, False, is_file=True)
+FILE_OUT = Direction("FILE_OUT", False, True, is_file=True)
+FILE_INOUT = Direction("FILE_INOUT", True, True, is_file=True)
+
+# Keys of the dictionary parameter definitions (e.g. {Type: COLLECTION_IN, Depth: 2})
+Type = "type"
+Depth = "depth"
+
+
+def get_direction(definition):
+    """
+    Returns the direction and the collection depth of the given parameter definition
+
+    :param definition: Parameter definition (a direction or a dictionary with the Type and Depth keys)
+        + type: Direction or dict
+    :return direction: Parameter direction
+        + type: Direction
+    :return depth: Collection depth (1 for non collection parameters)
+        + type: int
+    """
+
+    if isinstance(definition, dict):
+        direction = definition.get(Type, IN)
+        return direction, int(definition.get(Depth, 1))
+    if isinstance(definition, Direction):
+        return definition, 1
+    raise ValueError("Unknown parameter definition " + str(definition))
+
+
+#
+# UNIT TESTS
+#
+
+class TestParameter(unittest.TestCase):
+
+    def test_get_direction(self):
+        self.assertEqual(get_direction(INOUT), (INOUT, 1))
+        self.assertEqual(get_direction({Type: COLLECTION_IN, Depth: 2}), (COLLECTION_IN, 2))
+        self.assertEqual(get_direction({Type: COLLECTION_OUT}), (COLLECTION_OUT, 1))
+        self.assertRaises(ValueError, get_direction, "IN")
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    unittest.main()
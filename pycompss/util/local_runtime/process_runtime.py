@@ -0,0 +1,642 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import sys
+import threading
+
+from pycompss.util.local_runtime.runtime import LocalRuntime, LocalRuntimeException
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Process Runtime class
+#
+
+class ProcessRuntime(LocalRuntime):
+    """
+    Local runtime running the tasks on a pool of worker processes, for the task kernels that hold the GIL. The
+    dependencies are tracked by the worker threads of the master process (one per worker process), that send each
+    ready task to the process pool and wait for it.
+
+    The NumPy blocks (ndarrays and matrices) live in multiprocessing.shared_memory segments and the tasks exchange
+    handles to the segments instead of pickled copies:
+        - The blocks passed to a task are moved to a segment the first time (the segment becomes the new version of
+         the original block).
+        - The IN blocks are mapped read-only and the written blocks (INOUT, CONCURRENT and COLLECTION_INOUT elements)
+         are mapped writable and modified in place, since the dependencies guarantee that no other task accesses them.
+        - The new blocks created by a task (returned or replacing a collection element) are copied into new segments.
+    The segments are released when the master process drops its last reference to the block. The rest of objects are
+    pickled and the written ones are sent back to the master as their new versions.
+
+    The worker processes are forked when the first task runs, so the task functions must be defined (at module level)
+    before. This backend requires Python 3.8 or higher.
+    """
+
+    def __init__(self, num_workers=None):
+        """
+        Initializes the ProcessRuntime internal structures
+
+        :param num_workers: Number of worker processes (default the number of CPUs)
+            + type: int
+        """
+
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:
+            raise LocalRuntimeException("[ERROR] The processes backend requires multiprocessing.shared_memory")
+        self._shared_memory = shared_memory
+        self._pool = None
+        # Protects the pool and the creation of segments: the fork must not happen while another thread holds the
+        # lock of the resource tracker
+        self._pool_lock = threading.Lock()
+        # Map containing the ids of the shared blocks and their weak references and segment names
+        self._blocks = {}
+        # Map containing the segment names and the weak references to their blocks
+        self._segments = {}
+        super(ProcessRuntime, self).__init__(num_workers)
+
+    def stop(self):
+        """
+        Waits for all the submitted tasks and stops the worker threads and processes
+        """
+
+        try:
+            super(ProcessRuntime, self).stop()
+        finally:
+            with self._pool_lock:
+                if self._pool is not None:
+                    self._pool.close()
+                    self._pool.join()
+                    self._pool = None
+
+    #
+    # Task execution
+    #
+
+    def _call(self, task, args, kwargs):
+        """
+        Runs the task function on a worker process. The written objects are replaced in the arguments (and in the
+        collections) by their new versions
+
+        :param task: Task
+            + type: TaskInstance
+        :param args: Resolved positional arguments
+            + type: List<Object>
+        :param kwargs: Map containing the keyword argument names and their resolved values
+            + type: dict<str, Object>
+        :return: Value returned by the task function
+            + type: Object
+        """
+
+        encoded_args = [self._encode(value, direction, depth)
+                        for value, (_, direction, depth) in zip(args, task.args)]
+        encoded_kwargs = dict((name, self._encode(kwargs[name], direction, depth))
+                              for name, (_, direction, depth) in task.kwargs.items())
+        written_args = [index for index, (_, direction, _) in enumerate(task.args)
+                        if direction.is_write and not direction.is_file]
+        written_kwargs = [name for name, (_, direction, _) in task.kwargs.items()
+                          if direction.is_write and not direction.is_file]
+
+        async_result = self._get_pool().apply_async(_execute_task,
+                                                    (ProcessRuntime._get_function_reference(task.func), encoded_args,
+                                                     encoded_kwargs, written_args, written_kwargs))
+        encoded_result, new_args, new_kwargs = async_result.get()
+
+        for index, encoded_value in new_args.items():
+            _, direction, depth = task.args[index]
+            args[index] = self._update(args[index], self._decode(encoded_value), direction, depth)
+        for name, encoded_value in new_kwargs.items():
+            _, direction, depth = task.kwargs[name]
+            kwargs[name] = self._update(kwargs[name], self._decode(encoded_value), direction, depth)
+        return self._decode(encoded_result)
+
+    def _get_pool(self):
+        """
+        Returns the pool of worker processes, forking it on the first call
+
+        :return: Process pool
+            + type: multiprocessing.Pool
+        """
+
+        with self._pool_lock:
+            if self._pool is None:
+                import multiprocessing
+                context = multiprocessing.get_context("fork")
+                self._pool = context.Pool(self.num_workers, initializer=_initialize_worker)
+            return self._pool
+
+    @staticmethod
+    def _get_function_reference(func):
+        """
+        Returns the module and the qualified name of the given task function
+
+        :param func: Task function
+            + type: func
+        :return: Module name and qualified name
+            + type: Tuple(str, str)
+        """
+
+        qualified_name = getattr(func, "__qualname__", func.__name__)
+        if "<locals>" in qualified_name:
+            raise LocalRuntimeException("[ERROR] The task " + qualified_name + " is not defined at module level")
+        return func.__module__, qualified_name
+
+    @staticmethod
+    def _update(old_value, new_value, direction, depth):
+        """
+        Returns the new version of a written parameter. The elements of the written collections are replaced in place
+
+        :param old_value: Resolved value passed to the task
+            + type: Object
+        :param new_value: Value sent back by the task
+            + type: Object
+        :param direction: Parameter direction
+            + type: Direction
+        :param depth: Collection depth
+            + type: int
+        :return: New version of the parameter
+            + type: Object
+        """
+
+        if not direction.is_collection:
+            return new_value
+        for index, new_element in enumerate(new_value):
+            if depth > 1 and isinstance(old_value[index], list):
+                ProcessRuntime._update(old_value[index], new_element, direction, depth - 1)
+            else:
+                old_value[index] = new_element
+        return old_value
+
+    #
+    # Shared blocks
+    #
+
+    def _resolve_value(self, obj):
+        """
+        Returns the last version of the given object. The NumPy blocks are moved to shared memory
+
+        :param obj: Object or future
+            + type: Object
+        :return: Last version of the object
+            + type: Object
+        """
+
+        value = super(ProcessRuntime, self)._resolve_value(obj)
+        if _is_shareable(value) and self._get_segment_name(value) is None:
+            value = self._share(value)
+            with self._lock:
+                self._get_info(id(obj), obj, create=True).set_value(value)
+        return value
+
+    def _share(self, array):
+        """
+        Copies the given block into a new shared memory segment
+
+        :param array: Block
+            + type: numpy.ndarray
+        :return: Block stored in shared memory
+            + type: numpy.ndarray
+        """
+
+        with self._pool_lock:
+            segment = self._shared_memory.SharedMemory(create=True, size=array.nbytes)
+        shared_array = _build_array(segment, array.shape, array.dtype.str, type(array))
+        shared_array[...] = array
+        self._register(shared_array, segment)
+        return shared_array
+
+    def _register(self, array, segment):
+        """
+        Registers the given shared block. Its segment is released when the block is garbage collected
+
+        :param array: Block stored in the segment
+            + type: numpy.ndarray
+        :param segment: Shared memory segment
+            + type: multiprocessing.shared_memory.SharedMemory
+        """
+
+        import weakref
+        with self._lock:
+            self._blocks[id(array)] = (weakref.ref(array), segment.name)
+            self._segments[segment.name] = weakref.ref(array)
+        weakref.finalize(array, ProcessRuntime._release, segment, self._lock, self._blocks, self._segments, id(array))
+
+    @staticmethod
+    def _release(segment, lock, blocks, segments, array_id):
+        """
+        Releases the given segment (called when its block is garbage collected)
+
+        :param segment: Shared memory segment
+            + type: multiprocessing.shared_memory.SharedMemory
+        :param lock: Lock protecting the block maps
+            + type: threading.RLock
+        :param blocks: Map containing the ids of the shared blocks and their weak references and segment names
+            + type: dict<int, Tuple(weakref, str)>
+        :param segments: Map containing the segment names and the weak references to their blocks
+            + type: dict<str, weakref>
+        :param array_id: Id of the garbage collected block
+            + type: int
+        """
+
+        with lock:
+            entry = blocks.get(array_id)
+            if entry is not None and entry[1] == segment.name:
+                del blocks[array_id]
+            segments.pop(segment.name, None)
+        segment.close()
+        try:
+            segment.unlink()
+        except OSError:
+            pass
+
+    def _get_segment_name(self, array):
+        """
+        Returns the segment storing the given block
+
+        :param array: Block
+            + type: numpy.ndarray
+        :return: Segment name or None if the block is not shared
+            + type: str
+        """
+
+        with self._lock:
+            entry = self._blocks.get(id(array))
+        if entry is not None and entry[0]() is array:
+            return entry[1]
+        return None
+
+    def _encode(self, value, direction, depth):
+        """
+        Replaces the shared blocks of a task parameter by their handles
+
+        :param value: Resolved parameter value
+            + type: Object
+        :param direction: Parameter direction
+            + type: Direction
+        :param depth: Collection depth
+            + type: int
+        :return: Parameter value sent to the worker process
+            + type: Object
+        """
+
+        if direction.is_file:
+            return value
+        if direction.is_collection:
+            return [self._encode(element, direction, depth - 1) if depth > 1 and isinstance(element, list)
+                    else self._encode_block(element, direction) for element in value]
+        return self._encode_block(value, direction)
+
+    def _encode_block(self, value, direction):
+        """
+        Returns the handle of the given block or the given value if it is not a shared block
+
+        :param value: Resolved value
+            + type: Object
+        :param direction: Parameter direction
+            + type: Direction
+        :return: SharedBlock or the value
+            + type: Object
+        """
+
+        if not _is_shareable(value):
+            return value
+        segment_name = self._get_segment_name(value)
+        if segment_name is None:
+            return value
+        return SharedBlock(segment_name, value.shape, value.dtype.str, type(value), not direction.is_write)
+
+    def _decode(self, value):
+        """
+        Replaces the handles sent back by a worker process by the shared blocks
+
+        :param value: Value sent back by the worker process
+            + type: Object
+        :return: Value with shared blocks
+            + type: Object
+        """
+
+        if isinstance(value, SharedBlock):
+            with self._lock:
+                block_ref = self._segments.get(value.segment_name)
+            array = block_ref() if block_ref is not None else None
+            if array is None:
+                # New block created by the task (the master takes the ownership of its segment)
+                with self._pool_lock:
+                    segment = self._shared_memory.SharedMemory(name=value.segment_name)
+                array = _build_array(segment, value.shape, value.dtype, value.array_type)
+                self._register(array, segment)
+            return array
+        if isinstance(value, list):
+            return [self._decode(element) for element in value]
+        if isinstance(value, tuple):
+            return tuple(self._decode(element) for element in value)
+        return value
+
+
+#
+# Shared Block class
+#
+
+class SharedBlock(object):
+    """
+    Handle of a block stored in a shared memory segment
+
+    Attributes:
+        - segment_name: Name of the shared memory segment
+            + type: str
+        - shape: Block shape
+            + type: Tuple<int>
+        - dtype: Block data type
+            + type: str
+        - array_type: Block class (numpy.ndarray or numpy.matrix)
+            + type: type
+        - read_only: Whether the task can modify the block or not
+            + type: bool
+    """
+
+    def __init__(self, segment_name, shape, dtype, array_type, read_only):
+        """
+        Initializes the SharedBlock internal structures
+
+        :param segment_name: Name of the shared memory segment
+            + type: str
+        :param shape: Block shape
+            + type: Tuple<int>
+        :param dtype: Block data type
+            + type: str
+        :param array_type: Block class
+            + type: type
+        :param read_only: Whether the task can modify the block or not
+            + type: bool
+        """
+
+        self.segment_name = segment_name
+        self.shape = shape
+        self.dtype = dtype
+        self.array_type = array_type
+        self.read_only = read_only
+
+
+#
+# Shared memory helpers (shared by the master and the worker processes)
+#
+
+def _is_shareable(value):
+    """
+    Returns whether the given value is a NumPy block that can be stored in shared memory or not
+
+    :param value: Value
+        + type: Object
+    :return: True if the value is a non-empty ndarray of a non-object data type, False otherwise
+        + type: bool
+    """
+
+    try:
+        import numpy as np
+    except ImportError:
+        return False
+    return isinstance(value, np.ndarray) and value.dtype != object and value.nbytes > 0
+
+
+def _build_array(segment, shape, dtype, array_type):
+    """
+    Returns a block backed by the given segment
+
+    :param segment: Shared memory segment
+        + type: multiprocessing.shared_memory.SharedMemory
+    :param shape: Block shape
+        + type: Tuple<int>
+    :param dtype: Block data type
+        + type: str
+    :param array_type: Block class
+        + type: type
+    :return: Block
+        + type: numpy.ndarray
+    """
+
+    import numpy as np
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+    if array_type is not np.ndarray:
+        array = array.view(array_type)
+    return array
+
+
+def _initialize_worker():
+    """
+    Initializes a worker process: the tasks spawned by its tasks (nested tasks) run on a local runtime with a single
+    thread
+    """
+
+    from pycompss.util.local_runtime import runtime
+    runtime._runtime_lock = threading.Lock()
+    runtime._runtime = LocalRuntime(1)
+
+
+def _execute_task(function_reference, args, kwargs, written_args, written_kwargs):
+    """
+    Executes a task on a worker process
+
+    :param function_reference: Module and qualified name of the task function
+        + type: Tuple(str, str)
+    :param args: Positional arguments (with SharedBlock handles)
+        + type: List<Object>
+    :param kwargs: Map containing the keyword argument names and their values (with SharedBlock handles)
+        + type: dict<str, Object>
+    :param written_args: Positions of the written positional arguments
+        + type: List<int>
+    :param written_kwargs: Names of the written keyword arguments
+        + type: List<str>
+    :return: Returned value, map of the written positional arguments and map of the written keyword arguments
+     (with SharedBlock handles)
+        + type: Tuple(Object, dict<int, Object>, dict<str, Object>)
+    """
+
+    import importlib
+    from multiprocessing import shared_memory
+
+    segments = {}
+    created_segments = []
+
+    def decode(value):
+        if isinstance(value, SharedBlock):
+            if value.segment_name not in segments:
+                segments[value.segment_name] = (shared_memory.SharedMemory(name=value.segment_name), [])
+            segment, arrays = segments[value.segment_name]
+            array = _build_array(segment, value.shape, value.dtype, value.array_type)
+            array.flags.writeable = not value.read_only
+            arrays.append(array)
+            return array
+        if isinstance(value, list):
+            return [decode(element) for element in value]
+        return value
+
+    def encode(value):
+        if _is_shareable(value):
+            # Blocks modified in place keep their segment and new blocks are copied into new segments
+            for segment_name, (_, arrays) in segments.items():
+                if any(array is value for array in arrays):
+                    return SharedBlock(segment_name, value.shape, value.dtype.str, type(value), False)
+            segment = shared_memory.SharedMemory(create=True, size=value.nbytes)
+            shared_array = _build_array(segment, value.shape, value.dtype.str, type(value))
+            shared_array[...] = value
+            del shared_array
+            created_segments.append(segment)
+            return SharedBlock(segment.name, value.shape, value.dtype.str, type(value), False)
+        if isinstance(value, list):
+            return [encode(element) for element in value]
+        if isinstance(value, tuple):
+            return tuple(encode(element) for element in value)
+        return value
+
+    try:
+        module_name, qualified_name = function_reference
+        func = importlib.import_module(module_name)
+        for name in qualified_name.split("."):
+            func = getattr(func, name)
+        # Call the original function instead of the task decorator
+        func = getattr(func, "__wrapped__", func)
+
+        args = [decode(value) for value in args]
+        kwargs = dict((name, decode(value)) for name, value in kwargs.items())
+        result = func(*args, **kwargs)
+
+        return encode(result), dict((index, encode(args[index])) for index in written_args), \
+            dict((name, encode(kwargs[name])) for name in written_kwargs)
+    finally:
+        # The master process releases the segments
+        args = kwargs = result = None
+        for segment, arrays in segments.values():
+            del arrays[:]
+            try:
+                segment.close()
+            except BufferError:
+                # The task keeps a reference to the block
+                pass
+        for segment in created_segments:
+            segment.close()
+
+
+#
+# UNIT TESTS
+#
+
+# The tasks of the tests must be defined at module level (before the worker processes are forked)
+from pycompss.util.local_runtime.task import task as _task  # noqa: E402
+from pycompss.util.local_runtime.parameter import IN as _IN, INOUT as _INOUT, Type as _Type, Depth as _Depth, \
+    COLLECTION_INOUT as _COLLECTION_INOUT  # noqa: E402
+
+
+@_task(returns=1)
+def _test_create(value, size):
+    import numpy as np
+    return np.full((size, size), float(value))
+
+
+@_task(block=_INOUT)
+def _test_scale(block, factor):
+    block *= factor
+
+
+@_task(a=_IN, b=_IN, returns=2)
+def _test_add(a, b):
+    import os
+    return a + b, os.getpid()
+
+
+@_task(blocks={_Type: _COLLECTION_INOUT, _Depth: 1})
+def _test_shift(blocks, offset):
+    for index in range(len(blocks)):
+        blocks[index] = blocks[index] + offset
+
+
+@_task(block=_IN)
+def _test_write_in(block):
+    block[0, 0] = -1
+
+
+@_task(values=_INOUT)
+def _test_append(values, value):
+    values.append(value)
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "The processes backend requires Python 3.8 or higher")
+class TestProcessRuntime(unittest.TestCase):
+
+    def setUp(self):
+        from pycompss.util.local_runtime.runtime import start
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("NumPy is not available")
+        self.runtime = start(num_workers=2, backend="processes")
+
+    def tearDown(self):
+        from pycompss.util.local_runtime.runtime import stop
+        stop()
+
+    def test_blocks(self):
+        import os
+        import numpy as np
+
+        a = _test_create(1, 4)
+        b = np.full((4, 4), 2.0)
+        _test_scale(b, 3)
+        c, pid = _test_add(a, b)
+        blocks = [a, c]
+        _test_shift(blocks, 10)
+
+        self.assertNotEqual(self.runtime.wait_on(pid), os.getpid())
+        # The original block is not modified, its new version is stored in shared memory
+        self.assertTrue(np.all(b == 2.0))
+        self.assertTrue(np.all(self.runtime.wait_on(b) == 6.0))
+        new_a, new_c = self.runtime.wait_on([a, c])
+        self.assertTrue(np.all(new_a == 11.0))
+        self.assertTrue(np.all(new_c == 17.0))
+        self.assertIsNotNone(self.runtime._get_segment_name(new_c))
+
+    def test_read_only(self):
+        import numpy as np
+
+        block = np.zeros((2, 2))
+        _test_write_in(block)
+        self.assertRaises(LocalRuntimeException, self.runtime.barrier)
+        self.assertEqual(self.runtime.wait_on(block)[0, 0], 0.0)
+
+    def test_pickled_objects(self):
+        values = []
+        for value in range(3):
+            _test_append(values, value)
+        self.assertEqual(self.runtime.wait_on(values), [0, 1, 2])
+
+    def test_release(self):
+        import gc
+        import numpy as np
+
+        block = self.runtime.wait_on(_test_create(2, 2))
+        segment_name = self.runtime._get_segment_name(block)
+        self.assertTrue(np.all(block == 2.0))
+        self.runtime.barrier()
+        del block
+        gc.collect()
+        self.assertTrue(segment_name not in self.runtime._segments)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
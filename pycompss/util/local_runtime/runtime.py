@@ -0,0 +1,1129 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import threading
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Local Runtime class
+#
+
+class LocalRuntime(object):
+    """
+    Executes PyCOMPSs tasks on a pool of threads of the local machine. Stands in for the COMPSs runtime so that the
+    generated code can be executed, tested and benchmarked without a COMPSs installation (NumPy and BLAS kernels
+    release the GIL, so the tasks run in parallel).
+
+    As the COMPSs runtime, the data accessed by the tasks is tracked by object identity: each task depends on the last
+    tasks writing the objects it reads (and on the tasks reading the objects it writes), the futures returned by the
+    tasks are resolved before executing the tasks receiving them and the elements replaced by the tasks writing a
+    collection are the new versions of the original objects (returned by compss_wait_on and passed to the next tasks).
+    Thus, different positions of a written collection must hold different objects.
+
+    The tasks spawned by a task are its nested tasks: they do not depend on their ancestors and a compss_barrier
+    inside a task only waits for its nested tasks. A worker blocked on a synchronization is temporarily replaced by a
+    new worker so that the pool always has num_workers threads running tasks.
+
+    Attributes:
+        - num_workers: Number of threads running tasks
+            + type: int
+    """
+
+    # Static attribute Types that cannot be modified by a task and are not tracked when passed as IN parameters
+    _immutable_types = (int, float, complex, bool, str, bytes, type(None), type(u""))
+
+    def __init__(self, num_workers=None):
+        """
+        Initializes the LocalRuntime internal structures and starts the worker threads
+
+        :param num_workers: Number of threads running tasks (default the number of CPUs)
+            + type: int
+        """
+
+        import itertools
+        import multiprocessing
+        try:
+            import queue
+        except ImportError:
+            # Python 2
+            import Queue as queue
+
+        self.num_workers = num_workers if num_workers is not None else multiprocessing.cpu_count()
+        if self.num_workers < 1:
+            raise LocalRuntimeException("[ERROR] The local runtime requires at least one worker")
+
+        self._lock = threading.RLock()
+        self._ready_tasks = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._registry = {}
+        self._unfinished_tasks = set()
+        self._failed_tasks = []
+        self._surplus_workers = 0
+        self._current = threading.local()
+        self._workers = []
+        self._stopped = False
+        for _ in range(self.num_workers):
+            self._start_worker()
+
+    #
+    # Public methods
+    #
+
+    def submit(self, func, args, kwargs, num_returns=0, priority=False):
+        """
+        Submits a task. The task runs when all the tasks it depends on have finished
+
+        :param func: Task function
+            + type: func
+        :param args: Positional arguments as (value, direction, depth) tuples
+            + type: List<Tuple(Object, Direction, int)>
+        :param kwargs: Map containing the keyword argument names and their (value, direction, depth) tuples
+            + type: dict<str, Tuple(Object, Direction, int)>
+        :param num_returns: Number of values returned by the task (default 0)
+            + type: int
+        :param priority: Whether the task runs before the rest of ready tasks or not (default False)
+            + type: bool
+        :return: None, a Future or a tuple of num_returns Futures
+            + type: None, Future or Tuple<Future>
+        """
+
+        from pycompss.util.local_runtime.parameter import OUT
+
+        with self._lock:
+            if self._stopped:
+                raise LocalRuntimeException("[ERROR] The local runtime has been stopped")
+
+            parent = getattr(self._current, "task", None)
+            task = TaskInstance(func, args, kwargs, num_returns, priority, parent)
+            if parent is not None:
+                parent.children.append(task)
+
+            # Register the accesses of the task and compute its predecessors
+            predecessors = set()
+            for value, direction, depth in list(args) + list(kwargs.values()):
+                for key, obj in LocalRuntime._get_accessed_data(value, direction, depth):
+                    info = self._get_info(key, obj, create=True)
+                    predecessors.update(info.register_access(task, direction))
+
+            # Create the futures (written by the task)
+            futures = [Future(task, index if num_returns > 1 else None) for index in range(num_returns)]
+            for future in futures:
+                self._get_info(id(future), future, create=True).register_access(task, OUT)
+
+            # Nested tasks do not depend on their ancestors (that wait for them)
+            ancestors = set()
+            ancestor = parent
+            while ancestor is not None:
+                ancestors.add(ancestor)
+                ancestor = ancestor.parent
+            predecessors = [p for p in predecessors if p is not task and p not in ancestors and not p.finished]
+            task.pending = len(predecessors)
+            for predecessor in predecessors:
+                predecessor.successors.append(task)
+
+            self._unfinished_tasks.add(task)
+            if __debug__:
+                logger.debug("[LocalRuntime] Submitted task " + task.name + " depending on " +
+                             str([p.name for p in predecessors]))
+            if task.pending == 0:
+                self._enqueue(task)
+
+        if num_returns == 0:
+            return None
+        if num_returns == 1:
+            return futures[0]
+        return tuple(futures)
+
+    def wait_on(self, obj):
+        """
+        Waits for the tasks accessing the given object and returns its last version. The elements of lists are
+        synchronized recursively
+
+        :param obj: Object, future or list
+            + type: Object
+        :return: Last version of the object
+            + type: Object
+        """
+
+        with self._lock:
+            info = self._get_info(id(obj), obj)
+            tasks = [] if info is None else info.writers + info.readers
+        self._wait_tasks(tasks)
+        obj = self._resolve_value(obj)
+        if isinstance(obj, list):
+            return [self.wait_on(element) for element in obj]
+        return obj
+
+    def open(self, file_name, mode='r'):
+        """
+        Waits for the tasks writing the given file (and reading it, when opened for writing) and opens it
+
+        :param file_name: File path
+            + type: str
+        :param mode: Open mode (default 'r')
+            + type: str
+        :return: File object
+            + type: file
+        """
+
+        with self._lock:
+            info = self._get_info(("file", file_name), None)
+            tasks = []
+            if info is not None:
+                tasks = info.writers + info.readers if mode not in ['r', 'rb'] else list(info.writers)
+        self._wait_tasks(tasks)
+        return open(file_name, mode)
+
+    def barrier(self):
+        """
+        Waits for all the submitted tasks. Inside a task, only waits for its nested tasks. Raises the exception of
+        the first failed task, if any
+        """
+
+        task = getattr(self._current, "task", None)
+        if task is not None:
+            self._wait_tasks(list(task.children))
+            return
+
+        # The accesses are cleared in the same critical section that finds no unfinished tasks, so that the tasks
+        # submitted concurrently (e.g. by other master threads) keep their accesses
+        while True:
+            with self._lock:
+                tasks = list(self._unfinished_tasks)
+                if len(tasks) == 0:
+                    # There are no pending accesses: only keep the new versions of the objects
+                    for key in list(self._registry.keys()):
+                        info = self._registry[key]
+                        if info.has_value:
+                            info.clear_accesses()
+                        else:
+                            del self._registry[key]
+                    failed_tasks = self._failed_tasks
+                    self._failed_tasks = []
+                    break
+            self._wait_tasks(tasks)
+
+        if len(failed_tasks) > 0:
+            raise LocalRuntimeException("[ERROR] " + str(len(failed_tasks)) + " tasks failed. First failed task: " +
+                                        failed_tasks[0].name, failed_tasks[0].exception)
+
+    def stop(self):
+        """
+        Waits for all the submitted tasks and stops the worker threads
+        """
+
+        try:
+            self.barrier()
+        finally:
+            with self._lock:
+                self._stopped = True
+                workers = list(self._workers)
+            for _ in workers:
+                self._ready_tasks.put((2, next(self._sequence), None))
+            for worker in workers:
+                worker.join()
+
+    #
+    # Data tracking
+    #
+
+    @staticmethod
+    def _get_accessed_data(value, direction, depth):
+        """
+        Returns the data accessed by a parameter
+
+        :param value: Parameter value
+            + type: Object
+        :param direction: Parameter direction
+            + type: Direction
+        :param depth: Collection depth
+            + type: int
+        :return: List of registry keys and their objects
+            + type: List<Tuple(Object, Object)>
+        """
+
+        if direction.is_file:
+            return [(("file", value), None)]
+        if direction.is_collection:
+            return [(id(element), element) for element in LocalRuntime._flatten(value, depth)]
+        if not direction.is_write and isinstance(value, LocalRuntime._immutable_types):
+            return []
+        return [(id(value), value)]
+
+    @staticmethod
+    def _flatten(collection, depth):
+        """
+        Returns the elements of the given collection
+
+        :param collection: Nested list
+            + type: List
+        :param depth: Collection depth
+            + type: int
+        :return: List of elements
+            + type: List<Object>
+        """
+
+        elements = []
+        for element in collection:
+            if depth > 1 and isinstance(element, list):
+                elements.extend(LocalRuntime._flatten(element, depth - 1))
+            else:
+                elements.append(element)
+        return elements
+
+    def _get_info(self, key, obj, create=False):
+        """
+        Returns the tracking information of the given data. Must be called with the lock held
+
+        :param key: Registry key
+            + type: Object
+        :param obj: Object (None for files)
+            + type: Object
+        :param create: Whether to create the information when it does not exist or not (default False)
+            + type: bool
+        :return: Data information or None
+            + type: DataInfo
+        """
+
+        info = self._registry.get(key)
+        # The registry keeps a reference to the objects, but check the identity in case the entry was dropped
+        if info is not None and info.obj is not obj:
+            info = None
+        if info is None and create:
+            info = DataInfo(obj)
+            self._registry[key] = info
+        return info
+
+    def _resolve_value(self, obj):
+        """
+        Returns the last version of the given object
+
+        :param obj: Object or future
+            + type: Object
+        :return: Last version of the object
+            + type: Object
+        """
+
+        with self._lock:
+            info = self._get_info(id(obj), obj)
+            if info is not None and info.has_value:
+                return info.value
+        if isinstance(obj, Future):
+            return obj.result()
+        return obj
+
+    def _resolve_collection(self, collection, depth, replacements):
+        """
+        Returns a copy of the given collection containing the last version of its elements
+
+        :param collection: Nested list
+            + type: List
+        :param depth: Collection depth
+            + type: int
+        :param replacements: List where the original element, the resolved element, the resolved container and the
+         position of each element are stored
+            + type: List<Tuple(Object, Object, List, int)>
+        :return: Resolved collection
+            + type: List
+        """
+
+        resolved_collection = []
+        for element in collection:
+            if depth > 1 and isinstance(element, list):
+                resolved_collection.append(self._resolve_collection(element, depth - 1, replacements))
+            else:
+                resolved_element = self._resolve_value(element)
+                replacements.append((element, resolved_element, resolved_collection, len(resolved_collection)))
+                resolved_collection.append(resolved_element)
+        return resolved_collection
+
+    #
+    # Task execution
+    #
+
+    def _start_worker(self):
+        """
+        Starts a new worker thread. Must be called with the lock held (or on initialization)
+        """
+
+        worker = threading.Thread(target=self._worker_loop, name="LocalRuntimeWorker")
+        worker.daemon = True
+        self._workers.append(worker)
+        worker.start()
+
+    def _worker_loop(self):
+        """
+        Runs ready tasks until the runtime stops or the worker is surplus
+        """
+
+        while True:
+            _, _, task = self._ready_tasks.get()
+            if task is None:
+                break
+            self._run(task)
+            # Do not keep the last task (and its results) alive while waiting
+            task = None
+            with self._lock:
+                if self._surplus_workers > 0:
+                    self._surplus_workers -= 1
+                    self._workers.remove(threading.current_thread())
+                    break
+
+    def _enqueue(self, task):
+        """
+        Marks the given task as ready
+
+        :param task: Task
+            + type: TaskInstance
+        """
+
+        self._ready_tasks.put((0 if task.priority else 1, next(self._sequence), task))
+
+    def _run(self, task):
+        """
+        Runs the given task on the current thread
+
+        :param task: Task
+            + type: TaskInstance
+        """
+
+        previous_task = getattr(self._current, "task", None)
+        self._current.task = task
+        try:
+            replacements = []
+            args = []
+            for value, direction, depth in task.args:
+                args.append(None)
+                args[-1] = self._resolve_param(value, direction, depth, replacements, args, len(args) - 1)
+            kwargs = {}
+            for name, (value, direction, depth) in task.kwargs.items():
+                kwargs[name] = self._resolve_param(value, direction, depth, replacements, kwargs, name)
+            task.result = self._call(task, args, kwargs)
+
+            # The objects replaced in the written parameters are the new versions of the original objects
+            with self._lock:
+                for element, resolved_element, container, position in replacements:
+                    if container[position] is not resolved_element:
+                        self._get_info(id(element), element, create=True).set_value(container[position])
+        except Exception as e:
+            logger.error("[ERROR] Task " + task.name + " failed: " + str(e))
+            task.exception = e
+        finally:
+            # Tasks finish when their nested tasks finish
+            self._wait_tasks(list(task.children))
+            self._current.task = previous_task
+            self._finish(task)
+
+    def _call(self, task, args, kwargs):
+        """
+        Calls the task function with the given resolved arguments. The objects written by the task are modified in
+        place or replaced in the arguments (and in the collections)
+
+        :param task: Task
+            + type: TaskInstance
+        :param args: Resolved positional arguments
+            + type: List<Object>
+        :param kwargs: Map containing the keyword argument names and their resolved values
+            + type: dict<str, Object>
+        :return: Value returned by the task function
+            + type: Object
+        """
+
+        return task.func(*args, **kwargs)
+
+    def _resolve_param(self, value, direction, depth, replacements, container, position):
+        """
+        Returns the value passed to the task for the given parameter
+
+        :param value: Parameter value
+            + type: Object
+        :param direction: Parameter direction
+            + type: Direction
+        :param depth: Collection depth
+            + type: int
+        :param replacements: List where the original object, the resolved object, the container and the position of
+         each written object are stored
+            + type: List<Tuple(Object, Object, List or dict, int or str)>
+        :param container: Arguments containing the parameter
+            + type: List or dict
+        :param position: Position of the parameter in the arguments
+            + type: int or str
+        :return: Resolved value
+            + type: Object
+        """
+
+        if direction.is_file:
+            return value
+        if direction.is_collection:
+            collection_replacements = []
+            resolved_collection = self._resolve_collection(value, depth, collection_replacements)
+            if direction.is_write:
+                replacements.extend(collection_replacements)
+            return resolved_collection
+        resolved_value = self._resolve_value(value)
+        if direction.is_write:
+            replacements.append((value, resolved_value, container, position))
+        return resolved_value
+
+    def _finish(self, task):
+        """
+        Marks the given task as finished and releases its successors
+
+        :param task: Task
+            + type: TaskInstance
+        """
+
+        with self._lock:
+            task.finished = True
+            self._unfinished_tasks.discard(task)
+            if task.exception is not None and task.parent is None:
+                self._failed_tasks.append(task)
+            for successor in task.successors:
+                successor.pending -= 1
+                if successor.pending == 0:
+                    self._enqueue(successor)
+            task.successors = []
+        task.done.set()
+
+    def _wait_tasks(self, tasks):
+        """
+        Waits for the given tasks. When called from a worker, starts a new worker while waiting
+
+        :param tasks: List of tasks
+            + type: List<TaskInstance>
+        """
+
+        tasks = [task for task in tasks if not task.finished]
+        if len(tasks) == 0:
+            return
+
+        in_worker = getattr(self._current, "task", None) is not None
+        if in_worker:
+            with self._lock:
+                self._start_worker()
+        try:
+            for task in tasks:
+                task.done.wait()
+        finally:
+            if in_worker:
+                with self._lock:
+                    self._surplus_workers += 1
+
+
+#
+# Task Instance class
+#
+
+class TaskInstance(object):
+    """
+    Represents a submitted task
+
+    Attributes:
+        - name: Task name (function name and submission number)
+            + type: str
+        - func: Task function
+            + type: func
+        - args: Positional arguments as (value, direction, depth) tuples
+            + type: List<Tuple(Object, Direction, int)>
+        - kwargs: Map containing the keyword argument names and their (value, direction, depth) tuples
+            + type: dict<str, Tuple(Object, Direction, int)>
+        - num_returns: Number of returned values
+            + type: int
+        - priority: Whether the task runs before the rest of ready tasks or not
+            + type: bool
+        - parent: Task that spawned this task or None
+            + type: TaskInstance
+        - children: Tasks spawned by this task
+            + type: List<TaskInstance>
+        - pending: Number of unfinished predecessors
+            + type: int
+        - successors: Tasks depending on this task
+            + type: List<TaskInstance>
+        - finished: Whether the task has finished or not
+            + type: bool
+        - done: Event set when the task finishes
+            + type: threading.Event
+        - result: Value returned by the task
+            + type: Object
+        - exception: Exception raised by the task or None
+            + type: Exception
+    """
+
+    # Static attribute Number of created tasks
+    _counter = 0
+
+    def __init__(self, func, args, kwargs, num_returns, priority, parent):
+        """
+        Initializes the TaskInstance internal structures
+
+        :param func: Task function
+            + type: func
+        :param args: Positional arguments as (value, direction, depth) tuples
+            + type: List<Tuple(Object, Direction, int)>
+        :param kwargs: Map containing the keyword argument names and their (value, direction, depth) tuples
+            + type: dict<str, Tuple(Object, Direction, int)>
+        :param num_returns: Number of returned values
+            + type: int
+        :param priority: Whether the task runs before the rest of ready tasks or not
+            + type: bool
+        :param parent: Task that spawned this task or None
+            + type: TaskInstance
+        """
+
+        TaskInstance._counter += 1
+        self.name = getattr(func, "__name__", "task") + "#" + str(TaskInstance._counter)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.num_returns = num_returns
+        self.priority = priority
+        self.parent = parent
+        self.children = []
+        self.pending = 0
+        self.successors = []
+        self.finished = False
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+#
+# Data Information class
+#
+
+class DataInfo(object):
+    """
+    Tracks the accesses of the submitted tasks to an object (or file) and its last version
+
+    Attributes:
+        - obj: Tracked object (keeps it alive so that its identity is not reused)
+            + type: Object
+        - writers: Last tasks writing the object (several when they are concurrent)
+            + type: List<TaskInstance>
+        - readers: Tasks reading the object since the last write
+            + type: List<TaskInstance>
+        - concurrent: Whether the last writers are concurrent or not
+            + type: bool
+        - concurrent_predecessors: Tasks the concurrent writers depend on
+            + type: List<TaskInstance>
+        - has_value: Whether a task has replaced the object by a new version or not
+            + type: bool
+        - value: New version of the object
+            + type: Object
+    """
+
+    def __init__(self, obj):
+        """
+        Initializes the DataInfo internal structures
+
+        :param obj: Tracked object
+            + type: Object
+        """
+
+        self.obj = obj
+        self.writers = []
+        self.readers = []
+        self.concurrent = False
+        self.concurrent_predecessors = []
+        self.has_value = False
+        self.value = None
+
+    def register_access(self, task, direction):
+        """
+        Registers an access of the given task and returns the tasks it depends on
+
+        :param task: Task
+            + type: TaskInstance
+        :param direction: Access direction
+            + type: Direction
+        :return predecessors: List of tasks
+            + type: List<TaskInstance>
+        """
+
+        if direction.is_write and direction.is_concurrent:
+            if not self.concurrent or len(self.readers) > 0:
+                self.concurrent_predecessors = self.writers + self.readers
+                self.writers = []
+                self.readers = []
+                self.concurrent = True
+            self.writers.append(task)
+            return self.concurrent_predecessors
+        if direction.is_write:
+            predecessors = self.writers + self.readers
+            self.writers = [task]
+            self.readers = []
+            self.concurrent = False
+            return predecessors
+        self.readers.append(task)
+        return list(self.writers)
+
+    def set_value(self, value):
+        """
+        Stores a new version of the object
+
+        :param value: New version
+            + type: Object
+        """
+
+        self.has_value = True
+        self.value = value
+
+    def clear_accesses(self):
+        """
+        Forgets the accesses of the finished tasks
+        """
+
+        self.writers = []
+        self.readers = []
+        self.concurrent = False
+        self.concurrent_predecessors = []
+
+
+#
+# Future class
+#
+
+class Future(object):
+    """
+    Represents a value returned by a task
+
+    Attributes:
+        - task: Task returning the value
+            + type: TaskInstance
+        - index: Position of the value when the task returns several values or None
+            + type: int
+    """
+
+    def __init__(self, task, index=None):
+        """
+        Initializes the Future internal structures
+
+        :param task: Task returning the value
+            + type: TaskInstance
+        :param index: Position of the value when the task returns several values (default None)
+            + type: int
+        """
+
+        self.task = task
+        self.index = index
+
+    def done(self):
+        """
+        Returns whether the task returning the value has finished or not
+
+        :return: True if the task has finished, False otherwise
+            + type: bool
+        """
+
+        return self.task.finished
+
+    def result(self, timeout=None):
+        """
+        Waits for the task and returns the value. Raises the exception of the task if it failed
+
+        :param timeout: Maximum number of seconds to wait (default no limit)
+            + type: float
+        :return: Value returned by the task
+            + type: Object
+        """
+
+        if not self.task.done.wait(timeout):
+            raise LocalRuntimeException("[ERROR] Timeout waiting for task " + self.task.name)
+        if self.task.exception is not None:
+            raise self.task.exception
+        if self.index is None:
+            return self.task.result
+        return self.task.result[self.index]
+
+    def __repr__(self):
+        return "Future(" + self.task.name + ("" if self.index is None else ", " + str(self.index)) + ")"
+
+
+#
+# Runtime management
+#
+
+# Runtime used by the task decorator and the API functions
+_runtime = None
+_runtime_lock = threading.Lock()
+
+# Modules replaced by install
+_aliases = {"pycompss.api.api": "pycompss.util.local_runtime.api",
+            "pycompss.api.task": "pycompss.util.local_runtime.task",
+            "pycompss.api.parameter": "pycompss.util.local_runtime.parameter",
+            "pycompss.api.constraint": "pycompss.util.local_runtime.constraint"}
+_replaced_modules = {}
+
+
+def get_runtime():
+    """
+    Returns the current local runtime, starting a runtime with the default number of workers if there is none
+
+    :return: Local runtime
+        + type: LocalRuntime
+    """
+
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = LocalRuntime()
+        return _runtime
+
+
+def start(num_workers=None, backend="threads"):
+    """
+    Starts a new local runtime (stopping the current one, if any)
+
+    :param num_workers: Number of workers running tasks (default the number of CPUs)
+        + type: int
+    :param backend: Execution backend: "threads" runs the tasks on the worker threads and "processes" on a pool of
+     worker processes sharing the NumPy blocks (default "threads")
+        + type: str
+    :return: Local runtime
+        + type: LocalRuntime
+    """
+
+    global _runtime
+    if backend not in ["threads", "processes"]:
+        raise LocalRuntimeException("[ERROR] Unknown backend " + str(backend))
+    stop()
+    with _runtime_lock:
+        if backend == "processes":
+            from pycompss.util.local_runtime.process_runtime import ProcessRuntime
+            _runtime = ProcessRuntime(num_workers)
+        else:
+            _runtime = LocalRuntime(num_workers)
+        return _runtime
+
+
+def stop():
+    """
+    Waits for the submitted tasks and stops the current local runtime, if any
+    """
+
+    global _runtime
+    with _runtime_lock:
+        runtime = _runtime
+        _runtime = None
+    if runtime is not None:
+        runtime.stop()
+
+
+def install(num_workers=None, backend=None):
+    """
+    Registers the local runtime modules as the PyCOMPSs API modules (pycompss.api.task, pycompss.api.api,
+    pycompss.api.parameter and pycompss.api.constraint) so that the code importing them runs on the local runtime
+
+    :param num_workers: Number of workers running tasks. Keeps the current runtime when both num_workers and backend
+     are None (default None)
+        + type: int
+    :param backend: Execution backend ("threads" or "processes"). Keeps the current runtime when both num_workers and
+     backend are None (default None)
+        + type: str
+    """
+
+    import importlib
+    import sys
+    for module_name, local_module_name in _aliases.items():
+        if module_name not in _replaced_modules:
+            _replaced_modules[module_name] = sys.modules.get(module_name)
+        sys.modules[module_name] = importlib.import_module(local_module_name)
+    if num_workers is not None or backend is not None:
+        start(num_workers, backend if backend is not None else "threads")
+
+
+def uninstall():
+    """
+    Restores the PyCOMPSs API modules replaced by install and stops the local runtime
+    """
+
+    import sys
+    for module_name, module in _replaced_modules.items():
+        if module is None:
+            sys.modules.pop(module_name, None)
+        else:
+            sys.modules[module_name] = module
+    _replaced_modules.clear()
+    stop()
+
+
+def is_installed():
+    """
+    Returns whether the PyCOMPSs API modules are currently replaced by the local runtime modules or not
+
+    :return: True if the code importing pycompss.api.api runs on the local runtime, False otherwise
+        + type: bool
+    """
+
+    import sys
+    api_module = sys.modules.get("pycompss.api.api")
+    return getattr(api_module, "__name__", None) == _aliases["pycompss.api.api"]
+
+
+#
+# Exception Class
+#
+
+class LocalRuntimeException(Exception):
+
+    def __init__(self, msg=None, nested_exception=None):
+        self.msg = msg
+        self.nested_exception = nested_exception
+
+    def __str__(self):
+        s = "Exception on LocalRuntime class.\n"
+        if self.msg is not None:
+            s = s + "Message: " + str(self.msg) + "\n"
+        if self.nested_exception is not None:
+            s = s + "Nested Exception: " + str(self.nested_exception) + "\n"
+        return s
+
+
+#
+# UNIT TESTS
+#
+
+class TestLocalRuntime(unittest.TestCase):
+
+    def setUp(self):
+        self.runtime = start(num_workers=2)
+
+    def tearDown(self):
+        stop()
+
+    def test_futures(self):
+        from pycompss.util.local_runtime.task import task
+
+        @task(returns=1)
+        def increment(value):
+            return value + 1
+
+        @task(returns=2)
+        def split(value):
+            return value, -value
+
+        value = 0
+        for _ in range(10):
+            value = increment(value)
+        self.assertTrue(isinstance(value, Future))
+        positive, negative = split(value)
+        self.assertEqual(self.runtime.wait_on(positive), 10)
+        self.assertEqual(self.runtime.wait_on([[negative], value]), [[-10], 10])
+
+    def test_inout(self):
+        import time
+        from pycompss.util.local_runtime.parameter import IN, INOUT
+        from pycompss.util.local_runtime.task import task
+
+        @task(values=INOUT)
+        def append(values, value, delay):
+            time.sleep(delay)
+            values.append(value)
+
+        @task(values=IN, returns=1)
+        def count(values):
+            return len(values)
+
+        # The writes are serialized in submission order even if the first ones take longer
+        values = []
+        append(values, 1, 0.2)
+        append(values, 2, 0.1)
+        length = count(values)
+        append(values, 3, 0)
+        self.assertEqual(self.runtime.wait_on(length), 2)
+        self.assertEqual(self.runtime.wait_on(values), [1, 2, 3])
+
+    def test_collections(self):
+        from pycompss.util.local_runtime.parameter import Type, Depth, COLLECTION_IN, COLLECTION_INOUT
+        from pycompss.util.local_runtime.task import task
+
+        @task(returns=1)
+        def create(value):
+            return [value]
+
+        @task(c={Type: COLLECTION_INOUT, Depth: 2})
+        def scale(c, factor):
+            for i in range(len(c)):
+                for j in range(len(c[i])):
+                    c[i][j] = [c[i][j][0] * factor]
+
+        @task(c={Type: COLLECTION_IN, Depth: 1}, returns=1)
+        def total(c):
+            return sum(block[0] for block in c)
+
+        matrix = [[create(2 * i + j) for j in range(2)] for i in range(2)]
+        scale([row[:] for row in matrix], 10)
+        # The next tasks and the synchronization receive the new versions of the replaced elements
+        row_total = total(matrix[1])
+        self.assertEqual(self.runtime.wait_on(row_total), 50)
+        self.assertEqual(self.runtime.wait_on(matrix), [[[0], [10]], [[20], [30]]])
+
+    def test_concurrent(self):
+        import time
+        from pycompss.util.local_runtime.parameter import CONCURRENT, IN
+        from pycompss.util.local_runtime.task import task
+
+        lock = threading.Lock()
+
+        @task(values=CONCURRENT)
+        def add(values, value):
+            time.sleep(0.1)
+            with lock:
+                values.append(value)
+
+        @task(values=IN, returns=1)
+        def snapshot(values):
+            return sorted(values)
+
+        values = []
+        start_time = time.time()
+        for value in range(2):
+            add(values, value)
+        self.assertEqual(self.runtime.wait_on(snapshot(values)), [0, 1])
+        # Both writers run at the same time
+        self.assertTrue(time.time() - start_time < 0.19)
+
+    def test_nested(self):
+        from pycompss.util.local_runtime.api import compss_barrier
+        from pycompss.util.local_runtime.parameter import CONCURRENT, INOUT
+        from pycompss.util.local_runtime.task import task
+
+        @task(block=INOUT)
+        def inner(block, value):
+            block.append(value)
+
+        @task(blocks=CONCURRENT)
+        def outer(blocks, index):
+            for value in range(3):
+                inner(blocks[index], value)
+            compss_barrier()
+
+        # Every worker runs a parent task blocked on its nested tasks
+        blocks = [[] for _ in range(4)]
+        for index in range(4):
+            outer(blocks, index)
+        compss_barrier()
+        self.assertEqual(blocks, [[0, 1, 2]] * 4)
+
+    def test_failure(self):
+        from pycompss.util.local_runtime.task import task
+
+        @task(returns=1)
+        def fail():
+            raise ValueError("Task failure")
+
+        @task(returns=1)
+        def identity(value):
+            return value
+
+        result = identity(fail())
+        self.assertRaises(ValueError, self.runtime.wait_on, result)
+        self.assertRaises(LocalRuntimeException, self.runtime.barrier)
+        # The failures are only reported once
+        self.runtime.barrier()
+
+    def test_barrier_concurrent_submission(self):
+        from pycompss.util.local_runtime.parameter import IN, INOUT
+        from pycompss.util.local_runtime.task import task
+
+        release = threading.Event()
+
+        @task(block=INOUT)
+        def write(block):
+            release.wait(10)
+            block[0] = 1.0
+
+        @task(block=IN, returns=1)
+        def read(block):
+            return block[0]
+
+        class SubmittingLock(object):
+            # Submits a task each time the main thread releases the runtime lock while there are no unfinished tasks
+            def __init__(self, runtime, callback):
+                self.lock = runtime._lock
+                self.runtime = runtime
+                self.callback = callback
+                self.main_thread = threading.current_thread()
+
+            def __enter__(self):
+                return self.lock.__enter__()
+
+            def __exit__(self, *args):
+                self.lock.__exit__(*args)
+                if self.callback is not None and threading.current_thread() is self.main_thread and \
+                        len(self.runtime._unfinished_tasks) == 0:
+                    callback, self.callback = self.callback, None
+                    callback()
+
+        # The task submitted while the barrier finishes keeps its accesses
+        block = [0.0]
+        self.runtime._lock = SubmittingLock(self.runtime, lambda: write(block))
+        self.runtime.barrier()
+        value = read(block)
+        self.assertEqual(value.task.pending, 1)
+        release.set()
+        self.assertEqual(self.runtime.wait_on(value), 1.0)
+
+    def test_install(self):
+        code = "from pycompss.api.api import compss_barrier, compss_wait_on, compss_open\n" \
+               "from pycompss.api.task import task\n" \
+               "from pycompss.api.constraint import constraint\n" \
+               "from pycompss.api.parameter import *\n" \
+               "\n" \
+               "\n" \
+               "@constraint(ComputingUnits=\"2\")\n" \
+               "@task(var2=IN, returns=1)\n" \
+               "def S1(var2):\n" \
+               "    return var2 * 2\n" \
+               "\n" \
+               "\n" \
+               "@task(c={Type: COLLECTION_INOUT, Depth: 1})\n" \
+               "def LT2(c):\n" \
+               "    for i in range(len(c)):\n" \
+               "        c[i] = S1_no_task(c[i])\n" \
+               "\n" \
+               "\n" \
+               "def S1_no_task(var2):\n" \
+               "    return var2 * 2\n" \
+               "\n" \
+               "\n" \
+               "def kernel(a, n):\n" \
+               "    for i in range(n):\n" \
+               "        a[i] = S1(a[i])\n" \
+               "    LT2(a)\n" \
+               "    compss_barrier()\n" \
+               "    return compss_wait_on(a)\n"
+        import sys
+        self.assertFalse(is_installed())
+        install()
+        try:
+            self.assertTrue(is_installed())
+            module_globals = {}
+            exec(compile(code, "<generated>", "exec"), module_globals)
+            self.assertEqual(module_globals["kernel"]([1.5, 2.5, 3.5], 3), [6.0, 10.0, 14.0])
+        finally:
+            uninstall()
+        self.assertTrue("pycompss.api.task" not in sys.modules)
+        self.assertFalse(is_installed())
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
@@ -0,0 +1,162 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+from functools import wraps
+
+
+#
+# Task decorator definition
+#
+
+class Task(object):
+    """
+    Activates with the @task decorator of the local runtime. Each call to the decorated function submits a task to
+    the local runtime and returns the futures of its results instead of running the function.
+
+    Parsed kwargs:
+        - returns: Number of returned values (an integer) or type of the returned value (default no return)
+            + type: int or type
+        - priority: Whether the task runs before the rest of ready tasks or not (default False)
+            + type: bool
+        - <parameter name>: Parameter direction (e.g. IN, INOUT or {Type: COLLECTION_IN, Depth: 2}). The
+         parameters without direction are IN parameters, except self that is INOUT
+            + type: Direction or dict
+
+    The rest of kwargs of the PyCOMPSs @task decorator are accepted and ignored
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Parses the decorator arguments
+
+        :param args: Decorator arguments
+        :param kwargs: Decorator keyword arguments
+        """
+
+        from pycompss.util.local_runtime.parameter import Direction
+
+        self.args = args
+        self.kwargs = kwargs
+
+        returns = kwargs.get("returns")
+        if returns is None or returns is False:
+            self.num_returns = 0
+        elif isinstance(returns, int) and not isinstance(returns, bool):
+            self.num_returns = returns
+        else:
+            self.num_returns = 1
+
+        self.priority = kwargs.get("priority", False)
+        self.param2definition = dict((name, definition) for name, definition in kwargs.items()
+                                     if isinstance(definition, (Direction, dict)))
+
+    def __call__(self, func):
+        """
+        Returns the function submitting the tasks
+
+        :param func: Task function
+            + type: func
+        :return task_f: Function submitting a task on each call
+            + type: func
+        """
+
+        from pycompss.util.local_runtime.parameter import get_direction, IN, INOUT
+
+        arg_names = Task._get_arg_names(func)
+        name2param = {}
+        for arg_index, arg_name in enumerate(arg_names):
+            default_definition = INOUT if arg_index == 0 and arg_name == "self" else IN
+            name2param[arg_name] = get_direction(self.param2definition.get(arg_name, default_definition))
+
+        @wraps(func)
+        def task_f(*args, **kwargs):
+            from pycompss.util.local_runtime.runtime import get_runtime
+            task_args = []
+            for arg_index, value in enumerate(args):
+                # The extra positional arguments (*args) are IN parameters
+                arg_name = arg_names[arg_index] if arg_index < len(arg_names) else None
+                direction, depth = name2param.get(arg_name, (IN, 1))
+                task_args.append((value, direction, depth))
+            task_kwargs = {}
+            for name, value in kwargs.items():
+                direction, depth = name2param.get(name, (IN, 1))
+                task_kwargs[name] = (value, direction, depth)
+            return get_runtime().submit(func, task_args, task_kwargs, self.num_returns, self.priority)
+
+        return task_f
+
+    @staticmethod
+    def _get_arg_names(func):
+        """
+        Returns the names of the arguments of the given function
+
+        :param func: Function
+            + type: func
+        :return: List of argument names
+            + type: List<str>
+        """
+
+        import inspect
+        if hasattr(inspect, "getfullargspec"):
+            return inspect.getfullargspec(func).args
+        # Python 2
+        return inspect.getargspec(func).args
+
+
+# Same name than the PyCOMPSs decorator
+task = Task
+
+
+#
+# UNIT TESTS
+#
+
+class TestTask(unittest.TestCase):
+
+    def test_parse(self):
+        from pycompss.util.local_runtime.parameter import Type, Depth, COLLECTION_INOUT, INOUT
+
+        decorator = Task(a=INOUT, b={Type: COLLECTION_INOUT, Depth: 2}, returns=list, priority=True,
+                         isModifier=False)
+        self.assertEqual(decorator.num_returns, 1)
+        self.assertTrue(decorator.priority)
+        self.assertEqual(sorted(decorator.param2definition.keys()), ["a", "b"])
+        self.assertEqual(Task(returns=3).num_returns, 3)
+        self.assertEqual(Task().num_returns, 0)
+
+    def test_method(self):
+        from pycompss.util.local_runtime.runtime import start, stop
+
+        class Counter(object):
+            def __init__(self):
+                self.value = 0
+
+            @task()
+            def increment(self, amount):
+                self.value += amount
+
+        runtime = start(num_workers=2)
+        try:
+            counter = Counter()
+            for _ in range(5):
+                counter.increment(amount=2)
+            # The object is an INOUT parameter, so the calls are serialized
+            self.assertEqual(runtime.wait_on(counter).value, 10)
+        finally:
+            stop()
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
@@ -0,0 +1,829 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import threading
+
+from pycompss.util.local_runtime.runtime import LocalRuntime, DataInfo, TaskInstance, Future
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Task Graph class
+#
+
+class TaskGraph(object):
+    """
+    Task graph of an execution: one node per task instance (and per synchronization of the master) and one edge per
+    data dependence
+
+    Attributes:
+        - name: Graph name
+            + type: str
+        - nodes: List of nodes. Each node is a dictionary with its id, type ("task" or "sync"), name (e.g. S1#3 or
+         barrier#1), function (the task function or the synchronization API call) and accesses (the label and the
+         direction of each accessed block)
+            + type: List<dict<str, Object>>
+        - edges: List of edges. Each edge is a dictionary with its source node, target node, data label and type (RAW,
+         WAR or WAW for data dependences and SYNC for the synchronizations of the master)
+            + type: List<dict<str, Object>>
+    """
+
+    # Static attribute Fill colors of the task nodes (one per task function)
+    _colors = ["lightblue", "palegreen", "lightsalmon", "khaki", "plum", "lightpink", "paleturquoise", "wheat"]
+
+    # Static attribute Styles of the edges of each type
+    _edge_styles = {"RAW": "", "WAR": ", color=blue", "WAW": ", color=red", "SYNC": ", style=dashed, color=gray"}
+
+    def __init__(self, name="task_graph"):
+        """
+        Initializes an empty task graph
+
+        :param name: Graph name (default task_graph)
+            + type: str
+        """
+
+        self.name = name
+        self.nodes = []
+        self.edges = []
+
+    def add_node(self, node_type, name, function, accesses):
+        """
+        Adds a node to the graph
+
+        :param node_type: Node type ("task" or "sync")
+            + type: str
+        :param name: Node name
+            + type: str
+        :param function: Task function or synchronization API call
+            + type: str
+        :param accesses: List of (data label, direction name) tuples
+            + type: List<Tuple(str, str)>
+        :return: Node id
+            + type: int
+        """
+
+        node_id = len(self.nodes)
+        self.nodes.append({"id": node_id, "type": node_type, "name": name, "function": function,
+                           "accesses": [{"data": data, "direction": direction} for data, direction in accesses]})
+        return node_id
+
+    def add_edge(self, source, target, data, edge_type):
+        """
+        Adds an edge to the graph
+
+        :param source: Source node id
+            + type: int
+        :param target: Target node id
+            + type: int
+        :param data: Label of the data causing the dependence (None for synchronizations)
+            + type: str
+        :param edge_type: Edge type (RAW, WAR, WAW or SYNC)
+            + type: str
+        """
+
+        self.edges.append({"source": source, "target": target, "data": data, "type": edge_type})
+
+    def get_levels(self):
+        """
+        Returns the level of each node: the tasks without predecessors are on level 1 and the rest of tasks are one
+        level below their deepest predecessor. The synchronizations are on the level of their deepest predecessor, so
+        the tasks of the same level (a wavefront) can run in parallel
+
+        :return: List containing the level of each node
+            + type: List<int>
+        """
+
+        # The edges always go from an older node to a newer one, so the node order is a topological order
+        predecessors = [[] for _ in self.nodes]
+        for edge in self.edges:
+            predecessors[edge["target"]].append(edge["source"])
+        levels = []
+        for node in self.nodes:
+            level = max([levels[p] for p in predecessors[node["id"]]] + [0])
+            levels.append(level + 1 if node["type"] == "task" else level)
+        return levels
+
+    def get_summary(self):
+        """
+        Returns the summary of the graph: number of tasks (per task function), dependences and synchronizations,
+        critical path (number of levels), number of tasks of each level, maximum width and average parallelism
+
+        :return: Map containing the summary entries
+            + type: dict<str, Object>
+        """
+
+        levels = self.get_levels()
+        task_levels = [level for node, level in zip(self.nodes, levels) if node["type"] == "task"]
+        critical_path = max(task_levels + [0])
+        widths = [0] * critical_path
+        for level in task_levels:
+            widths[level - 1] += 1
+        functions = {}
+        for node in self.nodes:
+            if node["type"] == "task":
+                functions[node["function"]] = functions.get(node["function"], 0) + 1
+        return {"tasks": len(task_levels),
+                "functions": functions,
+                "dependences": len([edge for edge in self.edges if edge["type"] != "SYNC"]),
+                "synchronizations": len(self.nodes) - len(task_levels),
+                "critical_path": critical_path,
+                "max_width": max(widths + [0]),
+                "parallelism": round(float(len(task_levels)) / critical_path, 2) if critical_path > 0 else 0.0,
+                "widths": widths}
+
+    def to_dict(self):
+        """
+        Returns the graph as a dictionary (the nodes include their level)
+
+        :return: Map containing the graph name, nodes, edges and summary
+            + type: dict<str, Object>
+        """
+
+        nodes = [dict(node, level=level) for node, level in zip(self.nodes, self.get_levels())]
+        return {"name": self.name, "nodes": nodes, "edges": self.edges, "summary": self.get_summary()}
+
+    def to_json(self):
+        """
+        Returns the graph in JSON format
+
+        :return: JSON content
+            + type: str
+        """
+
+        import json
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    def to_dot(self):
+        """
+        Returns the graph in DOT format. The tasks of the same level are drawn on the same rank, the tasks of each
+        function share a color and the WAR (blue), WAW (red) and synchronization (dashed) edges are highlighted
+
+        :return: DOT content
+            + type: str
+        """
+
+        levels = self.get_levels()
+        function2color = {}
+        lines = ["digraph \"" + self.name + "\" {", "  node [style=filled];"]
+        for node in self.nodes:
+            if node["type"] == "task":
+                if node["function"] not in function2color:
+                    function2color[node["function"]] = TaskGraph._colors[len(function2color) % len(TaskGraph._colors)]
+                attributes = "fillcolor=" + function2color[node["function"]]
+            else:
+                attributes = "shape=box, fillcolor=lightgray"
+            tooltip = "\\n".join(access["direction"] + " " + access["data"] for access in node["accesses"])
+            lines.append("  " + str(node["id"]) + " [label=\"" + node["name"] + "\", tooltip=\"" +
+                         tooltip.replace("\"", "'") + "\", " + attributes + "];")
+        for edge in self.edges:
+            label = ", label=\"" + edge["data"].replace("\"", "'") + "\"" if edge["data"] is not None else ""
+            lines.append("  " + str(edge["source"]) + " -> " + str(edge["target"]) + " [" +
+                         (label + TaskGraph._edge_styles[edge["type"]]).lstrip(", ") + "];")
+        level2nodes = {}
+        for node, level in zip(self.nodes, levels):
+            if node["type"] == "task":
+                level2nodes.setdefault(level, []).append(str(node["id"]))
+        for level in sorted(level2nodes.keys()):
+            lines.append("  { rank=same; " + "; ".join(level2nodes[level]) + "; }")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_file, output_format=None):
+        """
+        Writes the graph to the given file
+
+        :param output_file: Output file path
+            + type: str
+        :param output_format: Output format ("dot" or "json"). Guessed from the file extension when None (default
+         None)
+            + type: str
+        :raise TaskGraphException: When the format is unknown
+        """
+
+        import os
+        if output_format is None:
+            output_format = os.path.splitext(output_file)[1].lstrip(".").lower()
+            output_format = "dot" if output_format == "gv" else output_format
+        if output_format == "dot":
+            content = self.to_dot()
+        elif output_format == "json":
+            content = self.to_json()
+        else:
+            raise TaskGraphException("[ERROR] Unknown task graph format " + str(output_format))
+        with open(output_file, 'w') as f:
+            f.write(content)
+
+
+#
+# Task Graph Runtime class
+#
+
+class TaskGraphRuntime(object):
+    """
+    Runtime recording the task graph of an execution without running the tasks. It exposes the same methods than the
+    LocalRuntime (used by the API of the local runtime) and computes the dependences with the same data tracking, but
+    the tasks never run: their futures are never resolved and the synchronizations return the given objects.
+
+    The blocks are labelled with the variable of the code spawning the tasks that holds them (e.g. c[1][2]) and the
+    values returned by the tasks with the task name (e.g. S1#3)
+    """
+
+    # Static attribute Maximum depth of the lists explored to label the blocks
+    _max_label_depth = 4
+
+    def __init__(self, name="task_graph"):
+        """
+        Initializes the TaskGraphRuntime internal structures
+
+        :param name: Name of the recorded graph (default task_graph)
+            + type: str
+        """
+
+        self.graph = TaskGraph(name)
+        self._lock = threading.RLock()
+        # Map containing the registry keys and the tracking information of the data
+        self._registry = {}
+        # Map containing the registry keys and their objects (kept alive so that their ids are not reused) and labels
+        self._labels = {}
+        # Map containing the tasks and their node ids (and the reverse map)
+        self._task2node = {}
+        self._node2task = {}
+        # Written data of each node (to compute the dependence types)
+        self._writes = set()
+        # Predecessors of each node (to mark the tasks finished by a synchronization)
+        self._predecessors = {}
+        # Unfinished nodes and nodes that have successors
+        self._unfinished = set()
+        self._has_successors = set()
+        self._last_sync = None
+        # Number of instances of each task function and synchronization
+        self._instances = {}
+        # Signature of the variables of each frame the last time it was explored
+        self._frame_signatures = {}
+        self._anonymous_data = 0
+
+    #
+    # Public methods (same than LocalRuntime)
+    #
+
+    def submit(self, func, args, kwargs, num_returns=0, priority=False):
+        """
+        Records a task and its dependences
+
+        :param func: Task function
+            + type: func
+        :param args: Positional arguments as (value, direction, depth) tuples
+            + type: List<Tuple(Object, Direction, int)>
+        :param kwargs: Map containing the keyword argument names and their (value, direction, depth) tuples
+            + type: dict<str, Tuple(Object, Direction, int)>
+        :param num_returns: Number of values returned by the task (default 0)
+            + type: int
+        :param priority: Whether the task runs before the rest of ready tasks or not (default False)
+            + type: bool
+        :return: None, a Future or a tuple of num_returns Futures (never resolved)
+            + type: None, Future or Tuple<Future>
+        """
+
+        from pycompss.util.local_runtime.parameter import OUT
+
+        with self._lock:
+            task = TaskInstance(func, args, kwargs, num_returns, priority, None)
+            function = getattr(func, "__name__", "task")
+            params = list(args) + list(kwargs.values())
+
+            # Label the accessed data
+            self._scan_frames()
+            accesses = []
+            for value, direction, depth in params:
+                for key, obj in LocalRuntime._get_accessed_data(value, direction, depth):
+                    accesses.append((key, obj, direction))
+            node_id = self.graph.add_node("task", self._get_instance_name(function), function,
+                                          [(self._get_label(key, obj), direction.name)
+                                           for key, obj, direction in accesses])
+            self._task2node[task] = node_id
+            self._node2task[node_id] = task
+            self._predecessors[node_id] = set()
+            self._unfinished.add(node_id)
+
+            # Register the accesses and add one edge per dependence
+            dependences = set()
+            for key, obj, direction in accesses:
+                info = self._registry.get(key)
+                if info is None or info.obj is not obj:
+                    info = DataInfo(obj)
+                    self._registry[key] = info
+                for predecessor in info.register_access(task, direction):
+                    if predecessor is task or predecessor.finished or (predecessor, key) in dependences:
+                        continue
+                    dependences.add((predecessor, key))
+                    predecessor_id = self._task2node[predecessor]
+                    if (predecessor_id, key) in self._writes:
+                        edge_type = "RAW" if direction.is_read else "WAW"
+                    else:
+                        edge_type = "WAR"
+                    self._add_edge(predecessor_id, node_id, self._get_label(key, obj), edge_type)
+                if direction.is_write:
+                    self._writes.add((node_id, key))
+
+            # The master cannot spawn the task before its last synchronization
+            if self._last_sync is not None and all(p < self._last_sync for p in self._predecessors[node_id]):
+                self._add_edge(self._last_sync, node_id, None, "SYNC")
+
+            # Create the futures (written by the task)
+            futures = [Future(task, index if num_returns > 1 else None) for index in range(num_returns)]
+            for index, future in enumerate(futures):
+                info = DataInfo(future)
+                info.register_access(task, OUT)
+                self._registry[id(future)] = info
+                label = self.graph.nodes[node_id]["name"] + ("[" + str(index) + "]" if num_returns > 1 else "")
+                self._labels[id(future)] = (future, label)
+                self._writes.add((node_id, id(future)))
+
+        if num_returns == 0:
+            return None
+        if num_returns == 1:
+            return futures[0]
+        return tuple(futures)
+
+    def wait_on(self, obj):
+        """
+        Records a synchronization on the given object (and on the elements of lists) and returns it
+
+        :param obj: Object, future or list
+            + type: Object
+        :return: The given object
+            + type: Object
+        """
+
+        with self._lock:
+            tasks = []
+            for key, element in self._get_synchronized_data(obj, 0):
+                info = self._registry.get(key)
+                if info is not None and info.obj is element:
+                    tasks.extend(info.writers + info.readers)
+            self._synchronize("wait_on", [self._task2node[task] for task in tasks if not task.finished],
+                              [(self._get_label(id(obj), obj), "SYNC")])
+        return obj
+
+    def open(self, file_name, mode='r'):
+        """
+        Records a synchronization on the given file and opens it
+
+        :param file_name: File path
+            + type: str
+        :param mode: Open mode (default 'r')
+            + type: str
+        :return: File object
+            + type: file
+        """
+
+        with self._lock:
+            info = self._registry.get(("file", file_name))
+            tasks = []
+            if info is not None:
+                tasks = info.writers + info.readers if mode not in ['r', 'rb'] else list(info.writers)
+            self._synchronize("compss_open", [self._task2node[task] for task in tasks if not task.finished],
+                              [(file_name, "SYNC")])
+        return open(file_name, mode)
+
+    def barrier(self):
+        """
+        Records a synchronization on all the recorded tasks
+        """
+
+        with self._lock:
+            # Waiting for the tasks without successors implies waiting for the rest
+            self._synchronize("barrier", sorted(self._unfinished - self._has_successors), [])
+            for info in self._registry.values():
+                info.clear_accesses()
+
+    def stop(self):
+        """
+        Stops the runtime (there is nothing to wait for)
+        """
+
+        pass
+
+    #
+    # Internal methods
+    #
+
+    def _add_edge(self, source, target, data, edge_type):
+        """
+        Adds an edge to the graph and updates the predecessors of the target
+
+        :param source: Source node id
+            + type: int
+        :param target: Target node id
+            + type: int
+        :param data: Data label
+            + type: str
+        :param edge_type: Edge type
+            + type: str
+        """
+
+        self.graph.add_edge(source, target, data, edge_type)
+        self._predecessors[target].add(source)
+        self._has_successors.add(source)
+
+    def _synchronize(self, function, node_ids, accesses):
+        """
+        Adds a synchronization node waiting for the given nodes and marks them (and their predecessors) as finished.
+        Does nothing when there are no nodes to wait for
+
+        :param function: Synchronization API call
+            + type: str
+        :param node_ids: Nodes waited by the synchronization
+            + type: List<int>
+        :param accesses: List of (data label, direction name) tuples
+            + type: List<Tuple(str, str)>
+        """
+
+        node_ids = sorted(set(node_ids))
+        if len(node_ids) == 0:
+            return
+        sync_id = self.graph.add_node("sync", self._get_instance_name(function), function, accesses)
+        self._predecessors[sync_id] = set()
+        for node_id in node_ids:
+            self._add_edge(node_id, sync_id, None, "SYNC")
+        self._last_sync = sync_id
+
+        pending = list(node_ids)
+        while len(pending) > 0:
+            node_id = pending.pop()
+            if node_id in self._unfinished:
+                self._unfinished.discard(node_id)
+                self._node2task[node_id].finished = True
+                pending.extend(self._predecessors[node_id])
+
+    def _get_instance_name(self, function):
+        """
+        Returns the name of a new instance of the given task function or synchronization (e.g. S1#3)
+
+        :param function: Task function or synchronization API call
+            + type: str
+        :return: Instance name
+            + type: str
+        """
+
+        self._instances[function] = self._instances.get(function, 0) + 1
+        return function + "#" + str(self._instances[function])
+
+    def _get_synchronized_data(self, obj, depth):
+        """
+        Returns the registry keys of the given object and of the elements of lists (recursively)
+
+        :param obj: Object, future or list
+            + type: Object
+        :param depth: Current list depth
+            + type: int
+        :return: List of registry keys and their objects
+            + type: List<Tuple(int, Object)>
+        """
+
+        data = [(id(obj), obj)]
+        if isinstance(obj, list) and depth < TaskGraphRuntime._max_label_depth:
+            for element in obj:
+                data.extend(self._get_synchronized_data(element, depth + 1))
+        return data
+
+    def _get_label(self, key, obj):
+        """
+        Returns the label of the given data. The data not found in the variables of the code spawning the tasks get
+        the name of their type and a sequence number
+
+        :param key: Registry key
+            + type: Object
+        :param obj: Object (None for files)
+            + type: Object
+        :return: Data label
+            + type: str
+        """
+
+        if isinstance(key, tuple):
+            # File
+            return key[1]
+        entry = self._labels.get(key)
+        if entry is None or entry[0] is not obj:
+            self._anonymous_data += 1
+            entry = (obj, type(obj).__name__ + "#" + str(self._anonymous_data))
+            self._labels[key] = entry
+        return entry[1]
+
+    def _scan_frames(self):
+        """
+        Labels the data held by the variables of the code spawning the tasks (the first frame outside the local
+        runtime). The frame is only explored when the objects bound to its variables change
+        """
+
+        import sys
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_globals.get("__name__", "").startswith("pycompss.util.local_runtime"):
+            frame = frame.f_back
+        if frame is None:
+            return
+
+        variables = dict(frame.f_locals)
+        signature = sorted((name, id(value)) for name, value in variables.items())
+        if self._frame_signatures.get(id(frame.f_code)) == signature:
+            return
+        self._frame_signatures[id(frame.f_code)] = signature
+        for name, value in variables.items():
+            self._label_data(value, name, 0)
+
+    def _label_data(self, obj, label, depth):
+        """
+        Labels the given object (and the elements of lists, recursively) when it has no label
+
+        :param obj: Object
+            + type: Object
+        :param label: Label
+            + type: str
+        :param depth: Current list depth
+            + type: int
+        """
+
+        if isinstance(obj, LocalRuntime._immutable_types) or id(obj) in self._labels:
+            return
+        self._labels[id(obj)] = (obj, label)
+        if isinstance(obj, list) and depth < TaskGraphRuntime._max_label_depth:
+            for index, element in enumerate(obj):
+                self._label_data(element, label + "[" + str(index) + "]", depth + 1)
+
+
+#
+# Task graph construction
+#
+
+# Lock serializing the recordings (the recorder replaces the current runtime while the code runs)
+_record_lock = threading.Lock()
+
+def build_task_graph(source_file, func_name=None, args=None, kwargs=None):
+    """
+    Records the task graph of the given (generated) code without running the tasks. The PyCOMPSs API modules are
+    replaced by the ones of the local runtime while the code runs, so the code does not need COMPSs
+
+    :param source_file: Python file containing the code that spawns the tasks (e.g. a *_autogen.py file)
+        + type: str
+    :param func_name: Name of the function of the file to call. When None, the file runs as a script and the graph
+     recorded until the end of the script (or until the script fails using the results of the tasks) is returned
+     (default None)
+        + type: str
+    :param args: Positional arguments of the function or command line arguments of the script (default None)
+        + type: List<Object>
+    :param kwargs: Keyword arguments of the function (default None)
+        + type: dict<str, Object>
+    :return: Task graph
+        + type: TaskGraph
+    :raise TaskGraphException: When the function does not exist or the code fails
+    """
+
+    import os
+
+    args = list(args) if args is not None else []
+    kwargs = kwargs if kwargs is not None else {}
+    graph_name = func_name if func_name is not None else os.path.splitext(os.path.basename(source_file))[0]
+    recorder = TaskGraphRuntime(graph_name)
+
+    with _record_lock:
+        return _record(recorder, source_file, func_name, args, kwargs)
+
+
+def _record(recorder, source_file, func_name, args, kwargs):
+    """
+    Runs the given code with the given recorder as current runtime. Must be called with the recording lock held
+
+    :param recorder: Recording runtime
+        + type: TaskGraphRuntime
+    :param source_file: Python file containing the code that spawns the tasks
+        + type: str
+    :param func_name: Name of the function of the file to call or None to run the file as a script
+        + type: str
+    :param args: Positional arguments of the function or command line arguments of the script
+        + type: List<Object>
+    :param kwargs: Keyword arguments of the function
+        + type: dict<str, Object>
+    :return: Task graph
+        + type: TaskGraph
+    :raise TaskGraphException: When the function does not exist or the code fails
+    """
+
+    import os
+    import sys
+    from pycompss.util.local_runtime import runtime as local_runtime
+
+    # Install the local runtime modules with the recorder as current runtime
+    installed = len(local_runtime._replaced_modules) > 0
+    with local_runtime._runtime_lock:
+        previous_runtime = local_runtime._runtime
+        local_runtime._runtime = recorder
+    if not installed:
+        local_runtime.install()
+    source_dir = os.path.dirname(os.path.abspath(source_file))
+    sys.path.insert(0, source_dir)
+    try:
+        if func_name is None:
+            import runpy
+            saved_argv = sys.argv
+            sys.argv = [source_file] + [str(arg) for arg in args]
+            try:
+                runpy.run_path(source_file, run_name="__main__")
+            except Exception as e:
+                # The code using the task results (e.g. the result checks) cannot run without running the tasks
+                if len(recorder.graph.nodes) == 0:
+                    raise
+                logger.warning("[TaskGraph] The script failed after recording " + str(len(recorder.graph.nodes)) +
+                               " nodes, keeping the graph recorded until the failure: " + str(e))
+            finally:
+                sys.argv = saved_argv
+        else:
+            # Keep a reference to the module while the function runs (Python 2 clears the globals of the modules
+            # when they are garbage collected)
+            module = _load_module(source_file)
+            func = getattr(module, func_name, None)
+            if func is None:
+                raise TaskGraphException("[ERROR] Cannot find function " + str(func_name) + " in " + str(source_file))
+            func(*args, **kwargs)
+    except TaskGraphException:
+        raise
+    except Exception as e:
+        raise TaskGraphException("[ERROR] Cannot record the task graph of " + str(source_file), e)
+    finally:
+        sys.path.remove(source_dir)
+        if not installed:
+            # Stops the recorder
+            local_runtime.uninstall()
+        with local_runtime._runtime_lock:
+            local_runtime._runtime = previous_runtime
+
+    if __debug__:
+        logger.debug("[TaskGraph] Recorded task graph " + recorder.graph.name + ": " +
+                     str(recorder.graph.get_summary()))
+    return recorder.graph
+
+
+def _load_module(source_file):
+    """
+    Loads a fresh copy of the given Python file as a module (without registering it)
+
+    :param source_file: Python file
+        + type: str
+    :return: Module
+        + type: module
+    """
+
+    import os
+    import types
+    module_name = "_task_graph_" + os.path.splitext(os.path.basename(source_file))[0].replace("-", "_")
+    module = types.ModuleType(module_name)
+    module.__file__ = source_file
+    with open(source_file, 'r') as f:
+        code = compile(f.read(), source_file, "exec")
+    exec(code, module.__dict__)
+    return module
+
+
+#
+# Exception Class
+#
+
+class TaskGraphException(Exception):
+
+    def __init__(self, msg=None, nested_exception=None):
+        self.msg = msg
+        self.nested_exception = nested_exception
+
+    def __str__(self):
+        s = "Exception on TaskGraph class.\n"
+        if self.msg is not None:
+            s = s + "Message: " + str(self.msg) + "\n"
+        if self.nested_exception is not None:
+            s = s + "Nested Exception: " + str(self.nested_exception) + "\n"
+        return s
+
+
+#
+# UNIT TESTS
+#
+
+class TestTaskGraph(unittest.TestCase):
+
+    _generated_code = "from pycompss.api.api import compss_barrier, compss_wait_on\n" \
+                      "from pycompss.api.task import task\n" \
+                      "from pycompss.api.parameter import *\n" \
+                      "\n" \
+                      "\n" \
+                      "@task(var1=INOUT)\n" \
+                      "def S1(var1, var2):\n" \
+                      "    var1.append(var2)\n" \
+                      "\n" \
+                      "\n" \
+                      "@task(c={Type: COLLECTION_IN, Depth: 2}, returns=1)\n" \
+                      "def S2(c):\n" \
+                      "    return len(c)\n" \
+                      "\n" \
+                      "\n" \
+                      "def kernel(n):\n" \
+                      "    a = [[[] for _ in range(n)] for _ in range(2)]\n" \
+                      "    for t1 in range(n):\n" \
+                      "        S1(a[0][t1], a[1][t1])\n" \
+                      "    for t1 in range(n):\n" \
+                      "        S1(a[1][t1], t1)\n" \
+                      "    total = S2(a)\n" \
+                      "    compss_barrier()\n" \
+                      "    for t1 in range(n):\n" \
+                      "        S1(a[0][t1], total)\n" \
+                      "    return compss_wait_on(a)\n" \
+                      "\n" \
+                      "\n" \
+                      "if __name__ == '__main__':\n" \
+                      "    import sys\n" \
+                      "    kernel(int(sys.argv[1]))\n"
+
+    def setUp(self):
+        import os
+        import tempfile
+        self.work_dir = tempfile.mkdtemp()
+        self.source_file = os.path.join(self.work_dir, "kernel_autogen.py")
+        with open(self.source_file, 'w') as f:
+            f.write(TestTaskGraph._generated_code)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.work_dir)
+
+    def test_function(self):
+        graph = build_task_graph(self.source_file, "kernel", [3])
+
+        summary = graph.get_summary()
+        self.assertEqual(summary["tasks"], 10)
+        self.assertEqual(summary["functions"], {"S1": 9, "S2": 1})
+        # 3 WAR dependences between the first loops and 6 RAW dependences of S2
+        self.assertEqual(summary["dependences"], 9)
+        self.assertEqual(summary["synchronizations"], 2)
+        self.assertEqual(summary["widths"], [3, 3, 1, 3])
+        self.assertEqual(summary["critical_path"], 4)
+
+        edge_types = [edge["type"] for edge in graph.edges]
+        self.assertEqual(edge_types.count("WAR"), 3)
+        self.assertEqual(edge_types.count("RAW"), 6)
+        self.assertTrue({"source": 0, "target": 3, "data": "a[1][0]", "type": "WAR"} in graph.edges)
+        self.assertEqual(graph.nodes[0]["accesses"], [{"data": "a[0][0]", "direction": "INOUT"},
+                                                      {"data": "a[1][0]", "direction": "IN"}])
+        # The tasks after the barrier only depend on it and the final synchronization waits for them
+        self.assertEqual(graph.nodes[7]["name"], "barrier#1")
+        self.assertEqual([edge["source"] for edge in graph.edges if edge["target"] == 8], [7])
+        self.assertEqual(graph.nodes[8]["accesses"][1]["data"], "S2#1")
+        self.assertEqual(sorted(edge["source"] for edge in graph.edges if edge["target"] == 11), [8, 9, 10])
+
+        # The real runtime is restored
+        from pycompss.util.local_runtime.runtime import get_runtime, stop
+        self.assertTrue(isinstance(get_runtime(), LocalRuntime))
+        stop()
+
+    def test_script_and_formats(self):
+        import os
+        import json
+
+        graph = build_task_graph(self.source_file, args=["2"])
+        self.assertEqual(graph.name, "kernel_autogen")
+        self.assertEqual(graph.get_summary()["tasks"], 7)
+
+        json_file = os.path.join(self.work_dir, "graph.json")
+        graph.write(json_file)
+        with open(json_file, 'r') as f:
+            content = json.load(f)
+        self.assertEqual(len(content["nodes"]), 9)
+        self.assertEqual([node["level"] for node in content["nodes"]][:5], [1, 1, 2, 2, 3])
+
+        dot_file = os.path.join(self.work_dir, "graph.dot")
+        graph.write(dot_file)
+        with open(dot_file, 'r') as f:
+            content = f.read()
+        self.assertTrue(content.startswith("digraph \"kernel_autogen\" {"))
+        self.assertEqual(content.count(" -> "), len(graph.edges))
+        self.assertTrue("{ rank=same; 0; 1; }" in content)
+        self.assertRaises(TaskGraphException, graph.write, os.path.join(self.work_dir, "graph.txt"))
+
+        self.assertRaises(TaskGraphException, build_task_graph, self.source_file, "missing")
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
@@ -67,31 +67,53 @@ class CodeReplacer(object):
         :raise CodeReplacerException:
         """
 
+        return self.replace_all([(self.func, new_code)], keep_generated_files)[0]
+
+    def replace_all(self, funcs2new_codes, keep_generated_files=False):
+        """
+        Replaces the code of several functions of the original file by the content of their new code files in a
+        single rewrite of the file and loads the new module once. Cleans all the files if an internal error is raised
+
+        :param funcs2new_codes: List of tuples containing a function defined in the original file and the file path
+         containing its new code
+            + type: List<Tuple(func, str)>
+        :param keep_generated_files: Flag to keep intermediate files
+            + type: bool
+        :return: List of pointers to the new functions (in the same order than the given functions)
+            + type: List<func>
+        :raise CodeReplacerException:
+        """
+
         if __debug__:
-            logger.debug("[code_replacer] Replacing code of " + str(self.func) + " by code inside " + str(new_code))
+            for func, new_code in funcs2new_codes:
+                logger.debug("[code_replacer] Replacing code of " + str(func) + " by code inside " + str(new_code))
 
         # Wrap the internal replace method to catch exceptions and restore user code
         try:
-            new_func = self._replace(new_code)
+            new_funcs = self._replace(funcs2new_codes)
         except Exception as e:
             if keep_generated_files:
                 self.restore()
             else:
                 self.clean()
-            raise CodeReplacerException("[ERROR] Cannot replace func " + str(self.func), e)
+            func_names = ", ".join(str(func) for func, _ in funcs2new_codes)
+            raise CodeReplacerException("[ERROR] Cannot replace func " + func_names, e)
 
         # Finish
         if __debug__:
-            logger.debug("[code_replacer] New function: " + str(new_func))
-        return new_func
+            logger.debug("[code_replacer] New functions: " + str(new_funcs))
+        return new_funcs
 
-    def _replace(self, new_code):
+    def _replace(self, funcs2new_codes):
         """
-        Replaces the func code by the content of new_code and cleans all the files if an
-        internal error is raised
-
-        :param new_code: File path containing the new code
-        :return: Pointer to the new function
+        Replaces the code of the given functions by the content of their new code files and cleans all the files if
+        an internal error is raised
+
+        :param funcs2new_codes: List of tuples containing a function defined in the original file and the file path
+         containing its new code
+            + type: List<Tuple(func, str)>
+        :return: List of pointers to the new functions
+            + type: List<func>
         :raise CodeReplacerException:
         """
 
@@ -102,25 +124,27 @@ class CodeReplacer(object):
         except Exception as e:
             raise CodeReplacerException("[ERROR] Cannot load original code from file", e)
 
-        # Retrieve function content
-        try:
-            import inspect
-            func_content = inspect.getsource(self.func)
-        except Exception as e:
-            raise CodeReplacerException("[ERROR] Cannot retrieve function content", e)
+        new_content = original_content
+        for func, new_code in funcs2new_codes:
+            # Retrieve function content
+            try:
+                import inspect
+                func_content = inspect.getsource(func)
+            except Exception as e:
+                raise CodeReplacerException("[ERROR] Cannot retrieve function content", e)
 
-        # Retrieve new code
-        try:
-            with open(new_code, 'r') as f:
-                new_content = f.read()
-        except Exception as e:
-            raise CodeReplacerException("[ERROR] Cannot retrieve new content", e)
+            # Retrieve new code
+            try:
+                with open(new_code, 'r') as f:
+                    new_func_content = f.read()
+            except Exception as e:
+                raise CodeReplacerException("[ERROR] Cannot retrieve new content", e)
 
-        # Replace function content by new code in original content
-        try:
-            new_content = original_content.replace(func_content, new_content)
-        except Exception as e:
-            raise CodeReplacerException("[ERROR] Cannot generate new content", e)
+            # Replace function content by new code in original content
+            try:
+                new_content = new_content.replace(func_content, new_func_content)
+            except Exception as e:
+                raise CodeReplacerException("[ERROR] Cannot generate new content", e)
 
         # Backup user file
         try:
@@ -157,21 +181,26 @@ class CodeReplacer(object):
             except Exception as e:
                 raise CodeReplacerException("[ERROR] Cannot erase original pyc file: " + str(self.compiled_file), e)
 
-        # Load new function from new file
+        # Load new functions from new file (the module is imported only once)
         # Similar to: from new_module import func.__name__ as new_func
         new_module = os.path.splitext(os.path.basename(self.original_file))[0]
         if __debug__:
-            logger.debug("[code_replacer] Import module " + str(self.func.__name__) + " from " + str(new_module))
+            logger.debug("[code_replacer] Import module " + str(new_module))
         try:
             import importlib
-            new_func = getattr(importlib.import_module(new_module), self.func.__name__)
+            module = importlib.import_module(new_module)
         except Exception as e:
-            raise CodeReplacerException(
-                "[ERROR] Cannot load new function and module " + str(self.func.__name__) + " from " + str(new_module),
-                e)
+            raise CodeReplacerException("[ERROR] Cannot load new module " + str(new_module), e)
+        new_funcs = []
+        for func, _ in funcs2new_codes:
+            try:
+                new_funcs.append(getattr(module, func.__name__))
+            except Exception as e:
+                raise CodeReplacerException(
+                    "[ERROR] Cannot load new function " + str(func.__name__) + " from " + str(new_module), e)
 
-        # Return the new function
-        return new_func
+        # Return the new functions
+        return new_funcs
 
     def restore(self):
         """
@@ -270,6 +299,47 @@ class TestCodeReplacer(unittest.TestCase):
             if cr is not None:
                 cr.clean()
 
+    def test_code_replacer_all(self):
+        # Insert function file into PYTHONPATH
+        import os
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        tests_path = dir_path + "/tests"
+        import sys
+        sys.path.insert(0, tests_path)
+
+        # Import functions to replace
+        from tests.original import test_func as f
+        from tests.original import unmodified_footer as g
+        import inspect
+        user_file = inspect.getfile(f)
+
+        # Import new code
+        file_new_code = tests_path + "/new.py"
+        file_new_footer = tests_path + "/new_footer.py"
+        cr = None
+        try:
+            # Perform replace of both functions in a single pass
+            cr = CodeReplacer(f)
+            new_f, new_g = cr.replace_all([(f, file_new_code), (g, file_new_footer)])
+
+            # Check functions have been reloaded
+            self.assertNotEqual(f, new_f)
+            self.assertNotEqual(g, new_g)
+
+            # Check final user file content
+            expected_file = tests_path + "/expected_all.python"
+            with open(expected_file, 'r') as f:
+                expected_content = f.read()
+            with open(user_file, 'r') as f:
+                user_content = f.read()
+            self.assertEqual(user_content, expected_content)
+        except Exception:
+            raise
+        finally:
+            # Clean intermediate files
+            if cr is not None:
+                cr.clean()
+
 
 #
 # MAIN FOR UNIT TEST
@@ -1,2 +1,2 @@
 # For * imports
-__all__ = ['original', 'new']
+__all__ = ['original', 'new', 'new_footer']
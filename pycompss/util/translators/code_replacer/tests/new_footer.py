@@ -0,0 +1,4 @@
+def unmodified_footer():
+    # Start of CLooG code
+    print("Generated New footer")
+    # End of CLooG code
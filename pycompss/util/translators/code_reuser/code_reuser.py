@@ -76,27 +76,46 @@ class CodeReuser(object):
         :raise CodeReuserException:
         """
 
+        return self.reuse_all([self.func])[0]
+
+    def reuse_all(self, funcs):
+        """
+        Replaces the code of several functions of the original file by the code previously stored in the autogen file.
+        The autogen module is loaded only once
+
+        :param funcs: List of functions defined in the original file
+            + type: List<func>
+        :return: List of pointers to the new functions (in the same order than the given functions)
+            + type: List<func>
+        :raise CodeReuserException:
+        """
+
         if __debug__:
-            logger.debug(
-                "[code_reuser] Reusing code of " + str(self.func) + " by code in file " + str(self.autogen_file))
+            for func in funcs:
+                logger.debug(
+                    "[code_reuser] Reusing code of " + str(func) + " by code in file " + str(self.autogen_file))
 
         # Wrap the internal replace method to catch exceptions and restore user code
         try:
-            new_func = self._reuse()
+            new_funcs = self._reuse(funcs)
         except Exception as e:
             self.restore()
-            raise CodeReuserException("[ERROR] Cannot replace func " + str(self.func), e)
+            func_names = ", ".join(str(func) for func in funcs)
+            raise CodeReuserException("[ERROR] Cannot replace func " + func_names, e)
 
         # Finish
         if __debug__:
-            logger.debug("[code_reuser] New function: " + str(new_func))
-        return new_func
+            logger.debug("[code_reuser] New functions: " + str(new_funcs))
+        return new_funcs
 
-    def _reuse(self):
+    def _reuse(self, funcs):
         """
-        Internal method to replace the func code by the code previously stored in the autogen file
+        Internal method to replace the code of the given functions by the code previously stored in the autogen file
 
-        :return: Poiunter to the new function
+        :param funcs: List of functions defined in the original file
+            + type: List<func>
+        :return: List of pointers to the new functions
+            + type: List<func>
         :raise CodeReuserException:
         """
 
@@ -116,22 +135,27 @@ class CodeReuser(object):
         except Exception as e:
             raise CodeReuserException("[ERROR] Cannot replace original file", e)
 
-        # Load new function from new file
+        # Load new functions from new file (the module is imported only once)
         # Similar to: from new_module import func.__name__ as new_func
         import os
         new_module = os.path.splitext(os.path.basename(self.original_file))[0]
         if __debug__:
-            logger.debug("[code_reuser] Import module " + str(self.func.__name__) + " from " + str(new_module))
+            logger.debug("[code_reuser] Import module " + str(new_module))
         try:
             import importlib
-            new_func = getattr(importlib.import_module(new_module), self.func.__name__)
+            module = importlib.import_module(new_module)
         except Exception as e:
-            raise CodeReuserException(
-                "[ERROR] Cannot load new function and module " + str(self.func.__name__) + " from " + str(new_module),
-                e)
-
-        # Return the new function
-        return new_func
+            raise CodeReuserException("[ERROR] Cannot load new module " + str(new_module), e)
+        new_funcs = []
+        for func in funcs:
+            try:
+                new_funcs.append(getattr(module, func.__name__))
+            except Exception as e:
+                raise CodeReuserException(
+                    "[ERROR] Cannot load new function " + str(func.__name__) + " from " + str(new_module), e)
+
+        # Return the new functions
+        return new_funcs
 
     def restore(self):
         """
@@ -9,7 +9,6 @@ from __future__ import print_function
 import logging
 import unittest
 import ast
-import islpy as isl
 
 #
 # Logger definition
@@ -23,9 +22,248 @@ logger = logging.getLogger("pycompss.api.autoparallel")
 #
 
 class Calculator(object):
+    """
+    Computes the bounds of the data accessed by the taskified loops.
+
+    Attributes:
+        - _lex_bounds_cache: Static map containing the canonical representation of the already solved loop bounds and
+         accesses and their global lexmin and lexmax expressions
+            + type: dict<Tuple, Tuple(dict, dict)>
+    """
+
+    # Static attribute Cache of computed lex bounds
+    _lex_bounds_cache = {}
 
     @staticmethod
     def compute_lex_bounds(loops_info, subscript_accesses_info):
+        """
+        Computes the lexmin and lexmax of a given set of accesses considering the given bounds. The results are cached
+        so that the loops with the same bounds and accesses (up to the names of the loop indexes) are only solved once
+
+        :param loops_info: Information about loop bounds and indexes
+        :param subscript_accesses_info: Map between subscript names and all its access expressions
+        :return: Two maps of the form Map<String, List<List<AST>> containing the global lexmin and lexmax expressions
+        for all the dimensions of each subscript
+        """
+
+        key = Calculator._get_canonical_key(loops_info, subscript_accesses_info)
+        if key in Calculator._lex_bounds_cache:
+            if __debug__:
+                logger.debug("[Calculator] Reusing cached lex bounds")
+        else:
+            # Rectangular domains are solved with interval arithmetic, the rest of domains with ISL
+            lex_bounds = Calculator._compute_box_lex_bounds(loops_info, subscript_accesses_info)
+            if lex_bounds is None:
+                lex_bounds = Calculator._compute_lex_bounds(loops_info, subscript_accesses_info)
+            Calculator._lex_bounds_cache[key] = lex_bounds
+
+        # Return copies because the callers may modify the returned expressions
+        import copy
+        return copy.deepcopy(Calculator._lex_bounds_cache[key])
+
+    @staticmethod
+    def clear_cache():
+        """
+        Erases all the cached lex bounds
+        """
+
+        Calculator._lex_bounds_cache.clear()
+
+    @staticmethod
+    def _get_canonical_key(loops_info, subscript_accesses_info):
+        """
+        Builds a hashable representation of the given loop bounds and accesses. The loop indexes are renamed by their
+        position because the resulting bounds only depend on the parameters
+
+        :param loops_info: Information about loop bounds and indexes
+        :param subscript_accesses_info: Map between subscript names and all its access expressions
+        :return: Tuple representing the loop bounds and the accesses
+        """
+
+        import copy
+        loop_ind2canonical = dict((loop_ind.id, "__loop" + str(index)) for index, loop_ind in
+                                  enumerate(loops_info.keys()))
+        renamer = _RenameVariables(loop_ind2canonical)
+
+        loops_key = tuple(ast.dump(renamer.visit(copy.deepcopy(loop_bounds))) for loop_bounds in loops_info.values())
+        accesses_key = tuple((subscript_name,
+                              tuple(tuple(ast.dump(renamer.visit(copy.deepcopy(dim))) for dim in access)
+                                    for access in subscript_accesses))
+                             for subscript_name, subscript_accesses in sorted(subscript_accesses_info.items()))
+        return loops_key, accesses_key
+
+    @staticmethod
+    def _compute_box_lex_bounds(loops_info, subscript_accesses_info):
+        """
+        Computes the lexmin and lexmax of a given set of accesses with interval arithmetic. Only rectangular domains
+        (the loop bounds do not depend on the loop indexes) and accesses that are affine on the loop indexes with unit
+        coefficients are supported. The minimum (maximum) of each dimension is obtained by replacing each loop index by
+        its first (last) value, the maximum is returned as an exclusive bound (plus one) and the global bounds are the
+        minimum (maximum) of the bounds of all the accesses
+
+        :param loops_info: Information about loop bounds and indexes
+        :param subscript_accesses_info: Map between subscript names and all its access expressions
+        :return: Two maps of the form Map<String, List<List<AST>> containing the global lexmin and lexmax expressions
+        for all the dimensions of each subscript or None if the loops or the accesses are not supported
+        """
+
+        # Check that the domain is rectangular
+        loop_ind2bounds = dict((loop_ind.id, loop_bounds.args) for loop_ind, loop_bounds in loops_info.items())
+        for bounds in loop_ind2bounds.values():
+            if len(bounds) != 2:
+                return None
+            for bound in bounds:
+                for node in ast.walk(bound):
+                    if isinstance(node, ast.Name) and node.id in loop_ind2bounds:
+                        return None
+
+        # Compute the bounds of each dimension of each access
+        subscript2globlexmin = {}
+        subscript2globlexmax = {}
+        for subscript_name, subscript_accesses in subscript_accesses_info.items():
+            num_dims = len(subscript_accesses[0])
+            dim_mins = [[] for _ in range(num_dims)]
+            dim_maxs = [[] for _ in range(num_dims)]
+            for access in subscript_accesses:
+                if len(access) != num_dims:
+                    return None
+                for dim_id, dim_access_ast in enumerate(access):
+                    # Python 3.9+ does not wrap the subscript indexes
+                    if isinstance(dim_access_ast, ast.Index):
+                        dim_access_ast = dim_access_ast.value
+                    coefs = Calculator._get_loop_coefficients(dim_access_ast, loop_ind2bounds)
+                    if coefs is None or any(coef != 1 for coef in coefs.values()):
+                        return None
+                    # The loop upper bounds are exclusive
+                    var2min = dict((loop_ind, loop_ind2bounds[loop_ind][0]) for loop_ind in coefs.keys())
+                    var2max = dict((loop_ind, ast.BinOp(left=loop_ind2bounds[loop_ind][1], op=ast.Sub(),
+                                                        right=ast.Num(n=1)))
+                                   for loop_ind in coefs.keys())
+                    dim_mins[dim_id].append(Calculator._replace_vars(dim_access_ast, var2min))
+                    dim_maxs[dim_id].append(Calculator._replace_vars(ast.BinOp(left=dim_access_ast, op=ast.Add(),
+                                                                               right=ast.Num(n=1)), var2max))
+
+            subscript2globlexmin[subscript_name] = [Calculator._merge_bounds(exprs, "min") for exprs in dim_mins]
+            subscript2globlexmax[subscript_name] = [Calculator._merge_bounds(exprs, "max") for exprs in dim_maxs]
+
+        if __debug__:
+            logger.debug("[Calculator] Computed lex bounds of a rectangular domain without ISL")
+
+        return subscript2globlexmin, subscript2globlexmax
+
+    @staticmethod
+    def _get_loop_coefficients(expr, loop_indexes):
+        """
+        Returns the coefficients of the loop indexes in the given expression
+
+        :param expr: AST expression
+            + type: AST.Node
+        :param loop_indexes: Names of the loop indexes
+            + type: Collection<str>
+        :return coefs: Map containing the loop indexes used in the expression and their coefficients or None if the
+        expression is not affine on the loop indexes
+            + type: dict<str, int>
+        """
+
+        if not any(isinstance(node, ast.Name) and node.id in loop_indexes for node in ast.walk(expr)):
+            # The expression only depends on the parameters
+            return {}
+        if isinstance(expr, ast.Name):
+            return {expr.id: 1}
+        if isinstance(expr, ast.UnaryOp) and isinstance(expr.op, (ast.UAdd, ast.USub)):
+            coefs = Calculator._get_loop_coefficients(expr.operand, loop_indexes)
+            if coefs is not None and isinstance(expr.op, ast.USub):
+                coefs = dict((loop_ind, -coef) for loop_ind, coef in coefs.items())
+            return coefs
+        if isinstance(expr, ast.BinOp) and isinstance(expr.op, (ast.Add, ast.Sub)):
+            left_coefs = Calculator._get_loop_coefficients(expr.left, loop_indexes)
+            right_coefs = Calculator._get_loop_coefficients(expr.right, loop_indexes)
+            if left_coefs is None or right_coefs is None:
+                return None
+            sign = 1 if isinstance(expr.op, ast.Add) else -1
+            for loop_ind, coef in right_coefs.items():
+                left_coefs[loop_ind] = left_coefs.get(loop_ind, 0) + sign * coef
+            return dict((loop_ind, coef) for loop_ind, coef in left_coefs.items() if coef != 0)
+        if isinstance(expr, ast.BinOp) and isinstance(expr.op, ast.Mult):
+            for factor, other in ((expr.left, expr.right), (expr.right, expr.left)):
+                if isinstance(factor, ast.Num) and isinstance(factor.n, int):
+                    coefs = Calculator._get_loop_coefficients(other, loop_indexes)
+                    if coefs is None:
+                        return None
+                    return dict((loop_ind, coef * factor.n) for loop_ind, coef in coefs.items() if factor.n != 0)
+        return None
+
+    @staticmethod
+    def _replace_vars(expr, var2expr):
+        """
+        Returns a copy of the given expression where the given variables are replaced by the given expressions and
+        the constant operations are folded
+
+        :param expr: AST expression
+            + type: AST.Node
+        :param var2expr: Map containing the variable names and their new expressions
+            + type: dict<str, AST.Node>
+        :return: New AST expression
+            + type: AST.Node
+        """
+
+        import copy
+        new_expr = _ReplaceVariables(var2expr).visit(copy.deepcopy(expr))
+        return _FoldConstants().visit(new_expr)
+
+    @staticmethod
+    def _merge_bounds(exprs, func_name):
+        """
+        Builds the minimum or maximum of the given expressions. Expressions that only differ on a constant term are
+        merged
+
+        :param exprs: List of AST expressions
+            + type: List<AST.Node>
+        :param func_name: "min" or "max"
+            + type: str
+        :return: AST expression
+            + type: AST.Node
+        """
+
+        # Split the constant term of each expression
+        core_keys = []
+        core2expr = {}
+        core2const = {}
+        for expr in exprs:
+            core, const = expr, 0
+            while isinstance(core, ast.BinOp) and isinstance(core.op, (ast.Add, ast.Sub)) and \
+                    isinstance(core.right, ast.Num):
+                const += core.right.n if isinstance(core.op, ast.Add) else -core.right.n
+                core = core.left
+            if isinstance(core, ast.Num):
+                core, const = None, const + core.n
+            core_key = ast.dump(core) if core is not None else None
+            if core_key not in core2expr:
+                core_keys.append(core_key)
+                core2expr[core_key] = core
+                core2const[core_key] = const
+            else:
+                core2const[core_key] = min(core2const[core_key], const) if func_name == "min" else \
+                    max(core2const[core_key], const)
+
+        # Rebuild the expressions
+        merged_exprs = []
+        for core_key in core_keys:
+            core, const = core2expr[core_key], core2const[core_key]
+            if core is None:
+                merged_exprs.append(ast.Num(n=const))
+            elif const == 0:
+                merged_exprs.append(core)
+            else:
+                merged_exprs.append(ast.BinOp(left=core, op=ast.Add() if const > 0 else ast.Sub(),
+                                              right=ast.Num(n=abs(const))))
+        if len(merged_exprs) == 1:
+            return merged_exprs[0]
+        return ast.Call(func=ast.Name(id=func_name, ctx=ast.Load()), args=merged_exprs, keywords=[], starargs=None,
+                        kwargs=None)
+
+    @staticmethod
+    def _compute_lex_bounds(loops_info, subscript_accesses_info):
         """
         Computes the lexmin and lexmax of a given set of accesses considering the given bounds
 
@@ -51,6 +289,90 @@ class Calculator(object):
         # Return lists of minimums and maximums of each dimension of each access per each subscript variable
         return subscript2globlexmin, subscript2globlexmax
 
+    @staticmethod
+    def is_fully_covered(loops_info, accesses, lbs, ubs):
+        """
+        Determines whether the given accesses cover all the positions of the chunk defined by the given bounds
+
+        :param loops_info: Information about loop bounds and indexes
+        :param accesses: List of access expressions (one per dimension) of a subscript
+        :param lbs: List of AST expressions of the lower bounds of each dimension of the chunk (inclusive)
+        :param ubs: List of AST expressions of the upper bounds of each dimension of the chunk (exclusive)
+        :return: True if the accesses cover the whole chunk, False otherwise (or if it cannot be proven)
+        """
+
+        import islpy as isl
+
+        # Only bounds defining a box (convex and without conditionals) are considered
+        for lb in lbs:
+            if not Calculator._is_box_bound(lb, "max"):
+                return False
+        for ub in ubs:
+            if not Calculator._is_box_bound(ub, "min"):
+                return False
+
+        num_dims = len(lbs)
+        try:
+            # Build the set of accessed positions (projecting out the loop indexes)
+            access_isl_builder = _IslSetBuilder()
+            access_isl_builder.set_variables([loop_ind.id for loop_ind in loops_info.keys()])
+            for loop_ind, loop_bounds in loops_info.items():
+                # The loop upper bound is exclusive (the chunk bounds over-approximate it, but coverage cannot)
+                access_isl_builder.add_constraint(2, loop_ind.id, loop_bounds.args[0])
+                access_isl_builder.add_constraint(3, loop_ind.id, loop_bounds.args[1])
+            accessed_isl_set = None
+            for access in accesses:
+                access_isl_builder.set_acccess_variables(num_dims)
+                for dim_id, dim_access_ast in enumerate(access):
+                    if isinstance(dim_access_ast, ast.Index):
+                        dim_access_ast = dim_access_ast.value
+                    access_isl_builder.add_access_constraint(dim_id, dim_access_ast)
+                isl_access = access_isl_builder.build_isl_set().project_out(isl.dim_type.set, num_dims,
+                                                                            len(loops_info))
+                isl_access = isl.Set.from_basic_set(isl_access)
+                if accessed_isl_set is None:
+                    accessed_isl_set = isl_access
+                else:
+                    accessed_isl_set = accessed_isl_set.union(isl_access)
+                access_isl_builder.clear_access_variables()
+                access_isl_builder.clear_access_constraints()
+
+            # Build the set of positions of the chunk
+            chunk_isl_builder = _IslSetBuilder()
+            chunk_isl_builder.set_acccess_variables(num_dims)
+            for dim_id in range(num_dims):
+                chunk_isl_builder.add_constraint(2, "d" + str(dim_id), lbs[dim_id])
+                chunk_isl_builder.add_constraint(3, "d" + str(dim_id), ubs[dim_id])
+            chunk_isl_set = isl.Set.from_basic_set(chunk_isl_builder.build_isl_set())
+
+            return accessed_isl_set is not None and chunk_isl_set.is_subset(accessed_isl_set)
+        except Exception as e:
+            if __debug__:
+                logger.debug("[Calculator] Cannot compute the coverage of the chunk: " + str(e))
+            return False
+
+    @staticmethod
+    def _is_box_bound(bound_ast, allowed_minmax):
+        """
+        Determines whether the given bound is an affine expression or a min/max of affine expressions
+
+        :param bound_ast: AST expression of the bound
+        :param allowed_minmax: Name of the min/max function allowed at the top of the bound ("min" for upper bounds,
+        "max" for lower bounds)
+        :return: True if the bound is valid, False otherwise
+        """
+
+        exprs = [bound_ast]
+        if isinstance(bound_ast, ast.Call) and isinstance(bound_ast.func, ast.Name) and \
+                bound_ast.func.id == allowed_minmax:
+            exprs = bound_ast.args
+        for expr in exprs:
+            for node in ast.walk(expr):
+                if not isinstance(node, (ast.BinOp, ast.UnaryOp, ast.Name, ast.Num, ast.operator, ast.unaryop,
+                                         ast.expr_context)):
+                    return False
+        return True
+
     @staticmethod
     def _convert_to_isl(loops_info, subscript_accesses_info):
         """
@@ -83,9 +405,8 @@ class Calculator(object):
             loop_ind_varname = loop_ind.id
             global_min_isl_builder.add_constraint(2, loop_ind_varname, loop_bounds.args[0])
             global_min_isl_builder.add_constraint(4, loop_ind_varname, loop_bounds.args[1])
-        import copy
-        global_max_isl_builder = copy.deepcopy(global_min_isl_builder)
-        specific_access_isl_builder = copy.deepcopy(global_min_isl_builder)
+        global_max_isl_builder = global_min_isl_builder.copy()
+        specific_access_isl_builder = global_min_isl_builder.copy()
 
         # Per each subscript, store a ISL object representing each of its accesses
         # The global info is common to all subscripts because it refers to the loop bounds
@@ -106,9 +427,12 @@ class Calculator(object):
 
                 # Add a constraint for each subscript dimension
                 for dim_id, dim_access_ast in enumerate(access):
-                    specific_access_isl_builder.add_access_constraint(dim_id, dim_access_ast.value)
-                    global_min_isl_builder.add_global_constraint(2, dim_id, dim_access_ast.value)
-                    global_max_isl_builder.add_global_constraint(4, dim_id, dim_access_ast.value)
+                    # Python 3.9+ does not wrap the subscript indexes
+                    if isinstance(dim_access_ast, ast.Index):
+                        dim_access_ast = dim_access_ast.value
+                    specific_access_isl_builder.add_access_constraint(dim_id, dim_access_ast)
+                    global_min_isl_builder.add_global_constraint(2, dim_id, dim_access_ast)
+                    global_max_isl_builder.add_global_constraint(4, dim_id, dim_access_ast)
 
                 # Generate the specific access ISL object and store it
                 # if __debug__:
@@ -223,14 +547,10 @@ class Calculator(object):
                 mins_ast = []
                 maxs_ast = []
                 for dim in range(num_dims):
-                    min_dim_str = lex_min.get_pw_aff(dim).__str__()
-                    min_dim_expr = Calculator._extract_expr(min_dim_str)
-                    min_dim_ast = Calculator._build_ast(min_dim_expr)
+                    min_dim_ast = Calculator._pw_aff_to_ast(lex_min.get_pw_aff(dim))
                     mins_ast.append(min_dim_ast)
 
-                    max_dim_str = lex_max.get_pw_aff(dim).__str__()
-                    max_dim_expr = Calculator._extract_expr(max_dim_str)
-                    max_dim_ast = Calculator._build_ast(max_dim_expr)
+                    max_dim_ast = Calculator._pw_aff_to_ast(lex_max.get_pw_aff(dim))
                     maxs_ast.append(max_dim_ast)
 
                 # Add minimum and maximum of each dimension to the access min/max lists
@@ -314,9 +634,7 @@ class Calculator(object):
             # Process each component (dimension) of the access
             global_min_ast = []
             for dim in range(num_dims):
-                min_dim_str = lex_min.get_pw_aff(dim).__str__()
-                min_dim_expr = Calculator._extract_expr(min_dim_str)
-                min_dim_ast = Calculator._build_ast(min_dim_expr)
+                min_dim_ast = Calculator._pw_aff_to_ast(lex_min.get_pw_aff(dim))
                 global_min_ast.append(min_dim_ast)
 
             # Store global minimum
@@ -343,9 +661,7 @@ class Calculator(object):
             # Process each component (dimension) of the access
             global_max_ast = []
             for dim in range(num_dims):
-                max_dim_str = lex_max.get_pw_aff(dim).__str__()
-                max_dim_expr = Calculator._extract_expr(max_dim_str)
-                max_dim_ast = Calculator._build_ast(max_dim_expr)
+                max_dim_ast = Calculator._pw_aff_to_ast(lex_max.get_pw_aff(dim))
                 global_max_ast.append(max_dim_ast)
 
             # Store global minimum
@@ -366,131 +682,288 @@ class Calculator(object):
         return subscript2global_lexmin, subscript2global_lexmax
 
     @staticmethod
-    def _extract_expr(str_line):
+    def _pw_aff_to_ast(pw_aff):
         """
-        Extracts the access expression from a full ISL output line
+        Builds an AST node representing the given ISL piecewise affine expression by walking its pieces. Each piece
+        is translated into a conditional expression whose test is the piece domain (the last piece is the default
+        value)
 
-        :param str_line: Full ISL output line
-        :return: String containing the access expression
+        :param pw_aff: ISL piecewise affine expression
+            + type: isl.PwAff
+        :return: AST node representing the given expression
+            + type: AST.Node
         """
 
-        # The expression is of the form [DOMAIN_VARS] -> { assign1 : cond1 ; assign2 : cond2 }
-        # if __debug__:
-        #     logger.debug("Extracting from: " + str(str_line))
-
-        # Remove domain vars header
-        import re
-        str_line = re.findall(r'{.*\}', str_line)[0][2:-2]
-
-        # Separate the different expressions
-        processed_assigns = []
-        processed_conditions = []
-        str_exprs = str_line.split(";")
-        for str_expr in str_exprs:
-            if "exists" not in str_expr:
-                # Split expression into assignment and condition
-                fields = str_expr.split(":")
-                str_assign = fields[0].strip()
-                str_condition = fields[1].strip() if len(fields) > 1 else None
-
-                # Remove the '[(' and ')]' from the assignment
-                str_assign = str_assign[2:-2]
-                # Insert multiplication marks in assign
-                str_assign = re.sub(r'(\d+)(\w)', r'\1*\2', str_assign)
-                # Insert multiplication marks and double = in condition
-                if str_condition is not None:
-                    str_condition = re.sub(r'(\d+)(\w)', r'\1*\2', str_condition)
-                    str_condition = re.sub(r' = ', r' == ', str_condition)
-                    str_condition = re.sub(r' mod ', r' % ', str_condition)
-                # Store expression
-                processed_assigns.append(str_assign)
-                processed_conditions.append(str_condition)
+        pieces = pw_aff.get_pieces()
+        if len(pieces) == 0:
+            raise Py2PyCOMPSsCalculatorException("[ERROR] Cannot build an expression from an empty ISL piecewise "
+                                                 "affine expression: " + str(pw_aff))
+
+        expr_ast = Calculator._aff_to_ast(pieces[-1][1])
+        for piece_set, piece_aff in reversed(pieces[:-1]):
+            expr_ast = ast.IfExp(test=Calculator._set_to_ast(piece_set),
+                                 body=Calculator._aff_to_ast(piece_aff),
+                                 orelse=expr_ast)
+        return expr_ast
+
+    @staticmethod
+    def _aff_to_ast(aff):
+        """
+        Builds an AST node representing the given ISL affine expression
+
+        :param aff: ISL affine expression
+            + type: isl.Aff
+        :return: AST node representing the given expression
+            + type: AST.Node
+        """
+
+        terms, den = Calculator._aff_to_terms(aff)
+        expr_ast = Calculator._terms_to_ast(terms)
+        if den != 1:
+            expr_ast = Calculator._floor_to_ast(expr_ast, den)
+        return expr_ast
+
+    @staticmethod
+    def _set_to_ast(isl_set):
+        """
+        Builds an AST node representing the condition of belonging to the given ISL set. Existentially quantified
+        variables are turned into explicit integer divisions
+
+        :param isl_set: ISL set
+            + type: isl.Set
+        :return: AST node representing the condition
+            + type: AST.Node
+        """
+
+        conjunctions = []
+        for basic_set in isl_set.compute_divs().get_basic_sets():
+            constraints_ast = [Calculator._constraint_to_ast(constraint)
+                               for constraint in basic_set.get_constraints()
+                               if not constraint.is_div_constraint()]
+            if len(constraints_ast) == 0:
+                conjunctions.append(ast.Name(id="True", ctx=ast.Load()))
+            elif len(constraints_ast) == 1:
+                conjunctions.append(constraints_ast[0])
             else:
-                # TODO: Treat exists expressions
-                # Expressions are of the form [val] : exists (e0: cond1 and 2e0 >= LB and 6e0 <= UB)
-                # Could be treated by removing the exists clause, the e0 variable and checking that LB <= UB
-                # For now, we skip this case
-                pass
+                conjunctions.append(ast.BoolOp(op=ast.And(), values=constraints_ast))
 
-        # Join all expressions
-        full_str = processed_assigns[0]
-        for i in range(1, len(processed_assigns)):
-            full_str += " if " + processed_conditions[i - 1] + " else " + processed_assigns[i]
+        if len(conjunctions) == 0:
+            return ast.Name(id="False", ctx=ast.Load())
+        if len(conjunctions) == 1:
+            return conjunctions[0]
+        return ast.BoolOp(op=ast.Or(), values=conjunctions)
 
-        # Return full expression
-        # if __debug__:
-        #     logger.debug("Extracted: " + str(full_str))
+    @staticmethod
+    def _constraint_to_ast(constraint):
+        """
+        Builds an AST node representing the given ISL constraint. As in the ISL printer, the last variable term is
+        kept on the left hand side and the rest of terms are moved to the right hand side
 
-        return full_str
+        :param constraint: ISL constraint
+            + type: isl.Constraint
+        :return: AST node representing the constraint
+            + type: AST.Compare
+        """
+
+        terms, _ = Calculator._aff_to_terms(constraint.get_aff())
+        terms = Calculator._rewrite_mods(terms)
+        var_terms = [(coef, term) for coef, term in terms if term is not None]
+        if len(var_terms) == 0:
+            left_coef, left_term = 0, None
+        else:
+            left_coef, left_term = var_terms[-1]
+            terms.remove((left_coef, left_term))
+
+        # c * x + rest >= 0 is printed as c * x >= -rest (or -c * x <= rest for negative coefficients)
+        if left_coef < 0:
+            op = ast.Eq() if constraint.is_equality() else ast.LtE()
+            right_terms = terms
+        else:
+            op = ast.Eq() if constraint.is_equality() else ast.GtE()
+            right_terms = [(-coef, term) for coef, term in terms]
+        left_ast = Calculator._terms_to_ast([(abs(left_coef), left_term)] if left_term is not None else [])
+
+        return ast.Compare(left=left_ast, ops=[op], comparators=[Calculator._terms_to_ast(right_terms)])
 
     @staticmethod
-    def _build_ast(str_expr):
+    def _aff_to_terms(aff):
+        """
+        Returns the terms of the given ISL affine expression multiplied by its denominator. Each term is a tuple
+        containing an integer coefficient and None (constant term), a variable name or a tuple of the form
+        ("floor", numerator terms, denominator) for the integer divisions
+
+        :param aff: ISL affine expression
+            + type: isl.Aff
+        :return terms: List of terms
+            + type: List<Tuple(int, Object)>
+        :return den: Denominator of the expression
+            + type: int
         """
-        Builds an AST node representing the given expression
 
-        :param str_expr: String expression
-        :return: AST node representing the given expression
+        import islpy as isl
+
+        den = Calculator._val_to_fraction(aff.get_denominator_val())
+        terms = []
+
+        # Constant term
+        constant = Calculator._val_to_fraction(aff.get_constant_val()) * den
+        if constant != 0:
+            terms.append((int(constant), None))
+
+        # Parameters and variables
+        for dim_type in (isl.dim_type.param, isl.dim_type.in_):
+            for pos in range(aff.dim(dim_type)):
+                coef = Calculator._val_to_fraction(aff.get_coefficient_val(dim_type, pos)) * den
+                if coef != 0:
+                    terms.append((int(coef), aff.get_dim_name(dim_type, pos)))
+
+        # Integer divisions (existentially quantified variables)
+        for pos in range(aff.dim(isl.dim_type.div)):
+            coef = Calculator._val_to_fraction(aff.get_coefficient_val(isl.dim_type.div, pos)) * den
+            if coef != 0:
+                div_terms, div_den = Calculator._aff_to_terms(aff.get_div(pos))
+                terms.append((int(coef), ("floor", tuple(div_terms), div_den)))
+
+        return terms, int(den)
+
+    @staticmethod
+    def _rewrite_mods(terms):
         """
+        Rewrites the integer divisions of the form c * floor(e / m) where c is a multiple of m as modulo operations
+        (c * floor(e / m) = c / m * e - c / m * (e mod m))
 
-        # Add int cast and math module to floor/ceil operations
-        str_expr = str_expr.replace("floor", "int(math.floor")
-        str_expr = str_expr.replace("ceil", "int(math.ceil")
+        :param terms: List of terms
+            + type: List<Tuple(int, Object)>
+        :return new_terms: List of terms
+            + type: List<Tuple(int, Object)>
+        """
 
-        # Add an extra closing braket for the int cast on floor cases
-        str_expr = Calculator._add_closing_braket(str_expr, "floor")
-        str_expr = Calculator._add_closing_braket(str_expr, "ceil")
+        mod_terms = []
+        rewritten = True
+        while rewritten:
+            rewritten = False
+            for index, (coef, term) in enumerate(terms):
+                if isinstance(term, tuple) and term[0] == "floor" and coef % term[2] == 0:
+                    factor = coef // term[2]
+                    rest = terms[:index] + terms[index + 1:]
+                    terms = Calculator._combine_terms(rest + [(factor * c, t) for c, t in term[1]])
+                    mod_terms.append((-factor, ("mod", term[1], term[2])))
+                    rewritten = True
+                    break
+        return terms + mod_terms
 
-        # Parse expression to AST
-        ast_translation = ast.parse(str_expr)
+    @staticmethod
+    def _combine_terms(terms):
+        """
+        Adds up the coefficients of the equal terms and removes the terms with a zero coefficient
 
-        # Remove AST module and expression (get only expression value)
-        ast_expr = ast_translation.body[0].value
+        :param terms: List of terms
+            + type: List<Tuple(int, Object)>
+        :return new_terms: List of terms (in order of first appearance)
+            + type: List<Tuple(int, Object)>
+        """
 
-        return ast_expr
+        order = []
+        term2coef = {}
+        for coef, term in terms:
+            if term not in term2coef:
+                order.append(term)
+                term2coef[term] = 0
+            term2coef[term] += coef
+        return [(term2coef[term], term) for term in order if term2coef[term] != 0]
 
     @staticmethod
-    def _add_closing_braket(str_expr, keyword):
+    def _terms_to_ast(terms):
         """
-        Adds an extra closing braket after each occurrence of the keyword in the str_expr
+        Builds an AST node representing the sum of the given terms
 
-        :param str_expr: String representing the all expression
-        :param keyword:  String representing the keyword
-        :return: Modified string containing an extra closing braket after each keyword occurrence
+        :param terms: List of terms
+            + type: List<Tuple(int, Object)>
+        :return: AST node representing the sum
+            + type: AST.Node
         """
 
-        begin_index = str_expr.find(keyword)
-        while begin_index != -1:
-            # Move index to the start of the internal expression
-            begin_index = begin_index + len(keyword)
-            # Calculate the ending of the internal expression
-            end_index = Calculator._find_closing_braket(str_expr, begin_index)
-            # Add the braket
-            str_expr = str_expr[:end_index] + ")" + str_expr[end_index:]
-            # Iterate to find next floor call
-            begin_index = str_expr.find(keyword, begin_index)
+        terms = Calculator._rewrite_mods(terms)
+        if len(terms) == 0:
+            return ast.Num(n=0)
 
-        return str_expr
+        expr_ast = None
+        for coef, term in terms:
+            if term is None:
+                term_ast = ast.Num(n=coef if expr_ast is None else abs(coef))
+            else:
+                atom_ast = Calculator._term_atom_to_ast(term)
+                if abs(coef) == 1:
+                    term_ast = atom_ast
+                    if expr_ast is None and coef < 0:
+                        term_ast = ast.UnaryOp(op=ast.USub(), operand=atom_ast)
+                else:
+                    term_coef = coef if expr_ast is None else abs(coef)
+                    term_ast = ast.BinOp(left=ast.Num(n=term_coef), op=ast.Mult(), right=atom_ast)
+
+            if expr_ast is None:
+                expr_ast = term_ast
+            else:
+                expr_ast = ast.BinOp(left=expr_ast, op=ast.Sub() if coef < 0 else ast.Add(), right=term_ast)
+        return expr_ast
+
+    @staticmethod
+    def _term_atom_to_ast(term):
+        """
+        Builds an AST node representing the given non-constant term (without its coefficient)
+
+        :param term: Variable name or tuple representing an integer division or modulo
+            + type: str or Tuple(str, List<Tuple(int, Object)>, int)
+        :return: AST node representing the term
+            + type: AST.Node
+        """
+
+        if not isinstance(term, tuple):
+            return ast.Name(id=term, ctx=ast.Load())
+
+        kind, num_terms, den = term
+        num_ast = Calculator._terms_to_ast(list(num_terms))
+        if kind == "mod":
+            return ast.BinOp(left=num_ast, op=ast.Mod(), right=ast.Num(n=den))
+        return Calculator._floor_to_ast(num_ast, den)
 
     @staticmethod
-    def _find_closing_braket(expr_str, index_start):
+    def _floor_to_ast(num_ast, den):
         """
-        Finds the closing braket of the expression starting on index_start
+        Builds an AST node representing the integer division int(math.floor(float(num) / float(den)))
+
+        :param num_ast: AST node representing the numerator
+            + type: AST.Node
+        :param den: Denominator
+            + type: int
+        :return: AST node representing the integer division
+            + type: AST.Call
+        """
+
+        div_ast = ast.BinOp(left=ast.Call(func=ast.Name(id="float", ctx=ast.Load()), args=[num_ast], keywords=[],
+                                          starargs=None, kwargs=None),
+                            op=ast.Div(),
+                            right=ast.Call(func=ast.Name(id="float", ctx=ast.Load()), args=[ast.Num(n=den)],
+                                           keywords=[], starargs=None, kwargs=None))
+        floor_ast = ast.Call(func=ast.Attribute(value=ast.Name(id="math", ctx=ast.Load()), attr="floor",
+                                                ctx=ast.Load()),
+                             args=[div_ast], keywords=[], starargs=None, kwargs=None)
+        return ast.Call(func=ast.Name(id="int", ctx=ast.Load()), args=[floor_ast], keywords=[], starargs=None,
+                        kwargs=None)
 
-        :param expr_str: String representing the all expression
-        :param index_start: Starting index
-        :return: Index of the closing braket
+    @staticmethod
+    def _val_to_fraction(val):
         """
+        Converts the given ISL value into a Python fraction
 
-        index_end = index_start + 1
-        parentesis_counter = 1
-        while parentesis_counter > 0 and index_end < len(expr_str):
-            if expr_str[index_end] == "(":
-                parentesis_counter += 1
-            elif expr_str[index_end] == ")":
-                parentesis_counter -= 1
-            index_end += 1
+        :param val: ISL value
+            + type: isl.Val
+        :return: Fraction representing the value
+            + type: fractions.Fraction
+        """
 
-        return index_end
+        from fractions import Fraction
+        return Fraction(val.to_str())
 
 
 #
@@ -499,9 +972,23 @@ class Calculator(object):
 
 class _IslSetBuilder:
     """
-    Auxiliar Class to build ISL Basic Sets
+    Auxiliar Class to build ISL Basic Sets. The constraints are stored as AST expressions and the sets are built
+    through the ISL constraint API on a shared ISL context (without parsing strings)
+
+    Attributes:
+        - _context: Static ISL context shared by all the built sets
+            + type: isl.Context
+        - _spaces: Static map containing the parameter and variable names and their ISL space
+            + type: dict<Tuple(Tuple(str), Tuple(str)), isl.Space>
     """
 
+    # Static attribute ISL context shared by all the built sets
+    _context = None
+    # Static attribute Cache of ISL spaces
+    _spaces = {}
+    # Static attribute Operators of each constraint type
+    _constraint_ops = [" = ", " > ", " >= ", " < ", " <= "]
+
     def __init__(self):
         """
         Initialization of the AccessSet class
@@ -516,6 +1003,24 @@ class _IslSetBuilder:
         self.global_constraints = []
         self.constraints = []
 
+    def copy(self):
+        """
+        Returns a copy of the builder. The constraint expressions are shared since they are never modified
+
+        :return: New builder containing the same space, variables and constraints
+            + type: _IslSetBuilder
+        """
+
+        new_builder = _IslSetBuilder()
+        new_builder.space = list(self.space)
+        new_builder.access_variables = list(self.access_variables)
+        new_builder.global_variables = list(self.global_variables)
+        new_builder.variables = list(self.variables)
+        new_builder.access_constraints = list(self.access_constraints)
+        new_builder.global_constraints = list(self.global_constraints)
+        new_builder.constraints = list(self.constraints)
+        return new_builder
+
     def set_acccess_variables(self, num_dims):
         """
         Craetes num_dims access variables
@@ -559,14 +1064,9 @@ class _IslSetBuilder:
         :param right_ast: AST expression for the assignation
         """
 
-        op, right_exprs = self._process_constraint(0, right_ast)
-
         left_expr = "d" + str(dim_id)
-
-        # Add all the expressions
-        for right_expr in right_exprs:
-            expr = left_expr + op + right_expr
-            self.access_constraints.append(expr)
+        for right_expr in self._process_constraint(0, right_ast):
+            self.access_constraints.append((left_expr, 0, right_expr))
 
     def add_constraint(self, constraint_type, left_expr, right_ast):
         """
@@ -577,12 +1077,8 @@ class _IslSetBuilder:
         :param right_ast: AST expression for the assignation
         """
 
-        op, right_exprs = self._process_constraint(constraint_type, right_ast)
-
-        # Add all the expressions
-        for right_expr in right_exprs:
-            expr = left_expr + op + right_expr
-            self.constraints.append(expr)
+        for right_expr in self._process_constraint(constraint_type, right_ast):
+            self.constraints.append((left_expr, constraint_type, right_expr))
 
     def add_global_constraint(self, constraint_type, dim_id, right_ast):
         """
@@ -593,14 +1089,9 @@ class _IslSetBuilder:
         :param right_ast: AST expression for the assignation
         """
 
-        op, right_exprs = self._process_constraint(constraint_type, right_ast)
-
         left_expr = "g" + str(dim_id)
-
-        # Add all the expressions
-        for right_expr in right_exprs:
-            expr = left_expr + op + right_expr
-            self.global_constraints.append(expr)
+        for right_expr in self._process_constraint(constraint_type, right_ast):
+            self.global_constraints.append((left_expr, constraint_type, right_expr))
 
     def clear_access_variables(self):
         """
@@ -636,12 +1127,33 @@ class _IslSetBuilder:
         :return: The ISL BasicSet represented by the self object
         """
 
-        return isl.BasicSet(self.__str__())
+        import islpy as isl
+
+        set_vars = self.access_variables + self.global_variables + self.variables
+        space = _IslSetBuilder._get_space(self.space, set_vars)
+        local_space = isl.LocalSpace.from_space(space)
+        name2var = {}
+        for pos, param_name in enumerate(self.space):
+            name2var[param_name] = (isl.dim_type.param, pos)
+        for pos, var_name in enumerate(set_vars):
+            name2var[var_name] = (isl.dim_type.set, pos)
+
+        isl_set = isl.BasicSet.universe(space)
+        for left_var, constraint_type, right_ast in self.access_constraints + self.global_constraints + \
+                self.constraints:
+            left_aff = isl.Aff.var_on_domain(local_space, *name2var[left_var])
+            right_aff = _IslSetBuilder._build_aff(right_ast, local_space, name2var)
+            isl_set = isl_set.add_constraint(_IslSetBuilder._build_constraint(constraint_type, left_aff, right_aff))
+        return isl_set
 
     def __str__(self):
+        import astor
         str_space = ", ".join(self.space)
         str_vars = ", ".join(self.access_variables + self.global_variables + self.variables)
-        str_constraints = " and ".join(self.access_constraints + self.global_constraints + self.constraints)
+        str_constraints = " and ".join(
+            left_expr + _IslSetBuilder._constraint_ops[constraint_type] + astor.to_source(right_expr).strip()
+            for left_expr, constraint_type, right_expr in
+            self.access_constraints + self.global_constraints + self.constraints)
 
         str_expr = "[" + str_space + "] -> { [" + str_vars + "] : " + str_constraints + "}"
 
@@ -652,25 +1164,15 @@ class _IslSetBuilder:
 
     def _process_constraint(self, constraint_type, right_ast):
         """
-        Process the constraint to build the space variables, the operand and the right expressions
+        Process the constraint to build the space variables and the right expressions
 
         :param constraint_type: Number indicating the constraint type
         :param right_ast: AST expression for the assignation
-        :return: An string representing the operand and a list of strings representing the right expressions
+        :return: A list of AST expressions without min/max representing the right expressions
         """
 
         # Check operator
-        if constraint_type == 0:
-            op = " = "
-        elif constraint_type == 1:
-            op = " > "
-        elif constraint_type == 2:
-            op = " >= "
-        elif constraint_type == 3:
-            op = " < "
-        elif constraint_type == 4:
-            op = " <= "
-        else:
+        if constraint_type not in range(len(_IslSetBuilder._constraint_ops)):
             raise Py2PyCOMPSsCalculatorException("ERROR: Unrecognised operand type")
 
         # Check for undefined accessed variables
@@ -680,12 +1182,120 @@ class _IslSetBuilder:
                 self.space.append(sv)
 
         # Divide right ast into expressions without min/max
-        exprs_ast = _IslSetBuilder._extract_exprs_without_minmax(right_ast)
-        import astor
-        exprs_str = [astor.to_source(expr) for expr in exprs_ast]
+        return _IslSetBuilder._extract_exprs_without_minmax(right_ast)
+
+    @staticmethod
+    def _get_context():
+        """
+        Returns the ISL context shared by all the built sets
+
+        :return: ISL context
+            + type: isl.Context
+        """
+
+        import islpy as isl
+
+        if _IslSetBuilder._context is None:
+            _IslSetBuilder._context = isl.Context()
+        return _IslSetBuilder._context
+
+    @staticmethod
+    def _get_space(param_names, var_names):
+        """
+        Returns the ISL set space with the given parameters and variables. Spaces are reused between sets
+
+        :param param_names: List of parameter names
+            + type: List<str>
+        :param var_names: List of variable names
+            + type: List<str>
+        :return: ISL space
+            + type: isl.Space
+        """
+
+        import islpy as isl
+
+        key = (tuple(param_names), tuple(var_names))
+        if key not in _IslSetBuilder._spaces:
+            _IslSetBuilder._spaces[key] = isl.Space.create_from_names(_IslSetBuilder._get_context(),
+                                                                      set=list(var_names),
+                                                                      params=list(param_names))
+        return _IslSetBuilder._spaces[key]
+
+    @staticmethod
+    def _build_constraint(constraint_type, left_aff, right_aff):
+        """
+        Builds the ISL constraint left_aff =,>,>=,<,<= right_aff
 
-        # Process right ast
-        return op, exprs_str
+        :param constraint_type: Number indicating the constraint type
+            + type: int
+        :param left_aff: ISL affine expression of the left hand side
+            + type: isl.Aff
+        :param right_aff: ISL affine expression of the right hand side
+            + type: isl.Aff
+        :return: ISL constraint
+            + type: isl.Constraint
+        """
+
+        import islpy as isl
+
+        if constraint_type == 0:
+            return isl.Constraint.equality_from_aff(left_aff.sub(right_aff))
+        one = isl.Val.one(_IslSetBuilder._get_context())
+        if constraint_type == 1:
+            return isl.Constraint.inequality_from_aff(left_aff.sub(right_aff).add_constant_val(one.neg()))
+        if constraint_type == 2:
+            return isl.Constraint.inequality_from_aff(left_aff.sub(right_aff))
+        if constraint_type == 3:
+            return isl.Constraint.inequality_from_aff(right_aff.sub(left_aff).add_constant_val(one.neg()))
+        return isl.Constraint.inequality_from_aff(right_aff.sub(left_aff))
+
+    @staticmethod
+    def _build_aff(node, local_space, name2var):
+        """
+        Builds the ISL affine expression represented by the given AST expression (without min/max nor casts)
+
+        :param node: AST expression
+            + type: AST.Node
+        :param local_space: ISL local space of the set
+            + type: isl.LocalSpace
+        :param name2var: Map containing the parameter and variable names and their ISL type and position
+            + type: dict<str, Tuple(isl.dim_type, int)>
+        :return: ISL affine expression
+            + type: isl.Aff
+        """
+
+        import islpy as isl
+
+        if isinstance(node, ast.Num):
+            val = isl.Val.int_from_si(_IslSetBuilder._get_context(), node.n)
+            return isl.Aff.val_on_domain(local_space, val)
+        if isinstance(node, ast.Name):
+            return isl.Aff.var_on_domain(local_space, *name2var[node.id])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = _IslSetBuilder._build_aff(node.operand, local_space, name2var)
+            return operand.neg() if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ("floor", "ceil") and \
+                len(node.args) == 1:
+            arg = _IslSetBuilder._build_aff(node.args[0], local_space, name2var)
+            return arg.floor() if node.func.id == "floor" else arg.ceil()
+        if isinstance(node, ast.BinOp):
+            left = _IslSetBuilder._build_aff(node.left, local_space, name2var)
+            right = _IslSetBuilder._build_aff(node.right, local_space, name2var)
+            if isinstance(node.op, ast.Add):
+                return left.add(right)
+            if isinstance(node.op, ast.Sub):
+                return left.sub(right)
+            if isinstance(node.op, ast.Mult):
+                return left.mul(right)
+            if isinstance(node.op, ast.Div):
+                return left.div(right)
+            if isinstance(node.op, ast.FloorDiv):
+                return left.div(right).floor()
+            if isinstance(node.op, ast.Mod) and right.is_cst():
+                return left.mod_val(right.get_constant_val())
+
+        import astor
+        raise Py2PyCOMPSsCalculatorException("[ERROR] Unsupported ISL expression: " + astor.to_source(node).strip())
 
     def _get_used_space_vars(self, node_ast):
         """
@@ -841,6 +1451,103 @@ class _RemovePythonCasts(ast.NodeTransformer):
         return node
 
 
+#
+# Class Node transformer to rename variables
+#
+
+class _RenameVariables(ast.NodeTransformer):
+    """
+    Node Transformer class to rename variables
+
+    Attributes:
+        - var2new_name : Map containing the variable names and their new names
+    """
+
+    def __init__(self, var2new_name):
+        """
+        Initialize the RenameVariables internal structures
+        """
+
+        self.var2new_name = var2new_name
+
+    def visit_Name(self, node):
+        if node.id in self.var2new_name.keys():
+            return ast.copy_location(ast.Name(id=self.var2new_name[node.id]), node)
+        return node
+
+
+#
+# Class Node transformer to replace variables by expressions
+#
+
+class _ReplaceVariables(ast.NodeTransformer):
+    """
+    Node Transformer class to replace variables by the given expressions
+
+    Attributes:
+        - var2expr: Map containing the variable names and their new expressions
+    """
+
+    def __init__(self, var2expr):
+        """
+        Initialize the ReplaceVariables internal structures
+        """
+        self.var2expr = var2expr
+
+    def visit_Name(self, node):
+        if node.id in self.var2expr:
+            import copy
+            return copy.deepcopy(self.var2expr[node.id])
+        return node
+
+
+#
+# Class Node transformer to fold constant operations
+#
+
+class _FoldConstants(ast.NodeTransformer):
+    """
+    Node Transformer class to fold the additions, subtractions and multiplications of constants and to remove the
+    neutral operands
+
+    Attributes:
+    """
+
+    def __init__(self):
+        """
+        Initialize the FoldConstants internal structures
+        """
+        pass
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Num):
+            return ast.copy_location(ast.Num(n=-node.operand.n), node)
+        return node
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        left_num = node.left.n if isinstance(node.left, ast.Num) else None
+        right_num = node.right.n if isinstance(node.right, ast.Num) else None
+        if isinstance(node.op, (ast.Add, ast.Sub, ast.Mult)) and left_num is not None and right_num is not None:
+            if isinstance(node.op, ast.Add):
+                value = left_num + right_num
+            elif isinstance(node.op, ast.Sub):
+                value = left_num - right_num
+            else:
+                value = left_num * right_num
+            return ast.copy_location(ast.Num(n=value), node)
+        if isinstance(node.op, (ast.Add, ast.Sub)) and right_num == 0:
+            return node.left
+        if isinstance(node.op, ast.Add) and left_num == 0:
+            return node.right
+        if isinstance(node.op, ast.Mult) and right_num == 1:
+            return node.left
+        if isinstance(node.op, ast.Mult) and left_num == 1:
+            return node.right
+        return node
+
+
 #
 # Class Node transformer to remove Min/Max expressions
 #
@@ -910,42 +1617,130 @@ class Py2PyCOMPSsCalculatorException(Exception):
 
 class TestCalculator(unittest.TestCase):
 
-    def test_extract_isl_line(self):
-        # Create string for full line
-        full_line = "[N, M] -> { [(-6 + M)] : N > 0 and M > 0 }"
-
-        # Parse it
-        parsed_line = Calculator._extract_expr(full_line)
-
-        # Check result
-        expected_parsed_line = "-6 + M"
-        self.assertEqual(parsed_line, expected_parsed_line)
-
-    def test_extract_isl_complex_line(self):
-        # Create string for full line
-        full_line = "[N, M] -> { [(-6 + M)] : N >= 2 and M >= 6 + 2N; [(-1 + 2N)] : N >= 2 and M >= -3 }"
-
-        # Parse it
-        parsed_line = Calculator._extract_expr(full_line)
-
-        # Check result
-        expected_parsed_line = "-6 + M if N >= 2 and M >= 6 + 2*N else -1 + 2*N"
-        self.assertEqual(parsed_line, expected_parsed_line)
-
-    def test_rebuild(self):
-        # Create string for full line
-        expression_str = "-1 + 2 * N"
+    @staticmethod
+    def _parse_expr(expr_str):
+        return ast.parse(expr_str).body[0].value
+
+    def test_is_fully_covered(self):
+        # Accesses are stored as Index nodes
+        def build_access(dims):
+            return [ast.Index(value=TestCalculator._parse_expr(dim)) for dim in dims]
+
+        loops_info = {ast.Name(id="t1"): TestCalculator._parse_expr("range(lb, ub)"),
+                      ast.Name(id="t2"): TestCalculator._parse_expr("range(0, n - 1)")}
+        accesses = [build_access(["t1", "t2"])]
+
+        # The chunk is written completely
+        lbs = [TestCalculator._parse_expr("lb"), TestCalculator._parse_expr("0")]
+        ubs = [TestCalculator._parse_expr("ub"), TestCalculator._parse_expr("min(n - 1, ub + n)")]
+        self.assertTrue(Calculator.is_fully_covered(loops_info, accesses, lbs, ubs))
+
+        # The chunk contains positions that are not written
+        ubs = [TestCalculator._parse_expr("ub + 1"), TestCalculator._parse_expr("n - 1")]
+        self.assertFalse(Calculator.is_fully_covered(loops_info, accesses, lbs, ubs))
+
+        # Only even positions are written
+        accesses = [build_access(["2 * t1", "t2"])]
+        ubs = [TestCalculator._parse_expr("2 * ub - 1"), TestCalculator._parse_expr("n - 1")]
+        lbs = [TestCalculator._parse_expr("2 * lb"), TestCalculator._parse_expr("0")]
+        self.assertFalse(Calculator.is_fully_covered(loops_info, accesses, lbs, ubs))
+
+        # Conditional bounds are not considered
+        ubs = [TestCalculator._parse_expr("ub if n > 0 else 0"), TestCalculator._parse_expr("n")]
+        self.assertFalse(Calculator.is_fully_covered(loops_info, accesses, lbs, ubs))
+
+    def test_lex_bounds_cache(self):
+        def build_problem(loop_ind, access_str):
+            bounds = TestCalculator._parse_expr("range(2 * t0, min(N, 2 * t0 + 2))".replace("t0", loop_ind))
+            access = [ast.Index(value=TestCalculator._parse_expr(access_str))]
+            return {ast.Name(id=loop_ind): bounds}, {"mat": [access]}
+
+        # Loops with the same bounds and accesses share the key even if their indexes have different names
+        loops_info1, accesses_info1 = build_problem("t1", "t1 + 1")
+        loops_info2, accesses_info2 = build_problem("t5", "t5 + 1")
+        loops_info3, accesses_info3 = build_problem("t1", "t1 + 2")
+        key = Calculator._get_canonical_key(loops_info1, accesses_info1)
+        self.assertEqual(key, Calculator._get_canonical_key(loops_info2, accesses_info2))
+        self.assertNotEqual(key, Calculator._get_canonical_key(loops_info3, accesses_info3))
+
+        # Cached results are returned without solving the ISL problem again and cannot be modified by the callers
+        Calculator.clear_cache()
+        Calculator._lex_bounds_cache[key] = ({"mat": [TestCalculator._parse_expr("2 * N")]},
+                                             {"mat": [TestCalculator._parse_expr("2 * N + 1")]})
+        lbs1, ubs1 = Calculator.compute_lex_bounds(loops_info1, accesses_info1)
+        lbs2, ubs2 = Calculator.compute_lex_bounds(loops_info2, accesses_info2)
+        self.assertEqual(ast.dump(lbs1["mat"][0]), ast.dump(lbs2["mat"][0]))
+        self.assertEqual(ast.dump(ubs1["mat"][0]), ast.dump(ubs2["mat"][0]))
+        self.assertIsNot(lbs1["mat"][0], lbs2["mat"][0])
+        self.assertEqual(len(Calculator._lex_bounds_cache), 1)
+        Calculator.clear_cache()
+
+    def test_box_lex_bounds(self):
+        import astor
 
-        # Parse it
-        expr_ast = Calculator._build_ast(expression_str)
+        # Rectangular tile with a stencil access
+        loops_info = {
+            ast.Name(id="t3"): TestCalculator._parse_expr("range(8 * t1, min(m_size - 1, 8 * t1 + 7) + 1)"),
+            ast.Name(id="t4"): TestCalculator._parse_expr("range(0, n)")}
+        accesses = [[TestCalculator._parse_expr(dim) for dim in access]
+                    for access in [("t3 - 1", "t4"), ("t3 + 1", "t4 + 2")]]
+        lbs, ubs = Calculator._compute_box_lex_bounds(loops_info, {"a": accesses})
+        self.assertEqual([astor.to_source(lb).strip() for lb in lbs["a"]], ["(8 * t1 - 1)", "(0)"])
+        self.assertEqual([astor.to_source(ub).strip() for ub in ubs["a"]],
+                         ["(min(m_size - 1, 8 * t1 + 7) + 2)", "(n + 2)"])
+
+        # The upper bounds are exclusive even when several loop indexes are added
+        sum_accesses = [[TestCalculator._parse_expr("t3 + t4 - 8 * t1")]]
+        lbs, ubs = Calculator._compute_box_lex_bounds(loops_info, {"a": sum_accesses})
+        self.assertEqual(eval(astor.to_source(lbs["a"][0]), {"min": min, "t1": 1, "m_size": 20, "n": 4}), 0)
+        self.assertEqual(eval(astor.to_source(ubs["a"][0]), {"min": min, "t1": 1, "m_size": 20, "n": 4}), 11)
+
+        # Accesses with non-unit coefficients are solved by ISL
+        for dim in ["5 - t4", "-t4 + n", "2 * t4 + 1"]:
+            non_unit_accesses = [[TestCalculator._parse_expr("t3"), TestCalculator._parse_expr(dim)]]
+            self.assertIsNone(Calculator._compute_box_lex_bounds(loops_info, {"a": non_unit_accesses}))
+
+        # Non-rectangular domain
+        triangular_loops_info = {ast.Name(id="t3"): TestCalculator._parse_expr("range(0, n)"),
+                                 ast.Name(id="t4"): TestCalculator._parse_expr("range(t3, n)")}
+        self.assertIsNone(Calculator._compute_box_lex_bounds(triangular_loops_info, {"a": accesses}))
+
+        # Non-affine accesses
+        non_affine_accesses = [[TestCalculator._parse_expr("t3 * t4")], [TestCalculator._parse_expr("t3 % 2")]]
+        self.assertIsNone(Calculator._compute_box_lex_bounds(loops_info, {"a": non_affine_accesses}))
+
+    def test_pw_aff_to_ast(self):
+        import islpy as isl
+        import math
+        import astor
 
-        # Check result
+        # Affine piece
+        pw_aff = isl.PwAff("[N, M] -> { [(-1 + 2N)] : N > 0 and M > 0 }")
         expected_expr_ast = ast.BinOp(left=ast.Num(n=-1),
                                       op=ast.Add(),
                                       right=ast.BinOp(left=ast.Num(n=2),
                                                       op=ast.Mult(),
                                                       right=ast.Name(id="N", ctx=ast.Load())))
-        self.assertEqual(ast.dump(expr_ast), ast.dump(expected_expr_ast))
+        self.assertEqual(ast.dump(Calculator._pw_aff_to_ast(pw_aff)), ast.dump(expected_expr_ast))
+
+        # Several pieces, existential and modulo conditions
+        isl_sets = [("[N, M] -> { [d] : 0 <= d < N and 0 <= d < M }", lambda n, m: min(n, m) - 1),
+                    ("[N, M] -> { [d] : exists (e : d = 2e and 0 <= d < N) }", lambda n, m: 2 * ((n - 1) // 2)),
+                    ("[N, M] -> { [d] : exists (e : N = 3e + 1) and 0 <= d < N + 2 * M }",
+                     lambda n, m: n + 2 * m - 1 if (n - 1) % 3 == 0 else None),
+                    ("[N, M] -> { [d] : 2d >= N and 3d <= 2N }",
+                     lambda n, m: (2 * n) // 3 if 2 * ((2 * n) // 3) >= n else None)]
+        for isl_set_str, expected_max in isl_sets:
+            pw_aff = isl.Set(isl_set_str).lexmax_pw_multi_aff().get_pw_aff(0)
+            expr_str = astor.to_source(Calculator._pw_aff_to_ast(pw_aff)).strip()
+            domain_str = astor.to_source(Calculator._set_to_ast(pw_aff.domain())).strip()
+            for n in range(1, 10):
+                for m in range(1, 4):
+                    env = {"math": math, "int": int, "float": float, "N": n, "M": m}
+                    if eval(domain_str, {}, env):
+                        self.assertEqual(eval(expr_str, {}, env), expected_max(n, m))
+                    else:
+                        self.assertIsNone(expected_max(n, m))
 
     def test_extract_exprs(self):
         # Create main AST node
@@ -1044,6 +1839,8 @@ class TestCalculator(unittest.TestCase):
         self.assertEqual(str(ast.dump(exprs[3])), str(ast.dump(expr3)))
 
     def test_compute_lex_minmax(self):
+        import islpy as isl
+
         # Create test access sets for 2d matrix mat
         a1 = [ast.Num(n=1), ast.Num(n=1)]
         a2 = [ast.Num(n=2), ast.Num(n=2)]
@@ -1183,83 +1980,20 @@ class TestCalculator(unittest.TestCase):
                                              right=ast.Num(n=5)))]
         subscript_accesses_info = {"mat": [access1, access2]}
 
-        # Call calculator lexmin/max
-        subs2glob_min, subs2glob_max = Calculator.compute_lex_bounds(loops_info, subscript_accesses_info)
+        # Call calculator lexmin/max (through ISL)
+        subs2glob_min, subs2glob_max = Calculator._compute_lex_bounds(loops_info, subscript_accesses_info)
 
         # Check global results
         self.assertEqual(str(ast.dump(subs2glob_min["mat"][0])), str(ast.dump(ast.Num(n=-5))))
         self.assertEqual(str(ast.dump(subs2glob_min["mat"][1])), str(ast.dump(ast.Num(n=-5))))
 
-        a11 = ast.IfExp(test=ast.BoolOp(op=ast.And(), values=[
-            ast.Compare(left=ast.Name(id='N', ctx=ast.Load()),
-                        ops=[ast.GtE()],
-                        comparators=[ast.Num(n=0)]),
-            ast.Compare(left=ast.BinOp(left=ast.Num(n=2), op=ast.Mult(), right=ast.Name(id='N', ctx=ast.Load())),
-                        ops=[ast.LtE()],
-                        comparators=[ast.BinOp(left=ast.Num(n=-7),
-                                               op=ast.Add(),
-                                               right=ast.Name(id='M', ctx=ast.Load()))])]),
-                        body=ast.BinOp(left=ast.Num(n=-5),
-                                       op=ast.Add(),
-                                       right=ast.Name(id='M', ctx=ast.Load())),
-                        orelse=ast.BinOp(left=ast.Num(n=1),
-                                         op=ast.Add(),
-                                         right=ast.BinOp(left=ast.Num(n=2),
-                                                         op=ast.Mult(),
-                                                         right=ast.Name(id='N', ctx=ast.Load()))))
-
-        a12 = ast.IfExp(test=ast.BoolOp(op=ast.And(), values=[
-            ast.Compare(left=ast.Name(id='N', ctx=ast.Load()),
-                        ops=[ast.GtE()],
-                        comparators=[ast.Num(n=0)]),
-            ast.Compare(left=ast.Num(n=0),
-                        ops=[ast.LtE(), ast.LtE()],
-                        comparators=[ast.Name(id='M', ctx=ast.Load()),
-                                     ast.BinOp(left=ast.Num(n=6),
-                                               op=ast.Add(),
-                                               right=ast.BinOp(left=ast.Num(n=2),
-                                                               op=ast.Mult(),
-                                                               right=ast.Name(id='N', ctx=ast.Load())))])]),
-                        body=ast.BinOp(left=ast.Num(n=1),
-                                       op=ast.Add(),
-                                       right=ast.BinOp(left=ast.Num(n=2),
-                                                       op=ast.Mult(),
-                                                       right=ast.Name(id='N', ctx=ast.Load()))),
-                        orelse=ast.BinOp(left=ast.Num(n=-5), op=ast.Add(), right=ast.Name(id='M', ctx=ast.Load())))
-
-        a21 = ast.IfExp(test=ast.BoolOp(op=ast.And(), values=[
-            ast.Compare(left=ast.Name(id='N', ctx=ast.Load()),
-                        ops=[ast.GtE()],
-                        comparators=[ast.Num(n=0)]),
-            ast.Compare(left=ast.BinOp(left=ast.Num(n=2), op=ast.Mult(), right=ast.Name(id='N', ctx=ast.Load())),
-                        ops=[ast.LtE()],
-                        comparators=[ast.BinOp(left=ast.Num(n=-7),
-                                               op=ast.Add(),
-                                               right=ast.Name(id='M', ctx=ast.Load()))])]),
-                        body=ast.BinOp(left=ast.Num(n=-5),
-                                       op=ast.Add(),
-                                       right=ast.Name(id='N', ctx=ast.Load())),
-                        orelse=ast.BinOp(left=ast.Num(n=-1),
-                                         op=ast.Add(),
-                                         right=ast.Name(id='M', ctx=ast.Load())))
-
-        a22 = ast.IfExp(test=ast.BoolOp(op=ast.And(), values=[
-            ast.Compare(left=ast.Name(id='N', ctx=ast.Load()),
-                        ops=[ast.GtE()],
-                        comparators=[ast.Num(n=0)]),
-            ast.Compare(left=ast.Num(n=0),
-                        ops=[ast.LtE(), ast.LtE()],
-                        comparators=[ast.Name(id='M', ctx=ast.Load()),
-                                     ast.BinOp(left=ast.Num(n=6),
-                                               op=ast.Add(),
-                                               right=ast.BinOp(left=ast.Num(n=2),
-                                                               op=ast.Mult(),
-                                                               right=ast.Name(id='N', ctx=ast.Load())))])]),
-                        body=ast.BinOp(left=ast.Num(n=-1), op=ast.Add(), right=ast.Name(id='M', ctx=ast.Load())),
-                        orelse=ast.BinOp(left=ast.Num(n=-5), op=ast.Add(), right=ast.Name(id='N', ctx=ast.Load())))
-
-        self.assertIn(str(ast.dump(subs2glob_max["mat"][0])), [str(ast.dump(a11)), str(ast.dump(a12))])
-        self.assertIn(str(ast.dump(subs2glob_max["mat"][1])), [str(ast.dump(a21)), str(ast.dump(a22))])
+        import astor
+        a11 = "(-5 + M if N >= 0 and M >= 7 + 2 * N else 1 + 2 * N)"
+        a12 = "(1 + 2 * N if N >= 0 and M >= 0 and M <= 6 + 2 * N else -5 + M)"
+        a21 = "(-5 + N if N >= 0 and M >= 7 + 2 * N else -1 + M)"
+        a22 = "(-1 + M if N >= 0 and M >= 0 and M <= 6 + 2 * N else -5 + N)"
+        self.assertIn(astor.to_source(subs2glob_max["mat"][0]).strip(), [a11, a12])
+        self.assertIn(astor.to_source(subs2glob_max["mat"][1]).strip(), [a21, a22])
 
 
 #
@@ -0,0 +1,285 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+import math
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Cost Model class
+#
+
+class CostModel(object):
+    """
+    Chooses the depth of the loop to taskify inside a loop nest. The number of iterations of each loop is estimated
+    by evaluating its bounds with the expected parameter values (the enclosing loop indexes take the middle value of
+    their range). Taskifying the loop of depth d creates one task per iteration of the d - 1 outer loops, each one
+    running all the iterations of the remaining loops. The chosen depth is the one whose estimated task duration is
+    closest to the target duration among the depths creating at least one task per worker.
+
+    Attributes:
+        - params: Map containing the parameter names and their expected values
+            + type: dict<str, int>
+        - iteration_cost: Estimated duration (in seconds) of an iteration of the innermost loop
+            + type: float
+        - task_duration: Target duration (in seconds) of a task
+            + type: float
+        - workers: Expected number of workers
+            + type: int
+    """
+
+    # Static attribute containing the functions that may appear on the loop bounds
+    _bound_functions = {"math": math, "int": int, "float": float, "min": min, "max": max, "abs": abs}
+
+    def __init__(self, params=None, iteration_cost=1e-5, task_duration=0.1, workers=1):
+        """
+        Initializes the CostModel internal structures
+
+        :param params: Map containing the parameter names and their expected values (default None)
+            + type: dict<str, int>
+        :param iteration_cost: Estimated duration (in seconds) of an iteration of the innermost loop (default 1e-5)
+            + type: float
+        :param task_duration: Target duration (in seconds) of a task (default 0.1)
+            + type: float
+        :param workers: Expected number of workers (default 1)
+            + type: int
+        """
+
+        self.params = params if params is not None else {}
+        self.iteration_cost = iteration_cost
+        self.task_duration = task_duration
+        self.workers = workers
+
+    def get_taskify_depth(self, main_loop):
+        """
+        Returns the depth (starting at 1 for the main loop) of the loop to taskify inside the given loop nest
+
+        :param main_loop: Main loop of the nest
+            + type: AST.For
+        :return depth: Depth of the loop to taskify or None if the iterations of the loops cannot be estimated
+            + type: int
+        """
+
+        trip_counts = self.get_trip_counts(main_loop)
+        if trip_counts is None:
+            return None
+
+        best_depth = len(trip_counts)
+        best_distance = None
+        for depth in range(1, len(trip_counts) + 1):
+            num_tasks = CostModel._product(trip_counts[:depth - 1])
+            duration = CostModel._product(trip_counts[depth - 1:]) * self.iteration_cost
+            if num_tasks < self.workers:
+                # Not enough tasks to feed all the workers
+                continue
+            distance = abs(math.log(max(duration, 1e-12) / self.task_duration))
+            if best_distance is None or distance < best_distance:
+                best_depth = depth
+                best_distance = distance
+
+        if __debug__:
+            logger.debug("[CostModel] Trip counts " + str(trip_counts) + " -> taskify depth " + str(best_depth))
+
+        return best_depth
+
+    def get_trip_counts(self, main_loop):
+        """
+        Returns the estimated number of iterations of each loop of the deepest path of the given loop nest
+
+        :param main_loop: Main loop of the nest
+            + type: AST.For
+        :return trip_counts: List of estimated number of iterations per depth or None if they cannot be estimated
+            + type: List<int>
+        """
+
+        env = dict(CostModel._bound_functions)
+        env.update(self.params)
+        trip_counts = []
+        for loop, assigns in CostModel.get_loop_path(main_loop):
+            try:
+                # Evaluate the CLooG variables assigned before the loop and its bounds
+                for assign in assigns:
+                    env[assign.targets[0].id] = CostModel._evaluate(assign.value, env)
+                range_args = [CostModel._evaluate(arg, env) for arg in loop.iter.args]
+            except Exception as e:
+                if __debug__:
+                    logger.debug("[CostModel] Cannot estimate the loop iterations: " + str(e))
+                return None
+            if len(range_args) == 1:
+                range_args = [0] + range_args
+            step = range_args[2] if len(range_args) > 2 else 1
+            trip_counts.append(max(int((range_args[1] - range_args[0]) / step), 1))
+            # Enclosed loops are evaluated at the middle iteration of the current loop
+            env[loop.target.id] = range_args[0] + step * ((trip_counts[-1] - 1) // 2)
+        return trip_counts
+
+    @staticmethod
+    def get_loop_path(main_loop):
+        """
+        Returns the loops of the deepest path of the given loop nest together with the CLooG assignments preceding
+        each one of them
+
+        :param main_loop: Main loop of the nest
+            + type: AST.For
+        :return loop_path: List of tuples containing a loop and the list of assignments preceding it
+            + type: List<Tuple(AST.For, List<AST.Assign>)>
+        """
+
+        loop_path = [(main_loop, [])]
+        current_loop = main_loop
+        while True:
+            inner_loops = CostModel._get_inner_loops(current_loop.body, [])
+            if len(inner_loops) == 0:
+                break
+            inner_loop, assigns = max(inner_loops, key=lambda loop_assigns: CostModel._get_height(loop_assigns[0]))
+            loop_path.append((inner_loop, assigns))
+            current_loop = inner_loop
+        return loop_path
+
+    @staticmethod
+    def _get_inner_loops(statements, assigns):
+        """
+        Returns the loops directly nested in the given statements (conditionals are traversed)
+
+        :param statements: List of statements
+            + type: List<AST.Node>
+        :param assigns: Assignments to simple variables preceding the statements
+            + type: List<AST.Assign>
+        :return inner_loops: List of tuples containing a loop and the list of assignments preceding it
+            + type: List<Tuple(AST.For, List<AST.Assign>)>
+        """
+
+        inner_loops = []
+        assigns = list(assigns)
+        for statement in statements:
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                    and isinstance(statement.targets[0], ast.Name):
+                assigns.append(statement)
+            elif isinstance(statement, ast.For):
+                if CostModel._is_range_loop(statement):
+                    inner_loops.append((statement, list(assigns)))
+            elif isinstance(statement, ast.If):
+                inner_loops.extend(CostModel._get_inner_loops(statement.body + statement.orelse, assigns))
+        return inner_loops
+
+    @staticmethod
+    def _get_height(loop):
+        """
+        Returns the number of nested loops of the deepest path starting at the given loop
+
+        :param loop: Loop
+            + type: AST.For
+        :return height: Number of loops
+            + type: int
+        """
+
+        inner_loops = CostModel._get_inner_loops(loop.body, [])
+        return 1 + max([CostModel._get_height(inner_loop) for inner_loop, _ in inner_loops] + [0])
+
+    @staticmethod
+    def _is_range_loop(loop):
+        """
+        Returns whether the given loop iterates over a range with a simple index or not
+
+        :param loop: Loop
+            + type: AST.For
+        :return: True if the loop is of the form for i in range(...), False otherwise
+            + type: boolean
+        """
+
+        return isinstance(loop.target, ast.Name) and isinstance(loop.iter, ast.Call) \
+            and isinstance(loop.iter.func, ast.Name) and loop.iter.func.id == "range" \
+            and 1 <= len(loop.iter.args) <= 3
+
+    @staticmethod
+    def _evaluate(expr, env):
+        """
+        Evaluates the given expression
+
+        :param expr: AST expression
+            + type: AST.Node
+        :param env: Map containing the variable names and their values
+            + type: dict
+        :return: Value of the expression
+            + type: int
+        """
+
+        import astor
+        return eval(astor.to_source(expr).strip(), {"__builtins__": {}}, env)
+
+    @staticmethod
+    def _product(values):
+        """
+        Returns the product of the given values
+
+        :param values: List of values
+            + type: List<int>
+        :return: Product of the values (1 for an empty list)
+            + type: int
+        """
+
+        result = 1
+        for value in values:
+            result = result * value
+        return result
+
+
+#
+# UNIT TESTS
+#
+
+class TestCostModel(unittest.TestCase):
+
+    _tiled_nest = "for t1 in range(0, int(math.floor(float(n - 1) / float(32))) + 1):\n" \
+                  "    for t2 in range(0, int(math.floor(float(n - 1) / float(32))) + 1):\n" \
+                  "        lbp = 32 * t1\n" \
+                  "        ubp = min(n - 1, 32 * t1 + 31)\n" \
+                  "        for t3 in range(lbp, ubp + 1):\n" \
+                  "            lbv = 32 * t2\n" \
+                  "            ubv = min(n - 1, 32 * t2 + 31)\n" \
+                  "            for t4 in range(lbv, ubv + 1):\n" \
+                  "                S1(t3, t4)\n"
+
+    def test_trip_counts(self):
+        main_loop = ast.parse(TestCostModel._tiled_nest).body[0]
+        self.assertEqual(len(CostModel.get_loop_path(main_loop)), 4)
+        self.assertEqual(CostModel(params={"n": 1024}).get_trip_counts(main_loop), [32, 32, 32, 32])
+        self.assertEqual(CostModel(params={"n": 40}).get_trip_counts(main_loop), [2, 2, 32, 32])
+        # Unknown parameters
+        self.assertIsNone(CostModel().get_trip_counts(main_loop))
+
+    def test_taskify_depth(self):
+        main_loop = ast.parse(TestCostModel._tiled_nest).body[0]
+        # Cheap iterations: one task per tile
+        cm = CostModel(params={"n": 1024}, iteration_cost=1e-4, task_duration=0.1, workers=4)
+        self.assertEqual(cm.get_taskify_depth(main_loop), 3)
+        # Expensive iterations: one task per row of a tile
+        cm = CostModel(params={"n": 1024}, iteration_cost=1e-1, task_duration=0.1, workers=4)
+        self.assertEqual(cm.get_taskify_depth(main_loop), 4)
+        # Very cheap iterations: one task per row of tiles (while keeping all the workers busy)
+        cm = CostModel(params={"n": 1024}, iteration_cost=1e-8, task_duration=1, workers=16)
+        self.assertEqual(cm.get_taskify_depth(main_loop), 2)
+        # Unknown parameters
+        self.assertIsNone(CostModel(workers=4).get_taskify_depth(main_loop))
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
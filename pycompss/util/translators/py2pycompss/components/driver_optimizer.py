@@ -0,0 +1,689 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Driver Optimizer class
+#
+
+class DriverOptimizer(object):
+    """
+    Applies a pipeline of optimization passes over the generated driver code (the code executed by the master process
+    to spawn the tasks): exact integer floor/ceil divisions, common subexpression elimination of loop bounds,
+    loop-invariant bound hoisting, and dead CLooG store elimination.
+
+    Attributes:
+        - _cloog_vars: Static list of CLooG variables
+            + type: list
+        - _pure_funcs: Static list of function names without side effects that can appear on loop bounds
+            + type: list
+        - hoisted_counter: Number of hoisted expressions
+            + type: int
+    """
+
+    # Static attribute List of control flow CLooG variables
+    _cloog_vars = ["lbp", "ubp", "lbv", "ubv"]
+
+    # Static attribute List of functions without side effects
+    _pure_funcs = ["min", "max", "int", "float", "abs", "math.floor", "math.ceil"]
+
+    def __init__(self):
+        """
+        Initializes the DriverOptimizer internal structures
+        """
+
+        self.hoisted_counter = 0
+
+    def optimize(self, statements):
+        """
+        Optimizes the given list of driver statements
+
+        :param statements: List of driver statements
+            + type: List<AST.Node>
+        :return: New list of driver statements
+            + type: List<AST.Node>
+        """
+
+        # Integer floor and ceil divisions
+        statements = [_RewriteIntegerDivisions().visit(s) for s in statements]
+
+        # Common subexpression elimination of loop bounds
+        DriverOptimizer._eliminate_common_subexpressions(statements)
+
+        # Loop-invariant bound hoisting
+        statements = self._hoist_invariants(statements)
+
+        # Dead CLooG store elimination (CLooG variables are not used after the driver code)
+        statements, _ = DriverOptimizer._eliminate_dead_stores(statements, set())
+
+        if __debug__:
+            import astor
+            from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
+            logger.debug("Optimized driver code:")
+            for s in statements:
+                logger.debug(astor.to_source(s, pretty_source=PyCOMPSsSourceGen.long_line_ps))
+
+        return statements
+
+    #
+    # Common subexpression elimination
+    #
+
+    @staticmethod
+    def _eliminate_common_subexpressions(statements):
+        """
+        Replaces the loop bounds and conditions previously assigned to a CLooG variable by the variable itself.
+        Modifies the given statements in place
+
+        :param statements: List of statements
+            + type: List<AST.Node>
+        """
+
+        # Map of available expressions: dump -> (variable name, variables used by the expression)
+        available = {}
+        for statement in statements:
+            # Replace available expressions on loop bounds and conditions
+            replacer = _ReplaceExpressions(available)
+            if isinstance(statement, ast.For):
+                statement.iter = replacer.visit(statement.iter)
+            elif isinstance(statement, (ast.If, ast.While)):
+                statement.test = replacer.visit(statement.test)
+
+            # Invalidate the expressions depending on modified variables
+            assigned = DriverOptimizer._get_assigned_names(statement)
+            for key, (var_name, used_names) in list(available.items()):
+                if var_name in assigned or len(used_names & assigned) > 0:
+                    del available[key]
+
+            # Register new expressions
+            if DriverOptimizer._is_cloog_assign(statement) and not DriverOptimizer._is_trivial(statement.value):
+                var_name = statement.targets[0].id
+                used_names = DriverOptimizer._get_used_names(statement.value)
+                if var_name not in used_names:
+                    available[ast.dump(statement.value)] = (var_name, used_names)
+
+            # Process inner blocks (loop bodies are processed from scratch because they are executed several times)
+            if isinstance(statement, (ast.For, ast.If, ast.While)):
+                DriverOptimizer._eliminate_common_subexpressions(statement.body)
+                DriverOptimizer._eliminate_common_subexpressions(statement.orelse)
+
+    #
+    # Loop-invariant hoisting
+    #
+
+    def _hoist_invariants(self, statements):
+        """
+        Moves the loop-invariant bound expressions before the loops. Only the expensive expressions (see is_expensive)
+        are hoisted: the cheap invariant CLooG bounds (e.g. ubp = n_size - 1) are deliberately left in place because
+        the hoisted assignment would cost as much as recomputing them. The expressions already assigned to a CLooG
+        variable before the loop reuse it (or are computed there once when the loop modifies the variable)
+
+        :param statements: List of statements
+            + type: List<AST.Node>
+        :return: New list of statements
+            + type: List<AST.Node>
+        """
+
+        new_statements = []
+        # Map of the expressions assigned to CLooG variables before the current statement: dump -> (assign, used names)
+        available = {}
+        for statement in statements:
+            if isinstance(statement, ast.For):
+                # Hoist the bounds of the inner statements that do not depend on any variable modified in the loop
+                hoisted = []
+                hi = _HoistInvariantBounds(self, DriverOptimizer._get_assigned_names(statement), hoisted, available)
+                statement.body = [hi.visit(s) for s in statement.body]
+                # The expressions already assigned before the loop are stored in the new variable where they are
+                # first computed (the assignment copies the new variable)
+                for assign, hoisted_assign in hi.relocated:
+                    index = next(i for i, s in enumerate(new_statements) if s is assign)
+                    new_statements.insert(index, hoisted_assign)
+                new_statements.extend(hoisted)
+                # Process inner loops
+                statement.body = self._hoist_invariants(statement.body)
+            elif isinstance(statement, (ast.If, ast.While)):
+                statement.body = self._hoist_invariants(statement.body)
+                statement.orelse = self._hoist_invariants(statement.orelse)
+            new_statements.append(statement)
+
+            # Invalidate the expressions depending on modified variables and register the new ones
+            assigned = DriverOptimizer._get_assigned_names(statement)
+            for key, (assign, used_names) in list(available.items()):
+                if assign.targets[0].id in assigned or len(used_names & assigned) > 0:
+                    del available[key]
+            if DriverOptimizer._is_cloog_assign(statement) and not DriverOptimizer._is_trivial(statement.value):
+                used_names = DriverOptimizer._get_used_names(statement.value)
+                if statement.targets[0].id not in used_names:
+                    available[ast.dump(statement.value)] = (statement, used_names)
+        return new_statements
+
+    def get_next_hoisted_var(self):
+        """
+        Returns the next variable name to store a hoisted expression
+
+        :return: Variable name
+            + type: str
+        """
+
+        self.hoisted_counter += 1
+        return "bnd" + str(self.hoisted_counter)
+
+    @staticmethod
+    def is_pure(node):
+        """
+        Determines whether the given expression has no side effects
+
+        :param node: AST node of the expression
+            + type: AST.Node
+        :return: True if the expression only performs arithmetic operations and calls to pure functions
+            + type: boolean
+        """
+
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                import astor
+                func_name = astor.to_source(child.func).strip()
+                if func_name not in DriverOptimizer._pure_funcs:
+                    return False
+            elif isinstance(child, (ast.Subscript, ast.Attribute)) and not DriverOptimizer._is_math_attr(child):
+                return False
+            elif isinstance(child, (ast.ListComp, ast.GeneratorExp, ast.Lambda)):
+                return False
+        return True
+
+    @staticmethod
+    def _is_math_attr(node):
+        """
+        Determines whether the given node is an attribute of the math module
+
+        :param node: AST node
+            + type: AST.Node
+        :return: True if the node is math.<attr>, False otherwise
+            + type: boolean
+        """
+
+        return isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "math"
+
+    @staticmethod
+    def is_expensive(node):
+        """
+        Determines whether the given expression is worth hoisting. The additions, subtractions and multiplications
+        are not hoisted on their own
+
+        :param node: AST node of the expression
+            + type: AST.Node
+        :return: True if the expression contains calls or divisions
+            + type: boolean
+        """
+
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                return True
+            if isinstance(child, ast.BinOp) and isinstance(child.op, (ast.Div, ast.FloorDiv, ast.Mod)):
+                return True
+        return False
+
+    #
+    # Dead store elimination
+    #
+
+    @staticmethod
+    def _eliminate_dead_stores(statements, live_after):
+        """
+        Removes the assignments to CLooG variables whose values are never read
+
+        :param statements: List of statements
+            + type: List<AST.Node>
+        :param live_after: Set of CLooG variables that are live after the statements
+            + type: set<str>
+        :return: A tuple containing the new list of statements and the set of CLooG variables that are live before
+         the statements
+            + type: Tuple(List<AST.Node>, set<str>)
+        """
+
+        live = set(live_after)
+        new_statements = []
+        for statement in reversed(statements):
+            if DriverOptimizer._is_cloog_assign(statement):
+                var_name = statement.targets[0].id
+                if var_name not in live:
+                    # Dead store
+                    continue
+                live.discard(var_name)
+                live |= DriverOptimizer._get_cloog_reads(statement.value)
+            elif isinstance(statement, ast.For) and len(statement.orelse) == 0:
+                # Compute the live variables at the beginning of the loop body until a fixed point is reached
+                body_live = set()
+                while True:
+                    _, new_body_live = DriverOptimizer._eliminate_dead_stores(statement.body, live | body_live)
+                    if new_body_live == body_live:
+                        break
+                    body_live = new_body_live
+                statement.body, _ = DriverOptimizer._eliminate_dead_stores(statement.body, live | body_live)
+                if len(statement.body) == 0:
+                    statement.body = [ast.Pass()]
+                live = live | body_live | DriverOptimizer._get_cloog_reads(statement.iter)
+            elif isinstance(statement, ast.If):
+                statement.body, body_live = DriverOptimizer._eliminate_dead_stores(statement.body, live)
+                statement.orelse, orelse_live = DriverOptimizer._eliminate_dead_stores(statement.orelse, live)
+                if len(statement.body) == 0:
+                    statement.body = [ast.Pass()]
+                live = body_live | orelse_live | DriverOptimizer._get_cloog_reads(statement.test)
+            else:
+                # Any other statement is kept intact
+                live |= DriverOptimizer._get_cloog_reads(statement)
+            new_statements.append(statement)
+        new_statements.reverse()
+        return new_statements, live
+
+    #
+    # Auxiliary methods
+    #
+
+    @staticmethod
+    def _is_cloog_assign(statement):
+        """
+        Determines whether the given statement is an assignment to a CLooG variable
+
+        :param statement: AST node
+            + type: AST.Node
+        :return: True if the statement assigns a CLooG variable, False otherwise
+            + type: boolean
+        """
+
+        return isinstance(statement, ast.Assign) and len(statement.targets) == 1 and \
+            isinstance(statement.targets[0], ast.Name) and statement.targets[0].id in DriverOptimizer._cloog_vars
+
+    @staticmethod
+    def _is_trivial(node):
+        """
+        Determines whether the given expression is a plain variable or number
+
+        :param node: AST node of the expression
+            + type: AST.Node
+        :return: True if the expression is a Name or a Num node, False otherwise
+            + type: boolean
+        """
+
+        return isinstance(node, (ast.Name, ast.Num))
+
+    @staticmethod
+    def _get_used_names(node):
+        """
+        Returns the names of the variables used by the given expression
+
+        :param node: AST node of the expression
+            + type: AST.Node
+        :return: Set of variable names
+            + type: set<str>
+        """
+
+        return set(child.id for child in ast.walk(node) if isinstance(child, ast.Name))
+
+    @staticmethod
+    def _get_assigned_names(node):
+        """
+        Returns the names of the variables assigned inside the given node (including loop and comprehension indexes)
+
+        :param node: AST node
+            + type: AST.Node
+        :return: Set of variable names
+            + type: set<str>
+        """
+
+        assigned = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Assign):
+                for target in child.targets:
+                    assigned |= DriverOptimizer._get_used_names(target)
+            elif isinstance(child, (ast.AugAssign, ast.For, ast.comprehension)):
+                assigned |= DriverOptimizer._get_used_names(child.target)
+        return assigned
+
+    @staticmethod
+    def _get_cloog_reads(node):
+        """
+        Returns the CLooG variables used inside the given node
+
+        :param node: AST node
+            + type: AST.Node
+        :return: Set of CLooG variable names
+            + type: set<str>
+        """
+
+        reads = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and child.id in DriverOptimizer._cloog_vars:
+                reads.add(child.id)
+        return reads
+
+
+#
+# Class Node transformer for integer divisions
+#
+
+class _RewriteIntegerDivisions(ast.NodeTransformer):
+    """
+    Node Transformer class to replace the float-based floor and ceil divisions generated by CLooG:
+        - int(math.floor(float(a) / float(b))) by a // b
+        - int(math.ceil(float(a) / float(b))) by -(-a // b)
+    """
+
+    def visit_Call(self, node):
+        """
+        Replaces the float-based divisions by exact integer divisions
+
+        :param node: Call AST node
+        :return new_node: New AST node representing the integer division or the same node
+        """
+
+        self.generic_visit(node)
+
+        # Match int(math.<floor|ceil>(float(a) / float(b)))
+        if not _RewriteIntegerDivisions._is_call(node, "int") or len(node.args) != 1:
+            return node
+        rounding = node.args[0]
+        if not isinstance(rounding, ast.Call) or len(rounding.args) != 1 or \
+                not isinstance(rounding.func, ast.Attribute) or not isinstance(rounding.func.value, ast.Name) or \
+                rounding.func.value.id != "math" or rounding.func.attr not in ["floor", "ceil"]:
+            return node
+        division = rounding.args[0]
+        if not isinstance(division, ast.BinOp) or not isinstance(division.op, ast.Div):
+            return node
+        if not _RewriteIntegerDivisions._is_call(division.left, "float") or \
+                not _RewriteIntegerDivisions._is_call(division.right, "float"):
+            return node
+        numerator = division.left.args[0]
+        denominator = division.right.args[0]
+
+        # Build the integer division
+        if rounding.func.attr == "floor":
+            new_node = ast.BinOp(left=numerator, op=ast.FloorDiv(), right=denominator)
+        else:
+            new_node = ast.UnaryOp(op=ast.USub(),
+                                   operand=ast.BinOp(left=ast.UnaryOp(op=ast.USub(), operand=numerator),
+                                                     op=ast.FloorDiv(),
+                                                     right=denominator))
+        return ast.copy_location(new_node, node)
+
+    @staticmethod
+    def _is_call(node, func_name):
+        """
+        Determines whether the given node is a call to the given function with a single argument
+
+        :param node: AST node
+        :param func_name: Function name
+        :return: True if the node is a call to func_name with one argument, False otherwise
+        """
+
+        return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == func_name and \
+            len(node.args) == 1
+
+
+#
+# Class Node transformer for available expressions
+#
+
+class _ReplaceExpressions(ast.NodeTransformer):
+    """
+    Node Transformer class to replace the available expressions by the variables storing them
+
+    Attributes:
+        - available: Map containing the dump of the available expressions and the variables storing them
+    """
+
+    def __init__(self, available):
+        """
+        Initializes the _ReplaceExpressions internal structures
+
+        :param available: Map containing the dump of the available expressions and the variables storing them
+        """
+
+        self.available = available
+
+    def visit(self, node):
+        """
+        Replaces the node if it is an available expression. Processes its children otherwise
+
+        :param node: AST node
+        :return new_node: Variable storing the expression or the same node
+        """
+
+        if isinstance(node, ast.expr) and not DriverOptimizer._is_trivial(node):
+            key = ast.dump(node)
+            if key in self.available.keys():
+                var_name, _ = self.available[key]
+                return ast.copy_location(ast.Name(id=var_name), node)
+        return self.generic_visit(node)
+
+
+#
+# Class Node transformer for loop-invariant bounds
+#
+
+class _HoistInvariantBounds(ast.NodeTransformer):
+    """
+    Node Transformer class to replace the loop-invariant bound expressions by new variables
+
+    Attributes:
+        - optimizer: DriverOptimizer instance providing the new variable names
+        - loop_assigned: Set of variable names assigned inside the loop
+        - hoisted: List of assignments of the hoisted expressions
+        - available: Map containing the dump of the expressions assigned to CLooG variables before the loop and their
+         assignments
+        - relocated: List of the assignments before the loop storing a hoisted expression and the assignments of the
+         new variables inserted before them
+    """
+
+    def __init__(self, optimizer, loop_assigned, hoisted, available):
+        """
+        Initializes the _HoistInvariantBounds internal structures
+
+        :param optimizer: DriverOptimizer instance providing the new variable names
+        :param loop_assigned: Set of variable names assigned inside the loop
+        :param hoisted: List where the assignments of the hoisted expressions are stored
+        :param available: Map containing the dump of the expressions assigned to CLooG variables before the loop and
+         their assignments
+        """
+
+        self.optimizer = optimizer
+        self.loop_assigned = loop_assigned
+        self.hoisted = hoisted
+        self.available = available
+        self.relocated = []
+
+    def visit_Assign(self, node):
+        """
+        Hoists the invariant parts of the values assigned to CLooG variables
+
+        :param node: Assign AST node
+        :return new_node: The modified node
+        """
+
+        self.generic_visit(node)
+        if DriverOptimizer._is_cloog_assign(node):
+            node.value = self._hoist(node.value)
+        return node
+
+    def visit_Call(self, node):
+        """
+        Hoists the invariant parts of the range arguments
+
+        :param node: Call AST node
+        :return new_node: The modified node
+        """
+
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Name) and node.func.id == "range":
+            node.args = [self._hoist(arg) for arg in node.args]
+        return node
+
+    def _hoist(self, node):
+        """
+        Hoists the biggest invariant sub-expressions of the given expression
+
+        :param node: AST node of the expression
+        :return new_node: The new expression
+        """
+
+        if DriverOptimizer.is_expensive(node) and DriverOptimizer.is_pure(node) and \
+                len(DriverOptimizer._get_used_names(node) & self.loop_assigned) == 0:
+            # Reuse previously hoisted expressions
+            key = ast.dump(node)
+            for assign in self.hoisted + [hoisted_assign for _, hoisted_assign in self.relocated]:
+                if ast.dump(assign.value) == key:
+                    return ast.copy_location(ast.Name(id=assign.targets[0].id), node)
+            # Reuse the variable assigned before the loop when the loop does not modify it
+            if key in self.available.keys() and self.available[key][0].targets[0].id not in self.loop_assigned:
+                return ast.copy_location(ast.Name(id=self.available[key][0].targets[0].id), node)
+            var_name = self.optimizer.get_next_hoisted_var()
+            hoisted_assign = ast.Assign(targets=[ast.Name(id=var_name)], value=node)
+            if key in self.available.keys():
+                # The loop modifies the variable: compute the expression once in the new variable and copy it to the
+                # variable assigned before the loop
+                assign, _ = self.available[key]
+                assign.value = ast.copy_location(ast.Name(id=var_name), assign.value)
+                del self.available[key]
+                self.relocated.append((assign, hoisted_assign))
+            else:
+                self.hoisted.append(hoisted_assign)
+            return ast.copy_location(ast.Name(id=var_name), node)
+
+        # Look for invariant sub-expressions
+        if isinstance(node, ast.BinOp):
+            node.left = self._hoist(node.left)
+            node.right = self._hoist(node.right)
+        elif isinstance(node, ast.UnaryOp):
+            node.operand = self._hoist(node.operand)
+        elif isinstance(node, ast.Call):
+            node.args = [self._hoist(arg) for arg in node.args]
+        return node
+
+
+#
+# UNIT TESTS
+#
+
+class TestDriverOptimizer(unittest.TestCase):
+
+    @staticmethod
+    def _optimize(code):
+        import astor
+        statements = ast.parse(code).body
+        new_statements = DriverOptimizer().optimize(statements)
+        return "".join(astor.to_source(s) for s in new_statements)
+
+    def test_integer_divisions(self):
+        code = "lbp = int(math.ceil(float(t1 + 1) / float(2)))\n" \
+               "for t2 in range(lbp, int(math.floor(float(t1 - 1) / float(2))) + 1):\n" \
+               "    S1(t2)\n"
+        got = TestDriverOptimizer._optimize(code)
+        expected = "lbp = -(-(t1 + 1) // 2)\n" \
+                   "for t2 in range(lbp, (t1 - 1) // 2 + 1):\n" \
+                   "    S1(t2)\n"
+        self.assertEqual(got, expected)
+
+    def test_common_subexpressions(self):
+        code = "lbp = 2 * t3\n" \
+               "ubp = min(m_size - 1, 2 * t3 + 1)\n" \
+               "for t4 in range(2 * t3, min(m_size - 1, 2 * t3 + 1) + 1):\n" \
+               "    S1(t4)\n"
+        got = TestDriverOptimizer._optimize(code)
+        expected = "lbp = 2 * t3\n" \
+                   "ubp = min(m_size - 1, 2 * t3 + 1)\n" \
+                   "for t4 in range(lbp, ubp + 1):\n" \
+                   "    S1(t4)\n"
+        self.assertEqual(got, expected)
+
+    def test_dead_stores(self):
+        code = "lbp = 0\n" \
+               "ubp = n - 1\n" \
+               "for t1 in range(0, n):\n" \
+               "    lbv = 0\n" \
+               "    ubv = m - 1\n" \
+               "    S1(t1)\n" \
+               "lbp = 0\n" \
+               "ubp = n - 1\n" \
+               "for t1 in range(lbp, ubp + 1):\n" \
+               "    S2(t1)\n"
+        got = TestDriverOptimizer._optimize(code)
+        expected = "for t1 in range(0, n):\n" \
+                   "    S1(t1)\n" \
+                   "lbp = 0\n" \
+                   "ubp = n - 1\n" \
+                   "for t1 in range(lbp, ubp + 1):\n" \
+                   "    S2(t1)\n"
+        self.assertEqual(got, expected)
+
+    def test_hoisting(self):
+        code = "for t2 in range(0, n):\n" \
+               "    lbp = 0\n" \
+               "    ubp = int(math.floor(float(m_size - 1) / float(2)))\n" \
+               "    for t3 in range(lbp, ubp + 1):\n" \
+               "        for t4 in range(2 * t3, min(m_size - 1, 2 * t3 + 1) + 1):\n" \
+               "            S1(t2, t3, t4)\n"
+        got = TestDriverOptimizer._optimize(code)
+        expected = "bnd1 = (m_size - 1) // 2\n" \
+                   "for t2 in range(0, n):\n" \
+                   "    lbp = 0\n" \
+                   "    ubp = bnd1\n" \
+                   "    for t3 in range(lbp, ubp + 1):\n" \
+                   "        for t4 in range(2 * t3, min(m_size - 1, 2 * t3 + 1) + 1):\n" \
+                   "            S1(t2, t3, t4)\n"
+        self.assertEqual(got, expected)
+
+    def test_hoisting_existing_assignment(self):
+        # The variable assigned before the loop is modified by the loop: the expression is computed only once
+        code = "lbp = 0\n" \
+               "ubp = int(math.floor(float(m_size - 1) / float(2)))\n" \
+               "for t2 in range(lbp, ubp + 1):\n" \
+               "    ubp = int(math.floor(float(m_size - 1) / float(2)))\n" \
+               "    for t3 in range(0, ubp + 1):\n" \
+               "        S1(t2, t3)\n"
+        got = TestDriverOptimizer._optimize(code)
+        expected = "lbp = 0\n" \
+                   "bnd1 = (m_size - 1) // 2\n" \
+                   "ubp = bnd1\n" \
+                   "for t2 in range(lbp, ubp + 1):\n" \
+                   "    ubp = bnd1\n" \
+                   "    for t3 in range(0, ubp + 1):\n" \
+                   "        S1(t2, t3)\n"
+        self.assertEqual(got, expected)
+
+        # The variable assigned before the loop is not modified by the loop: the variable is reused
+        code = "ubp = int(math.floor(float(m_size - 1) / float(2)))\n" \
+               "for t2 in range(0, ubp + 1):\n" \
+               "    ubv = int(math.floor(float(m_size - 1) / float(2)))\n" \
+               "    for t3 in range(0, ubv + 1):\n" \
+               "        S1(t2, t3)\n"
+        got = TestDriverOptimizer._optimize(code)
+        expected = "ubp = (m_size - 1) // 2\n" \
+                   "for t2 in range(0, ubp + 1):\n" \
+                   "    ubv = ubp\n" \
+                   "    for t3 in range(0, ubv + 1):\n" \
+                   "        S1(t2, t3)\n"
+        self.assertEqual(got, expected)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
@@ -24,7 +24,7 @@ class HeaderBuilder(object):
 
     @staticmethod
     def build_task_header(in_vars, in_collection_vars, out_vars, out_collection_vars, inout_vars,
-                          inout_collection_vars, return_vars):
+                          inout_collection_vars, return_vars, concurrent_vars=None):
         """
         Constructs the task header corresponding to the given IN, OUT, and INOUT variables
 
@@ -42,6 +42,8 @@ class HeaderBuilder(object):
             + type: Dict<str, int>
         :param return_vars: List of names of RETURN variables
             + type: List<str>
+        :param concurrent_vars: List of names of CONCURRENT variables (default None)
+            + type: List<str>
         :return task_header: String representing the PyCOMPSs task header
             + type: str
         """
@@ -90,6 +92,14 @@ class HeaderBuilder(object):
                 first = False
             task_header += iocv + "={Type: COLLECTION_INOUT, Depth: " + str(dim) + "}"
 
+        if concurrent_vars is not None:
+            for cv in concurrent_vars:
+                if not first:
+                    task_header += ", "
+                else:
+                    first = False
+                task_header += cv + "=CONCURRENT"
+
         # Add return information
         if len(return_vars) > 0:
             if not first:
@@ -101,6 +111,40 @@ class HeaderBuilder(object):
 
         return task_header
 
+    @staticmethod
+    def build_constraint_header(constraints):
+        """
+        Constructs the constraint header corresponding to the given constraints
+
+        :param constraints: List of tuples containing the constraint names and the source code of their values
+            + type: List<Tuple(str, str)>
+        :return constraint_header: String representing the PyCOMPSs constraint header
+            + type: str
+        """
+
+        return "@constraint(" + ", ".join(name + "=" + value for name, value in constraints) + ")"
+
+    @staticmethod
+    def add_task_options(header, options):
+        """
+        Adds the given task options to the task header
+
+        :param header: String representing the PyCOMPSs task header
+            + type: str
+        :param options: List of tuples containing the option names and the source code of their values
+            + type: List<Tuple(str, str)>
+        :return new_header: String representing the PyCOMPSs task header with the given options
+            + type: str
+        """
+
+        if len(options) == 0:
+            return header
+
+        options_str = ", ".join(name + "=" + value for name, value in options)
+        if header.endswith("()"):
+            return header[:-1] + options_str + ")"
+        return header[:-1] + ", " + options_str + ")"
+
     @staticmethod
     def split_task_header(header):
         """
@@ -113,10 +157,10 @@ class HeaderBuilder(object):
         header = header.replace("@task(", "")
         header = header.replace(")", "")
 
+        # Collection directions contain commas, so we cannot split the entries by ", "
+        import re
         args2dirs = {}
-        arguments = header.split(", ")
-        for entry in arguments:
-            argument, direction = entry.split("=")
+        for argument, direction in re.findall(r"(\w+)=(\{[^}]*\}|[^,]+)", header):
             args2dirs[argument] = direction
 
         return args2dirs
@@ -158,6 +202,43 @@ class TestHeaderBuilder(unittest.TestCase):
                           "var2={Type: COLLECTION_INOUT, Depth: 2})"
         self.assertEqual(header_got, header_expected)
 
+    def test_concurrent_header(self):
+        header_got = HeaderBuilder.build_task_header(["t2", "n"], {}, [], {}, [], {}, [], concurrent_vars=["c"])
+        self.assertEqual(header_got, "@task(t2=IN, n=IN, c=CONCURRENT)")
+
+    def test_constraint_header(self):
+        constraints = [("ComputingUnits", "'4'"), ("MemorySize", "'2.0'")]
+
+        header_got = HeaderBuilder.build_constraint_header(constraints)
+        header_expected = "@constraint(ComputingUnits='4', MemorySize='2.0')"
+        self.assertEqual(header_got, header_expected)
+
+    def test_task_options(self):
+        options = [("priority", "True")]
+
+        header_got = HeaderBuilder.add_task_options("@task(in1=IN, returns=1)", options)
+        self.assertEqual(header_got, "@task(in1=IN, returns=1, priority=True)")
+        header_got = HeaderBuilder.add_task_options("@task()", options)
+        self.assertEqual(header_got, "@task(priority=True)")
+        header_got = HeaderBuilder.add_task_options("@task(in1=IN)", [])
+        self.assertEqual(header_got, "@task(in1=IN)")
+
+    def test_split_regular_header(self):
+        header = "@task(in1=IN, out1=OUT, inout1=INOUT, returns=3)"
+
+        args2dirs_got = HeaderBuilder.split_task_header(header)
+        args2dirs_expected = {"in1": "IN", "out1": "OUT", "inout1": "INOUT", "returns": "3"}
+        self.assertEqual(args2dirs_got, args2dirs_expected)
+
+    def test_split_collections_header(self):
+        header = "@task(in1=IN, var1={Type: COLLECTION_IN, Depth: 1}, var2={Type: COLLECTION_INOUT, Depth: 2})"
+
+        args2dirs_got = HeaderBuilder.split_task_header(header)
+        args2dirs_expected = {"in1": "IN",
+                              "var1": "{Type: COLLECTION_IN, Depth: 1}",
+                              "var2": "{Type: COLLECTION_INOUT, Depth: 2}"}
+        self.assertEqual(args2dirs_got, args2dirs_expected)
+
 
 #
 # MAIN
@@ -0,0 +1,278 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Class Node transformer for loop chunking
+#
+
+class LoopChunker(ast.NodeTransformer):
+    """
+    Node transformer class. Finds the outermost parallel loops of the given statement, strip-mines them by the given
+    chunk size and taskifies each chunk of consecutive iterations.
+
+    Attributes:
+        - _parallel_bound_vars: Static list of CLooG variables used as lower bound of parallel loops
+            + type: list
+        - task_counter_id: Task counter id
+            + type: int
+        - task2headers: Map containing the task name and its header
+            + type: dict
+        - task2func_code: Map containing the task name and its AST code representation
+            + type: dict
+        - chunk_size: Number of consecutive iterations of the parallel loop grouped in a single task
+            + type: int
+        - views: Whether to generate the task variants receiving ndarray views instead of collections or not
+            + type: boolean
+    """
+
+    # Static attribute List of CLooG variables used as lower bound of parallel loops
+    _parallel_bound_vars = ["lbp", "lbv"]
+
+    def __init__(self, task_counter_id, task2headers, task2func_code, chunk_size, views=False):
+        """
+        Initializes the LoopChunker internal structures
+
+        :param task_counter_id: Task counter id
+            + type: int
+        :param task2headers: Map containing the task names and their headers
+            + type: dict
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :param chunk_size: Number of consecutive iterations of the parallel loop grouped in a single task
+            + type: int
+        :param views: Whether to generate the task variants receiving ndarray views instead of collections or not
+         (default False)
+            + type: boolean
+        """
+
+        if chunk_size < 1:
+            raise Py2PyCOMPSsLoopChunkerException("[ERROR] Invalid chunk size " + str(chunk_size))
+
+        self.task_counter_id = task_counter_id
+        self.task2headers = task2headers
+        self.task2func_code = task2func_code
+        self.chunk_size = chunk_size
+        self.views = views
+
+    def get_final_task_counter_id(self):
+        """
+        Returns the task counter
+
+        :return task_counter_id: Task counter
+        """
+
+        return self.task_counter_id
+
+    def get_final_task2headers(self):
+        """
+        Returns the map containing the task names and their headers
+
+        :return task2headers: Map containing the task names and their headers
+        """
+
+        return self.task2headers
+
+    def get_final_task2func_code(self):
+        """
+        Returns the map containing the task names and their AST code representations
+
+        :return task2func_code: Map containing the task names and their AST code representations
+        """
+
+        return self.task2func_code
+
+    def visit_For(self, node):
+        """
+        Chunks the given loop if it is a parallel loop. Otherwise, processes its children
+
+        :param node: For AST node representation
+        :return new_node: If the node is a parallel loop, a list of nodes containing the chunked loop. Otherwise,
+         the same original node
+        """
+
+        if LoopChunker._is_parallel_loop(node):
+            # Do not process children: inner parallel loops are executed inside the chunk task
+            return self._chunk_loop(node)
+
+        self.generic_visit(node)
+        return node
+
+    @staticmethod
+    def _is_parallel_loop(node):
+        """
+        Determines whether the given loop is a parallel loop generated by PLUTO
+
+        :param node: For AST node representation
+            + type: AST.For
+        :return: True if the loop is a parallel loop, False otherwise
+            + type: boolean
+        """
+
+        iter_node = node.iter
+        if not isinstance(iter_node, ast.Call) or not isinstance(iter_node.func, ast.Name):
+            return False
+        if iter_node.func.id != "range" or len(iter_node.args) != 2:
+            return False
+        lb = iter_node.args[0]
+        return isinstance(lb, ast.Name) and lb.id in LoopChunker._parallel_bound_vars
+
+    def _chunk_loop(self, node):
+        """
+        Strip-mines the given parallel loop and taskifies the loop iterating over each chunk
+
+        :param node: For AST node representation
+            + type: AST.For
+        :return: List of nodes containing the chunked loop
+            + type: List<AST.Node>
+        """
+
+        ub_assign, outer_loop, inner_loop = self._strip_mine_loop(node)
+
+        # Taskify the loop over the chunk iterations
+        from pycompss.util.translators.py2pycompss.components.loop_taskificator import LoopTaskificator
+        lt = LoopTaskificator(self.task_counter_id, self.task2headers, self.task2func_code, outer_loop,
+                              loops2taskify=[inner_loop], views=self.views)
+        new_outer_loop = lt.visit(outer_loop)
+        self.task_counter_id = lt.get_final_task_counter_id()
+        self.task2headers = lt.get_final_task2headers()
+        self.task2func_code = lt.get_final_task2func_code()
+
+        if __debug__:
+            import astor
+            from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
+            logger.debug("New Chunked loop:")
+            logger.debug(astor.to_source(ub_assign, pretty_source=PyCOMPSsSourceGen.long_line_ps))
+            logger.debug(astor.to_source(new_outer_loop, pretty_source=PyCOMPSsSourceGen.long_line_ps))
+
+        return [ub_assign, new_outer_loop]
+
+    def _strip_mine_loop(self, node):
+        """
+        Splits the given loop into a loop over the chunks and a loop over the iterations of each chunk
+
+        :param node: For AST node representation
+            + type: AST.For
+        :return: A tuple containing the assignment of the chunks upper bound, the loop over the chunks and the loop
+         over the iterations of each chunk
+            + type: Tuple(AST.Assign, AST.For, AST.For)
+        """
+
+        loop_ind = node.target.id
+        chunk_ind = "c" + loop_ind
+        chunk_ub = "ubc" + loop_ind[1:]
+        lb = node.iter.args[0]
+        ub = node.iter.args[1]
+
+        # Store the loop upper bound because the CLooG variables may be modified inside the loop body
+        ub_assign = ast.Assign(targets=[ast.Name(id=chunk_ub)], value=ub)
+
+        # Loop over the chunk iterations: for t in range(ct, min(ct + chunk_size, ubc))
+        inner_ub = ast.Call(func=ast.Name(id="min"),
+                            args=[ast.BinOp(left=ast.Name(id=chunk_ind),
+                                            op=ast.Add(),
+                                            right=ast.Num(n=self.chunk_size)),
+                                  ast.Name(id=chunk_ub)],
+                            keywords=[],
+                            starargs=None,
+                            kwargs=None)
+        inner_loop = ast.For(target=node.target,
+                             iter=ast.Call(func=ast.Name(id="range"),
+                                           args=[ast.Name(id=chunk_ind), inner_ub],
+                                           keywords=[],
+                                           starargs=None,
+                                           kwargs=None),
+                             body=node.body,
+                             orelse=[])
+
+        # Loop over the chunks: for ct in range(lb, ubc, chunk_size)
+        outer_loop = ast.For(target=ast.Name(id=chunk_ind),
+                             iter=ast.Call(func=ast.Name(id="range"),
+                                           args=[lb, ast.Name(id=chunk_ub), ast.Num(n=self.chunk_size)],
+                                           keywords=[],
+                                           starargs=None,
+                                           kwargs=None),
+                             body=[inner_loop],
+                             orelse=[])
+
+        return ub_assign, outer_loop, inner_loop
+
+
+#
+# Exception Class
+#
+
+class Py2PyCOMPSsLoopChunkerException(Exception):
+
+    def __init__(self, msg=None, nested_exception=None):
+        self.msg = msg
+        self.nested_exception = nested_exception
+
+    def __str__(self):
+        s = "Exception on Py2PyCOMPSs.translate.LoopChunker method.\n"
+        if self.msg is not None:
+            s = s + "Message: " + str(self.msg) + "\n"
+        if self.nested_exception is not None:
+            s = s + "Nested Exception: " + str(self.nested_exception) + "\n"
+        return s
+
+
+#
+# UNIT TESTS
+#
+
+class TestLoopChunker(unittest.TestCase):
+
+    def test_is_parallel_loop(self):
+        parallel_loop = ast.parse("for t1 in range(lbp, ubp + 1):\n    pass").body[0]
+        self.assertTrue(LoopChunker._is_parallel_loop(parallel_loop))
+        vector_loop = ast.parse("for t2 in range(lbv, ubv + 1):\n    pass").body[0]
+        self.assertTrue(LoopChunker._is_parallel_loop(vector_loop))
+        seq_loop = ast.parse("for t2 in range(0, m_size - 1 + 1):\n    pass").body[0]
+        self.assertFalse(LoopChunker._is_parallel_loop(seq_loop))
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(Py2PyCOMPSsLoopChunkerException):
+            LoopChunker(0, {}, {}, 0)
+
+    def test_strip_mine_loop(self):
+        code = "for t1 in range(lbp, ubp + 1):\n" \
+               "    for t2 in range(0, m_size - 1 + 1):\n" \
+               "        mat[t1][t2] = S1(mat[t1][t2], coef1, coef2)\n"
+        loop = ast.parse(code).body[0]
+
+        lc = LoopChunker(1, {}, {}, 4)
+        ub_assign, outer_loop, inner_loop = lc._strip_mine_loop(loop)
+
+        import astor
+        self.assertEqual(astor.to_source(ub_assign).strip(), "ubc1 = ubp + 1")
+        self.assertEqual(astor.to_source(outer_loop).strip(),
+                         "for ct1 in range(lbp, ubc1, 4):\n"
+                         "    for t1 in range(ct1, min(ct1 + 4, ubc1)):\n"
+                         "        for t2 in range(0, m_size - 1 + 1):\n"
+                         "            mat[t1][t2] = S1(mat[t1][t2], coef1, coef2)")
+        self.assertTrue(outer_loop.body[0] is inner_loop)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
@@ -23,7 +23,8 @@ logger = logging.getLogger("pycompss.api.autoparallel")
 
 class LoopTaskificator(ast.NodeTransformer):
     """
-    Node transformer class. Finds all the main loops and taskifies the internal loops of depth max_depth/2.
+    Node transformer class. Finds all the main loops and taskifies the internal loops of depth max_depth/2 (or the
+    loops of the depth given by the user or chosen by the cost model).
 
     Attributes:
         - _cloog_vars: Static list of cloog variables
@@ -36,12 +37,15 @@ class LoopTaskificator(ast.NodeTransformer):
             + type: dict
         - loops2taskify: List of loops to taskify from the original statement
             + type: list
+        - views: Whether to generate the task variants receiving ndarray views instead of collections or not
+            + type: boolean
     """
 
     # Static attribute List of control flow CLooG variables
     _cloog_vars = ["lbp", "ubp", "lbv", "ubv"]
 
-    def __init__(self, task_counter_id, task2headers, task2func_code, original_statement):
+    def __init__(self, task_counter_id, task2headers, task2func_code, original_statement, loops2taskify=None,
+                 views=False, cost_model=None, taskify_depth=None):
         """
         Initializes the _LoopTasking internal structures
 
@@ -53,17 +57,42 @@ class LoopTaskificator(ast.NodeTransformer):
             + type: dict
         :param original_statement: Original statement to loop-taskify
             + type: node AST
+        :param loops2taskify: List of loops to taskify. When None, the middle loop of each main loop is taskified
+         (default None)
+            + type: list
+        :param views: Whether to generate the task variants receiving ndarray views instead of collections or not
+         (default False)
+            + type: boolean
+        :param cost_model: Cost model choosing the depth of the loop to taskify of each main loop. Only used when
+         loops2taskify is None. The middle loop is taskified when the cost model cannot estimate the loop iterations
+         (default None)
+            + type: CostModel
+        :param taskify_depth: Depth (starting at 1 for the main loop) of the loop to taskify of each main loop.
+         Overrides the cost model. Only used when loops2taskify is None (default None)
+            + type: int
         """
 
         self.task_counter_id = task_counter_id
         self.task2headers = task2headers
         self.task2func_code = task2func_code
+        self.views = views
 
-        self.loops2taskify = []
-        main_fors = LoopTaskificator._extract_main_loops(original_statement)
-        for f in main_fors:
-            _, _, loop2taskify = LoopTaskificator._extract_middle_loop(f, 0)
-            self.loops2taskify.append(loop2taskify)
+        if loops2taskify is not None:
+            self.loops2taskify = loops2taskify
+        else:
+            self.loops2taskify = []
+            main_fors = LoopTaskificator._extract_main_loops(original_statement)
+            for f in main_fors:
+                depth = taskify_depth
+                if depth is None and cost_model is not None:
+                    depth = cost_model.get_taskify_depth(f)
+                if depth is not None:
+                    from pycompss.util.translators.py2pycompss.components.cost_model import CostModel
+                    loop_path = CostModel.get_loop_path(f)
+                    loop2taskify, _ = loop_path[min(max(depth, 1), len(loop_path)) - 1]
+                else:
+                    _, _, loop2taskify = LoopTaskificator._extract_middle_loop(f, 0)
+                self.loops2taskify.append(loop2taskify)
 
         # if __debug__:
         #     logger.debug("Tiled loops to taskify inside the given statement:")
@@ -291,10 +320,19 @@ class LoopTaskificator(ast.NodeTransformer):
         #     logger.debug("- Final task detected COLLECTION_INOUT variables:")
         #     logger.debug(task_collection_inout_vars.items())
 
+        # Collections whose chunk is completely overwritten without being read are write-only
+        task_collection_out_vars = {}
+        read_vars = self._get_read_subscript_vars(func_node)
+        for v in list(task_collection_inout_vars.keys()):
+            if v not in read_vars and subscripts_info.is_fully_written(v):
+                task_collection_out_vars[v] = task_collection_inout_vars.pop(v)
+
         # Build task general information
-        tciv_names = task_collection_in_vars.keys()
-        tciov_names = task_collection_inout_vars.keys()
-        task_args = LoopTaskificator._build_task_args(task_in_vars, tciv_names, task_inout_vars, tciov_names)
+        tciv_names = list(task_collection_in_vars.keys())
+        tcov_names = list(task_collection_out_vars.keys())
+        tciov_names = list(task_collection_inout_vars.keys())
+        task_args = LoopTaskificator._build_task_args(task_in_vars, tciv_names, task_inout_vars, tciov_names,
+                                                      tcov_names)
         # if __debug__:
         #     import astor
         #     logger.debug("- Task args (AST mode):")
@@ -305,10 +343,25 @@ class LoopTaskificator(ast.NodeTransformer):
         self.task_counter_id += 1
         task_name = "LT" + str(self.task_counter_id)
         self._build_task_code(task_name, task_in_vars, task_collection_in_vars, task_inout_vars,
-                              task_collection_inout_vars, task_args, func_node)
+                              task_collection_inout_vars, task_args, func_node,
+                              out_collection_vars=task_collection_out_vars)
 
         # Build callee
-        callee = LoopTaskificator._build_task_callee(task_name, task_args, tciv_names, tciov_names, subscripts_info)
+        callee = LoopTaskificator._build_task_callee(task_name, task_args, tciv_names, tcov_names + tciov_names,
+                                                     subscripts_info)
+
+        # Build the variant receiving ndarray views (when all the collections are ndarrays)
+        # Views are always updated in place, so write-only collections are passed as INOUT
+        if self.views and len(tciv_names) + len(tcov_names) + len(tciov_names) > 0:
+            view_func_node = copy.deepcopy(node)
+            view_func_node = _RewriteTaskSubscripts(subscripts_info, as_view=True).visit(view_func_node)
+            view_task_name = task_name + "_view"
+            self._build_task_code(view_task_name, task_in_vars + tciv_names, {},
+                                  task_inout_vars + tcov_names + tciov_names, {}, task_args, view_func_node)
+            view_callee = LoopTaskificator._build_task_callee(view_task_name, task_args, tciv_names,
+                                                              tcov_names + tciov_names, subscripts_info, as_view=True)
+            callee = [LoopTaskificator._build_views_check(tciv_names, tcov_names + tciov_names, view_callee,
+                                                          callee)]
 
         return callee
 
@@ -580,6 +633,52 @@ class LoopTaskificator(ast.NodeTransformer):
                     inout_vars.extend(iov)
         return in_vars, inout_vars
 
+    def _get_read_subscript_vars(self, node):
+        """
+        Returns the names of the subscript variables read inside the given node. Subscripts assigned by plain
+        assignments and passed as OUT parameters to tasks are not read
+
+        :param node: AST node representing the head of the statement
+            + type: AST.Node
+        :return: Set of names of the read subscript variables
+            + type: Set<str>
+        """
+
+        from pycompss.util.translators.py2pycompss.components.header_builder import HeaderBuilder
+
+        read_vars = set()
+        # Identifiers of the subscript nodes whose access is not a read
+        skipped_ids = set()
+
+        def skip_access(access_node):
+            while isinstance(access_node, ast.Subscript):
+                skipped_ids.add(id(access_node))
+                access_node = access_node.value
+
+        for child in ast.walk(node):
+            if isinstance(child, ast.Assign):
+                for target in child.targets:
+                    for target_node in (target.elts if isinstance(target, ast.Tuple) else [target]):
+                        skip_access(target_node)
+            elif isinstance(child, ast.Call) and isinstance(child.func, ast.Name) and \
+                    child.func.id in self.task2headers.keys():
+                task_def_arguments = self.task2func_code[child.func.id].args.args
+                task_def_args2directions = HeaderBuilder.split_task_header(self.task2headers[child.func.id])
+                for position, call_arg in enumerate(child.args):
+                    if position < len(task_def_arguments) and isinstance(call_arg, ast.Subscript):
+                        task_def_arg = task_def_arguments[position]
+                        arg_name = task_def_arg.id if isinstance(task_def_arg, ast.Name) else task_def_arg.arg
+                        direction = task_def_args2directions.get(arg_name, "IN")
+                        if direction == "OUT" or "COLLECTION_OUT" in direction:
+                            skip_access(call_arg)
+
+        # AugAssign targets are read and written, the rest of subscripts are read
+        for child in ast.walk(node):
+            if isinstance(child, ast.Subscript) and id(child) not in skipped_ids:
+                read_vars.add(LoopTaskificator._extract_subscript_name(child))
+
+        return read_vars
+
     @staticmethod
     def _get_cloog_vars(statement, is_target, for_level):
         written = {}
@@ -665,7 +764,7 @@ class LoopTaskificator(ast.NodeTransformer):
                 "[ERROR] Unrecognised type " + str(type(node)) + " on task argument")
 
     @staticmethod
-    def _build_task_args(in_vars, in_collection_vars, inout_vars, inout_collection_vars):
+    def _build_task_args(in_vars, in_collection_vars, inout_vars, inout_collection_vars, out_collection_vars=None):
         """
         Builds the task arguments
 
@@ -677,12 +776,16 @@ class LoopTaskificator(ast.NodeTransformer):
             + type: List<str>
         :param inout_collection_vars: List of COLLECTION_INOUT variables
             + type: List<str>
+        :param out_collection_vars: List of COLLECTION_OUT variables (default None)
+            + type: List<str>
         :return: List of task arguments
             + List<AST.Node>
         """
+        if out_collection_vars is None:
+            out_collection_vars = []
         task_args_names = []
         task_args_ast = []
-        for var in in_vars + in_collection_vars + inout_vars + inout_collection_vars:
+        for var in in_vars + in_collection_vars + out_collection_vars + inout_vars + inout_collection_vars:
             if var not in task_args_names:
                 task_args_names.append(var)
 
@@ -692,7 +795,7 @@ class LoopTaskificator(ast.NodeTransformer):
         return task_args_ast
 
     def _build_task_code(self, task_name, in_vars, in_collection_vars, inout_vars, inout_collection_vars, task_args,
-                         func_node):
+                         func_node, out_collection_vars=None):
         """
         Rebuilds the code to be performed on the task and its header and stores it into the internal structures
 
@@ -710,13 +813,15 @@ class LoopTaskificator(ast.NodeTransformer):
             + type: List<AST.Node>
         :param func_node: Previous function code
             + type: AST.Node
+        :param out_collection_vars: Dictionary of OUT collection variables and its dimension (default None)
+            + type: Dict<str, int>
         """
         # Build task header
         from pycompss.util.translators.py2pycompss.components.header_builder import HeaderBuilder
         task_header = HeaderBuilder.build_task_header(in_vars,
                                                       in_collection_vars,
                                                       [],
-                                                      {},
+                                                      out_collection_vars if out_collection_vars is not None else {},
                                                       inout_vars,
                                                       inout_collection_vars,
                                                       [])
@@ -742,7 +847,8 @@ class LoopTaskificator(ast.NodeTransformer):
             logger.debug(astor.to_source(new_task, pretty_source=PyCOMPSsSourceGen.long_line_ps))
 
     @staticmethod
-    def _build_task_callee(task_name, task_args, in_collection_args, inout_collection_args, subscripts_info):
+    def _build_task_callee(task_name, task_args, in_collection_args, inout_collection_args, subscripts_info,
+                           as_view=False):
         """
         Constructs the complete task callee: chunks subscripts, flats arguments, calls the task, rebuilds arguments,
         and un-chunks subscripts
@@ -757,6 +863,8 @@ class LoopTaskificator(ast.NodeTransformer):
             + type: List<str>
         :param subscripts_info: Information about subscript accesses and bounds
             + type: _SubscriptsInfo
+        :param as_view: Whether to chunk the subscripts as ndarray views or as collections (default False)
+            + type: boolean
         :return: List of nodes representing the full task callee
             + type: List<AST.Node>
         """
@@ -789,9 +897,12 @@ class LoopTaskificator(ast.NodeTransformer):
             collection_chuncked_vars[orig_var_name] = chunk_var_name
 
             # Build chunk assignation
-            list_comp = subscripts_info.get_as_list_comp(orig_var_name)
+            if as_view:
+                chunk_value = subscripts_info.get_as_registered_view(orig_var_name)
+            else:
+                chunk_value = subscripts_info.get_as_list_comp(orig_var_name)
             assign_node = ast.Assign(targets=[chunk_var],
-                                     value=list_comp)
+                                     value=chunk_value)
             # if __debug__:
             #     import astor
             #     logger.debug("- Add chunk statement:")
@@ -823,6 +934,39 @@ class LoopTaskificator(ast.NodeTransformer):
         # Assign to function return
         return new_nodes
 
+    @staticmethod
+    def _build_views_check(in_collection_args, inout_collection_args, view_callee, collection_callee):
+        """
+        Constructs the statement choosing at runtime between the task callee using ndarray views and the task callee
+        using collections
+
+        :param in_collection_args: List of task IN arguments
+            + type: List<str>
+        :param inout_collection_args: List of task INOUT arguments
+            + type: List<str>
+        :param view_callee: List of nodes representing the task callee using ndarray views
+            + type: List<AST.Node>
+        :param collection_callee: List of nodes representing the task callee using collections
+            + type: List<AST.Node>
+        :return: If node representing the full task callee
+            + type: AST.If
+        """
+
+        # ndarrays (and any array supporting basic slicing) are detected by their shape attribute
+        checks = []
+        for var_name in list(in_collection_args) + list(inout_collection_args):
+            checks.append(ast.Call(func=ast.Name(id="hasattr"),
+                                   args=[ast.Name(id=var_name), ast.Str(s="shape")],
+                                   keywords=[],
+                                   starargs=None,
+                                   kwargs=None))
+        if len(checks) == 1:
+            test = checks[0]
+        else:
+            test = ast.BoolOp(op=ast.And(), values=checks)
+
+        return ast.If(test=test, body=view_callee, orelse=collection_callee)
+
 
 #
 # Class representing subscript accesses information
@@ -834,6 +978,7 @@ class _SubscriptInformation(object):
 
     Attributes:
             - loops_info : Information about loop indices and bounds
+            - subscript_accesses_info : Information about subscript access expressions
             - lbs : Expression for minimum lower bound of any dimension of an access to any subscript
             - ubs : Expression for maximum upper bound of any dimension of an access to any subscript
             - steps : Expression for the gcb step size of any dimension of an access to any subscript
@@ -869,6 +1014,10 @@ class _SubscriptInformation(object):
         #         # logger.debug(str(astor.to_source(k)) + " -> " + str(astor.dump_tree(v)))
         #         logger.debug(str(astor.to_source(k)) + " -> " + str(astor.to_source(v)))
 
+        # Store the information required to check the chunks coverage
+        self.loops_info = fixed_loops_info
+        self.subscript_accesses_info = subscript_accesses_info
+
         # Compute lbs and ubs
         from pycompss.util.translators.py2pycompss.components.calculator import Calculator
         self.subs2glob_lbs, self.subs2glob_ubs = Calculator.compute_lex_bounds(fixed_loops_info,
@@ -910,12 +1059,27 @@ class _SubscriptInformation(object):
         else:
             return 0
 
-    def get_chunk_access(self, var_name, current_access_subscript):
+    def is_fully_written(self, var_name):
+        """
+        Returns whether the accesses to the given variable cover all the positions of its chunk
+
+        :param var_name: Variable name
+            + type: str
+        :return: True if all the positions of the chunk are accessed, False otherwise
+            + type: boolean
+        """
+
+        from pycompss.util.translators.py2pycompss.components.calculator import Calculator
+        return Calculator.is_fully_covered(self.loops_info, self.subscript_accesses_info[var_name],
+                                           self.subs2glob_lbs[var_name], self.subs2glob_ubs[var_name])
+
+    def get_chunk_access(self, var_name, current_access_subscript, as_view=False):
         """
         Returns the modified offset access to a given subscript
 
         :param var_name: Variable name
         :param current_access_subscript: Subscript representing the original access
+        :param as_view: Whether the chunk is an ndarray view (accessed by a tuple of indexes) or a collection
         :return: Modified access to the subscript according to chunks
         """
 
@@ -931,11 +1095,12 @@ class _SubscriptInformation(object):
         dim = len(access_lbs)
 
         # Create chunk access
+        new_indexes = [ast.BinOp(left=access[index], op=ast.Sub(), right=access_lbs[index]) for index in range(dim)]
+        if as_view and dim > 1:
+            return ast.Subscript(value=ast.Name(id=var_name),
+                                 slice=ast.Index(value=ast.Tuple(elts=new_indexes)))
         new_chunk_access = None
-        for index in range(dim):
-            new_index = ast.BinOp(left=access[index],
-                                  op=ast.Sub(),
-                                  right=access_lbs[index])
+        for new_index in new_indexes:
             if new_chunk_access is None:
                 new_chunk_access = ast.Subscript(value=ast.Name(id=var_name),
                                                  slice=ast.Index(value=new_index))
@@ -986,6 +1151,46 @@ class _SubscriptInformation(object):
                                          generators=generators_list)
         return list_comp
 
+    def get_as_view(self, var_name):
+        """
+        Returns the basic slicing expression for the given variable. When the variable is an ndarray, the expression
+        is a view of the chunk (no copies)
+
+        :param var_name: Variable to be chunked
+        :return: Expression for chunking
+        """
+
+        lbs = self.subs2glob_lbs[var_name]
+        ubs = self.subs2glob_ubs[var_name]
+
+        slices = [ast.Slice(lower=lb, upper=ub, step=None) for lb, ub in zip(lbs, ubs)]
+        if len(slices) == 1:
+            return ast.Subscript(value=ast.Name(id=var_name), slice=slices[0])
+        return ast.Subscript(value=ast.Name(id=var_name), slice=ast.ExtSlice(dims=slices))
+
+    def get_as_registered_view(self, var_name):
+        """
+        Returns the expression retrieving the view of the chunk of the given variable from the views registry of the
+        variable (<var_name>_views). The chunks with the same bounds share the same view object, so that the runtime
+        orders the tasks accessing them, and the Synchronizer writes the registered views back to the variable when
+        synchronizing it
+
+        :param var_name: Variable to be chunked
+        :return: Expression for chunking
+        """
+
+        import copy
+        view = self.get_as_view(var_name)
+        key_elts = [ast.Call(func=ast.Name(id="id"), args=[ast.Name(id=var_name)], keywords=[], starargs=None,
+                             kwargs=None)]
+        for lb, ub in zip(self.subs2glob_lbs[var_name], self.subs2glob_ubs[var_name]):
+            key_elts.extend([copy.deepcopy(lb), copy.deepcopy(ub)])
+        return ast.Call(func=ast.Attribute(value=ast.Name(id=var_name + "_views"), attr="setdefault"),
+                        args=[ast.Tuple(elts=key_elts), view],
+                        keywords=[],
+                        starargs=None,
+                        kwargs=None)
+
     def get_as_loop(self, orig_var_name, chunk_var_name):
         """
         Returns the for expression required to unchunk the given variable to its original positions
@@ -1203,16 +1408,19 @@ class _RewriteTaskSubscripts(ast.NodeTransformer):
             - subscript_info : Subscript information (loop bounds, accesses, etc.)
             - var_counter : Number of replaced variables
             - registered_vars : Dictionary mapping replaced variables and its original subscript name
+            - as_view : Whether the chunks are ndarray views or collections
     """
 
-    def __init__(self, subscript_info):
+    def __init__(self, subscript_info, as_view=False):
         """
         Initializes the _RewriteSubscriptToSubscript internal structures.
 
         :param subscript_info: Information about subscript access (Object of type SubscriptInformation)
+        :param as_view: Whether the chunks are ndarray views or collections
         """
 
         self.subscript_info = subscript_info
+        self.as_view = as_view
         self.var_counter = 1
         self.registered_vars = {}
 
@@ -1272,7 +1480,7 @@ class _RewriteTaskSubscripts(ast.NodeTransformer):
         """
 
         # Create variable access
-        return self.subscript_info.get_chunk_access(var_name, node)
+        return self.subscript_info.get_chunk_access(var_name, node, as_view=self.as_view)
 
 
 #
@@ -1384,7 +1592,101 @@ class Py2PyCOMPSsLoopTaskificatorException(Exception):
 #
 
 class TestLoopTaskificator(unittest.TestCase):
-    pass
+
+    @staticmethod
+    def _build_subscript_info(subs2glob_lbs, subs2glob_ubs):
+        # Skip the bounds computation (requires ISL)
+        subscript_info = _SubscriptInformation.__new__(_SubscriptInformation)
+        subscript_info.subs2glob_lbs = subs2glob_lbs
+        subscript_info.subs2glob_ubs = subs2glob_ubs
+        return subscript_info
+
+    def test_chunk_as_view(self):
+        lbs = {"c": [ast.parse("2 * t2").body[0].value, ast.parse("2 * t3").body[0].value],
+               "x": [ast.Name(id="t2")]}
+        ubs = {"c": [ast.Name(id="m_size"), ast.parse("2 + 2 * t3").body[0].value],
+               "x": [ast.parse("t2 + 1").body[0].value]}
+        subscript_info = TestLoopTaskificator._build_subscript_info(lbs, ubs)
+
+        import astor
+        self.assertEqual(astor.to_source(subscript_info.get_as_view("c")).strip(),
+                         "c[2 * t2:m_size, 2 * t3:2 + 2 * t3]")
+        self.assertEqual(astor.to_source(subscript_info.get_as_view("x")).strip(), "x[t2:t2 + 1]")
+
+    def test_read_subscript_vars(self):
+        task2headers = {"S1": "@task(var2=IN, returns=1)",
+                        "S2": "@task(var2=IN, var1=OUT)",
+                        "S3": "@task(var1=INOUT)"}
+        task2func_code = {"S1": ast.parse("def S1(var2):\n    return f(var2)").body[0],
+                          "S2": ast.parse("def S2(var2, var1):\n    g(var2, var1)").body[0],
+                          "S3": ast.parse("def S3(var1):\n    h(var1)").body[0]}
+        code = "for t1 in range(0, n):\n" \
+               "    b[t1] = S1(a[t1])\n" \
+               "    S2(a[t1], c[t1])\n" \
+               "    S3(d[t1])\n" \
+               "    e[t1][t1] += x[idx[t1]]\n"
+        node = ast.parse(code).body[0]
+
+        lt = LoopTaskificator(0, task2headers, task2func_code, node, loops2taskify=[node])
+        read_vars = lt._get_read_subscript_vars(node)
+        self.assertEqual(sorted(read_vars), ["a", "d", "e", "idx", "x"])
+
+    def test_loops2taskify_depth(self):
+        code = "for t1 in range(0, int(math.floor(float(n - 1) / float(32))) + 1):\n" \
+               "    for t2 in range(0, int(math.floor(float(n - 1) / float(32))) + 1):\n" \
+               "        for t3 in range(32 * t1, min(n - 1, 32 * t1 + 31) + 1):\n" \
+               "            for t4 in range(32 * t2, min(n - 1, 32 * t2 + 31) + 1):\n" \
+               "                S1(t3, t4)\n"
+        node = ast.parse(code).body[0]
+        loop_t3 = node.body[0].body[0]
+        loop_t4 = loop_t3.body[0]
+
+        from pycompss.util.translators.py2pycompss.components.cost_model import CostModel
+        cost_model = CostModel(params={"n": 1024}, iteration_cost=1e-1, task_duration=0.1, workers=4)
+
+        # Default middle loop
+        lt = LoopTaskificator(0, {}, {}, node)
+        self.assertEqual(lt.loops2taskify, [loop_t3])
+        # Depth chosen by the cost model
+        lt = LoopTaskificator(0, {}, {}, node, cost_model=cost_model)
+        self.assertEqual(lt.loops2taskify, [loop_t4])
+        # User depth overrides the cost model
+        lt = LoopTaskificator(0, {}, {}, node, cost_model=cost_model, taskify_depth=1)
+        self.assertEqual(lt.loops2taskify, [node])
+        # The cost model cannot estimate the iterations without the parameter values
+        lt = LoopTaskificator(0, {}, {}, node, cost_model=CostModel(workers=4))
+        self.assertEqual(lt.loops2taskify, [loop_t3])
+
+    def test_view_callee(self):
+        lbs = {"a": [ast.Name(id="t1")], "c": [ast.Name(id="t1"), ast.Num(n=0)]}
+        ubs = {"a": [ast.parse("t1 + 2").body[0].value], "c": [ast.parse("t1 + 2").body[0].value, ast.Name(id="n")]}
+        subscript_info = TestLoopTaskificator._build_subscript_info(lbs, ubs)
+        task_args = [ast.Name(id="n"), ast.Name(id="a"), ast.Name(id="c")]
+
+        callee = LoopTaskificator._build_task_callee("LT1_view", task_args, ["a"], ["c"], subscript_info,
+                                                     as_view=True)
+
+        # The views are retrieved from the registries and the master does not wait for the task
+        import astor
+        from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
+        self.assertEqual("".join(astor.to_source(node, pretty_source=PyCOMPSsSourceGen.long_line_ps)
+                                 for node in callee),
+                         "LT1_view_aux_0 = a_views.setdefault((id(a), t1, t1 + 2), a[t1:t1 + 2])\n"
+                         "LT1_view_aux_1 = c_views.setdefault((id(c), t1, t1 + 2, 0, n), c[t1:t1 + 2, 0:n])\n"
+                         "LT1_view(n, LT1_view_aux_0, LT1_view_aux_1)\n")
+
+    def test_views_check(self):
+        view_callee = [ast.parse("LT1_view(n, LT1_view_aux_0, LT1_view_aux_1)").body[0]]
+        collection_callee = [ast.parse("LT1(n, LT1_aux_0, LT1_aux_1)").body[0]]
+
+        check = LoopTaskificator._build_views_check(["a"], ["c"], view_callee, collection_callee)
+
+        import astor
+        self.assertEqual(astor.to_source(check).strip(),
+                         "if hasattr(a, 'shape') and hasattr(c, 'shape'):\n"
+                         "    LT1_view(n, LT1_view_aux_0, LT1_view_aux_1)\n"
+                         "else:\n"
+                         "    LT1(n, LT1_aux_0, LT1_aux_1)")
 
 
 #
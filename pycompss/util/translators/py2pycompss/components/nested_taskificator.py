@@ -0,0 +1,371 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Nested Taskificator class
+#
+
+class NestedTaskificator(object):
+    """
+    Wraps each iteration of the outermost parallel loops of the driver code into a parent task that spawns the inner
+    tasks from a worker (nested tasks). Thus, the master process only spawns one task per iteration of the parallel
+    loop and the generation of the inner tasks is distributed among the workers. The iterations of a parallel loop are
+    independent, so the parent tasks of a loop instance access the variables written by their inner tasks as CONCURRENT
+    parameters. Each parent task synchronizes the results of its inner tasks into these parameters before finishing and
+    the master synchronizes them after the loop, so that the parent tasks of successive instances of the loop (e.g.
+    inside an enclosing sequential loop) are not run concurrently.
+
+    Attributes:
+        - task_counter_id: Task counter id
+            + type: int
+        - task2headers: Map containing the task name and its header
+            + type: dict
+        - task2func_code: Map containing the task name and its AST code representation
+            + type: dict
+        - parallel_lines: Line numbers of the loops marked as parallel by PLUTO
+            + type: set<int>
+    """
+
+    # Static attribute List of names that are never task parameters
+    _global_names = ["range", "min", "max", "int", "float", "abs", "len", "hasattr", "id", "math", "compss_barrier",
+                     "compss_wait_on", "compss_open", "True", "False", "None"]
+
+    def __init__(self, task_counter_id, task2headers, task2func_code, parallel_lines):
+        """
+        Initializes the NestedTaskificator internal structures
+
+        :param task_counter_id: Task counter id
+            + type: int
+        :param task2headers: Map containing the task names and their headers
+            + type: dict
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :param parallel_lines: Line numbers of the loops marked as parallel by PLUTO
+            + type: set<int>
+        """
+
+        self.task_counter_id = task_counter_id
+        self.task2headers = task2headers
+        self.task2func_code = task2func_code
+        self.parallel_lines = parallel_lines
+
+    def get_final_task_counter_id(self):
+        """
+        Returns the task counter
+
+        :return task_counter_id: Task counter
+        """
+
+        return self.task_counter_id
+
+    def get_final_task2headers(self):
+        """
+        Returns the map containing the task names and their headers
+
+        :return task2headers: Map containing the task names and their headers
+        """
+
+        return self.task2headers
+
+    def get_final_task2func_code(self):
+        """
+        Returns the map containing the task names and their AST code representations
+
+        :return task2func_code: Map containing the task names and their AST code representations
+        """
+
+        return self.task2func_code
+
+    @staticmethod
+    def get_parallel_lines(par_py):
+        """
+        Returns the line numbers of the loops marked as parallel (# parallel for) in the given PLUTO output file
+
+        :param par_py: File containing the Python parallelization of a for block
+            + type: str
+        :return parallel_lines: Line numbers of the parallel loops
+            + type: set<int>
+        """
+
+        with open(par_py, 'r') as f:
+            lines = f.readlines()
+
+        parallel_lines = set()
+        for line_index, line in enumerate(lines):
+            if line.strip().startswith("# parallel for"):
+                # Line numbers start at 1 and the loop is on the next line
+                parallel_lines.add(line_index + 2)
+        return parallel_lines
+
+    def nest(self, statements):
+        """
+        Wraps the iterations of the outermost parallel loops of the given statements into parent tasks
+
+        :param statements: List of driver statements
+            + type: List<AST.Node>
+        :return: New list of driver statements
+            + type: List<AST.Node>
+        """
+
+        new_statements = []
+        for statement in statements:
+            if isinstance(statement, ast.For):
+                if getattr(statement, "lineno", None) in self.parallel_lines and self._contains_task_calls(statement):
+                    parent_call, concurrent_vars = self._build_parent_task(statement)
+                    statement.body = [parent_call]
+                    new_statements.append(statement)
+                    # Wait for the parent tasks of this loop instance before running the next statements
+                    for var in concurrent_vars:
+                        new_statements.append(ast.parse(var + " = compss_wait_on(" + var + ")").body[0])
+                    continue
+                statement.body = self.nest(statement.body)
+            elif isinstance(statement, ast.If):
+                statement.body = self.nest(statement.body)
+                statement.orelse = self.nest(statement.orelse)
+            new_statements.append(statement)
+        return new_statements
+
+    def _contains_task_calls(self, node):
+        """
+        Determines whether the given node calls any task or not
+
+        :param node: AST node
+            + type: AST.Node
+        :return: True if the node contains task calls, False otherwise
+            + type: boolean
+        """
+
+        from pycompss.util.translators.py2pycompss.components.synchronizer import Synchronizer
+        return any(isinstance(child, ast.Call) and Synchronizer.is_task_call(child, self.task2headers)
+                   for child in ast.walk(node))
+
+    def _build_parent_task(self, loop):
+        """
+        Creates the parent task running an iteration of the given loop and returns the statement calling it and the
+        variables written by its inner tasks
+
+        :param loop: Parallel loop
+            + type: AST.For
+        :return: A tuple containing the statement calling the parent task and the list of its CONCURRENT parameters
+            + type: Tuple(AST.Expr, List<str>)
+        """
+
+        from pycompss.util.translators.py2pycompss.components.header_builder import HeaderBuilder
+        from pycompss.util.translators.py2pycompss.components.synchronizer import Synchronizer
+
+        # Retrieve the task parameters: the loop index and the free variables of the loop body (except the view
+        # registries, which are local to the parent task)
+        var2views = Synchronizer.get_view_registries(loop.body)
+        registries = [registry for var_registries in var2views.values() for registry in var_registries]
+        param_names = [v for v in NestedTaskificator._get_free_vars(loop, self.task2headers) if v not in registries]
+        aux2vars = Synchronizer.get_aux_vars(loop.body)
+        written_vars = []
+        for statement in loop.body:
+            statement_written_vars, _ = Synchronizer.get_task_written_vars(statement, self.task2headers,
+                                                                            self.task2func_code, aux2vars)
+            written_vars.extend(v for v in statement_written_vars if v in param_names and v not in written_vars)
+        in_vars = [v for v in param_names if v not in written_vars]
+        concurrent_vars = [v for v in param_names if v in written_vars]
+
+        # Build the parent task: the loop body followed by a barrier on the inner tasks and the synchronization of
+        # their results into the CONCURRENT parameters (updated in place so that they are sent back to the master,
+        # after writing back the views passed to the inner tasks)
+        self.task_counter_id += 1
+        task_name = "NT" + str(self.task_counter_id)
+        task_header = HeaderBuilder.build_task_header(in_vars, {}, [], {}, [], {}, [],
+                                                      concurrent_vars=concurrent_vars)
+        param_names = in_vars + concurrent_vars
+        task_args = [ast.Name(id=v) for v in param_names]
+        task_body = [ast.parse(registry + " = {}").body[0] for registry in registries]
+        task_body.extend(loop.body)
+        task_body.append(ast.parse("compss_barrier()").body[0])
+        for var in concurrent_vars:
+            for registry in var2views.get(var, []):
+                task_body.extend(Synchronizer.build_views_write_back(var, registry))
+            task_body.append(ast.parse(var + "[:] = compss_wait_on(" + var + "[:])").body[0])
+        new_task = ast.FunctionDef(name=task_name,
+                                   args=ast.arguments(args=task_args, vararg=None, kwarg=None, defaults=[]),
+                                   body=task_body,
+                                   decorator_list=[])
+        self.task2func_code[task_name] = new_task
+        self.task2headers[task_name] = task_header
+        if __debug__:
+            from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
+            import astor
+            logger.debug("- New Parent Task Header:")
+            logger.debug(task_header)
+            logger.debug("- New parent task:")
+            logger.debug(astor.to_source(new_task, pretty_source=PyCOMPSsSourceGen.long_line_ps))
+
+        # Build the parent task call
+        call = ast.Call(func=ast.Name(id=task_name), args=[ast.Name(id=v) for v in param_names], keywords=[],
+                        starargs=None, kwargs=None)
+        return ast.Expr(value=call), concurrent_vars
+
+    @staticmethod
+    def _get_free_vars(loop, task2headers):
+        """
+        Returns the variables used inside the loop body that are defined outside it. The loop index comes first and
+        the rest of variables are sorted by name
+
+        :param loop: Loop
+            + type: AST.For
+        :param task2headers: Map containing the task names and their headers
+            + type: dict
+        :return free_vars: List of variable names
+            + type: List<str>
+        """
+
+        # Names defined inside the loop body or referring to functions
+        local_names = set(NestedTaskificator._global_names) | set(task2headers.keys())
+        for statement in loop.body:
+            for node in ast.walk(statement):
+                if isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        if isinstance(target, ast.Name):
+                            local_names.add(target.id)
+                elif isinstance(node, (ast.For, ast.comprehension)) and isinstance(node.target, ast.Name):
+                    local_names.add(node.target.id)
+                elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+                    local_names.add(node.func.id)
+
+        free_vars = set()
+        for statement in loop.body:
+            for node in ast.walk(statement):
+                if isinstance(node, ast.Name) and node.id not in local_names:
+                    free_vars.add(node.id)
+        free_vars.discard(loop.target.id)
+        return [loop.target.id] + sorted(free_vars)
+
+
+#
+# UNIT TESTS
+#
+
+class TestNestedTaskificator(unittest.TestCase):
+
+    def test_parallel_lines(self):
+        code = "if (n >= 1):\n" \
+               "    # parallel for PRIVATE(t3) REDUCTION()\n" \
+               "    for t2 in range(0, n):\n" \
+               "        for t3 in range(0, n):\n" \
+               "            S1(t2, t3)\n"
+        import os
+        import tempfile
+        fd, par_py = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(code)
+            self.assertEqual(NestedTaskificator.get_parallel_lines(par_py), {3})
+        finally:
+            os.remove(par_py)
+
+    def test_nest(self):
+        task2headers = {"LT1": "@task(n=IN, t2=IN, aux_b={Type: COLLECTION_IN, Depth: 1}, "
+                               "aux_c={Type: COLLECTION_INOUT, Depth: 1})"}
+        task2func_code = {"LT1": ast.parse("def LT1(n, t2, aux_b, aux_c):\n    pass").body[0]}
+        code = "if n >= 1:\n" \
+               "    for t1 in range(0, n):\n" \
+               "        for t2 in range(0, n):\n" \
+               "            lbp = 2 * t2\n" \
+               "            aux_b = [b[t3] for t3 in range(lbp, n)]\n" \
+               "            aux_c = [c[t1][t3] for t3 in range(lbp, n)]\n" \
+               "            LT1(n, t2, aux_b, aux_c)\n"
+        statements = ast.parse(code).body
+
+        # Only the inner loop is parallel
+        nt = NestedTaskificator(1, task2headers, task2func_code, {3})
+        new_statements = nt.nest(statements)
+
+        import astor
+        self.assertEqual(nt.get_final_task_counter_id(), 2)
+        self.assertEqual(nt.get_final_task2headers()["NT2"], "@task(t2=IN, b=IN, n=IN, t1=IN, c=CONCURRENT)")
+        self.assertEqual(astor.to_source(new_statements[0]).strip(),
+                         "if n >= 1:\n"
+                         "    for t1 in range(0, n):\n"
+                         "        for t2 in range(0, n):\n"
+                         "            NT2(t2, b, n, t1, c)\n"
+                         "        c = compss_wait_on(c)")
+        parent_code = nt.get_final_task2func_code()["NT2"]
+        self.assertEqual(astor.to_source(parent_code.body[-2]).strip(), "compss_barrier()")
+        self.assertEqual(astor.to_source(parent_code.body[-1]).strip(), "c[:] = compss_wait_on(c[:])")
+
+    def test_nest_execution(self):
+        task2headers = {"LT1": "@task(aux_prev={Type: COLLECTION_IN, Depth: 1}, "
+                               "aux_c={Type: COLLECTION_INOUT, Depth: 1})"}
+        task2func_code = {"LT1": ast.parse("def LT1(aux_prev, aux_c):\n"
+                                           "    time.sleep(0.01)\n"
+                                           "    for i in range(len(aux_c)):\n"
+                                           "        aux_c[i] = aux_c[i] + aux_prev[i]").body[0]}
+        code = "for t1 in range(1, n):\n" \
+               "    for t2 in range(0, n // 2):\n" \
+               "        aux_prev = [c[t1 - 1][t3] for t3 in range(2 * t2, 2 * t2 + 2)]\n" \
+               "        aux_c = [c[t1][t3] for t3 in range(2 * t2, 2 * t2 + 2)]\n" \
+               "        LT1(aux_prev, aux_c)\n"
+        statements = ast.parse(code).body
+
+        # Only the inner loop is parallel: the rows of c are computed in order
+        nt = NestedTaskificator(1, task2headers, task2func_code, {2})
+        new_statements = nt.nest(statements)
+
+        import astor
+        module_code = "import time\n" \
+                      "from pycompss.api.api import compss_barrier, compss_wait_on\n" \
+                      "from pycompss.api.task import task\n" \
+                      "from pycompss.api.parameter import *\n"
+        for task_name, func_code in nt.get_final_task2func_code().items():
+            module_code += "\n\n" + nt.get_final_task2headers()[task_name] + "\n" + astor.to_source(func_code)
+        kernel = ast.FunctionDef(name="kernel", args=ast.parse("def f(c, n):\n    pass").body[0].args,
+                                 body=new_statements + ast.parse("return compss_wait_on(c)").body, decorator_list=[])
+        module_code += "\n\n" + astor.to_source(kernel)
+
+        n = 8
+        expected = [[float(i + j) for j in range(n)] for i in range(n)]
+        for t1 in range(1, n):
+            for t2 in range(n):
+                expected[t1][t2] += expected[t1 - 1][t2]
+
+        from pycompss.util.local_runtime import runtime
+        runtime.install(4, "threads")
+        try:
+            module_globals = {}
+            exec(compile(module_code, "<generated>", "exec"), module_globals)
+            result = module_globals["kernel"]([[float(i + j) for j in range(n)] for i in range(n)], n)
+        finally:
+            runtime.uninstall()
+        self.assertEqual(result, expected)
+
+    def test_no_task_calls(self):
+        code = "for t1 in range(0, n):\n" \
+               "    c[t1] = 0\n"
+        statements = ast.parse(code).body
+
+        nt = NestedTaskificator(0, {}, {}, {1})
+        new_statements = nt.nest(statements)
+        self.assertEqual(new_statements, statements)
+        self.assertEqual(nt.get_final_task_counter_id(), 0)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
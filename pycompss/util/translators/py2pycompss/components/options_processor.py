@@ -0,0 +1,360 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Options Processor class
+#
+
+class OptionsProcessor(object):
+    """
+    Computes the constraints and the task options of the generated tasks from the constraints and task options of
+    the original callees. Constraints are either inherited from the @constraint decorators of the module containing the
+    user function or given per callee name by the user (user values override inherited values).
+
+    Attributes:
+        - callee2constraints: Map containing the callee names and their constraints (name to value source code)
+            + type: dict<str, dict<str, str>>
+        - callee2options: Map containing the callee names and their task options (name to value source code)
+            + type: dict<str, dict<str, str>>
+    """
+
+    def __init__(self, func=None, constraints=None, task_options=None):
+        """
+        Initializes the OptionsProcessor internal structures
+
+        :param func: Python original function. Used to inherit the @constraint decorators of its module
+            + type: func
+        :param constraints: Map containing the callee names and their constraints
+            + type: dict<str, dict<str, Object>>
+        :param task_options: Map containing the callee names and their task options
+            + type: dict<str, dict<str, Object>>
+        """
+
+        self.callee2constraints = OptionsProcessor.get_module_constraints(func) if func is not None else {}
+        for callee, callee_constraints in OptionsProcessor._to_source(constraints).items():
+            self.callee2constraints.setdefault(callee, {}).update(callee_constraints)
+        self.callee2options = OptionsProcessor._to_source(task_options)
+
+    def is_empty(self):
+        """
+        Returns whether there are constraints or task options to propagate or not
+
+        :return: True if there are no constraints nor task options, False otherwise
+            + type: boolean
+        """
+
+        return len(self.callee2constraints) == 0 and len(self.callee2options) == 0
+
+    def get_task_constraints(self, task_name, task2func_code):
+        """
+        Returns the constraints of the given task
+
+        :param task_name: Name of the task
+            + type: str
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :return constraints: Sorted list of tuples containing the constraint names and the source code of their values
+            + type: List<Tuple(str, str)>
+        """
+
+        callees = OptionsProcessor._get_callees(task_name, task2func_code)
+        return OptionsProcessor._merge([self.callee2constraints[c] for c in callees if c in self.callee2constraints])
+
+    def get_task_options(self, task_name, task2func_code):
+        """
+        Returns the task options of the given task
+
+        :param task_name: Name of the task
+            + type: str
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :return options: Sorted list of tuples containing the option names and the source code of their values
+            + type: List<Tuple(str, str)>
+        """
+
+        callees = OptionsProcessor._get_callees(task_name, task2func_code)
+        return OptionsProcessor._merge([self.callee2options[c] for c in callees if c in self.callee2options])
+
+    @staticmethod
+    def get_module_constraints(func):
+        """
+        Retrieves the @constraint decorators of the functions defined in the module of the given function
+
+        :param func: Python function
+            + type: func
+        :return callee2constraints: Map containing the function names and their constraints
+            + type: dict<str, dict<str, str>>
+        """
+
+        module_ast = OptionsProcessor._get_module_ast(func)
+        if module_ast is None:
+            # The module source is not available (e.g. interactive sessions), no constraints can be inherited
+            return {}
+
+        return OptionsProcessor._get_ast_constraints(module_ast)
+
+    @staticmethod
+    def get_module_functions(func):
+        """
+        Retrieves the AST of the functions defined in the module of the given function
+
+        :param func: Python function
+            + type: func
+        :return name2func_def: Map containing the function names and their AST representations
+            + type: dict<str, ast.FunctionDef>
+        """
+
+        module_ast = OptionsProcessor._get_module_ast(func)
+        if module_ast is None:
+            return {}
+
+        return dict((node.name, node) for node in module_ast.body if isinstance(node, ast.FunctionDef))
+
+    @staticmethod
+    def _get_module_ast(func):
+        """
+        Parses the source code of the module of the given function
+
+        :param func: Python function
+            + type: func
+        :return module_ast: AST representation of the module or None if its source is not available
+            + type: ast.Module
+        """
+
+        import inspect
+        try:
+            module_source = inspect.getsource(inspect.getmodule(func))
+            return ast.parse(module_source)
+        except Exception as e:
+            if __debug__:
+                logger.debug("[OptionsProcessor] Cannot retrieve the module source: " + str(e))
+            return None
+
+    @staticmethod
+    def _get_ast_constraints(module_ast):
+        """
+        Retrieves the @constraint decorators of the functions defined in the given AST
+
+        :param module_ast: AST representation of a module
+            + type: ast.Module
+        :return callee2constraints: Map containing the function names and their constraints
+            + type: dict<str, dict<str, str>>
+        """
+
+        import astor
+        callee2constraints = {}
+        for node in ast.walk(module_ast):
+            if isinstance(node, ast.FunctionDef):
+                for decorator in node.decorator_list:
+                    if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name) \
+                            and decorator.func.id == "constraint":
+                        func_constraints = callee2constraints.setdefault(node.name, {})
+                        for keyword in decorator.keywords:
+                            func_constraints[keyword.arg] = astor.to_source(keyword.value).strip()
+        return callee2constraints
+
+    @staticmethod
+    def _to_source(callee2values):
+        """
+        Converts the values of the given user map to their source code representation
+
+        :param callee2values: Map containing the callee names and the user values
+            + type: dict<str, dict<str, Object>>
+        :return callee2source: Map containing the callee names and the source code of the user values
+            + type: dict<str, dict<str, str>>
+        """
+
+        if callee2values is None:
+            return {}
+        return dict((callee, dict((name, repr(value)) for name, value in values.items()))
+                    for callee, values in callee2values.items())
+
+    @staticmethod
+    def _get_callees(task_name, task2func_code):
+        """
+        Returns the names of the functions called by the given task. Calls to other generated functions are processed
+        recursively
+
+        :param task_name: Name of the task
+            + type: str
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :return callees: List of the names of the functions called by the task (in order of appearance)
+            + type: List<str>
+        """
+
+        callees = []
+        pending = [task_name]
+        visited = set()
+        while len(pending) > 0:
+            name = pending.pop(0)
+            if name in visited or name not in task2func_code:
+                continue
+            visited.add(name)
+            for node in ast.walk(task2func_code[name]):
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+                    callee = node.func.id
+                    if callee in task2func_code:
+                        pending.append(callee)
+                    elif callee not in callees:
+                        callees.append(callee)
+        return callees
+
+    @staticmethod
+    def _merge(values_list):
+        """
+        Merges the constraints or options of several callees. Numeric values take the maximum, boolean values take the
+        disjunction and the rest of values take the first value
+
+        :param values_list: List of maps containing names and the source code of their values
+            + type: List<dict<str, str>>
+        :return merged: Sorted list of tuples containing the names and the source code of the merged values
+            + type: List<Tuple(str, str)>
+        """
+
+        merged = {}
+        for values in values_list:
+            for name, value in values.items():
+                if name not in merged:
+                    merged[name] = value
+                else:
+                    merged[name] = OptionsProcessor._merge_value(merged[name], value)
+        return sorted(merged.items())
+
+    @staticmethod
+    def _merge_value(value1, value2):
+        """
+        Merges two values given as source code
+
+        :param value1: Source code of the first value
+            + type: str
+        :param value2: Source code of the second value
+            + type: str
+        :return merged: Source code of the merged value
+            + type: str
+        """
+
+        eval1 = OptionsProcessor._literal_eval(value1)
+        eval2 = OptionsProcessor._literal_eval(value2)
+        if isinstance(eval1, bool) and isinstance(eval2, bool):
+            return repr(eval1 or eval2)
+        num1 = OptionsProcessor._to_number(eval1)
+        num2 = OptionsProcessor._to_number(eval2)
+        if num1 is not None and num2 is not None:
+            return value2 if num2 > num1 else value1
+        return value1
+
+    @staticmethod
+    def _literal_eval(value):
+        """
+        Evaluates the given source code if it is a literal
+
+        :param value: Source code of a value
+            + type: str
+        :return: The evaluated literal or None if it cannot be evaluated
+            + type: Object
+        """
+
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return None
+
+    @staticmethod
+    def _to_number(value):
+        """
+        Converts the given value into a number. PyCOMPSs constraints are usually given as numeric strings
+
+        :param value: Value
+            + type: Object
+        :return: The numeric value or None if the value is not numeric
+            + type: float
+        """
+
+        if isinstance(value, bool) or value is None:
+            return None
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+
+
+#
+# UNIT TESTS
+#
+
+class TestOptionsProcessor(unittest.TestCase):
+
+    def test_ast_constraints(self):
+        code = "@constraint(ComputingUnits=\"4\", MemorySize=\"2.0\")\n" \
+               "def potrf(a):\n" \
+               "    return a\n" \
+               "\n" \
+               "@task(returns=1)\n" \
+               "def gemm(a, b, c):\n" \
+               "    return c\n"
+
+        callee2constraints = OptionsProcessor._get_ast_constraints(ast.parse(code))
+        self.assertEqual(list(callee2constraints.keys()), ["potrf"])
+        self.assertEqual(sorted(callee2constraints["potrf"].keys()), ["ComputingUnits", "MemorySize"])
+
+    def test_module_functions(self):
+        from pycompss.util.translators.py2pycompss.tests.test3_multiply_taskified_func import matmul
+        name2func_def = OptionsProcessor.get_module_functions(matmul)
+        self.assertEqual(sorted(name2func_def.keys()), ["matmul", "multiply", "scale"])
+        self.assertEqual(name2func_def["scale"].name, "scale")
+
+        # Built-in functions have no source
+        self.assertEqual(OptionsProcessor.get_module_functions(len), {})
+
+    def test_task_constraints(self):
+        code = "def S1(var1, var2):\n" \
+               "    res1 = S2_no_task(var1)\n" \
+               "    return gemm(res1, var2, potrf(var1))\n" \
+               "def S2_no_task(var1):\n" \
+               "    return syrk(var1)\n"
+        module_ast = ast.parse(code)
+        task2func_code = {"S1": module_ast.body[0], "S2_no_task": module_ast.body[1]}
+
+        op = OptionsProcessor(constraints={"potrf": {"ComputingUnits": "4"},
+                                           "gemm": {"ComputingUnits": "8", "ProcessorArchitecture": "x86"},
+                                           "syrk": {"ComputingUnits": "2"}},
+                              task_options={"syrk": {"priority": True}, "unused": {"priority": False}})
+        self.assertFalse(op.is_empty())
+        self.assertEqual(OptionsProcessor._get_callees("S1", task2func_code), ["gemm", "potrf", "syrk"])
+        self.assertEqual(op.get_task_constraints("S1", task2func_code),
+                         [("ComputingUnits", "'8'"), ("ProcessorArchitecture", "'x86'")])
+        self.assertEqual(op.get_task_options("S1", task2func_code), [("priority", "True")])
+        self.assertEqual(op.get_task_constraints("S2_no_task", task2func_code), [("ComputingUnits", "'2'")])
+
+    def test_merge_values(self):
+        self.assertEqual(OptionsProcessor._merge_value("'4'", "'8'"), "'8'")
+        self.assertEqual(OptionsProcessor._merge_value("16", "8"), "16")
+        self.assertEqual(OptionsProcessor._merge_value("False", "True"), "True")
+        self.assertEqual(OptionsProcessor._merge_value("'x86'", "'arm'"), "'x86'")
+        self.assertEqual(OptionsProcessor._merge_value("'${ComputingUnits}'", "'4'"), "'${ComputingUnits}'")
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
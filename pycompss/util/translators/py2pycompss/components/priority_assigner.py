@@ -0,0 +1,498 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Priority Assigner class
+#
+
+class PriorityAssigner(object):
+    """
+    Detects the tasks on the critical path of the generated code. The schedule generated by PLUTO places the
+    statements that gate the next wavefront (e.g. the panel factorizations) in outer loops, while the statements
+    consuming their results are nested deeper. Thus, a task is considered critical when a block it writes is read by
+    a task enclosed by more loops. Its priority level is the difference between the maximum loop depth and its own
+    loop depth.
+
+    The accessed blocks are computed by running the generated loop nests with a small sample value for the
+    parameters (without calling the tasks), so that the tasks writing and reading different blocks of the same array
+    (e.g. the diagonal blocks updated by syrk and the panel blocks read by gemm) are told apart.
+
+    Attributes:
+        - _sample_size: Static value of the parameters (e.g. the matrix sizes) when running the loop nests
+            + type: int
+        - _max_task_instances: Static maximum number of task instances simulated
+            + type: int
+    """
+
+    # Static attribute Value of the unknown parameters when running the loop nests
+    _sample_size = 6
+
+    # Static attribute Maximum number of simulated task instances
+    _max_task_instances = 100000
+
+    @staticmethod
+    def get_priority_levels(generated_statements, task2headers, task2func_code):
+        """
+        Computes the priority level of the tasks on the critical path
+
+        :param generated_statements: List of the autogenerated statements (the ones issuing tasks)
+            + type: List<AST.Node>
+        :param task2headers: Map containing the task names and their headers
+            + type: dict
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :return task2levels: Map containing the names of the critical tasks and their priority level (>= 1)
+            + type: dict<str, int>
+        """
+
+        simulator = _AccessSimulator(task2headers, task2func_code, PriorityAssigner._sample_size,
+                                     PriorityAssigner._max_task_instances)
+        try:
+            for statement in generated_statements:
+                simulator.run(statement, 0)
+        except _SimulationLimitReached:
+            # Keep the dependences found so far
+            if __debug__:
+                logger.debug("[PriorityAssigner] Simulation stopped after " +
+                             str(PriorityAssigner._max_task_instances) + " task instances")
+        if len(simulator.task2depth) == 0:
+            return {}
+        max_depth = max(simulator.task2depth.values())
+
+        # The priority level depends on the outermost loop depth of each critical task
+        task2levels = {}
+        for task_name in simulator.critical_tasks:
+            task2levels[task_name] = max_depth - simulator.task2depth[task_name]
+
+        if __debug__:
+            logger.debug("[PriorityAssigner] Critical tasks: " + str(task2levels))
+
+        return task2levels
+
+
+#
+# Access simulator class
+#
+
+class _AccessSimulator(object):
+    """
+    Runs the given loop nests registering the blocks accessed by each task instance (instead of calling the tasks)
+    and detects the tasks whose written blocks are read by tasks enclosed by more loops
+
+    Attributes:
+        - task2headers: Map containing the task names and their headers
+        - task2func_code: Map containing the task names and their AST code representations
+        - sample_size: Value of the unknown parameters
+        - max_task_instances: Maximum number of simulated task instances
+        - env: Map containing the current values of the loop indexes and of the assigned variables
+        - last_writes: Map containing the variable names and the list of the last written blocks (keys, task name and
+         loop depth)
+        - task2depth: Map containing the simulated task names and their minimum loop depth
+        - critical_tasks: Set of task names whose written blocks are read by deeper tasks
+        - num_task_instances: Number of simulated task instances
+    """
+
+    def __init__(self, task2headers, task2func_code, sample_size, max_task_instances):
+        """
+        Initializes the _AccessSimulator internal structures
+
+        :param task2headers: Map containing the task names and their headers
+        :param task2func_code: Map containing the task names and their AST code representations
+        :param sample_size: Value of the unknown parameters
+        :param max_task_instances: Maximum number of simulated task instances
+        """
+
+        import math
+        self.task2headers = task2headers
+        self.task2func_code = task2func_code
+        self.sample_size = sample_size
+        self.max_task_instances = max_task_instances
+        self.builtins = {"min": min, "max": max, "int": int, "float": float, "abs": abs, "range": range,
+                         "math": math}
+        self.env = {}
+        self.last_writes = {}
+        self.task2depth = {}
+        self.critical_tasks = set()
+        self.num_task_instances = 0
+
+    def run(self, node, depth):
+        """
+        Runs the given statement
+
+        :param node: AST node of the statement
+        :param depth: Number of loops enclosing the statement
+        :raise _SimulationLimitReached: When the maximum number of task instances is reached
+        """
+
+        from pycompss.util.translators.py2pycompss.components.synchronizer import Synchronizer
+
+        if isinstance(node, ast.For):
+            values = self._eval(node.iter)
+            if not isinstance(node.target, ast.Name) or values is None:
+                if __debug__:
+                    logger.debug("[PriorityAssigner] Skipping loop with unknown iterations")
+                return
+            for value in values:
+                self.env[node.target.id] = value
+                for child in node.body:
+                    self.run(child, depth + 1)
+            return
+        if isinstance(node, ast.If):
+            test = self._eval(node.test)
+            # Unknown conditions are considered true
+            for child in (node.body if test is None or test else node.orelse):
+                self.run(child, depth)
+            return
+
+        task_calls = [call for call in ast.walk(node)
+                      if isinstance(call, ast.Call) and Synchronizer.is_task_call(call, self.task2headers)]
+        if len(task_calls) == 0:
+            # Assignments of CLooG variables and auxiliary collections or views
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                view = Synchronizer.get_registered_view(node.value)
+                value = self._eval(node.value if view is None else view)
+                if value is not None:
+                    self.env[node.targets[0].id] = value
+                else:
+                    self.env.pop(node.targets[0].id, None)
+            return
+
+        # Statement issuing tasks (generated statements may wrap the assignment in an expression)
+        call2targets = {}
+        for assign in ast.walk(node):
+            if isinstance(assign, ast.Assign):
+                call2targets[id(assign.value)] = assign.targets
+        for call in task_calls:
+            self._run_task(call, call2targets.get(id(call), []), depth)
+
+    def _run_task(self, call, targets, depth):
+        """
+        Registers the blocks accessed by the given task call
+
+        :param call: AST Call node to a task
+        :param targets: List of AST nodes of the assignment targets of the call
+        :param depth: Number of loops enclosing the call
+        :raise _SimulationLimitReached: When the maximum number of task instances is reached
+        """
+
+        from pycompss.util.translators.py2pycompss.components.header_builder import HeaderBuilder
+        from pycompss.util.translators.py2pycompss.components.synchronizer import Synchronizer
+
+        self.num_task_instances += 1
+        if self.num_task_instances > self.max_task_instances:
+            raise _SimulationLimitReached()
+
+        task_name = call.func.id
+        self.task2depth[task_name] = min(depth, self.task2depth.get(task_name, depth))
+
+        # Retrieve the blocks read and written through the task parameters and returns
+        args2dirs = HeaderBuilder.split_task_header(self.task2headers[task_name])
+        task_params = self.task2func_code[task_name].args.args
+        read_blocks = []
+        written_blocks = []
+        for position, arg in enumerate(call.args):
+            direction = "IN"
+            if position < len(task_params):
+                # Task parameters are Name nodes (Python 2) or arg nodes (Python 3)
+                param = task_params[position]
+                param_name = param.id if isinstance(param, ast.Name) else param.arg
+                direction = args2dirs.get(param_name, "IN")
+            blocks = self._get_blocks(arg)
+            if Synchronizer.is_written(direction):
+                written_blocks.extend(blocks)
+            if "OUT" not in direction or "INOUT" in direction:
+                read_blocks.extend(blocks)
+        for target in targets:
+            written_blocks.extend(self._get_blocks(target))
+
+        # The writers of the read blocks are critical when the reader is nested deeper
+        for block in read_blocks:
+            for keys, writer_name, writer_depth in self.last_writes.get(block.name, []):
+                if writer_depth < depth and _Block.overlap(keys, block.keys):
+                    self.critical_tasks.add(writer_name)
+
+        # Register the new versions of the written blocks
+        for block in written_blocks:
+            writes = [w for w in self.last_writes.get(block.name, []) if w[0] != block.keys]
+            writes.append((block.keys, task_name, depth))
+            self.last_writes[block.name] = writes
+
+    def _get_blocks(self, node):
+        """
+        Returns the blocks accessed by the given task argument or assignment target
+
+        :param node: AST node of the argument or target
+        :return: List of accessed blocks
+        """
+
+        value = self._eval(node)
+        if value is None:
+            return []
+        if isinstance(node, ast.Name) and not isinstance(value, (_Block, list, tuple)):
+            # Whole variable (e.g. a scalar)
+            return [_Block(node.id, ())]
+        return _AccessSimulator._flatten(value)
+
+    @staticmethod
+    def _flatten(value):
+        """
+        Returns the blocks contained in the given value (a block or nested lists of blocks)
+
+        :param value: Evaluated argument
+        :return: List of blocks
+        """
+
+        if isinstance(value, _Block):
+            return [value]
+        if isinstance(value, (list, tuple)):
+            blocks = []
+            for element in value:
+                blocks.extend(_AccessSimulator._flatten(element))
+            return blocks
+        return []
+
+    def _eval(self, node):
+        """
+        Evaluates the given expression. The subscripted variables are evaluated as blocks and the unknown variables
+        take the sample value
+
+        :param node: AST node of the expression
+        :return: Value of the expression or None if it cannot be evaluated
+        """
+
+        import copy
+        expr = copy.deepcopy(node)
+        comprehension_targets = set(id(target) for comp in ast.walk(expr) if isinstance(comp, ast.comprehension)
+                                    for target in ast.walk(comp.target))
+        subscripted = set()
+        names = set()
+        for child in ast.walk(expr):
+            # Assignment targets are evaluated as expressions
+            if hasattr(child, "ctx") and id(child) not in comprehension_targets:
+                child.ctx = ast.Load()
+            if isinstance(child, ast.Subscript):
+                base = child.value
+                while isinstance(base, ast.Subscript):
+                    base = base.value
+                if isinstance(base, ast.Name):
+                    subscripted.add(base.id)
+            elif isinstance(child, ast.Name):
+                names.add(child.id)
+
+        global_vars = dict(self.builtins)
+        for name in names:
+            if name in self.env.keys():
+                global_vars[name] = self.env[name]
+            elif name in subscripted:
+                global_vars[name] = _Block(name, ())
+            elif name not in self.builtins.keys():
+                global_vars[name] = self.sample_size
+
+        try:
+            code = compile(ast.fix_missing_locations(ast.Expression(body=expr)), "<priority_assigner>", "eval")
+            return eval(code, global_vars)
+        except Exception:
+            return None
+
+
+#
+# Block class
+#
+
+class _Block(object):
+    """
+    Block of a variable accessed by a task. Indexing a block returns the sub-block
+
+    Attributes:
+        - name: Variable name
+        - keys: Tuple of indexes (integers or slices) of each dimension
+    """
+
+    def __init__(self, name, keys):
+        """
+        Initializes the _Block internal structures
+
+        :param name: Variable name
+        :param keys: Tuple of indexes of each dimension
+        """
+
+        self.name = name
+        self.keys = keys
+
+    def __getitem__(self, key):
+        """
+        Returns the sub-block at the given index
+
+        :param key: Index, slice or tuple of indexes and slices
+        :return: Sub-block
+        """
+
+        keys = key if isinstance(key, tuple) else (key,)
+        return _Block(self.name, self.keys + keys)
+
+    @staticmethod
+    def overlap(keys1, keys2):
+        """
+        Determines whether two blocks of the same variable overlap. The missing dimensions cover the whole dimension
+
+        :param keys1: Indexes of the first block
+        :param keys2: Indexes of the second block
+        :return: True if the blocks may overlap, False otherwise
+        """
+
+        for key1, key2 in zip(keys1, keys2):
+            if isinstance(key1, slice) or isinstance(key2, slice):
+                lb1, ub1 = _Block._get_range(key1)
+                lb2, ub2 = _Block._get_range(key2)
+                if max(lb1, lb2) >= min(ub1, ub2):
+                    return False
+            elif isinstance(key1, (int, float)) and isinstance(key2, (int, float)) and key1 != key2:
+                return False
+        return True
+
+    @staticmethod
+    def _get_range(key):
+        """
+        Returns the lower (inclusive) and upper (exclusive) indexes covered by the given index or slice
+
+        :param key: Index or slice
+        :return: Lower and upper indexes
+        """
+
+        if isinstance(key, slice):
+            lb = key.start if key.start is not None else 0
+            ub = key.stop if key.stop is not None else float("inf")
+            return lb, ub
+        if isinstance(key, (int, float)):
+            return key, key + 1
+        return float("-inf"), float("inf")
+
+
+#
+# Exception Class
+#
+
+class _SimulationLimitReached(Exception):
+    """
+    Raised when the maximum number of simulated task instances is reached
+    """
+
+    pass
+
+
+#
+# UNIT TESTS
+#
+
+class TestPriorityAssigner(unittest.TestCase):
+
+    def test_cholesky_priorities(self):
+        task2headers = {"S1": "@task(var1=INOUT)",
+                        "S2": "@task(var2=IN, var1=INOUT)",
+                        "S3": "@task(var2=IN, var3=IN, var1=INOUT)"}
+        task2func_code = {"S1": ast.parse("def S1(var1):\n    potrf(var1)").body[0],
+                          "S2": ast.parse("def S2(var2, var1):\n    trsm(var2, var1)").body[0],
+                          "S3": ast.parse("def S3(var2, var3, var1):\n    gemm(var2, var3, var1)").body[0]}
+        code = "for t1 in range(0, n):\n" \
+               "    S1(a[t1][t1])\n" \
+               "    for t2 in range(t1 + 1, n):\n" \
+               "        S2(a[t1][t1], a[t2][t1])\n" \
+               "        for t3 in range(t1 + 1, t2 + 1):\n" \
+               "            S3(a[t2][t1], a[t3][t1], a[t2][t3])\n"
+        statements = ast.parse(code).body
+
+        task2levels = PriorityAssigner.get_priority_levels(statements, task2headers, task2func_code)
+        self.assertEqual(task2levels, {"S1": 2, "S2": 1})
+
+    def test_returns_priorities(self):
+        task2headers = {"S1": "@task(var1=IN, returns=1)",
+                        "S2": "@task(var1=IN, returns=1)"}
+        task2func_code = {"S1": ast.parse("def S1(var1):\n    return f(var1)").body[0],
+                          "S2": ast.parse("def S2(var1):\n    return g(var1)").body[0]}
+        code = "for t1 in range(0, n):\n" \
+               "    b[t1] = S1(a[t1])\n" \
+               "for t1 in range(0, n):\n" \
+               "    for t2 in range(0, n):\n" \
+               "        c[t2] = S2(b[t1])\n"
+        statements = ast.parse(code).body
+
+        task2levels = PriorityAssigner.get_priority_levels(statements, task2headers, task2func_code)
+        self.assertEqual(task2levels, {"S1": 1})
+
+    def test_block_accesses(self):
+        # The syrk tasks (S3) update the diagonal blocks, which are only read by the next potrf (S1)
+        task2headers = {"S1": "@task(var1=INOUT)",
+                        "S2": "@task(var2=IN, var1=INOUT)",
+                        "S3": "@task(var2=IN, var1=INOUT)",
+                        "S4": "@task(var2=IN, var3=IN, var1=INOUT)"}
+        task2func_code = {"S1": ast.parse("def S1(var1):\n    potrf(var1)").body[0],
+                          "S2": ast.parse("def S2(var2, var1):\n    trsm(var2, var1)").body[0],
+                          "S3": ast.parse("def S3(var2, var1):\n    syrk(var2, var1)").body[0],
+                          "S4": ast.parse("def S4(var2, var3, var1):\n    gemm(var2, var3, var1)").body[0]}
+        code = "for t1 in range(0, n):\n" \
+               "    S1(a[t1][t1])\n" \
+               "    for t2 in range(t1 + 1, n):\n" \
+               "        S2(a[t1][t1], a[t2][t1])\n" \
+               "    for t2 in range(t1 + 1, n):\n" \
+               "        S3(a[t2][t1], a[t2][t2])\n" \
+               "        for t3 in range(t1 + 1, t2):\n" \
+               "            S4(a[t2][t1], a[t3][t1], a[t2][t3])\n"
+        statements = ast.parse(code).body
+
+        task2levels = PriorityAssigner.get_priority_levels(statements, task2headers, task2func_code)
+        self.assertEqual(task2levels, {"S1": 2, "S2": 1})
+
+    def test_collection_accesses(self):
+        # The first task only writes the first rows, which are not read by the chunk tasks
+        task2headers = {"S1": "@task(var1=INOUT)",
+                        "LT2": "@task(t1=IN, a={Type: COLLECTION_IN, Depth: 1})"}
+        task2func_code = {"S1": ast.parse("def S1(var1):\n    init(var1)").body[0],
+                          "LT2": ast.parse("def LT2(t1, a):\n    pass").body[0]}
+        code = "for t1 in range(0, 2):\n" \
+               "    S1(a[t1])\n" \
+               "for t1 in range(0, 2):\n" \
+               "    for t2 in range(0, 2):\n" \
+               "        LT2_aux_0 = [a[gv0] for gv0 in range(2 * t2 + 2, 2 * t2 + 4, 1)]\n" \
+               "        LT2(t1, LT2_aux_0)\n"
+        statements = ast.parse(code).body
+        self.assertEqual(PriorityAssigner.get_priority_levels(statements, task2headers, task2func_code), {})
+
+        # Reading the first rows makes it critical
+        statements = ast.parse(code.replace("2 * t2 + 2, 2 * t2 + 4", "2 * t2, 2 * t2 + 2")).body
+        self.assertEqual(PriorityAssigner.get_priority_levels(statements, task2headers, task2func_code), {"S1": 1})
+
+    def test_no_critical_tasks(self):
+        task2headers = {"S1": "@task(var2=IN, var3=IN, var1=INOUT)"}
+        task2func_code = {"S1": ast.parse("def S1(var2, var3, var1):\n    var1 += var2 * var3").body[0]}
+        code = "for t1 in range(0, n):\n" \
+               "    for t2 in range(0, n):\n" \
+               "        S1(a[t1], b[t2], c[t1][t2])\n"
+        statements = ast.parse(code).body
+
+        task2levels = PriorityAssigner.get_priority_levels(statements, task2headers, task2func_code)
+        self.assertEqual(task2levels, {})
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
@@ -0,0 +1,445 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Class Node transformer for statement coarsening
+#
+
+class StatementCoarsener(ast.NodeTransformer):
+    """
+    Node transformer class. Finds adjacent task calls that belong to the same iteration point and access the same
+    data neighborhood, and fuses them into a single task when their combined cost does not exceed the given
+    granularity threshold.
+
+    Attributes:
+        - task_counter_id: Task counter id
+            + type: int
+        - task2headers: Map containing the task name and its header
+            + type: dict
+        - task2func_code: Map containing the task name and its AST code representation
+            + type: dict
+        - threshold: Maximum combined cost of the statements fused into a single task
+            + type: int
+    """
+
+    def __init__(self, task_counter_id, task2headers, task2func_code, threshold):
+        """
+        Initializes the StatementCoarsener internal structures
+
+        :param task_counter_id: Task counter id
+            + type: int
+        :param task2headers: Map containing the task names and their headers
+            + type: dict
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :param threshold: Maximum combined cost of the statements fused into a single task
+            + type: int
+        """
+
+        self.task_counter_id = task_counter_id
+        self.task2headers = task2headers
+        self.task2func_code = task2func_code
+        self.threshold = threshold
+
+    def get_final_task_counter_id(self):
+        """
+        Returns the task counter
+
+        :return task_counter_id: Task counter
+        """
+
+        return self.task_counter_id
+
+    def get_final_task2headers(self):
+        """
+        Returns the map containing the task names and their headers
+
+        :return task2headers: Map containing the task names and their headers
+        """
+
+        return self.task2headers
+
+    def get_final_task2func_code(self):
+        """
+        Returns the map containing the task names and their AST code representations
+
+        :return task2func_code: Map containing the task names and their AST code representations
+        """
+
+        return self.task2func_code
+
+    def generic_visit(self, node):
+        """
+        Processes the children of the given node and coarsens the statements of each of its bodies
+
+        :param node: AST node
+        :return new_node: The same node with its bodies coarsened
+        """
+
+        node = super(StatementCoarsener, self).generic_visit(node)
+        for field in ["body", "orelse"]:
+            if field in node._fields and isinstance(getattr(node, field), list):
+                setattr(node, field, self._coarsen_body(getattr(node, field)))
+        return node
+
+    def _coarsen_body(self, statements):
+        """
+        Groups the adjacent fusable statements of the given body and replaces each group by a call to a new task
+
+        :param statements: List of statements of a body
+            + type: List<AST.Node>
+        :return: New list of statements
+            + type: List<AST.Node>
+        """
+
+        new_statements = []
+        group = []
+        group_cost = 0
+        for statement in statements + [None]:
+            cost = self._get_statement_cost(statement)
+            if cost is not None and len(group) > 0 and group_cost + cost <= self.threshold and \
+                    StatementCoarsener._can_join(group, statement):
+                # Add statement to the current group
+                group.append(statement)
+                group_cost += cost
+                continue
+
+            # Close current group
+            if len(group) > 1:
+                new_statements.append(self._fuse_statements(group))
+            else:
+                new_statements.extend(group)
+
+            # Start a new group
+            if cost is not None and cost <= self.threshold:
+                group = [statement]
+                group_cost = cost
+            else:
+                group = []
+                group_cost = 0
+                if statement is not None:
+                    new_statements.append(statement)
+
+        return new_statements
+
+    def _get_statement_cost(self, statement):
+        """
+        Returns the cost of the given statement if it is a candidate for coarsening
+
+        :param statement: AST node representing the statement
+            + type: AST.Node
+        :return: The number of calls inside the task invoked by the statement or None if the statement cannot be fused
+            + type: int
+        """
+
+        # Only single assignments of task returns are considered
+        if not isinstance(statement, ast.Assign) or len(statement.targets) != 1:
+            return None
+        if not isinstance(statement.targets[0], (ast.Name, ast.Subscript)):
+            return None
+        if not isinstance(statement.value, ast.Call) or not isinstance(statement.value.func, ast.Name):
+            return None
+        task_name = statement.value.func.id
+        if task_name not in self.task2headers.keys() or self.task2headers[task_name] is None:
+            return None
+
+        # All the task parameters must be IN so that the fused task only returns values
+        from pycompss.util.translators.py2pycompss.components.header_builder import HeaderBuilder
+        args2dirs = HeaderBuilder.split_task_header(self.task2headers[task_name])
+        for arg_name, direction in args2dirs.items():
+            if arg_name != "returns" and direction != "IN":
+                return None
+        if args2dirs.get("returns") != "1":
+            return None
+
+        # The cost of the statement is the number of calls performed by the task
+        task_code = self.task2func_code[task_name]
+        return max(1, len([n for n in ast.walk(task_code) if isinstance(n, ast.Call)]))
+
+    @staticmethod
+    def _can_join(group, statement):
+        """
+        Determines whether the given statement can be fused with the statements of the current group
+
+        :param group: List of statements of the current group
+            + type: List<AST.Node>
+        :param statement: Candidate statement
+            + type: AST.Node
+        :return: True if the statement shares the group neighborhood and can be fused safely, False otherwise
+            + type: boolean
+        """
+
+        # Statements must share the same iteration point and data neighborhood
+        if StatementCoarsener._get_neighborhood(statement) != StatementCoarsener._get_neighborhood(group[0]):
+            return False
+
+        # Check the dependencies with the previously written values
+        written = [StatementCoarsener._get_key(s.targets[0]) for s in group]
+        written_names = [StatementCoarsener._get_base_name(s.targets[0]) for s in group]
+        if StatementCoarsener._get_key(statement.targets[0]) in written:
+            # Output dependency
+            return False
+        for arg in statement.value.args:
+            if StatementCoarsener._get_base_name(arg) in written_names and \
+                    StatementCoarsener._get_key(arg) not in written:
+                # The read value may alias a different position of a written variable
+                return False
+        return True
+
+    @staticmethod
+    def _get_neighborhood(statement):
+        """
+        Returns the variable names used inside the subscripts of the given statement
+
+        :param statement: AST node representing the statement
+            + type: AST.Node
+        :return: Set of variable names used to index the accessed data
+            + type: set<str>
+        """
+
+        neighborhood = set()
+        for node in [statement.targets[0]] + statement.value.args:
+            for sub in ast.walk(node):
+                if isinstance(sub, ast.Subscript):
+                    for n in ast.walk(sub.slice):
+                        if isinstance(n, ast.Name):
+                            neighborhood.add(n.id)
+        return neighborhood
+
+    @staticmethod
+    def _get_key(node):
+        """
+        Returns a comparable representation of the given expression that does not depend on its load/store context
+
+        :param node: AST node
+            + type: AST.Node
+        :return: Source code of the expression
+            + type: str
+        """
+
+        import astor
+        return astor.to_source(node).strip()
+
+    @staticmethod
+    def _get_base_name(node):
+        """
+        Returns the name of the variable accessed by the given Name or Subscript node
+
+        :param node: AST node
+            + type: AST.Node
+        :return: The variable name or None if the node is not a variable access
+            + type: str
+        """
+
+        while isinstance(node, ast.Subscript):
+            node = node.value
+        if isinstance(node, ast.Name):
+            return node.id
+        return None
+
+    def _fuse_statements(self, group):
+        """
+        Builds a new task containing the calls of all the statements in the group and returns its callee
+
+        :param group: List of statements to fuse
+            + type: List<AST.Node>
+        :return: Assign node calling the new task
+            + type: AST.Node
+        """
+
+        import copy
+
+        # Create the new task name
+        self.task_counter_id += 1
+        task_name = "S" + str(self.task_counter_id)
+
+        # Compute task parameters and body
+        call_args = []
+        param_names = []
+        keys2params = {}
+        forwarded = {}
+        body = []
+        targets = []
+        return_vars = []
+        for index, statement in enumerate(group):
+            inner_args = []
+            for arg in statement.value.args:
+                arg_key = StatementCoarsener._get_key(arg)
+                if arg_key in forwarded.keys():
+                    # Use the value computed by a previous statement of the task
+                    inner_args.append(ast.Name(id=forwarded[arg_key]))
+                    continue
+                if arg_key not in keys2params.keys():
+                    if isinstance(arg, ast.Name):
+                        param_name = arg.id
+                    else:
+                        param_name = "var" + str(len(call_args) + 1)
+                    keys2params[arg_key] = param_name
+                    param_names.append(param_name)
+                    call_args.append(copy.deepcopy(arg))
+                inner_args.append(ast.Name(id=keys2params[arg_key]))
+
+            res_name = "res" + str(index + 1)
+            inner_call = ast.Call(func=ast.Name(id=statement.value.func.id),
+                                  args=inner_args,
+                                  keywords=[],
+                                  starargs=None,
+                                  kwargs=None)
+            body.append(ast.Assign(targets=[ast.Name(id=res_name)], value=inner_call))
+            forwarded[StatementCoarsener._get_key(statement.targets[0])] = res_name
+            targets.append(copy.deepcopy(statement.targets[0]))
+            return_vars.append(res_name)
+        body.append(ast.Return(value=ast.Tuple(elts=[ast.Name(id=rv) for rv in return_vars])))
+
+        # Build task code calling the original statements as plain methods
+        from pycompss.util.translators.py2pycompss.components.loop_taskificator import _UntaskCallees
+        new_task = ast.FunctionDef(name=task_name,
+                                   args=ast.arguments(args=[ast.Name(id=p) for p in param_names], vararg=None,
+                                                      kwarg=None, defaults=[]),
+                                   body=body,
+                                   decorator_list=[])
+        new_task = _UntaskCallees(self.task2headers, self.task2func_code).visit(new_task)
+
+        # Build task header
+        from pycompss.util.translators.py2pycompss.components.header_builder import HeaderBuilder
+        task_header = HeaderBuilder.build_task_header(param_names, {}, [], {}, [], {}, return_vars)
+
+        # Add information to internal structures
+        self.task2func_code[task_name] = new_task
+        self.task2headers[task_name] = task_header
+        if __debug__:
+            from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
+            import astor
+            logger.debug("- New Coarsened Task Header:")
+            logger.debug(task_header)
+            logger.debug("- New coarsened task:")
+            logger.debug(astor.to_source(new_task, pretty_source=PyCOMPSsSourceGen.long_line_ps))
+
+        # Build callee
+        new_node = ast.Assign(targets=[ast.Tuple(elts=targets)],
+                              value=ast.Call(func=ast.Name(id=task_name),
+                                             args=call_args,
+                                             keywords=[],
+                                             starargs=None,
+                                             kwargs=None))
+        return ast.copy_location(new_node, group[0])
+
+
+#
+# UNIT TESTS
+#
+
+class TestStatementCoarsener(unittest.TestCase):
+
+    @staticmethod
+    def _build_tasks():
+        task2headers = {"S2": "@task(var2=IN, var3=IN, returns=1)",
+                        "S3": "@task(b_size=IN, returns=1)"}
+        task2func_code = {"S2": ast.parse("def S2(var2, var3):\n    return solve(var2, var3)").body[0],
+                          "S3": ast.parse("def S3(b_size):\n    return zeros(b_size)").body[0]}
+        return task2headers, task2func_code
+
+    def test_fuse_same_iteration(self):
+        task2headers, task2func_code = TestStatementCoarsener._build_tasks()
+        code = "for t1 in range(1, N):\n" \
+               "    a[t1][0] = S2(a[0][0], a[t1][0])\n" \
+               "    a[0][t1] = S3(b_size)\n"
+        statement = ast.parse(code).body[0]
+
+        sc = StatementCoarsener(3, task2headers, task2func_code, 2)
+        new_statement = sc.visit(statement)
+
+        self.assertEqual(sc.get_final_task_counter_id(), 4)
+        self.assertEqual(len(new_statement.body), 1)
+        self.assertEqual(sc.get_final_task2headers()["S4"], "@task(var1=IN, var2=IN, b_size=IN, returns=2)")
+        self.assertTrue("S2_no_task" in sc.get_final_task2func_code().keys())
+        self.assertTrue("S3_no_task" in sc.get_final_task2func_code().keys())
+
+        import astor
+        self.assertEqual(astor.to_source(new_statement.body[0]).strip(),
+                         "a[t1][0], a[0][t1] = S4(a[0][0], a[t1][0], b_size)")
+        self.assertEqual(astor.to_source(sc.get_final_task2func_code()["S4"]).strip(),
+                         "def S4(var1, var2, b_size):\n"
+                         "    res1 = S2_no_task(var1, var2)\n"
+                         "    res2 = S3_no_task(b_size)\n"
+                         "    return res1, res2")
+
+    def test_threshold(self):
+        task2headers, task2func_code = TestStatementCoarsener._build_tasks()
+        code = "for t1 in range(1, N):\n" \
+               "    a[t1][0] = S2(a[0][0], a[t1][0])\n" \
+               "    a[0][t1] = S3(b_size)\n"
+        statement = ast.parse(code).body[0]
+
+        sc = StatementCoarsener(3, task2headers, task2func_code, 1)
+        new_statement = sc.visit(statement)
+
+        self.assertEqual(sc.get_final_task_counter_id(), 3)
+        self.assertEqual(len(new_statement.body), 2)
+
+    def test_different_neighborhood(self):
+        task2headers, task2func_code = TestStatementCoarsener._build_tasks()
+        code = "for t1 in range(1, N):\n" \
+               "    for t2 in range(1, N):\n" \
+               "        a[t1][t2] = S2(a[0][0], a[t1][t2])\n" \
+               "        a[0][t1] = S3(b_size)\n"
+        statement = ast.parse(code).body[0]
+
+        sc = StatementCoarsener(3, task2headers, task2func_code, 4)
+        new_statement = sc.visit(statement)
+
+        self.assertEqual(sc.get_final_task_counter_id(), 3)
+        self.assertEqual(len(new_statement.body[0].body), 2)
+
+    def test_forward_and_alias(self):
+        task2headers, task2func_code = TestStatementCoarsener._build_tasks()
+        # The second statement reads the value written by the first one: it is forwarded inside the task
+        code = "for t1 in range(1, N):\n" \
+               "    a[0][t1] = S3(b_size)\n" \
+               "    a[t1][0] = S2(b[0][0], a[0][t1])\n"
+        statement = ast.parse(code).body[0]
+        sc = StatementCoarsener(3, task2headers, task2func_code, 2)
+        new_statement = sc.visit(statement)
+        import astor
+        self.assertEqual(astor.to_source(new_statement.body[0]).strip(),
+                         "a[0][t1], a[t1][0] = S4(b_size, b[0][0])")
+        self.assertEqual(astor.to_source(sc.get_final_task2func_code()["S4"]).strip(),
+                         "def S4(b_size, var2):\n"
+                         "    res1 = S3_no_task(b_size)\n"
+                         "    res2 = S2_no_task(var2, res1)\n"
+                         "    return res1, res2")
+
+        # The second statement reads a possibly aliased position of the written variable: no fusion
+        task2headers, task2func_code = TestStatementCoarsener._build_tasks()
+        code = "for t1 in range(1, N):\n" \
+               "    a[0][t1] = S3(b_size)\n" \
+               "    a[t1][0] = S2(a[0][0], a[0][t1 - 1])\n"
+        statement = ast.parse(code).body[0]
+        sc = StatementCoarsener(3, task2headers, task2func_code, 2)
+        new_statement = sc.visit(statement)
+        self.assertEqual(len(new_statement.body), 2)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
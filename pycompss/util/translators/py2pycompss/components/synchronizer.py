@@ -0,0 +1,610 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Synchronizer class
+#
+
+class Synchronizer(object):
+    """
+    Inserts the minimum synchronizations required by the host code of a function containing task calls. Instead of
+    draining the whole task graph after each loop block, each variable written by tasks is only synchronized (by means
+    of compss_wait_on) right before the first host statement accessing it, and a final barrier is only added when
+    there are pending tasks at the end of the function. The views of arrays passed to the tasks are kept in a registry
+    per array (initialized before the first autogenerated statement using it) and written back to the array right
+    before synchronizing it.
+    """
+
+    @staticmethod
+    def synchronize(func_body, generated_statements, task2headers, task2func_code):
+        """
+        Inserts the synchronizations required by the host statements of the given function body
+
+        :param func_body: List of statements of the function body
+            + type: List<AST.Node>
+        :param generated_statements: List of the autogenerated statements of the function body (the ones issuing tasks)
+            + type: List<AST.Node>
+        :param task2headers: Map containing the task names and their headers
+            + type: dict
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :return: New list of statements of the function body
+            + type: List<AST.Node>
+        """
+
+        # Compute the variables written by the tasks of each autogenerated statement
+        generated_ids = {}
+        aux2vars = Synchronizer.get_aux_vars(generated_statements)
+        for statement in generated_statements:
+            written_vars, untracked = Synchronizer.get_task_written_vars(statement, task2headers, task2func_code,
+                                                                          aux2vars)
+            generated_ids[id(statement)] = (written_vars, untracked)
+
+        # Initialize the view registries before the first autogenerated statement using them
+        var2views = Synchronizer.get_view_registries(generated_statements)
+        initialized_registries = set()
+        body = []
+        for statement in func_body:
+            if id(statement) in generated_ids.keys():
+                for node in ast.walk(statement):
+                    if Synchronizer.get_registered_view(node) is not None and \
+                            node.func.value.id not in initialized_registries:
+                        initialized_registries.add(node.func.value.id)
+                        body.append(ast.parse(node.func.value.id + " = {}").body[0])
+            body.append(statement)
+
+        # Process the function body
+        new_body, pending_vars, untracked = Synchronizer._sync_statements(body, generated_ids, var2views, [], False)
+
+        # Add a final barrier if there are pending tasks at the end of the function
+        if (untracked or len(pending_vars) > 0) and (len(new_body) == 0 or not isinstance(new_body[-1], ast.Return)):
+            Synchronizer._write_back_views(pending_vars, var2views, new_body)
+            new_body.append(Synchronizer._build_barrier())
+
+        if __debug__:
+            logger.debug("[Synchronizer] Variables written by tasks: " + str(pending_vars))
+
+        return new_body
+
+    @staticmethod
+    def _sync_statements(statements, generated_ids, var2views, pending_vars, untracked):
+        """
+        Inserts the synchronizations required by the given list of statements
+
+        :param statements: List of statements
+            + type: List<AST.Node>
+        :param generated_ids: Map containing the ids of the autogenerated statements and their written variables
+            + type: Dict<int, Tuple(List<str>, boolean)>
+        :param var2views: Map containing the variable names and the names of their view registries
+            + type: Dict<str, List<str>>
+        :param pending_vars: List of variables written by tasks that have not been synchronized
+            + type: List<str>
+        :param untracked: Whether there are pending tasks without tracked outputs
+            + type: boolean
+        :return: A tuple containing the new list of statements, the variables pending of synchronization, and whether
+         there are pending tasks without tracked outputs after the statements
+            + type: Tuple(List<AST.Node>, List<str>, boolean)
+        """
+
+        pending_vars = list(pending_vars)
+        new_statements = []
+        for statement in statements:
+            if id(statement) in generated_ids.keys():
+                # Autogenerated code only issues more tasks, no need to synchronize
+                written_vars, block_untracked = generated_ids[id(statement)]
+                for var in written_vars:
+                    if var not in pending_vars:
+                        pending_vars.append(var)
+                untracked = untracked or block_untracked
+                new_statements.append(statement)
+            elif isinstance(statement, ast.Return):
+                # Returned variables are propagated as they are, but the tasks must be finished
+                accessed_nodes = []
+                if statement.value is not None and not Synchronizer._is_plain_return(statement.value):
+                    accessed_nodes = [statement.value]
+                pending_vars = Synchronizer._wait_accessed_vars(accessed_nodes, pending_vars, var2views, new_statements)
+                if untracked or len(pending_vars) > 0:
+                    Synchronizer._write_back_views(pending_vars, var2views, new_statements)
+                    new_statements.append(Synchronizer._build_barrier())
+                new_statements.append(statement)
+            elif isinstance(statement, (ast.If, ast.For, ast.While)):
+                # Synchronize the variables accessed by the statement header
+                header_nodes = [statement.test] if not isinstance(statement, ast.For) else [statement.target,
+                                                                                           statement.iter]
+                pending_vars = Synchronizer._wait_accessed_vars(header_nodes, pending_vars, var2views, new_statements)
+                # Process the inner blocks. Conservatively, synchronizations inside them are not propagated
+                statement.body, _, _ = Synchronizer._sync_statements(statement.body, generated_ids, var2views,
+                                                                     pending_vars, untracked)
+                statement.orelse, _, _ = Synchronizer._sync_statements(statement.orelse, generated_ids, var2views,
+                                                                       pending_vars, untracked)
+                new_statements.append(statement)
+            else:
+                # Generic host statement: synchronize all the accessed variables
+                pending_vars = Synchronizer._wait_accessed_vars([statement], pending_vars, var2views, new_statements)
+                new_statements.append(statement)
+
+        return new_statements, pending_vars, untracked
+
+    @staticmethod
+    def _wait_accessed_vars(nodes, pending_vars, var2views, new_statements):
+        """
+        Appends a compss_wait_on statement to new_statements for each pending variable accessed by the given nodes
+
+        :param nodes: List of AST nodes to inspect
+            + type: List<AST.Node>
+        :param pending_vars: List of variables written by tasks that have not been synchronized
+            + type: List<str>
+        :param var2views: Map containing the variable names and the names of their view registries
+            + type: Dict<str, List<str>>
+        :param new_statements: List of statements where the synchronizations are appended
+            + type: List<AST.Node>
+        :return: The new list of pending variables
+            + type: List<str>
+        """
+
+        accessed_vars = set()
+        for node in nodes:
+            for child in ast.walk(node):
+                if isinstance(child, ast.Name):
+                    accessed_vars.add(child.id)
+
+        new_pending_vars = []
+        for var in pending_vars:
+            if var in accessed_vars:
+                Synchronizer._write_back_views([var], var2views, new_statements)
+                wait_on = ast.parse(var + " = compss_wait_on(" + var + ")").body[0]
+                new_statements.append(wait_on)
+            else:
+                new_pending_vars.append(var)
+        return new_pending_vars
+
+    @staticmethod
+    def _write_back_views(var_names, var2views, new_statements):
+        """
+        Appends to new_statements the statements writing the registered views of the given variables back to them
+
+        :param var_names: List of variable names
+            + type: List<str>
+        :param var2views: Map containing the variable names and the names of their view registries
+            + type: Dict<str, List<str>>
+        :param new_statements: List of statements where the write backs are appended
+            + type: List<AST.Node>
+        """
+
+        for var in var_names:
+            for registry in var2views.get(var, []):
+                new_statements.extend(Synchronizer.build_views_write_back(var, registry))
+
+    @staticmethod
+    def build_views_write_back(var_name, registry):
+        """
+        Returns the statements writing the views of the given registry back to the viewed array and emptying the
+        registry. The runtime may send copies of the views to the tasks (e.g. when it does not share memory with the
+        master), so the last version of each view is retrieved and copied into the view
+
+        :param var_name: Name of the viewed variable
+            + type: str
+        :param registry: Name of the view registry
+            + type: str
+        :return: List of statements
+            + type: List<AST.Node>
+        """
+
+        view_name = var_name + "_view"
+        code = "for " + view_name + " in " + registry + ".values():\n" \
+               "    " + view_name + "[...] = compss_wait_on(" + view_name + ")\n" + \
+               registry + ".clear()\n"
+        return ast.parse(code).body
+
+    @staticmethod
+    def _is_plain_return(node):
+        """
+        Determines whether the returned expression only contains variables
+
+        :param node: AST node of the returned expression
+            + type: AST.Node
+        :return: True if the returned expression is a variable or a tuple of variables, False otherwise
+            + type: boolean
+        """
+
+        if isinstance(node, ast.Name):
+            return True
+        if isinstance(node, ast.Tuple):
+            return all(isinstance(elt, ast.Name) for elt in node.elts)
+        return False
+
+    @staticmethod
+    def _build_barrier():
+        """
+        Returns a new barrier statement
+
+        :return: AST node of the barrier statement
+            + type: AST.Node
+        """
+
+        return ast.parse("compss_barrier()").body[0]
+
+    @staticmethod
+    def get_aux_vars(statements):
+        """
+        Returns the auxiliary variables containing chunks of collections (or views of arrays) and the variables they
+        contain
+
+        :param statements: List of statements
+            + type: List<AST.Node>
+        :return: Map containing the auxiliary variable names and the list of chunked variable names
+            + type: Dict<str, List<str>>
+        """
+
+        aux2vars = {}
+        for statement in statements:
+            for node in ast.walk(statement):
+                if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name) \
+                        and isinstance(node.value, ast.ListComp):
+                    chunked_vars = []
+                    for child in ast.walk(node.value.elt):
+                        if isinstance(child, ast.Subscript):
+                            var_name = Synchronizer._get_base_name(child)
+                            if var_name is not None and var_name not in chunked_vars:
+                                chunked_vars.append(var_name)
+                    aux2vars[node.targets[0].id] = chunked_vars
+                elif isinstance(node, ast.Assign) and len(node.targets) == 1 and \
+                        isinstance(node.targets[0], ast.Name):
+                    # Views of ndarrays (basic slicing), directly built or retrieved from a view registry
+                    view = Synchronizer.get_registered_view(node.value)
+                    if view is None:
+                        view = node.value
+                    if isinstance(view, ast.Subscript) and Synchronizer._is_basic_slicing(view.slice) and \
+                            isinstance(view.value, ast.Name):
+                        aux2vars[node.targets[0].id] = [view.value.id]
+        return aux2vars
+
+    @staticmethod
+    def get_registered_view(node):
+        """
+        Returns the view built by the given retrieval from a view registry (<registry>.setdefault(key, view))
+
+        :param node: AST node
+            + type: AST.Node
+        :return: The AST node building the view or None if the node is not a retrieval from a view registry
+            + type: AST.Subscript
+        """
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "setdefault" \
+                and isinstance(node.func.value, ast.Name) and node.func.value.id.endswith("_views") \
+                and len(node.args) == 2 and isinstance(node.args[1], ast.Subscript) \
+                and isinstance(node.args[1].value, ast.Name):
+            return node.args[1]
+        return None
+
+    @staticmethod
+    def get_view_registries(statements):
+        """
+        Returns the view registries used by the given statements
+
+        :param statements: List of statements
+            + type: List<AST.Node>
+        :return: Map containing the viewed variable names and the names of their view registries
+            + type: Dict<str, List<str>>
+        """
+
+        var2views = {}
+        for statement in statements:
+            for node in ast.walk(statement):
+                view = Synchronizer.get_registered_view(node)
+                if view is not None:
+                    registries = var2views.setdefault(view.value.id, [])
+                    if node.func.value.id not in registries:
+                        registries.append(node.func.value.id)
+        return var2views
+
+    @staticmethod
+    def _is_basic_slicing(node):
+        """
+        Determines whether the given subscript slice is a basic slicing (i.e. builds a view of an array)
+
+        :param node: AST node of the subscript slice
+            + type: AST.Node
+        :return: True if the slice contains slices, False otherwise
+            + type: boolean
+        """
+
+        if isinstance(node, ast.Slice) or isinstance(node, ast.ExtSlice):
+            return True
+        # Python 3.9+ represents extended slices as tuples
+        return isinstance(node, ast.Tuple) and any(isinstance(elt, ast.Slice) for elt in node.elts)
+
+    @staticmethod
+    def get_task_written_vars(statement, task2headers, task2func_code, aux2vars):
+        """
+        Returns the variables written by the tasks called inside the given statement
+
+        :param statement: AST node representing the head of the statement
+            + type: AST.Node
+        :param task2headers: Map containing the task names and their headers
+            + type: dict
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :param aux2vars: Map containing the auxiliary variable names and the list of chunked variable names
+            + type: Dict<str, List<str>>
+        :return: A tuple containing the list of variables written by tasks and whether there are tasks without
+         tracked outputs
+            + type: Tuple(List<str>, boolean)
+        """
+
+        from pycompss.util.translators.py2pycompss.components.header_builder import HeaderBuilder
+
+        written_vars = []
+        untracked = False
+        for node in ast.walk(statement):
+            if not isinstance(node, ast.Call) or not Synchronizer.is_task_call(node, task2headers):
+                continue
+
+            # Variables written through the task parameters
+            task_name = node.func.id
+            args2dirs = HeaderBuilder.split_task_header(task2headers[task_name])
+            task_params = task2func_code[task_name].args.args
+            call_written_vars = []
+            for position, param in enumerate(task_params):
+                # Task parameters are Name nodes (Python 2) or arg nodes (Python 3)
+                param_name = param.id if isinstance(param, ast.Name) else param.arg
+                direction = args2dirs.get(param_name, "IN")
+                if position < len(node.args) and Synchronizer.is_written(direction):
+                    call_written_vars.extend(Synchronizer.get_var_names(node.args[position], aux2vars))
+            if "returns" not in args2dirs.keys() and len(call_written_vars) == 0:
+                untracked = True
+            for var in call_written_vars:
+                if var not in written_vars:
+                    written_vars.append(var)
+
+        # Variables written through the task returns
+        for node in ast.walk(statement):
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) and \
+                    Synchronizer.is_task_call(node.value, task2headers):
+                for target in node.targets:
+                    for var in Synchronizer.get_var_names(target, aux2vars):
+                        if var not in written_vars:
+                            written_vars.append(var)
+
+        return written_vars, untracked
+
+    @staticmethod
+    def is_task_call(node, task2headers):
+        """
+        Determines whether the given call node is a call to a task
+
+        :param node: AST Call node
+            + type: AST.Call
+        :param task2headers: Map containing the task names and their headers
+            + type: dict
+        :return: True if the node calls a task, False otherwise
+            + type: boolean
+        """
+
+        return isinstance(node.func, ast.Name) and node.func.id in task2headers.keys() and \
+            task2headers[node.func.id] is not None
+
+    @staticmethod
+    def is_written(direction):
+        """
+        Determines whether the given parameter direction writes the parameter
+
+        :param direction: Parameter direction as written in the task header
+            + type: str
+        :return: True if the direction is not IN, False otherwise
+            + type: boolean
+        """
+
+        return direction != "IN" and "COLLECTION_IN," not in direction
+
+    @staticmethod
+    def get_var_names(node, aux2vars):
+        """
+        Returns the variable names accessed by the given task argument or target
+
+        :param node: AST node of the argument or target
+            + type: AST.Node
+        :param aux2vars: Map containing the auxiliary variable names and the list of chunked variable names
+            + type: Dict<str, List<str>>
+        :return: List of variable names
+            + type: List<str>
+        """
+
+        if isinstance(node, ast.Tuple):
+            var_names = []
+            for elt in node.elts:
+                var_names.extend(Synchronizer.get_var_names(elt, aux2vars))
+            return var_names
+
+        var_name = Synchronizer._get_base_name(node)
+        if var_name is None:
+            return []
+        if var_name in aux2vars.keys():
+            return aux2vars[var_name]
+        return [var_name]
+
+    @staticmethod
+    def _get_base_name(node):
+        """
+        Returns the name of the variable accessed by the given Name or Subscript node
+
+        :param node: AST node
+            + type: AST.Node
+        :return: The variable name or None if the node is not a variable access
+            + type: str
+        """
+
+        while isinstance(node, ast.Subscript):
+            node = node.value
+        if isinstance(node, ast.Name):
+            return node.id
+        return None
+
+
+#
+# UNIT TESTS
+#
+
+class TestSynchronizer(unittest.TestCase):
+
+    @staticmethod
+    def _synchronize(code, task2headers, task2func_code):
+        # Loops represent the autogenerated code
+        func = ast.parse(code).body[0]
+        generated_statements = [s for s in func.body if isinstance(s, ast.For)]
+        func.body = Synchronizer.synchronize(func.body, generated_statements, task2headers, task2func_code)
+
+        import astor
+        from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
+        return astor.to_source(func, pretty_source=PyCOMPSsSourceGen.long_line_ps)
+
+    def test_no_host_accesses(self):
+        task2headers = {"S1": "@task(var2=IN, returns=1)", "S2": "@task(var2=IN, returns=1)"}
+        task2func_code = {"S1": ast.parse("def S1(var2):\n    return f(var2)").body[0],
+                          "S2": ast.parse("def S2(var2):\n    return g(var2)").body[0]}
+        code = "def func(a, b, n):\n" \
+               "    for t1 in range(0, n):\n" \
+               "        a[t1] = S1(a[t1])\n" \
+               "    for t1 in range(0, n):\n" \
+               "        b[t1] = S2(a[t1])\n" \
+               "    return b\n"
+
+        got = TestSynchronizer._synchronize(code, task2headers, task2func_code)
+        expected = "def func(a, b, n):\n" \
+                   "    for t1 in range(0, n):\n" \
+                   "        a[t1] = S1(a[t1])\n" \
+                   "    for t1 in range(0, n):\n" \
+                   "        b[t1] = S2(a[t1])\n" \
+                   "    compss_barrier()\n" \
+                   "    return b\n"
+        self.assertEqual(got, expected)
+
+    def test_host_accesses(self):
+        task2headers = {"S1": "@task(var2=IN, var3=IN, var1=INOUT)",
+                        "LT2": "@task(n=IN, a={Type: COLLECTION_IN, Depth: 1}, b={Type: COLLECTION_INOUT, Depth: 1})"}
+        task2func_code = {"S1": ast.parse("def S1(var2, var3, var1):\n    var1 += var2 * var3").body[0],
+                          "LT2": ast.parse("def LT2(n, a, b):\n    pass").body[0]}
+        code = "def func(a, b, c, n, debug):\n" \
+               "    for t1 in range(0, n):\n" \
+               "        S1(a[t1], b[t1], c[t1])\n" \
+               "    if debug:\n" \
+               "        show(a)\n" \
+               "        show(c)\n" \
+               "    for t1 in range(0, n):\n" \
+               "        LT2_aux_0 = [a[gv0] for gv0 in range(0, n, 1)]\n" \
+               "        LT2_aux_1 = [b[gv0] for gv0 in range(0, n, 1)]\n" \
+               "        LT2(n, LT2_aux_0, LT2_aux_1)\n" \
+               "    x = sum(b)\n" \
+               "    c = compute(c, x)\n"
+
+        got = TestSynchronizer._synchronize(code, task2headers, task2func_code)
+        expected = "def func(a, b, c, n, debug):\n" \
+                   "    for t1 in range(0, n):\n" \
+                   "        S1(a[t1], b[t1], c[t1])\n" \
+                   "    if debug:\n" \
+                   "        show(a)\n" \
+                   "        c = compss_wait_on(c)\n" \
+                   "        show(c)\n" \
+                   "    for t1 in range(0, n):\n" \
+                   "        LT2_aux_0 = [a[gv0] for gv0 in range(0, n, 1)]\n" \
+                   "        LT2_aux_1 = [b[gv0] for gv0 in range(0, n, 1)]\n" \
+                   "        LT2(n, LT2_aux_0, LT2_aux_1)\n" \
+                   "    b = compss_wait_on(b)\n" \
+                   "    x = sum(b)\n" \
+                   "    c = compss_wait_on(c)\n" \
+                   "    c = compute(c, x)\n"
+        self.assertEqual(got, expected)
+
+    def test_untracked_tasks(self):
+        task2headers = {"S1": "@task(var1=IN)"}
+        task2func_code = {"S1": ast.parse("def S1(var1):\n    show(var1)").body[0]}
+        code = "def func(a, n):\n" \
+               "    for t1 in range(0, n):\n" \
+               "        S1(a[t1])\n" \
+               "    show(a)\n"
+
+        got = TestSynchronizer._synchronize(code, task2headers, task2func_code)
+        expected = "def func(a, n):\n" \
+                   "    for t1 in range(0, n):\n" \
+                   "        S1(a[t1])\n" \
+                   "    show(a)\n" \
+                   "    compss_barrier()\n"
+        self.assertEqual(got, expected)
+
+    def test_view_accesses(self):
+        task2headers = {"LT1_view": "@task(n=IN, c=INOUT)"}
+        task2func_code = {"LT1_view": ast.parse("def LT1_view(n, c):\n    pass").body[0]}
+        code = "def func(c, n):\n" \
+               "    for t1 in range(0, n):\n" \
+               "        LT1_view_aux_0 = c_views.setdefault((id(c), t1, t1 + 2, 0, n), c[t1:t1 + 2, 0:n])\n" \
+               "        LT1_view(n, LT1_view_aux_0)\n" \
+               "    show(c)\n"
+
+        # The views are only written back when the host code accesses the array
+        got = TestSynchronizer._synchronize(code, task2headers, task2func_code)
+        expected = "def func(c, n):\n" \
+                   "    c_views = {}\n" \
+                   "    for t1 in range(0, n):\n" \
+                   "        LT1_view_aux_0 = c_views.setdefault((id(c), t1, t1 + 2, 0, n), c[t1:t1 + 2, 0:n])\n" \
+                   "        LT1_view(n, LT1_view_aux_0)\n" \
+                   "    for c_view in c_views.values():\n" \
+                   "        c_view[...] = compss_wait_on(c_view)\n" \
+                   "    c_views.clear()\n" \
+                   "    c = compss_wait_on(c)\n" \
+                   "    show(c)\n"
+        self.assertEqual(got, expected)
+
+    def test_view_final_write_back(self):
+        task2headers = {"LT1_view": "@task(n=IN, a=IN, c=INOUT)"}
+        task2func_code = {"LT1_view": ast.parse("def LT1_view(n, a, c):\n    pass").body[0]}
+        code = "def func(a, c, n):\n" \
+               "    for t1 in range(0, n):\n" \
+               "        LT1_view_aux_0 = a_views.setdefault((id(a), t1, t1 + 2), a[t1:t1 + 2])\n" \
+               "        LT1_view_aux_1 = c_views.setdefault((id(c), t1, t1 + 2), c[t1:t1 + 2])\n" \
+               "        LT1_view(n, LT1_view_aux_0, LT1_view_aux_1)\n" \
+               "    for t1 in range(0, n):\n" \
+               "        LT1_view_aux_1 = c_views.setdefault((id(c), t1, t1 + 2), c[t1:t1 + 2])\n" \
+               "        LT1_view(n, LT1_view_aux_1, LT1_view_aux_1)\n"
+
+        # The registries are initialized once and the written views are written back before the final barrier
+        got = TestSynchronizer._synchronize(code, task2headers, task2func_code)
+        expected = "def func(a, c, n):\n" \
+                   "    a_views = {}\n" \
+                   "    c_views = {}\n" \
+                   "    for t1 in range(0, n):\n" \
+                   "        LT1_view_aux_0 = a_views.setdefault((id(a), t1, t1 + 2), a[t1:t1 + 2])\n" \
+                   "        LT1_view_aux_1 = c_views.setdefault((id(c), t1, t1 + 2), c[t1:t1 + 2])\n" \
+                   "        LT1_view(n, LT1_view_aux_0, LT1_view_aux_1)\n" \
+                   "    for t1 in range(0, n):\n" \
+                   "        LT1_view_aux_1 = c_views.setdefault((id(c), t1, t1 + 2), c[t1:t1 + 2])\n" \
+                   "        LT1_view(n, LT1_view_aux_1, LT1_view_aux_1)\n" \
+                   "    for c_view in c_views.values():\n" \
+                   "        c_view[...] = compss_wait_on(c_view)\n" \
+                   "    c_views.clear()\n" \
+                   "    compss_barrier()\n"
+        self.assertEqual(got, expected)
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
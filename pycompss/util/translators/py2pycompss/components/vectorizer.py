@@ -0,0 +1,564 @@
+#!/usr/bin/python
+
+# -*- coding: utf-8 -*-
+
+# For better print formatting
+from __future__ import print_function
+
+# Imports
+import unittest
+import logging
+import ast
+
+#
+# Logger definition
+#
+
+logger = logging.getLogger("pycompss.api.autoparallel")
+
+
+#
+# Vectorizer class
+#
+
+class Vectorizer(object):
+    """
+    Rewrites the body of the loop tasks receiving ndarray views as a single NumPy expression over the whole chunk.
+    Only loop nests applying a pure arithmetic statement element-wise are vectorized. This is, rectangular loop nests
+    containing a single statement of the form target = S_no_task(args) where the callee returns an arithmetic
+    expression of its parameters and where all the array accesses index each dimension with the same loop index. The
+    calls to user functions returning an arithmetic expression of their parameters (e.g. return coef1 * elem + coef2)
+    are inlined.
+
+    Attributes:
+        - _cloog_vars: Static list of CLooG variables
+            + type: list
+        - _arithmetic_nodes: Static tuple of the AST nodes allowed inside pure arithmetic expressions
+            + type: tuple
+        - _max_inline_depth: Static maximum number of nested calls inlined
+            + type: int
+    """
+
+    # Static attribute List of control flow CLooG variables
+    _cloog_vars = ["lbp", "ubp", "lbv", "ubv"]
+
+    # Static attribute Tuple of the AST nodes allowed inside pure arithmetic expressions
+    _arithmetic_nodes = (ast.BinOp, ast.UnaryOp, ast.Name, ast.Num, ast.operator, ast.unaryop, ast.expr_context)
+
+    # Static attribute Maximum number of nested calls inlined
+    _max_inline_depth = 8
+
+    @staticmethod
+    def vectorize(task_code, task2func_code, callee2func_def=None):
+        """
+        Vectorizes the body of the given task if possible
+
+        :param task_code: AST representation of the task function. Modified in place
+            + type: ast.FunctionDef
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :param callee2func_def: Map containing the names of the user functions and their AST representations. Used to
+         inline the user callees (default None)
+            + type: dict<str, ast.FunctionDef>
+        :return: True if the task has been vectorized, False otherwise
+            + type: boolean
+        """
+
+        if len(task_code.body) != 1 or not isinstance(task_code.body[0], ast.For):
+            return False
+
+        # Retrieve the loop nest and its statement
+        loops2bounds, statement = Vectorizer._get_loop_nest(task_code.body[0])
+        if loops2bounds is None:
+            return False
+
+        # Build the element-wise expression
+        element_statement = Vectorizer._inline_callee(statement, task2func_code, callee2func_def or {})
+        if element_statement is None:
+            return False
+
+        # Rewrite the array accesses as slices over the whole iteration space
+        vectorized_statement = _RewriteElementAccesses(loops2bounds).visit(element_statement)
+        if vectorized_statement is None:
+            return False
+
+        task_code.body = [vectorized_statement]
+
+        if __debug__:
+            import astor
+            from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
+            logger.debug("[Vectorizer] Vectorized task " + str(task_code.name) + ":")
+            logger.debug(astor.to_source(task_code, pretty_source=PyCOMPSsSourceGen.long_line_ps))
+
+        return True
+
+    @staticmethod
+    def _get_loop_nest(node):
+        """
+        Returns the bounds of each loop of the given rectangular loop nest and its innermost statement
+
+        :param node: AST node representing the outermost loop
+            + type: ast.For
+        :return: A tuple containing a map of the loop indexes and a tuple with their lower and upper bounds and the
+         innermost statement. (None, None) if the loop nest cannot be vectorized
+            + type: Tuple(dict<str, Tuple(AST.Node, AST.Node)>, AST.Node)
+        """
+
+        loops2bounds = {}
+        current = node
+        while isinstance(current, ast.For):
+            # Check the loop header: for t in range(lb, ub)
+            if not isinstance(current.target, ast.Name) or len(current.orelse) > 0:
+                return None, None
+            iter_node = current.iter
+            if not isinstance(iter_node, ast.Call) or not isinstance(iter_node.func, ast.Name) or \
+                    iter_node.func.id != "range" or len(iter_node.args) not in [1, 2]:
+                return None, None
+            if len(iter_node.args) == 1:
+                lb, ub = ast.Num(n=0), iter_node.args[0]
+            else:
+                lb, ub = iter_node.args
+            # Check that the bounds do not depend on the iterations of the loop nest
+            for bound in (lb, ub):
+                for name in ast.walk(bound):
+                    if isinstance(name, ast.Name) and \
+                            (name.id in loops2bounds.keys() or name.id in Vectorizer._cloog_vars):
+                        return None, None
+            loops2bounds[current.target.id] = (lb, ub)
+
+            # Skip the CLooG assignments (they are only used by the loop bounds)
+            body = [s for s in current.body if not Vectorizer._is_cloog_assign(s)]
+            if len(body) != 1:
+                return None, None
+            current = body[0]
+
+        return loops2bounds, current
+
+    @staticmethod
+    def _is_cloog_assign(statement):
+        """
+        Determines whether the given statement is an assignment to a CLooG variable
+
+        :param statement: AST node representing the statement
+            + type: AST.Node
+        :return: True if the statement assigns a CLooG variable, False otherwise
+            + type: boolean
+        """
+
+        return isinstance(statement, ast.Assign) and len(statement.targets) == 1 and \
+            isinstance(statement.targets[0], ast.Name) and statement.targets[0].id in Vectorizer._cloog_vars
+
+    @staticmethod
+    def _inline_callee(statement, task2func_code, callee2func_def):
+        """
+        Inlines the arithmetic expression of the callee of the given statement
+
+        :param statement: AST node representing the statement (target = S_no_task(args))
+            + type: AST.Node
+        :param task2func_code: Map containing the task names and their AST code representations
+            + type: dict
+        :param callee2func_def: Map containing the names of the user functions and their AST representations
+            + type: dict<str, ast.FunctionDef>
+        :return: A new assignment of the arithmetic expression to the statement target. None if the callee is not a
+         pure arithmetic expression
+            + type: ast.Assign
+        """
+
+        if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Assign):
+            # Generated statements may wrap the assignment in an expression
+            statement = statement.value
+        if not isinstance(statement, ast.Assign) or len(statement.targets) != 1 or \
+                not isinstance(statement.value, ast.Call) or not isinstance(statement.value.func, ast.Name):
+            return None
+
+        import copy
+        inliner = _InlineCalls(task2func_code, callee2func_def)
+        new_expr = inliner.visit(copy.deepcopy(statement.value))
+        if not inliner.valid or any(isinstance(n, ast.Call) for n in ast.walk(new_expr)):
+            return None
+        return ast.Assign(targets=copy.deepcopy(statement.targets), value=new_expr)
+
+    @staticmethod
+    def get_arithmetic_expr(func_def):
+        """
+        Returns the arithmetic expression returned by the given function
+
+        :param func_def: AST representation of the function
+            + type: ast.FunctionDef
+        :return: The returned expression or None if the function body is not a single return of an arithmetic
+         expression of its parameters. The expression may contain calls to other functions (to be inlined)
+            + type: AST.Node
+        """
+
+        body = func_def.body
+        # Skip the docstring
+        if len(body) > 1 and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Str):
+            body = body[1:]
+        if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+            return None
+        expr = body[0].value
+
+        params = Vectorizer._get_params(func_def)
+        func_names = set(id(node.func) for node in ast.walk(expr) if isinstance(node, ast.Call))
+        for node in ast.walk(expr):
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name):
+                    return None
+            elif not isinstance(node, Vectorizer._arithmetic_nodes):
+                return None
+            elif isinstance(node, ast.Name) and id(node) not in func_names and node.id not in params:
+                # Global variables may not be available inside the task
+                return None
+        return expr
+
+    @staticmethod
+    def _get_params(func_def):
+        """
+        Returns the parameter names of the given function
+
+        :param func_def: AST representation of the function
+            + type: ast.FunctionDef
+        :return: List of parameter names
+            + type: List<str>
+        """
+
+        # Parameters are Name nodes (Python 2) or arg nodes (Python 3)
+        return [param.id if isinstance(param, ast.Name) else param.arg for param in func_def.args.args]
+
+
+#
+# Class Node transformer to inline arithmetic calls
+#
+
+class _InlineCalls(ast.NodeTransformer):
+    """
+    Node Transformer class to replace the calls to the generated and user functions returning an arithmetic
+    expression of their parameters by the expression itself
+
+    Attributes:
+            - task2func_code : Map containing the task names and their AST code representations
+            - callee2func_def : Map containing the names of the user functions and their AST representations
+            - depth : Number of nested calls being inlined
+            - valid : Whether all the calls have been inlined or not
+    """
+
+    def __init__(self, task2func_code, callee2func_def):
+        """
+        Initializes the _InlineCalls internal structures
+
+        :param task2func_code: Map containing the task names and their AST code representations
+        :param callee2func_def: Map containing the names of the user functions and their AST representations
+        """
+
+        self.task2func_code = task2func_code
+        self.callee2func_def = callee2func_def
+        self.depth = 0
+        self.valid = True
+
+    def visit_Call(self, node):
+        """
+        Replaces the call by the arithmetic expression of its callee
+
+        :param node: Call AST node
+        :return new_node: The inlined expression or the same node if it cannot be inlined
+        """
+
+        self.generic_visit(node)
+        if not isinstance(node.func, ast.Name) or len(node.keywords) > 0 or \
+                self.depth >= Vectorizer._max_inline_depth:
+            self.valid = False
+            return node
+        func_def = self.task2func_code.get(node.func.id, self.callee2func_def.get(node.func.id))
+        expr = Vectorizer.get_arithmetic_expr(func_def) if func_def is not None else None
+        params = Vectorizer._get_params(func_def) if func_def is not None else []
+        if expr is None or len(params) != len(node.args):
+            self.valid = False
+            return node
+
+        # Replace the callee parameters by the call arguments and inline the nested calls of the arguments
+        import copy
+        new_expr = _ReplaceNames(dict(zip(params, node.args))).visit(copy.deepcopy(expr))
+        self.depth += 1
+        new_expr = self.visit(new_expr)
+        self.depth -= 1
+        return ast.copy_location(new_expr, node)
+
+
+#
+# Class Node transformer to replace names by expressions
+#
+
+class _ReplaceNames(ast.NodeTransformer):
+    """
+    Node Transformer class to replace the given variable names by the given expressions
+
+    Attributes:
+            - names2exprs : Dictionary mapping variable names to AST expressions
+    """
+
+    def __init__(self, names2exprs):
+        """
+        Initializes the _ReplaceNames internal structures
+
+        :param names2exprs: Dictionary mapping variable names to AST expressions
+        """
+
+        self.names2exprs = names2exprs
+
+    def visit_Name(self, node):
+        """
+        Replaces the name by its expression if registered
+
+        :param node: Name AST node
+        :return new_node: The registered expression or the same node
+        """
+
+        if node.id in self.names2exprs.keys():
+            import copy
+            return copy.deepcopy(self.names2exprs[node.id])
+        return node
+
+
+#
+# Class Node transformer to rewrite element accesses as slices
+#
+
+class _RewriteElementAccesses(ast.NodeTransformer):
+    """
+    Node Transformer class to rewrite the element accesses of a statement inside a loop nest as slices covering the
+    whole iteration space of the loop nest. Returns None when the statement is not element-wise
+
+    Attributes:
+            - loops2bounds : Dictionary mapping the loop indexes to their lower and upper bounds
+            - loop_order : List of loop indexes accessed by each dimension of the arrays (shared by all the accesses)
+            - array2indexes : Dictionary mapping the array names to the dump of their indexes
+            - valid : Whether all the accesses are element-wise or not
+    """
+
+    def __init__(self, loops2bounds):
+        """
+        Initializes the _RewriteElementAccesses internal structures
+
+        :param loops2bounds: Dictionary mapping the loop indexes to their lower and upper bounds
+        """
+
+        self.loops2bounds = loops2bounds
+        self.loop_order = None
+        self.array2indexes = {}
+        self.valid = True
+
+    def visit_Assign(self, node):
+        """
+        Rewrites the accesses of the given statement
+
+        :param node: Assign AST node
+        :return new_node: The rewritten statement or None if it cannot be vectorized
+        """
+
+        # Process the target first to detect reads of the target array on different positions
+        node.targets = [self.visit(target) for target in node.targets]
+        node.value = self.visit(node.value)
+        if not self.valid or self.loop_order is None:
+            return None
+        return node
+
+    def visit_Subscript(self, node):
+        """
+        Rewrites the element access as a slice
+
+        :param node: Subscript AST node
+        :return new_node: Subscript AST node accessing the slice
+        """
+
+        if not isinstance(node.value, ast.Name):
+            self.valid = False
+            return node
+        index = node.slice.value if isinstance(node.slice, ast.Index) else node.slice
+        indexes = index.elts if isinstance(index, ast.Tuple) else [index]
+
+        # Each dimension must be indexed by a loop index (with an offset)
+        loop_order = []
+        offsets = []
+        for dim_index in indexes:
+            loop_ind, offset = self._split_index(dim_index)
+            if loop_ind is None:
+                self.valid = False
+                return node
+            loop_order.append(loop_ind)
+            offsets.append(offset)
+        if sorted(loop_order) != sorted(self.loops2bounds.keys()):
+            self.valid = False
+            return node
+        if self.loop_order is None:
+            self.loop_order = loop_order
+        elif self.loop_order != loop_order:
+            self.valid = False
+            return node
+
+        # Each array must always be accessed at the same position (no loop carried dependencies)
+        indexes_dump = ast.dump(index)
+        if self.array2indexes.setdefault(node.value.id, indexes_dump) != indexes_dump:
+            self.valid = False
+            return node
+
+        # Build slices
+        slices = []
+        for loop_ind, offset in zip(loop_order, offsets):
+            lb, ub = self.loops2bounds[loop_ind]
+            slices.append(ast.Slice(lower=_RewriteElementAccesses._sub(lb, offset),
+                                    upper=_RewriteElementAccesses._sub(ub, offset),
+                                    step=None))
+        if len(slices) == 1:
+            return ast.Subscript(value=node.value, slice=slices[0])
+        return ast.Subscript(value=node.value, slice=ast.ExtSlice(dims=slices))
+
+    def visit_Name(self, node):
+        """
+        Checks that loop indexes are only used inside the array accesses
+
+        :param node: Name AST node
+        :return new_node: The same node
+        """
+
+        if node.id in self.loops2bounds.keys():
+            self.valid = False
+        return node
+
+    def _split_index(self, dim_index):
+        """
+        Splits the given index in the form t or t - offset
+
+        :param dim_index: AST node of the index of a dimension
+        :return: A tuple containing the loop index name and the offset AST node (None when there is no offset).
+         (None, None) if the index is not of the given form
+        """
+
+        if isinstance(dim_index, ast.Name) and dim_index.id in self.loops2bounds.keys():
+            return dim_index.id, None
+        if isinstance(dim_index, ast.BinOp) and isinstance(dim_index.op, ast.Sub) and \
+                isinstance(dim_index.left, ast.Name) and dim_index.left.id in self.loops2bounds.keys():
+            for name in ast.walk(dim_index.right):
+                if isinstance(name, ast.Name) and name.id in self.loops2bounds.keys():
+                    return None, None
+            return dim_index.left.id, dim_index.right
+        return None, None
+
+    @staticmethod
+    def _sub(bound, offset):
+        """
+        Returns the AST expression of bound - offset
+
+        :param bound: AST node of the loop bound
+        :param offset: AST node of the offset (or None)
+        :return: AST node of the subtraction. None if both expressions are equal (omitted slice lower bound)
+        """
+
+        import copy
+        if offset is None:
+            return copy.deepcopy(bound)
+        if ast.dump(bound) == ast.dump(offset):
+            return None
+        return ast.BinOp(left=copy.deepcopy(bound), op=ast.Sub(), right=copy.deepcopy(offset))
+
+
+#
+# UNIT TESTS
+#
+
+class TestVectorizer(unittest.TestCase):
+
+    @staticmethod
+    def _parse_func(code):
+        return ast.parse(code).body[0]
+
+    def test_vectorize_elementwise(self):
+        task2func_code = {"S1_no_task": TestVectorizer._parse_func("def S1_no_task(var2, beta):\n"
+                                                                   "    return var2 * beta + 1\n")}
+        task_code = TestVectorizer._parse_func("def LT3_view(t3, n, t2, beta, c):\n"
+                                               "    for t4 in range(2 * t3, n):\n"
+                                               "        lbv = 2 * t2\n"
+                                               "        ubv = n - 1\n"
+                                               "        for t5 in range(2 * t2, n):\n"
+                                               "            c[t5 - 2 * t2, t4 - 2 * t3] = "
+                                               "S1_no_task(c[t5 - 2 * t2, t4 - 2 * t3], beta)\n")
+
+        self.assertTrue(Vectorizer.vectorize(task_code, task2func_code))
+
+        import astor
+        self.assertEqual(astor.to_source(task_code.body[0]).strip(),
+                         "c[:n - 2 * t2, :n - 2 * t3] = c[:n - 2 * t2, :n - 2 * t3] * beta + 1")
+
+    def test_vectorize_1d(self):
+        task2func_code = {"S1_no_task": TestVectorizer._parse_func("def S1_no_task(var2, var3):\n"
+                                                                   "    return -var2 + var3\n")}
+        task_code = TestVectorizer._parse_func("def LT1_view(n, x, y):\n"
+                                               "    for t1 in range(0, n):\n"
+                                               "        y[t1] = S1_no_task(x[t1], y[t1])\n")
+
+        self.assertTrue(Vectorizer.vectorize(task_code, task2func_code))
+
+        import astor
+        self.assertEqual(astor.to_source(task_code.body[0]).strip(), "y[0:n] = -x[0:n] + y[0:n]")
+
+    def test_vectorize_user_callee(self):
+        # EP kernel: the generated statement calls the user function compute
+        callee2func_def = {"compute": TestVectorizer._parse_func("def compute(elem, coef1, coef2):\n"
+                                                                 "    return coef1 * elem + coef2\n")}
+        task2func_code = {"S1_no_task": TestVectorizer._parse_func("def S1_no_task(var2, coef1, coef2):\n"
+                                                                   "    return compute(var2, coef1, coef2)\n")}
+        task_code = TestVectorizer._parse_func("def LT2_view(ct1, ubc1, m_size, coef1, coef2, mat):\n"
+                                               "    for t1 in range(ct1, min(ct1 + 32, ubc1)):\n"
+                                               "        for t2 in range(0, m_size):\n"
+                                               "            mat[t1 - ct1, t2 - 0] = "
+                                               "S1_no_task(mat[t1 - ct1, t2 - 0], coef1, coef2)\n")
+
+        # Without the user functions the callee cannot be inlined
+        import copy
+        self.assertFalse(Vectorizer.vectorize(copy.deepcopy(task_code), task2func_code))
+
+        self.assertTrue(Vectorizer.vectorize(task_code, task2func_code, callee2func_def))
+
+        import astor
+        from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
+        self.assertEqual(astor.to_source(task_code.body[0], pretty_source=PyCOMPSsSourceGen.long_line_ps).strip(),
+                         "mat[:min(ct1 + 32, ubc1) - ct1, :m_size - 0] = coef1 * mat[:min(ct1 + 32, ubc1) - ct1, "
+                         ":m_size - 0] + coef2")
+
+    def test_not_vectorizable(self):
+        task2func_code = {"S1_no_task": TestVectorizer._parse_func("def S1_no_task(var2):\n"
+                                                                   "    return var2 * 2\n"),
+                          "S2_no_task": TestVectorizer._parse_func("def S2_no_task(var2):\n"
+                                                                   "    return compute(var2)\n")}
+        callee2func_def = {"compute": TestVectorizer._parse_func("def compute(elem):\n"
+                                                                 "    return np.exp(elem)\n")}
+        # Non-arithmetic callee
+        task_code = TestVectorizer._parse_func("def LT1_view(n, x):\n"
+                                               "    for t1 in range(0, n):\n"
+                                               "        x[t1] = S2_no_task(x[t1])\n")
+        self.assertFalse(Vectorizer.vectorize(task_code, task2func_code, callee2func_def))
+        # Loop carried dependency
+        task_code = TestVectorizer._parse_func("def LT1_view(n, x):\n"
+                                               "    for t1 in range(1, n):\n"
+                                               "        x[t1] = S1_no_task(x[t1 - 1])\n")
+        self.assertFalse(Vectorizer.vectorize(task_code, task2func_code))
+        # Reduction (not all the loop indexes are accessed)
+        task_code = TestVectorizer._parse_func("def LT1_view(n, x, y):\n"
+                                               "    for t1 in range(0, n):\n"
+                                               "        for t2 in range(0, n):\n"
+                                               "            x[t1] = S1_no_task(y[t1, t2])\n")
+        self.assertFalse(Vectorizer.vectorize(task_code, task2func_code))
+        # Non-rectangular loop nest
+        task_code = TestVectorizer._parse_func("def LT1_view(n, x):\n"
+                                               "    for t1 in range(0, n):\n"
+                                               "        for t2 in range(t1, n):\n"
+                                               "            x[t1, t2] = S1_no_task(x[t1, t2])\n")
+        self.assertFalse(Vectorizer.vectorize(task_code, task2func_code))
+
+
+#
+# MAIN
+#
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(levelname)s | %(name)s - %(message)s')
+    unittest.main()
@@ -0,0 +1,9 @@
+def ep(mat, n_size, m_size, coef1, coef2):
+    for i in range(n_size):
+        for j in range(m_size):
+            mat[i][j] = compute(mat[i][j], coef1, coef2)
+    return mat
+
+
+def compute(elem, coef1, coef2):
+    return coef1 * elem + coef2
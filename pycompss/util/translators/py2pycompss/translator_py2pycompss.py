@@ -24,7 +24,9 @@ logger = logging.getLogger("pycompss.api.autoparallel")
 class Py2PyCOMPSs(object):
 
     @staticmethod
-    def translate(func, par_py_files, output, tile=False):
+    def translate(func, par_py_files, output, tile=False, coarsen=None, chunk=None, optimize=False, constraints=None,
+                  task_options=None, priority=False, views=False, inplace=False,
+                  vectorize=False, cost_model=None, taskify_depth=None, nested=False, task_counter_id=0):
         """
         Substitutes the given parallel python files into the original
         function code and adds the required PyCOMPSs annotations. The
@@ -38,6 +40,50 @@ class Py2PyCOMPSs(object):
             + type: str
         :param tile: Whether tile mode is enabled or not (default False)
             + type: bool
+        :param coarsen: Maximum cost of the statements fused into a single task. Disabled when None (default None)
+            + type: int
+        :param chunk: Number of consecutive iterations of the parallel loops grouped into a single task. Only used
+         when tile mode is disabled. Disabled when None (default None)
+            + type: int
+        :param optimize: Whether to apply the optimization passes to the generated driver code or not (default False)
+            + type: bool
+        :param constraints: Map containing the original callee names and the constraints of the tasks calling them.
+         Extends the @constraint decorators of the callees (default None)
+            + type: dict<str, dict<str, Object>>
+        :param task_options: Map containing the original callee names and the options of the tasks calling them
+         (default None)
+            + type: dict<str, dict<str, Object>>
+        :param priority: Whether to mark the tasks on the critical path as high-priority tasks or not. When set to
+         "level", the priority level of each critical task is also written (default False)
+            + type: bool or str
+        :param views: Whether to generate the loop task variants receiving ndarray views instead of collections or not.
+         Only used when tile mode or chunks are enabled (default False)
+            + type: bool
+        :param inplace: Whether the statements assigning the result of a callee to one of its arguments update the
+         argument in place (INOUT parameter) instead of returning a new object. When True, only the callees defined
+         in the module of func that update that parameter through subscript assignments or out= keywords, and return
+         nothing or the parameter itself, are converted. Pure callees, scalar updates (c += x) and callees without
+         source keep returning a new object. A list of callee names converts these callees without checking them
+         (default False)
+            + type: bool or List<str>
+        :param vectorize: Whether to rewrite the element-wise loop tasks as NumPy expressions over the whole chunk or
+         not. Enables the ndarray views. Only used when tile mode or chunks are enabled (default False)
+            + type: bool
+        :param cost_model: Map containing the arguments of the cost model choosing the depth of the taskified loops
+         (params, iteration_cost, task_duration and workers). Only used when tile mode is enabled. Disabled when None
+         (default None)
+            + type: dict<str, Object>
+        :param taskify_depth: Depth (starting at 1 for the main loop) of the taskified loops. Overrides the cost model.
+         Only used when tile mode is enabled. Disabled when None (default None)
+            + type: int
+        :param nested: Whether to wrap the iterations of the outermost parallel loops into parent tasks that spawn
+         the inner tasks from the workers (nested tasks) or not (default False)
+            + type: bool
+        :param task_counter_id: Number of tasks already generated in the same module. The generated task names
+         continue from it so that several functions of the same module can be translated together (default 0)
+            + type: int
+        :return task_counter_id: Number of tasks generated in the module after translating the function
+            + type: int
         :raise Py2PyCOMPSsException:
         """
 
@@ -48,16 +94,35 @@ class Py2PyCOMPSs(object):
                 logger.debug("[Py2PyCOMPSs]  - File: " + str(par_f))
             logger.debug("[Py2PyCOMPSs]  - Output: " + str(output))
 
-        # Load user function code
+        # Load user function code (copy it because astor caches the function AST and we modify it)
         import astor
-        func_ast = astor.code_to_ast(func)
+        import copy
+        func_ast = copy.deepcopy(astor.code_to_ast(func))
+
+        # The vectorized tasks operate on ndarray views
+        views = views or vectorize
+
+        # Retrieve the user functions that can be checked for in place updates or inlined by the vectorizer
+        callee2func_def = {}
+        if inplace is True or vectorize:
+            from pycompss.util.translators.py2pycompss.components.options_processor import OptionsProcessor
+            callee2func_def = OptionsProcessor.get_module_functions(func)
+
+        # Build the cost model choosing the depth of the taskified loops
+        loop_cost_model = None
+        if cost_model is not None:
+            from pycompss.util.translators.py2pycompss.components.cost_model import CostModel
+            loop_cost_model = CostModel(**cost_model)
 
         # Initialize output content
         output_imports = []
         task2headers = {}
         task2func_code = {}
         output_loops_code = []
-        task_counter_id = 0
+        driver_optimizer = None
+        if optimize:
+            from pycompss.util.translators.py2pycompss.components.driver_optimizer import DriverOptimizer
+            driver_optimizer = DriverOptimizer()
 
         # Process each par_py file
         for par_py in par_py_files:
@@ -86,7 +151,7 @@ class Py2PyCOMPSs(object):
 
                     # Update task
                     header, code, original_args, new_args, ret_args, new_vars2subscripts = Py2PyCOMPSs._process_task(
-                        statement, task_new_name)
+                        statement, task_new_name, inplace, callee2func_def)
 
                     task2headers[task_new_name] = header
                     task2func_code[task_new_name] = code
@@ -106,18 +171,53 @@ class Py2PyCOMPSs(object):
                     #     logger.debug("New statement received:")
                     #     logger.debug(astor.to_source(new_statement, pretty_source=PyCOMPSsSourceGen.long_line_ps))
 
+                    # Statement coarsening
+                    if coarsen is not None:
+                        from pycompss.util.translators.py2pycompss.components.statement_coarsener import \
+                            StatementCoarsener
+                        sc = StatementCoarsener(task_counter_id, task2headers, task2func_code, coarsen)
+                        new_statement = sc.visit(new_statement)
+                        task_counter_id = sc.get_final_task_counter_id()
+                        task2headers = sc.get_final_task2headers()
+                        task2func_code = sc.get_final_task2func_code()
+
                     # Loop tasking
                     if tile:
                         from pycompss.util.translators.py2pycompss.components.loop_taskificator import LoopTaskificator
-                        lt = LoopTaskificator(task_counter_id, task2headers, task2func_code, new_statement)
+                        lt = LoopTaskificator(task_counter_id, task2headers, task2func_code, new_statement,
+                                              views=views, cost_model=loop_cost_model, taskify_depth=taskify_depth)
                         lt_new_statement = lt.visit(new_statement)
                         task_counter_id = lt.get_final_task_counter_id()
                         task2headers = lt.get_final_task2headers()
                         task2func_code = lt.get_final_task2func_code()
+                    elif chunk is not None:
+                        from pycompss.util.translators.py2pycompss.components.loop_chunker import LoopChunker
+                        lc = LoopChunker(task_counter_id, task2headers, task2func_code, chunk, views=views)
+                        lt_new_statement = lc.visit(new_statement)
+                        task_counter_id = lc.get_final_task_counter_id()
+                        task2headers = lc.get_final_task2headers()
+                        task2func_code = lc.get_final_task2func_code()
                     else:
                         lt_new_statement = new_statement
-                    # Store new code
-                    output_code.append(lt_new_statement)
+                    # Store new code (transformed main loops are replaced by a list of statements)
+                    if isinstance(lt_new_statement, list):
+                        output_code.extend(lt_new_statement)
+                    else:
+                        output_code.append(lt_new_statement)
+
+            # Optimize the driver code
+            if driver_optimizer is not None:
+                output_code = driver_optimizer.optimize(output_code)
+
+            # Spawn the tasks of the parallel loops from parent tasks
+            if nested:
+                from pycompss.util.translators.py2pycompss.components.nested_taskificator import NestedTaskificator
+                nt = NestedTaskificator(task_counter_id, task2headers, task2func_code,
+                                        NestedTaskificator.get_parallel_lines(par_py))
+                output_code = nt.nest(output_code)
+                task_counter_id = nt.get_final_task_counter_id()
+                task2headers = nt.get_final_task2headers()
+                task2func_code = nt.get_final_task2func_code()
 
             # Store output code
             output_loops_code.append(output_code)
@@ -125,6 +225,7 @@ class Py2PyCOMPSs(object):
         # Substitute loops code on function code
         loop_index = 0
         new_body = []
+        generated_statements = []
         for statement in func_ast.body:
             if isinstance(statement, ast.For):
                 # Check the correctness of the number of generated loops
@@ -133,20 +234,21 @@ class Py2PyCOMPSs(object):
                         "[ERROR] The number of generated parallel FORs is < than the original number of main FORs")
                 # Substitute code with all parallel loop statements
                 new_body.extend(output_loops_code[loop_index])
-                # Add barrier
-                barrier = ast.parse("compss_barrier()")
-                new_body.append(barrier.body[0])
+                generated_statements.extend(output_loops_code[loop_index])
                 # Mark next loop
                 loop_index = loop_index + 1
             else:
                 # Store the same statement to new body
                 new_body.append(statement)
-        func_ast.body = new_body
         # Check that we have substituted all loops
         if loop_index != len(output_loops_code):
             raise Py2PyCOMPSsException(
                 "[ERROR] The number of generated parallel FORs is > than the original number of main FORs")
 
+        # Add the synchronizations required by the host code
+        from pycompss.util.translators.py2pycompss.components.synchronizer import Synchronizer
+        func_ast.body = Synchronizer.synchronize(new_body, generated_statements, task2headers, task2func_code)
+
         # Remove the parallel decorator
         for decorator in func_ast.decorator_list:
             if isinstance(decorator, ast.Call):
@@ -167,6 +269,41 @@ class Py2PyCOMPSs(object):
         #    logger.debug("OUTPUT CODE:")
         #    logger.debug(ast.dump(func_ast.body))
 
+        # Vectorize the element-wise loop tasks receiving ndarray views
+        if vectorize:
+            from pycompss.util.translators.py2pycompss.components.vectorizer import Vectorizer
+            for task_name, task_code in task2func_code.items():
+                if task_name.endswith("_view") and task2headers.get(task_name) is not None:
+                    Vectorizer.vectorize(task_code, task2func_code, callee2func_def)
+
+        # Add the constraints and the task options of the original callees
+        from pycompss.util.translators.py2pycompss.components.options_processor import OptionsProcessor
+        from pycompss.util.translators.py2pycompss.components.header_builder import HeaderBuilder
+        options_processor = OptionsProcessor(func, constraints, task_options)
+        task2constraint_headers = {}
+        if not options_processor.is_empty():
+            for task_name in list(task2headers.keys()):
+                # The parent tasks only spawn the inner tasks, which hold the constraints and options of the callees
+                if nested and task_name.startswith("NT"):
+                    continue
+                task_constraints = options_processor.get_task_constraints(task_name, task2func_code)
+                if len(task_constraints) > 0:
+                    task2constraint_headers[task_name] = HeaderBuilder.build_constraint_header(task_constraints)
+                task_opts = options_processor.get_task_options(task_name, task2func_code)
+                task2headers[task_name] = HeaderBuilder.add_task_options(task2headers[task_name], task_opts)
+
+        # Mark the tasks on the critical path as high-priority tasks
+        task2priority_levels = {}
+        if priority:
+            from pycompss.util.translators.py2pycompss.components.priority_assigner import PriorityAssigner
+            task2priority_levels = PriorityAssigner.get_priority_levels(generated_statements, task2headers,
+                                                                        task2func_code)
+            for task_name in task2priority_levels.keys():
+                # Priorities explicitly set by the user task options are preserved
+                if "priority=" not in task2headers[task_name]:
+                    task2headers[task_name] = HeaderBuilder.add_task_options(task2headers[task_name],
+                                                                             [("priority", "True")])
+
         # Print content to PyCOMPSs file
         from pycompss.util.translators.astor_source_gen.pycompss_source_gen import PyCOMPSsSourceGen
         with open(output, 'w') as f:
@@ -178,6 +315,8 @@ class Py2PyCOMPSs(object):
             # Write default PyCOMPSs imports
             print("from pycompss.api.api import compss_barrier, compss_wait_on, compss_open", file=f)
             print("from pycompss.api.task import task", file=f)
+            if len(task2constraint_headers) > 0:
+                print("from pycompss.api.constraint import constraint", file=f)
             print("from pycompss.api.parameter import *", file=f)
             print("", file=f)
             print("", file=f)
@@ -188,6 +327,10 @@ class Py2PyCOMPSs(object):
                 task_header = task2headers.get(task_name)
                 # Print task header if method is still a task
                 if task_header is not None:
+                    if priority == "level" and task_name in task2priority_levels:
+                        print("# Priority level: " + str(task2priority_levels[task_name]), file=f)
+                    if task_name in task2constraint_headers:
+                        print(task2constraint_headers[task_name], file=f)
                     print(task_header, file=f)
                 # Add method code
                 print(astor.to_source(task_code, pretty_source=PyCOMPSsSourceGen.long_line_ps), file=f)
@@ -200,8 +343,10 @@ class Py2PyCOMPSs(object):
         if __debug__:
             logger.debug("[Py2PyCOMPSs] End translation")
 
+        return task_counter_id
+
     @staticmethod
-    def _process_task(func, new_name):
+    def _process_task(func, new_name, inplace=False, callee2func_def=None):
         """
         Processes the current function to obtain its task header, its
         PyCOMPSs equivalent function and the callee modification. Renames
@@ -209,6 +354,10 @@ class Py2PyCOMPSs(object):
 
         :param func: AST node representing the head of the Python function
         :param new_name: New name for the Python function
+        :param inplace: Whether the callee updates in place the argument receiving its result. Can be a list of callee
+         names
+        :param callee2func_def: Map containing the callee names and their AST representations. Used to check the
+         callees when inplace is True
         :return task_header: String representing the function task header
         :return new_func: new AST node representing the head of the function
         :return original_args: List of original arguments
@@ -246,6 +395,16 @@ class Py2PyCOMPSs(object):
         #     logger.debug("RETURN variables:")
         #     logger.debug(return_vars)
 
+        # Update in place the argument receiving the callee result
+        inplace_var = Py2PyCOMPSs._get_inplace_var(new_func.body[0], return_vars, var2subscript, inplace,
+                                                   callee2func_def)
+        if inplace_var is not None:
+            new_func.body[0] = ast.Expr(value=new_func.body[0].value)
+            return_vars = []
+            in_vars = [var for var in in_vars if var != inplace_var]
+            if inplace_var not in inout_vars:
+                inout_vars.append(inplace_var)
+
         # Add non subscript variables to var2subscript
         for var in in_vars + out_vars + inout_vars + return_vars:
             if var not in var2subscript.keys():
@@ -280,6 +439,84 @@ class Py2PyCOMPSs(object):
 
         return task_header, new_func, original_args, new_args, return_vars, var2subscript
 
+    @staticmethod
+    def _get_inplace_var(statement, return_vars, var2subscript, inplace, callee2func_def=None):
+        """
+        Returns the callee argument that can be updated in place instead of receiving the callee result. This is, the
+        argument accessing the same position than the statement target. When inplace is True, the callee must update
+        the corresponding parameter in place (see _updates_in_place)
+
+        :param statement: AST node representing the task statement
+        :param return_vars: List of return variables
+        :param var2subscript: Dictionary containing the mapping of new variables to previous subscripts
+        :param inplace: Whether the in place mode is enabled. Can be a list of callee names
+        :param callee2func_def: Map containing the callee names and their AST representations (default None)
+        :return inplace_var: The name of the variable to update in place or None if the statement cannot be updated
+         in place
+        """
+
+        if not inplace or len(return_vars) != 1:
+            return None
+        if not isinstance(statement, ast.Assign) or not isinstance(statement.value, ast.Call) or \
+                not isinstance(statement.value.func, ast.Name):
+            return None
+        if isinstance(inplace, list) and statement.value.func.id not in inplace:
+            return None
+
+        # Compare the source of the accesses (the AST contexts differ between targets and arguments)
+        import astor
+        ret_var = return_vars[0]
+        target_source = astor.to_source(var2subscript.get(ret_var, ast.Name(id=ret_var))).strip()
+        for position, arg in enumerate(statement.value.args):
+            if isinstance(arg, ast.Name) and arg.id != ret_var:
+                arg_source = astor.to_source(var2subscript.get(arg.id, arg)).strip()
+                if arg_source == target_source:
+                    if inplace is True:
+                        callee_def = (callee2func_def or {}).get(statement.value.func.id)
+                        if callee_def is None or not Py2PyCOMPSs._updates_in_place(callee_def, position):
+                            return None
+                    return arg.id
+        return None
+
+    @staticmethod
+    def _updates_in_place(func_def, position):
+        """
+        Determines whether the given callee updates in place the parameter at the given position. This is, whether
+        it assigns subscripts of the parameter or passes it as the out keyword (so the argument must be a mutable
+        block), and it returns nothing or the parameter itself
+
+        :param func_def: AST representation of the callee
+        :param position: Position of the parameter
+        :return: True if the parameter is updated in place, False otherwise
+        """
+
+        if position >= len(func_def.args.args):
+            return False
+        # Parameters are Name nodes (Python 2) or arg nodes (Python 3)
+        param = func_def.args.args[position]
+        param_name = param.id if isinstance(param, ast.Name) else param.arg
+
+        updated = False
+        for node in ast.walk(func_def):
+            if isinstance(node, ast.Return) and node.value is not None:
+                if not isinstance(node.value, ast.Name) or node.value.id != param_name:
+                    return False
+            elif isinstance(node, (ast.Assign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Subscript):
+                        while isinstance(target, ast.Subscript):
+                            target = target.value
+                        updated = updated or isinstance(target, ast.Name) and target.id == param_name
+                    elif isinstance(target, ast.Name) and target.id == param_name:
+                        # The parameter is rebound (e.g. c += x on a scalar)
+                        return False
+            elif isinstance(node, ast.Call):
+                for keyword in node.keywords:
+                    if keyword.arg == "out" and isinstance(keyword.value, ast.Name) and keyword.value.id == param_name:
+                        updated = True
+        return updated
+
 
 #
 # Class Node transformer for subscripts to plain variables
@@ -540,6 +777,62 @@ class Py2PyCOMPSsException(Exception):
 
 class TestPy2PyCOMPSs(unittest.TestCase):
 
+    def test_process_task_inplace(self):
+        import astor
+        code = "def S2(i, j, k):\n" \
+               "    c[i][j] = multiply(c[i][j], alpha, a[i][k], b[k][j])\n"
+
+        # Default mode returns a new object
+        func = ast.parse(code).body[0]
+        header, new_func, _, _, ret_args, _ = Py2PyCOMPSs._process_task(func, "S2")
+        self.assertEqual(header, "@task(var2=IN, alpha=IN, var3=IN, var4=IN, returns=1)")
+        self.assertEqual(ret_args, ["var1"])
+
+        # In place mode updates the argument accessing the target position
+        func = ast.parse(code).body[0]
+        header, new_func, _, _, ret_args, _ = Py2PyCOMPSs._process_task(func, "S2", inplace=["multiply"])
+        self.assertEqual(header, "@task(alpha=IN, var3=IN, var4=IN, var2=INOUT)")
+        self.assertEqual(ret_args, [])
+        self.assertEqual(astor.to_source(new_func.body[0]).strip(), "multiply(var2, alpha, var3, var4)")
+
+        # Callees not registered as in place keep returning a new object
+        func = ast.parse(code).body[0]
+        header, _, _, _, ret_args, _ = Py2PyCOMPSs._process_task(func, "S2", inplace=["gemm"])
+        self.assertEqual(ret_args, ["var1"])
+
+    def test_process_task_inplace_checked(self):
+        code = "def S2(i, j, k):\n" \
+               "    c[i][j] = multiply(c[i][j], alpha, a[i][k], b[k][j])\n"
+        callees = {"pure": "def multiply(c, alpha, a, b):\n"
+                           "    return c + alpha * np.dot(a, b)\n",
+                   "scalar": "def multiply(c, alpha, a, b):\n"
+                             "    c += alpha * a * b\n"
+                             "    return c\n",
+                   "block": "def multiply(c, alpha, a, b):\n"
+                            "    c[:, :] += alpha * np.dot(a, b)\n"
+                            "    return c\n",
+                   "out": "def multiply(c, alpha, a, b):\n"
+                          "    np.add(c, alpha * np.dot(a, b), out=c)\n"}
+
+        # Pure callees and scalar updates keep returning a new object
+        for kind in ["pure", "scalar"]:
+            func = ast.parse(code).body[0]
+            callee2func_def = {"multiply": ast.parse(callees[kind]).body[0]}
+            _, _, _, _, ret_args, _ = Py2PyCOMPSs._process_task(func, "S2", True, callee2func_def)
+            self.assertEqual(ret_args, ["var1"])
+        # Callees without source are not converted either
+        func = ast.parse(code).body[0]
+        _, _, _, _, ret_args, _ = Py2PyCOMPSs._process_task(func, "S2", True, {})
+        self.assertEqual(ret_args, ["var1"])
+
+        # Callees updating the block in place
+        for kind in ["block", "out"]:
+            func = ast.parse(code).body[0]
+            callee2func_def = {"multiply": ast.parse(callees[kind]).body[0]}
+            header, _, _, _, ret_args, _ = Py2PyCOMPSs._process_task(func, "S2", True, callee2func_def)
+            self.assertEqual(header, "@task(alpha=IN, var3=IN, var4=IN, var2=INOUT)")
+            self.assertEqual(ret_args, [])
+
     def test_matmul(self):
         # Base variables
         import os
@@ -580,6 +873,45 @@ class TestPy2PyCOMPSs(unittest.TestCase):
             # Erase file
             os.remove(out_file)
 
+    def test_task_counter_id(self):
+        # Base variables
+        import os
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        tests_path = dir_path + "/tests"
+
+        # Insert function file into pythonpath
+        import sys
+        sys.path.insert(0, tests_path)
+
+        # Import function to replace
+        import importlib
+        func_name = "matmul"
+        test_module = importlib.import_module("pycompss.util.translators.py2pycompss.tests.test1_matmul_func")
+        func = getattr(test_module, func_name)
+
+        # Create list of parallel py codes
+        src_file0 = tests_path + "/test1_matmul.src.python"
+        par_py_files = [src_file0]
+
+        # Output file
+        out_file = tests_path + "/test1_matmul.counter.out.pycompss"
+
+        # Translate as if another function of the same module had already generated 4 tasks
+        task_counter_id = Py2PyCOMPSs.translate(func, par_py_files, out_file, task_counter_id=4)
+
+        # Check the task names continue from the given counter
+        try:
+            with open(out_file, 'r') as f:
+                out_content = f.read()
+            self.assertEqual(task_counter_id, 5)
+            self.assertIn("def S5(", out_content)
+            self.assertNotIn("def S1(", out_content)
+        except Exception:
+            raise
+        finally:
+            # Erase file
+            os.remove(out_file)
+
     def test_multiply(self):
         # Base variables
         import os
@@ -620,6 +952,228 @@ class TestPy2PyCOMPSs(unittest.TestCase):
             # Erase file
             os.remove(out_file)
 
+    def test_matmul_optimized(self):
+        # Base variables
+        import os
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        tests_path = dir_path + "/tests"
+
+        # Insert function file into pythonpath
+        import sys
+        sys.path.insert(0, tests_path)
+
+        # Import function to replace
+        import importlib
+        func_name = "matmul"
+        test_module = importlib.import_module("pycompss.util.translators.py2pycompss.tests.test1_matmul_func")
+        func = getattr(test_module, func_name)
+
+        # Create list of parallel py codes
+        src_file0 = tests_path + "/test1_matmul.src.python"
+        par_py_files = [src_file0]
+
+        # Output file
+        out_file = tests_path + "/test1_matmul_optimized.out.pycompss"
+
+        # Translate
+        Py2PyCOMPSs.translate(func, par_py_files, out_file, optimize=True)
+
+        # Check file content
+        expected_file = tests_path + "/test1_matmul_optimized.expected.pycompss"
+        try:
+            with open(expected_file, 'r') as f:
+                expected_content = f.read()
+            with open(out_file, 'r') as f:
+                out_content = f.read()
+            self.assertEqual(out_content, expected_content)
+        except Exception:
+            raise
+        finally:
+            # Erase file
+            os.remove(out_file)
+
+    def test_multiply_optimized(self):
+        # Base variables
+        import os
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        tests_path = dir_path + "/tests"
+
+        # Insert function file into pythonpath
+        import sys
+        sys.path.insert(0, tests_path)
+
+        # Import function to replace
+        import importlib
+        func_name = "matmul"
+        test_module = importlib.import_module(
+            "pycompss.util.translators.py2pycompss.tests.test3_multiply_taskified_func")
+        func = getattr(test_module, func_name)
+
+        # Create list of parallel py codes (tiled CLooG code with floor divisions and min bounds)
+        src_file0 = tests_path + "/test3_multiply_taskified.src.python"
+        par_py_files = [src_file0]
+
+        # Output file
+        out_file = tests_path + "/test3_multiply_optimized.out.pycompss"
+
+        # Translate
+        Py2PyCOMPSs.translate(func, par_py_files, out_file, optimize=True)
+
+        # Check file content
+        expected_file = tests_path + "/test3_multiply_optimized.expected.pycompss"
+        try:
+            with open(expected_file, 'r') as f:
+                expected_content = f.read()
+            with open(out_file, 'r') as f:
+                out_content = f.read()
+            self.assertEqual(out_content, expected_content)
+        except Exception:
+            raise
+        finally:
+            # Erase file
+            os.remove(out_file)
+
+    def test_matmul_chunked(self):
+        # Base variables
+        import os
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        tests_path = dir_path + "/tests"
+
+        # Insert function file into pythonpath
+        import sys
+        sys.path.insert(0, tests_path)
+
+        # Import function to replace
+        import importlib
+        func_name = "matmul"
+        test_module = importlib.import_module("pycompss.util.translators.py2pycompss.tests.test1_matmul_func")
+        func = getattr(test_module, func_name)
+
+        # Create list of parallel py codes
+        src_file0 = tests_path + "/test1_matmul.src.python"
+        par_py_files = [src_file0]
+
+        # Output file
+        out_file = tests_path + "/test1_matmul_chunked.out.pycompss"
+
+        # Translate
+        Py2PyCOMPSs.translate(func, par_py_files, out_file, chunk=2)
+
+        # Check file content (the order of the collection parameters may change)
+        expected_file1 = tests_path + "/test1_matmul_chunked.expected1.pycompss"
+        expected_file2 = tests_path + "/test1_matmul_chunked.expected2.pycompss"
+        try:
+            with open(expected_file1, 'r') as f:
+                expected_content1 = f.read()
+            with open(expected_file2, 'r') as f:
+                expected_content2 = f.read()
+            with open(out_file, 'r') as f:
+                out_content = f.read()
+            self.assertIn(out_content, [expected_content1, expected_content2])
+        except Exception:
+            raise
+        finally:
+            # Erase file
+            os.remove(out_file)
+
+    def test_multiply_views(self):
+        # Base variables
+        import os
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        tests_path = dir_path + "/tests"
+
+        # Insert function file into pythonpath
+        import sys
+        sys.path.insert(0, tests_path)
+
+        # Import function to replace
+        import importlib
+        func_name = "matmul"
+        test_module = importlib.import_module(
+            "pycompss.util.translators.py2pycompss.tests.test3_multiply_taskified_func")
+        func = getattr(test_module, func_name)
+
+        # Create list of parallel py codes
+        src_file0 = tests_path + "/test3_multiply_taskified.src.python"
+        par_py_files = [src_file0]
+
+        # Output file
+        out_file = tests_path + "/test3_multiply_views.out.pycompss"
+
+        # Translate
+        Py2PyCOMPSs.translate(func, par_py_files, out_file, tile=True, views=True)
+
+        # Check file content (the order of the collection parameters may change)
+        expected_file1 = tests_path + "/test3_multiply_views.expected1.pycompss"
+        expected_file2 = tests_path + "/test3_multiply_views.expected2.pycompss"
+        try:
+            with open(expected_file1, 'r') as f:
+                expected_content1 = f.read()
+            with open(expected_file2, 'r') as f:
+                expected_content2 = f.read()
+            with open(out_file, 'r') as f:
+                out_content = f.read()
+            self.assertIn(out_content, [expected_content1, expected_content2])
+        except Exception:
+            raise
+        finally:
+            # Erase file
+            os.remove(out_file)
+
+    def test_ep_vectorized(self):
+        # Base variables
+        import os
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        tests_path = dir_path + "/tests"
+
+        # Insert function file into pythonpath
+        import sys
+        sys.path.insert(0, tests_path)
+
+        # Import function to replace
+        import importlib
+        func_name = "ep"
+        test_module = importlib.import_module("pycompss.util.translators.py2pycompss.tests.test4_ep_func")
+        func = getattr(test_module, func_name)
+
+        # Create list of parallel py codes
+        src_file0 = tests_path + "/test4_ep.src.python"
+        par_py_files = [src_file0]
+
+        # Output file
+        out_file = tests_path + "/test4_ep_vectorized.out.pycompss"
+
+        # Translate
+        Py2PyCOMPSs.translate(func, par_py_files, out_file, chunk=2, vectorize=True)
+
+        # Check file content
+        try:
+            with open(out_file, 'r') as f:
+                out_ast = ast.parse(f.read())
+            funcs = dict((node.name, node) for node in out_ast.body if isinstance(node, ast.FunctionDef))
+
+            # The view task is vectorized (no loops)
+            view_tasks = [name for name in funcs.keys() if name.endswith("_view")]
+            self.assertEqual(len(view_tasks), 1)
+            self.assertFalse(any(isinstance(node, ast.For) for node in ast.walk(funcs[view_tasks[0]])))
+
+            # The master does not synchronize inside the generated loops (the loops calling tasks)
+            generated_loops = 0
+            for loop in ast.walk(funcs[func_name]):
+                if isinstance(loop, ast.For):
+                    called_names = [node.func.id for node in ast.walk(loop)
+                                    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)]
+                    if view_tasks[0] in called_names:
+                        generated_loops += 1
+                        self.assertFalse("compss_wait_on" in called_names)
+                        self.assertFalse("compss_barrier" in called_names)
+            self.assertTrue(generated_loops > 0)
+        except Exception:
+            raise
+        finally:
+            # Erase file
+            os.remove(out_file)
+
     def _test_multiply_taskified(self):
         # Base variables
         import os